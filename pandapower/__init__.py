@@ -2,6 +2,7 @@ __version__ = "1.6.0"
 
 from pandapower.auxiliary import *
 from pandapower.create import *
+from pandapower.builder import NetworkBuilder, bulk_create
 from pandapower.diagnostic import *
 from pandapower.file_io import *
 from pandapower.run import *
@@ -26,6 +26,7 @@
 # THE SOFTWARE.
 # (https://github.com/bcj/AttrDict/blob/master/LICENSE.txt)
 
+import hashlib
 from collections import MutableMapping
 
 import numpy as np
@@ -33,8 +34,9 @@ import pandas as pd
 import scipy as sp
 import six
 
-from pandapower.idx_brch import F_BUS, T_BUS, BR_STATUS
+from pandapower.idx_brch import BR_STATUS
 from pandapower.idx_bus import BUS_I, BUS_TYPE, NONE, PD, QD
+from pandapower.pf.ppci_variables import _get_branch_buses
 
 try:
     from numba import jit
@@ -181,6 +183,36 @@ class pandapowerNet(ADict):
     def __init__(self, *args, **kwargs):
         super(pandapowerNet, self).__init__(*args, **kwargs)
 
+    def __getitem__(self, key):
+        # result tables of a power flow with results="lazy" are calculated on first access
+        lazy_results = self.__dict__.get("_lazy_results")
+        if lazy_results and key in lazy_results:
+            lazy_results[key]()
+        return super(pandapowerNet, self).__getitem__(key)
+
+    def __setitem__(self, key, value):
+        lazy_results = self.__dict__.get("_lazy_results")
+        if lazy_results and key in lazy_results:
+            del lazy_results[key]
+        super(pandapowerNet, self).__setitem__(key, value)
+
+    def _calculate_lazy_results(self):
+        lazy_results = self.__dict__.get("_lazy_results")
+        while lazy_results:
+            next(iter(lazy_results.values()))()
+
+    def __getstate__(self):
+        self._calculate_lazy_results()
+        return super(pandapowerNet, self).__getstate__()
+
+    def items(self):
+        self._calculate_lazy_results()
+        return super(pandapowerNet, self).items()
+
+    def values(self):
+        self._calculate_lazy_results()
+        return super(pandapowerNet, self).values()
+
     def __repr__(self):  # pragma: no cover
         r = "This pandapower network includes the following parameter tables:"
         par = []
@@ -284,8 +316,7 @@ def _check_connectivity(ppc):
     br_status=ppc['branch'][:, BR_STATUS]==True
     nobranch = ppc['branch'][br_status, :].shape[0]
     nobus = ppc['bus'].shape[0]
-    bus_from = ppc['branch'][br_status, F_BUS].real.astype(int)
-    bus_to = ppc['branch'][br_status, T_BUS].real.astype(int)
+    bus_from, bus_to = _get_branch_buses(ppc['branch'][br_status])
 
     slacks = ppc['bus'][ppc['bus'][:, BUS_TYPE] == 3, BUS_I]
 
@@ -348,7 +379,9 @@ def _select_is_elements_numba(net, isolated_nodes=None):
     if isolated_nodes is not None and len(isolated_nodes) > 0:
         ppc_bus_isolated = np.zeros(net["_ppc"]["bus"].shape[0], dtype=bool)
         ppc_bus_isolated[isolated_nodes] = True
-        set_isolated_buses_oos(bus_in_service, ppc_bus_isolated, net["_pd2ppc_lookups"]["bus"])
+        # the lookup also contains the auxiliary buses after the highest bus index
+        bus_lookup = net["_pd2ppc_lookups"]["bus"][:max_bus_idx + 1]
+        set_isolated_buses_oos(bus_in_service, ppc_bus_isolated, bus_lookup)
 
     is_elements = dict()
     for element in ["load", "sgen", "gen", "ward", "xward", "shunt", "ext_grid", "storage"]:
@@ -359,9 +392,20 @@ def _select_is_elements_numba(net, isolated_nodes=None):
             set_elements_oos(element_df["bus"].values, element_df["in_service"].values,
                              bus_in_service, element_in_service)
         is_elements[element] = element_in_service
+    # each dcline is modelled by a generator at the from bus and one at the to bus
+    dcline = net["dcline"]
+    is_elements["dcline"] = dcline["in_service"].values.astype(bool)[:, np.newaxis] & \
+                            bus_in_service[dcline[["from_bus", "to_bus"]].values.astype(int)]
     is_elements["bus_is_idx"] = net["bus"].index.values[bus_in_service[net["bus"].index.values]]
     is_elements["line_is_idx"] = net["line"].index[net["line"].in_service.values]
+    _add_controllable_is_elements(net, is_elements)
+    return is_elements
+
 
+def _add_controllable_is_elements(net, is_elements):
+    """
+    Copies the controllable elements of the OPF from the in service elements of the net
+    """
     if net["_options"]["mode"] == "opf" and "_is_elements" in net and net._is_elements is not None:
         if "load_controllable" in net._is_elements:
             is_elements["load_controllable"] = net._is_elements["load_controllable"]
@@ -369,7 +413,64 @@ def _select_is_elements_numba(net, isolated_nodes=None):
             is_elements["sgen_controllable"] = net._is_elements["sgen_controllable"]
         if "storage_controllable" in net._is_elements:
             is_elements["storage_controllable"] = net._is_elements["storage_controllable"]
-    return is_elements
+
+
+# columns of the element tables which determine the topology of the ppc: the switch states, the
+# in service status and the buses of all elements
+TOPOLOGY_COLUMNS = {
+    "bus": ["in_service"],
+    "switch": ["bus", "element", "et", "closed"],
+    "line": ["from_bus", "to_bus", "in_service"],
+    "trafo": ["hv_bus", "lv_bus", "in_service"],
+    "trafo3w": ["hv_bus", "mv_bus", "lv_bus", "in_service"],
+    "impedance": ["from_bus", "to_bus", "in_service"],
+    "dcline": ["from_bus", "to_bus", "in_service"],
+    "load": ["bus", "in_service"],
+    "sgen": ["bus", "in_service"],
+    "gen": ["bus", "in_service"],
+    "ext_grid": ["bus", "in_service"],
+    "storage": ["bus", "in_service"],
+    "shunt": ["bus", "in_service"],
+    "ward": ["bus", "in_service"],
+    "xward": ["bus", "in_service"]}
+
+
+def _topology_fingerprint(net):
+    """
+    Returns a hash over the topology columns of all element tables (including their index) and
+    the options which change the topology of the ppc.
+    """
+    options = net["_options"]
+    fingerprint = hashlib.md5(repr((options["mode"], options["r_switch"],
+                                    options["check_connectivity"])).encode("utf-8"))
+    for element in sorted(TOPOLOGY_COLUMNS):
+        table = net[element]
+        fingerprint.update(element.encode("utf-8"))
+        fingerprint.update(np.ascontiguousarray(table.index.values).tobytes())
+        for column in TOPOLOGY_COLUMNS[element]:
+            if column not in table:
+                continue
+            values = table[column].values
+            if values.dtype == object:
+                values = values.astype(str)
+            fingerprint.update(("%s:%s" % (column, values.dtype)).encode("utf-8"))
+            fingerprint.update(np.ascontiguousarray(values).tobytes())
+    return fingerprint.hexdigest()
+
+
+def _get_topology_cache(net):
+    """
+    Returns the cache of the structures that _pd2ppc derives from the topology of the net (in
+    service elements, bus lookup, switch and out of service bus information, isolated buses). The
+    cache is stored in net["_pd2ppc_topology"] together with the topology fingerprint and is
+    emptied if the fingerprint changed since the last conversion.
+    """
+    fingerprint = _topology_fingerprint(net)
+    topology = net.get("_pd2ppc_topology")
+    if topology is None or topology["fingerprint"] != fingerprint:
+        topology = {"fingerprint": fingerprint}
+        net["_pd2ppc_topology"] = topology
+    return topology
 
 
 def _add_ppc_options(net, calculate_voltage_angles, trafo_model, check_connectivity, mode,
@@ -491,36 +592,6 @@ def _add_options(net, options):
     net._options.update(options)
 
 
-def _clean_up(net, res=True):
-    # mode = net.__internal_options["mode"]
-
-    # set internal selected _is_elements to None. This way it is not stored (saves disk space)
-    # net._is_elements = None
-
-    mode = net._options["mode"]
-    if res:
-        res_bus = net["res_bus_sc"] if mode == "sc" else net["res_bus"]
-    if len(net["trafo3w"]) > 0:
-        buses_3w = net.trafo3w["ad_bus"].values
-        net["bus"].drop(buses_3w, inplace=True)
-        net["trafo3w"].drop(["ad_bus"], axis=1, inplace=True)
-        if res:
-            res_bus.drop(buses_3w, inplace=True)
-
-    if len(net["xward"]) > 0:
-        xward_buses = net["xward"]["ad_bus"].values
-        net["bus"].drop(xward_buses, inplace=True)
-        net["xward"].drop(["ad_bus"], axis=1, inplace=True)
-        if res:
-            res_bus.drop(xward_buses, inplace=True)
-
-    if len(net["dcline"]) > 0:
-        dc_gens = net.gen.index[(len(net.gen) - len(net.dcline) * 2):]
-        net.gen.drop(dc_gens, inplace=True)
-        if res:
-            net.res_gen.drop(dc_gens, inplace=True)
-
-
 def _set_isolated_buses_out_of_service(net, ppc):
     # set disconnected buses out of service
     # first check if buses are connected to branches
@@ -0,0 +1 @@
+from pandapower.benchmark.suite import BENCHMARKS, run_benchmarks, compare_benchmarks, default_cases
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+"""
+Command line interface of the benchmark suite, e.g.
+
+    python -m pandapower.benchmark --cases case9 case118 --benchmarks runpp_nr runpp_fdbx
+    python -m pandapower.benchmark --output results.csv --baseline baseline.csv
+
+Exits with status 1 if a baseline is given and a benchmark is slower than the tolerance allows.
+"""
+
+import argparse
+import sys
+
+import pandas as pd
+
+from pandapower.benchmark.suite import BENCHMARKS, run_benchmarks, compare_benchmarks, \
+    default_cases
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog="python -m pandapower.benchmark",
+                                     description="pandapower benchmark suite")
+    parser.add_argument("--cases", nargs="+", choices=list(default_cases().keys()),
+                        help="networks to benchmark (default: all)")
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS,
+                        help="benchmarks to run (default: all)")
+    parser.add_argument("--repetitions", type=int, default=3,
+                        help="number of timed runs per benchmark")
+    parser.add_argument("--output", help="csv file for the results")
+    parser.add_argument("--baseline", help="csv file with the results of a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative slowdown compared to the baseline")
+    args = parser.parse_args(args)
+
+    cases = default_cases()
+    if args.cases is not None:
+        cases = type(cases)((name, cases[name]) for name in args.cases)
+    results = run_benchmarks(cases, args.benchmarks, args.repetitions)
+    print(results.to_string())
+    if args.output is not None:
+        results.to_csv(args.output, index=False)
+    if args.baseline is not None:
+        slowdowns = compare_benchmarks(results, pd.read_csv(args.baseline), args.tolerance)
+        if len(slowdowns):
+            print("\nslower than the baseline:")
+            print(slowdowns.to_string())
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
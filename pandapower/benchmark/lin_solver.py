@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+from time import time
+
+import pandas as pd
+
+import pandapower as pp
+import pandapower.networks as pn
+from pandapower.pf.linear_solver import LIN_SOLVERS, UMFPACK_INSTALLED
+
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _default_lin_solver_cases():
+    return {"case118": pn.case118, "case1354pegase": pn.case1354pegase,
+            "case2869pegase": pn.case2869pegase, "case9241pegase": pn.case9241pegase}
+
+
+def benchmark_lin_solvers(cases=None, lin_solvers=None, repetitions=3, **kwargs):
+    """
+    Compares the run time of runpp for all available sparse linear solvers.
+
+    For each case, one power flow is carried out with every solver to compile the numba functions
+    and to validate the results against SuperLU. Then the minimum run time of the given number of
+    repetitions is recorded for a power flow from scratch and for a power flow with recycled
+    Ybus / ppc, where the solvers can reuse the ordering or symbolic factorization of the Jacobian.
+
+    OPTIONAL:
+        **cases** (dict, None) - dict of case name and function that returns a pandapower net.
+        Defaults to case118, case1354pegase, case2869pegase and case9241pegase.
+
+        **lin_solvers** (list, None) - solvers to compare, defaults to all available solvers
+
+        **repetitions** (int, 3) - number of power flows per case and solver
+
+        **kwargs** - additional options for runpp
+
+    OUTPUT:
+        **results** (DataFrame) - run times in seconds with one row per case and solver
+
+    EXAMPLE:
+        from pandapower.benchmark.lin_solver import benchmark_lin_solvers
+        print(benchmark_lin_solvers())
+    """
+    if cases is None:
+        cases = _default_lin_solver_cases()
+    if lin_solvers is None:
+        lin_solvers = [s for s in LIN_SOLVERS if s != "umfpack" or UMFPACK_INSTALLED]
+    recycle = dict(_is_elements=True, ppc=True, Ybus=True)
+
+    rows = []
+    for name, case in cases.items():
+        try:
+            net = case()
+        except Exception as e:
+            logger.warning("case %s could not be loaded: %s" % (name, e))
+            continue
+        pp.runpp(net, lin_solver="superlu", **kwargs)
+        vm_ref = net.res_bus.vm_pu.values.copy()
+        for lin_solver in lin_solvers:
+            pp.runpp(net, lin_solver=lin_solver, **kwargs)
+            max_dev = abs(net.res_bus.vm_pu.values - vm_ref).max()
+            t_full = []
+            t_recycle = []
+            for _ in range(repetitions):
+                t0 = time()
+                pp.runpp(net, lin_solver=lin_solver, **kwargs)
+                t_full.append(time() - t0)
+                t0 = time()
+                pp.runpp(net, lin_solver=lin_solver, recycle=recycle, **kwargs)
+                t_recycle.append(time() - t0)
+            rows.append({"case": name, "buses": len(net.bus), "lin_solver": lin_solver,
+                         "runpp_s": min(t_full), "runpp_recycle_s": min(t_recycle),
+                         "iterations": net._ppc["iterations"], "max_vm_deviation": max_dev})
+    return pd.DataFrame(rows, columns=["case", "buses", "lin_solver", "runpp_s",
+                                       "runpp_recycle_s", "iterations", "max_vm_deviation"])
+
+
+if __name__ == "__main__":
+    print(benchmark_lin_solvers().to_string())
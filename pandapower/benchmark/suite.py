@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+import copy
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from timeit import default_timer
+
+import numpy as np
+import pandas as pd
+
+import pandapower as pp
+import pandapower.networks as pn
+import pandapower.shortcircuit as sc
+from pandapower.estimation import estimate
+
+try:
+    import tracemalloc
+except ImportError:
+    # peak memory is not measured with python 2
+    tracemalloc = None
+
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+BENCHMARKS = ["create", "runpp_nr", "runpp_iwamoto_nr", "runpp_bfsw", "runpp_fdbx", "runpp_gs",
+              "rundcpp", "runopp", "calc_sc", "estimate", "to_json", "from_json", "to_binary",
+              "from_binary"]
+
+# benchmarks are skipped for networks with more buses, since they take too long (gs, bfsw, opf)
+# or need too much memory (the state estimation uses a dense admittance matrix)
+MAX_BUSES = {"runpp_gs": 300, "runpp_bfsw": 3000, "runopp": 3000, "estimate": 300}
+
+RESULT_COLUMNS = ["case", "buses", "benchmark", "time_s", "peak_memory_mb", "iterations",
+                  "success", "error"]
+
+
+def default_cases():
+    """
+    Returns the networks of the benchmark suite as ordered dict of name and function that creates
+    the network: power system test cases from case9 to case9241pegase, the Kerber and Dickert LV
+    networks and the CIGRE / Oberrhein MV networks.
+    """
+    return OrderedDict([
+        ("case9", pn.case9),
+        ("case30", pn.case30),
+        ("case118", pn.case118),
+        ("case300", pn.case300),
+        ("case1354pegase", pn.case1354pegase),
+        ("case2869pegase", pn.case2869pegase),
+        ("case9241pegase", pn.case9241pegase),
+        ("kerber_landnetz_kabel_1", pn.create_kerber_landnetz_kabel_1),
+        ("kerber_dorfnetz", pn.create_kerber_dorfnetz),
+        ("kerber_vorstadtnetz_kabel_2", pn.create_kerber_vorstadtnetz_kabel_2),
+        ("kb_extrem_vorstadtnetz_2", pn.kb_extrem_vorstadtnetz_2),
+        ("dickert_lv_long_multiple", lambda: pn.create_dickert_lv_network(
+            feeders_range="long", linetype="C&OHL", customer="multiple", case="good")),
+        ("cigre_mv", lambda: pn.create_cigre_network_mv(with_der="pv_wind")),
+        ("mv_oberrhein", pn.mv_oberrhein)])
+
+
+def run_benchmarks(cases=None, benchmarks=None, repetitions=3, max_buses=None):
+    """
+    Measures the run time, the peak memory and the time per calculation stage of the pandapower
+    calculations for a set of networks.
+
+    Each benchmark is carried out once to compile the numba functions and then repeated
+    repetitions times, the minimum run time is reported. The time per stage (see the profile
+    option of runpp) is taken from the last repetition. The peak memory is measured with
+    tracemalloc in an additional run (python 3 only, NaN otherwise). Benchmarks that fail are
+    reported with the error message instead of being raised.
+
+    OPTIONAL:
+        **cases** (dict, None) - dict of case name and function that returns a pandapower net.
+        Defaults to default_cases().
+
+        **benchmarks** (list, None) - benchmarks to run, defaults to all BENCHMARKS:
+
+            - "create": creation of the network with the case function
+            - "runpp_<algorithm>": runpp with the algorithms nr, iwamoto_nr, bfsw, fdbx and gs
+            - "rundcpp", "runopp", "calc_sc" (3ph, max): the respective calculations
+            - "estimate": state estimation with voltage and power measurements at all buses
+            - "to_json", "from_json", "to_binary", "from_binary": saving and loading of the \
+              network
+
+        **repetitions** (int, 3) - number of timed runs per case and benchmark
+
+        **max_buses** (dict, None) - maximum number of buses per benchmark, larger networks are
+        skipped. Updates the defaults in MAX_BUSES.
+
+    OUTPUT:
+        **results** (DataFrame) - one row per case and benchmark with the columns in
+        RESULT_COLUMNS and one column "stage_<name>" per calculation stage
+
+    EXAMPLE:
+        from pandapower.benchmark import run_benchmarks
+        results = run_benchmarks(benchmarks=["runpp_nr", "runpp_fdbx"])
+    """
+    if cases is None:
+        cases = default_cases()
+    if benchmarks is None:
+        benchmarks = BENCHMARKS
+    unknown = set(benchmarks) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError("Unknown benchmarks %s" % sorted(unknown))
+    limits = dict(MAX_BUSES, **(max_buses or {}))
+
+    rows = []
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for name, case in cases.items():
+            try:
+                net = case()
+            except Exception as e:
+                logger.warning("case %s could not be created: %s" % (name, e))
+                rows.append({"case": name, "benchmark": "create", "success": False,
+                             "error": str(e)})
+                continue
+            n_bus = len(net.bus)
+            path = os.path.join(tmpdir, "%s.json" % name)
+            for benchmark in benchmarks:
+                if n_bus > limits.get(benchmark, np.inf):
+                    logger.info("%s is skipped for %s (%u buses)" % (benchmark, name, n_bus))
+                    continue
+                logger.info("running %s for %s" % (benchmark, name))
+                row = {"case": name, "buses": n_bus, "benchmark": benchmark}
+                try:
+                    func, timed_net = _get_benchmark(benchmark, net, case, path)
+                    row.update(_measure(func, timed_net, repetitions))
+                    row["success"] = True
+                except Exception as e:
+                    logger.warning("%s failed for %s: %s" % (benchmark, name, e))
+                    row.update({"success": False, "error": str(e)})
+                rows.append(row)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    results = pd.DataFrame(rows)
+    stage_columns = sorted(c for c in results.columns if c.startswith("stage_"))
+    return results.reindex(columns=RESULT_COLUMNS + stage_columns)
+
+
+def compare_benchmarks(results, baseline, tolerance=0.2, min_time_s=1e-3):
+    """
+    Compares benchmark results with the results of a baseline (e.g. the last release) and returns
+    the benchmarks that are more than tolerance slower than in the baseline. Benchmarks that take
+    less than min_time_s in the baseline are not compared, since their run time is too noisy.
+
+    OUTPUT:
+        **slowdowns** (DataFrame) - case, benchmark, time_s, baseline_time_s and ratio of the
+        slower benchmarks
+    """
+    merged = pd.merge(results[["case", "benchmark", "time_s"]],
+                      baseline[["case", "benchmark", "time_s"]].rename(
+                          columns={"time_s": "baseline_time_s"}),
+                      on=["case", "benchmark"])
+    merged = merged[merged.baseline_time_s >= min_time_s]
+    merged["ratio"] = merged.time_s / merged.baseline_time_s
+    return merged[merged.ratio > 1 + tolerance].reset_index(drop=True)
+
+
+def _get_benchmark(benchmark, net, case, path):
+    """
+    Returns the function that runs the benchmark once and the net whose net["_timings"] contains
+    the stage timings afterwards (None if the benchmark is not profiled).
+    """
+    if benchmark == "create":
+        return case, None
+    if benchmark.startswith("runpp_"):
+        algorithm = benchmark[len("runpp_"):]
+        return lambda: pp.runpp(net, algorithm=algorithm, profile=True), net
+    if benchmark == "rundcpp":
+        return lambda: pp.rundcpp(net, profile=True), net
+    if benchmark == "runopp":
+        return lambda: pp.runopp(net, profile=True), net
+    if benchmark == "calc_sc":
+        net_sc = _prepare_sc_net(net)
+        return lambda: sc.calc_sc(net_sc, profile=True), net_sc
+    if benchmark == "estimate":
+        net_se = _prepare_estimation_net(net)
+
+        def run_estimate():
+            if not estimate(net_se, ref_power=1e8, profile=True):
+                raise UserWarning("state estimation did not converge")
+        return run_estimate, net_se
+    if benchmark == "to_json":
+        return lambda: pp.to_json(net, path), None
+    if benchmark == "from_json":
+        if not os.path.exists(path):
+            pp.to_json(net, path)
+        return lambda: pp.from_json(path), None
+    binary_path = os.path.splitext(path)[0] + ".ppb"
+    if benchmark == "to_binary":
+        return lambda: pp.to_binary(net, binary_path), None
+    if benchmark == "from_binary":
+        if not os.path.exists(binary_path):
+            pp.to_binary(net, binary_path)
+        return lambda: pp.from_binary(binary_path), None
+    raise ValueError("Unknown benchmark %s" % benchmark)
+
+
+def _measure(func, timed_net, repetitions):
+    """
+    Runs func once for the compilation, then repetitions times for the run time and once more for
+    the peak memory.
+    """
+    func()
+    times = []
+    for _ in range(repetitions):
+        t0 = default_timer()
+        func()
+        times.append(default_timer() - t0)
+    result = {"time_s": min(times)}
+    if timed_net is not None and "_timings" in timed_net:
+        timings = timed_net["_timings"]
+        result["iterations"] = timings["iterations"]
+        for stage, t in timings["stages"].items():
+            result["stage_%s" % stage] = t
+    result["peak_memory_mb"] = _get_peak_memory_mb(func)
+    return result
+
+
+def _get_peak_memory_mb(func):
+    if tracemalloc is None:
+        return np.nan
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024. ** 2
+
+
+def _prepare_sc_net(net):
+    """
+    Returns a copy of the net with default short circuit parameters for external grids,
+    generators and static generators where they are missing (the power system test cases do
+    not define them).
+    """
+    net = copy.deepcopy(net)
+    for column, default in [("s_sc_max_mva", 1000.), ("rx_max", 0.1)]:
+        if column not in net.ext_grid:
+            net.ext_grid[column] = np.nan
+        net.ext_grid[column] = net.ext_grid[column].fillna(default)
+    if len(net.gen):
+        defaults = {"vn_kv": pd.Series(net.bus.vn_kv.loc[net.gen.bus].values,
+                                       index=net.gen.index),
+                    "sn_kva": np.maximum(abs(net.gen.p_kw) * 1.2, 1e3),
+                    "xdss": 0.2, "rdss": 0.005, "cos_phi": 0.85}
+        for column, default in defaults.items():
+            if column not in net.gen:
+                net.gen[column] = np.nan
+            net.gen[column] = net.gen[column].fillna(default)
+    if len(net.sgen):
+        defaults = {"sn_kva": np.maximum(abs(net.sgen.p_kw) * 1.2, 1.), "k": 1.}
+        for column, default in defaults.items():
+            if column not in net.sgen:
+                net.sgen[column] = np.nan
+            net.sgen[column] = net.sgen[column].fillna(default)
+    return net
+
+
+def _prepare_estimation_net(net):
+    """
+    Returns a copy of the net with voltage and power measurements at all supplied buses, which are
+    taken from a power flow.
+    """
+    net = copy.deepcopy(net)
+    pp.runpp(net)
+    res_bus = net.res_bus[net.res_bus.vm_pu.notnull()]
+    n = len(res_bus)
+    measurements = pd.DataFrame({
+        "type": ["v"] * n + ["p"] * n + ["q"] * n,
+        "element_type": "bus",
+        "value": np.r_[res_bus.vm_pu.values, -res_bus.p_kw.values, -res_bus.q_kvar.values],
+        "std_dev": np.r_[np.full(n, 0.01), np.full(2 * n, 1.)],
+        "bus": np.tile(res_bus.index.values, 3),
+        "element": np.nan,
+        "name": None})
+    net.measurement = measurements.reindex(columns=net.measurement.columns)
+    return net
@@ -13,14 +13,16 @@ import pandas as pd
 
 from pandapower.auxiliary import get_values
 from pandapower.idx_brch import F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, SHIFT, BR_STATUS, RATE_A, \
-    BR_R_ASYM, BR_X_ASYM, branch_cols
+    BR_R_ASYM, BR_X_ASYM, BR_G, branch_cols
 from pandapower.idx_bus import BASE_KV, VM, VA
+from pandapower.pf.ppci_variables import _get_branch_buses
 
 
 def _build_branch_ppc(net, ppc):
     """
     Takes the empty ppc network and fills it with the branch values. The branch
-    datatype will be np.complex 128 afterwards.
+    datatype will be np.float64 afterwards, the complex line charging susceptance is split into
+    the susceptance BR_B and the conductance BR_G.
 
     .. note:: The order of branches in the ppc is:
             1. Lines
@@ -38,7 +40,7 @@ def _build_branch_ppc(net, ppc):
     length = _initialize_branch_lookup(net)
     lookup = net._pd2ppc_lookups["branch"]
     mode = net._options["mode"]
-    ppc["branch"] = np.zeros(shape=(length, branch_cols), dtype=np.complex128)
+    ppc["branch"] = np.zeros(shape=(length, branch_cols), dtype=np.float64)
     if mode == "sc":
         from pandapower.shortcircuit.idx_brch import branch_cols_sc
         branch_sc = np.empty(shape=(length, branch_cols_sc), dtype=float)
@@ -47,16 +49,18 @@ def _build_branch_ppc(net, ppc):
     ppc["branch"][:, :13] = np.array([0, 0, 0, 0, 0, 250, 250, 250, 1, 0, 1, -360, 360])
     if "line" in lookup:
         f, t = lookup["line"]
-        ppc["branch"][f:t, [F_BUS, T_BUS, BR_R, BR_X, BR_B,
-                            BR_STATUS, RATE_A]] = _calc_line_parameter(net, ppc)
+        _set_branch_values(ppc["branch"], f, t, [F_BUS, T_BUS, BR_R, BR_X, BR_B, BR_STATUS, RATE_A],
+                           _calc_line_parameter(net, ppc))
     if "trafo" in lookup:
         f, t = lookup["trafo"]
-        ppc["branch"][f:t, [F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, SHIFT, BR_STATUS,
-                            RATE_A]] = _calc_trafo_parameter(net, ppc)
+        _set_branch_values(ppc["branch"], f, t, [F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, SHIFT,
+                                                 BR_STATUS, RATE_A],
+                           _calc_trafo_parameter(net, ppc))
     if "trafo3w" in lookup:
         f, t = lookup["trafo3w"]
-        ppc["branch"][f:t, [F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, SHIFT, BR_STATUS, RATE_A]] = \
-            _calc_trafo3w_parameter(net, ppc)
+        _set_branch_values(ppc["branch"], f, t, [F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, SHIFT,
+                                                 BR_STATUS, RATE_A],
+                           _calc_trafo3w_parameter(net, ppc))
     if "impedance" in lookup:
         f, t = lookup["impedance"]
         ppc["branch"][f:t, [F_BUS, T_BUS, BR_R, BR_X, BR_R_ASYM, BR_X_ASYM, BR_STATUS]] = \
@@ -70,6 +74,17 @@ def _build_branch_ppc(net, ppc):
         ppc["branch"][f:t, [F_BUS, T_BUS, BR_R]] = _calc_switch_parameter(net, ppc)
 
 
+def _set_branch_values(branch, f, t, columns, values):
+    """
+    Writes the temporary branch parameters values (complex array with one column per entry in
+    columns) to the rows f:t of the real valued branch matrix. The complex susceptance b - j*g in
+    the BR_B column is split into the susceptance BR_B and the conductance BR_G.
+    """
+    branch[f:t, columns] = values.real
+    if BR_B in columns:
+        branch[f:t, BR_G] = -values[:, columns.index(BR_B)].imag
+
+
 def _initialize_branch_lookup(net):
     r_switch = net["_options"]["r_switch"]
     start = 0
@@ -428,8 +443,9 @@ def _trafo_df_from_trafo3w(net):
     trafos2w = {}
     nr_trafos = len(net["trafo3w"])
     tap_variables = ("tp_pos", "tp_mid", "tp_max", "tp_min", "tp_st_percent", "tp_st_degree")
+    star_buses = net["_pd2ppc_lookups"]["aux"]["trafo3w"]
     i = 0
-    for ttab in net["trafo3w"].itertuples():
+    for ttab, star_bus in zip(net["trafo3w"].itertuples(), star_buses):
         vsc = np.array([ttab.vsc_hv_percent, ttab.vsc_mv_percent, ttab.vsc_lv_percent], dtype=float)
         vscr = np.array([ttab.vscr_hv_percent, ttab.vscr_mv_percent, ttab.vscr_lv_percent], dtype=float)
         sn = np.array([ttab.sn_hv_kva, ttab.sn_mv_kva, ttab.sn_lv_kva])
@@ -467,7 +483,7 @@ def _trafo_df_from_trafo3w(net):
 
         max_load = ttab.max_loading_percent if "max_loading_percent" in ttab._fields else 0
 
-        trafos2w[i] = {"hv_bus": ttab.hv_bus, "lv_bus": ttab.ad_bus, "sn_kva": ttab.sn_hv_kva,
+        trafos2w[i] = {"hv_bus": ttab.hv_bus, "lv_bus": star_bus, "sn_kva": ttab.sn_hv_kva,
                        "vn_hv_kv": ttab.vn_hv_kv, "vn_lv_kv": ttab.vn_hv_kv,
                        "vscr_percent": vscr_2w[0], "vsc_percent": vsc_2w[0],
                        "pfe_kw": ttab.pfe_kw if loss_location == "hv" else 0,
@@ -480,7 +496,7 @@ def _trafo_df_from_trafo3w(net):
                        "parallel": 1, "df": 1, "in_service": ttab.in_service, "shift_degree": 0,
                        "max_loading_percent": max_load}
         trafos2w[i + nr_trafos] = {
-            "hv_bus": ttab.ad_bus, "lv_bus": ttab.mv_bus, "sn_kva": ttab.sn_mv_kva,
+            "hv_bus": star_bus, "lv_bus": ttab.mv_bus, "sn_kva": ttab.sn_mv_kva,
             "vn_hv_kv": ttab.vn_hv_kv, "vn_lv_kv": ttab.vn_mv_kv, "vscr_percent": vscr_2w[1],
             "vsc_percent": vsc_2w[1], "pfe_kw": ttab.pfe_kw if loss_location == "mv" else 0,
             "i0_percent": ttab.i0_percent * ttab.sn_hv_kva / ttab.sn_mv_kva
@@ -492,7 +508,7 @@ def _trafo_df_from_trafo3w(net):
             "df": 1, "in_service": ttab.in_service, "shift_degree": ttab.shift_mv_degree,
             "max_loading_percent": max_load}
         trafos2w[i + 2 * nr_trafos] = {
-            "hv_bus": ttab.ad_bus, "lv_bus": ttab.lv_bus, "sn_kva": ttab.sn_lv_kva,
+            "hv_bus": star_bus, "lv_bus": ttab.lv_bus, "sn_kva": ttab.sn_lv_kva,
             "vn_hv_kv": ttab.vn_hv_kv, "vn_lv_kv": ttab.vn_lv_kv, "vscr_percent": vscr_2w[2],
             "vsc_percent": vsc_2w[2], "pfe_kw": ttab.pfe_kw if loss_location == "lv" else 0,
             "i0_percent": ttab.i0_percent * ttab.sn_hv_kva / ttab.sn_lv_kva
@@ -512,7 +528,7 @@ def _trafo_df_from_trafo3w(net):
 
 def _calc_impedance_parameter(net):
     bus_lookup = net["_pd2ppc_lookups"]["bus"]
-    t = np.zeros(shape=(len(net["impedance"].index), 7), dtype=np.complex128)
+    t = np.zeros(shape=(len(net["impedance"].index), 7), dtype=np.float64)
     sn_impedance = net["impedance"]["sn_kva"].values
     sn_net = net.sn_kva
     rij = net["impedance"]["rft_pu"].values
@@ -533,10 +549,10 @@ def _calc_xward_parameter(net, ppc):
     bus_lookup = net["_pd2ppc_lookups"]["bus"]
     baseR = np.square(get_values(ppc["bus"][:, BASE_KV], net["xward"]["bus"].values, bus_lookup)) / \
             net.sn_kva * 1e3
-    t = np.zeros(shape=(len(net["xward"].index), 5), dtype=np.complex128)
+    t = np.zeros(shape=(len(net["xward"].index), 5), dtype=np.float64)
     xw_is = net["_is_elements"]["xward"]
     t[:, 0] = bus_lookup[net["xward"]["bus"].values]
-    t[:, 1] = bus_lookup[net["xward"]["ad_bus"].values]
+    t[:, 1] = bus_lookup[net["_pd2ppc_lookups"]["aux"]["xward"]]
     t[:, 2] = net["xward"]["r_ohm"] / baseR
     t[:, 3] = net["xward"]["x_ohm"] / baseR
     t[:, 4] = xw_is
@@ -557,7 +573,25 @@ def _gather_branch_switch_info(bus, branch_id, branch_type, net):
         return is_to_bus, bus, net["trafo"].index.get_loc(branch_id)
 
 
-def _switch_branches(net, ppc):
+def _get_branch_switch_info(net, switch_mask, branch_type):
+    switches = net["switch"].loc[switch_mask]
+    mapfunc = partial(_gather_branch_switch_info, branch_type=branch_type, net=net)
+    return np.array(list(map(mapfunc, switches["bus"].values, switches["element"].values)),
+                    dtype=int)
+
+
+def _get_topology_info(topology, key, func, *args):
+    """
+    Returns func(\*args) from the topology cache of _pd2ppc, adds it if it is not cached yet
+    """
+    if topology is None:
+        return func(*args)
+    if key not in topology:
+        topology[key] = func(*args)
+    return topology[key]
+
+
+def _switch_branches(net, ppc, topology=None):
     from pandapower.shortcircuit.idx_bus import C_MIN, C_MAX
     """
     Updates the ppc["branch"] matrix with the changed from or to values
@@ -567,6 +601,9 @@ def _switch_branches(net, ppc):
         **pd_net** - The pandapower format network
 
         **ppc** - The PYPOWER format network to fill in values
+
+        **topology** - The topology cache of _pd2ppc, the positions of the switched branches
+        are taken from it
     """
     bus_lookup = net["_pd2ppc_lookups"]["bus"]
     connectivity_check = net["_options"]["check_connectivity"]
@@ -625,18 +662,14 @@ def _switch_branches(net, ppc):
 
         if nlo:
             future_buses = [ppc["bus"]]
-            line_switches = net["switch"].loc[slidx]
 
             # determine on which side the switch is located
-            mapfunc = partial(_gather_branch_switch_info, branch_type="l", net=net)
-            ls_info = list(map(mapfunc,
-                               line_switches["bus"].values,
-                               line_switches["element"].values))
+            ls_info = _get_topology_info(topology, "line_switch_info", _get_branch_switch_info,
+                                         net, slidx, "l")
             # we now have the following matrix
             # 0: 1 if switch is at to_bus, 0 else
             # 1: bus of the switch
             # 2: position of the line a switch is connected to
-            ls_info = np.array(ls_info, dtype=int)
 
             # build new buses
             new_ls_buses = np.zeros(shape=(nlo, ppc["bus"].shape[1]), dtype=float)
@@ -646,9 +679,9 @@ def _switch_branches(net, ppc):
             new_ls_buses[:, 0] = new_indices
             new_ls_buses[:, BASE_KV] = get_values(ppc["bus"][:, BASE_KV], ls_info[:, 1], bus_lookup)
             #             set voltage of new buses to voltage on other branch end
-            to_buses = ppc["branch"][ls_info[ls_info[:, 0].astype(bool), 2], 1].real.astype(int)
-            from_buses = ppc["branch"][ls_info[np.logical_not(ls_info[:, 0]), 2], 0].real \
-                .astype(int)
+            to_buses = _get_branch_buses(ppc["branch"][ls_info[ls_info[:, 0].astype(bool), 2]])[1]
+            from_buses = _get_branch_buses(ppc["branch"][ls_info[np.logical_not(ls_info[:, 0]),
+                                                                 2]])[0]
 
             if len(to_buses):
                 ix = ls_info[:, 0] == 1
@@ -677,18 +710,14 @@ def _switch_branches(net, ppc):
 
         if nto:
             future_buses = [ppc["bus"]]
-            trafo_switches = net["switch"].loc[stidx]
 
             # determine on which side the switch is located
-            mapfunc = partial(_gather_branch_switch_info, branch_type="t", net=net)
-            ts_info = list(map(mapfunc,
-                               trafo_switches["bus"].values,
-                               trafo_switches["element"].values))
+            ts_info = _get_topology_info(topology, "trafo_switch_info", _get_branch_switch_info,
+                                         net, stidx, "t")
             # we now have the following matrix
             # 0: 1 if switch is at lv_bus, 0 else
             # 1: bus of the switch
             # 2: position of the trafo a switch is connected to
-            ts_info = np.array(ts_info, dtype=int)
 
             # build new buses
             new_ts_buses = np.zeros(shape=(nto, ppc["bus"].shape[1]), dtype=float)
@@ -697,9 +726,9 @@ def _switch_branches(net, ppc):
             new_ts_buses[:, 0] = new_indices
             new_ts_buses[:, BASE_KV] = get_values(ppc["bus"][:, BASE_KV], ts_info[:, 1], bus_lookup)
             # set voltage of new buses to voltage on other branch end
-            to_buses = ppc["branch"][ts_info[ts_info[:, 0].astype(bool), 2], 1].real.astype(int)
-            from_buses = ppc["branch"][ts_info[np.logical_not(ts_info[:, 0]), 2], 0].real \
-                .astype(int)
+            to_buses = _get_branch_buses(ppc["branch"][ts_info[ts_info[:, 0].astype(bool), 2]])[1]
+            from_buses = _get_branch_buses(ppc["branch"][ts_info[np.logical_not(ts_info[:, 0]),
+                                                                 2]])[0]
 
             # set newly created buses to voltage on other side of
             if len(to_buses):
@@ -734,7 +763,46 @@ def _switch_branches(net, ppc):
             ppc["bus"] = np.vstack(future_buses)
 
 
-def _branches_with_oos_buses(net, ppc):
+def _get_oos_bus_line_info(net, bus_is_idx, line_is_idx):
+    """
+    Returns the information about the in service lines which are connected to an out of service
+    bus at exactly one side as matrix:
+    0: 1 if the out of service bus is the to_bus, 0 else
+    1: out of service bus
+    2: position of the line
+    """
+    # out of service buses
+    bus_oos = np.setdiff1d(net['bus'].index.values, bus_is_idx)
+    # from buses of line
+    line_buses = net["line"][["from_bus", "to_bus"]].loc[line_is_idx].values
+    f_bus = line_buses[:, 0]
+    t_bus = line_buses[:, 1]
+
+    # determine on which side of the line the oos bus is located
+    mask_from = np.in1d(f_bus, bus_oos)
+    mask_to = np.in1d(t_bus, bus_oos)
+
+    mask_and = mask_to & mask_from
+    if np.any(mask_and):
+        mask_from[mask_and] = False
+        mask_to[mask_and] = False
+
+    # get lines that are connected to oos bus at exactly one side
+    # buses that are connected to two oos buses will be removed by ext2int
+    mask_or = mask_to | mask_from
+    # check whether buses are connected to line
+    oos_buses_at_lines = np.r_[f_bus[mask_from], t_bus[mask_to]]
+    n_oos_buses_at_lines = len(oos_buses_at_lines)
+
+    ls_info = np.zeros((n_oos_buses_at_lines, 3), dtype=int)
+    if n_oos_buses_at_lines > 0:
+        ls_info[:, 0] = mask_to[mask_or] & ~mask_from[mask_or]
+        ls_info[:, 1] = oos_buses_at_lines
+        ls_info[:, 2] = np.nonzero(np.in1d(net['line'].index, line_is_idx[mask_or]))[0]
+    return ls_info
+
+
+def _branches_with_oos_buses(net, ppc, topology=None):
     """
     Updates the ppc["branch"] matrix with the changed from or to values
     if the branch is connected to an out of service bus
@@ -746,7 +814,9 @@ def _branches_with_oos_buses(net, ppc):
         **n** - The pandapower format network
 
         **ppc** - The PYPOWER format network to fill in values
-        **bus_is** - The in service buses
+
+        **topology** - The topology cache of _pd2ppc, the lines at out of service buses are
+        taken from it
     """
     bus_lookup = net["_pd2ppc_lookups"]["bus"]
     # get in service elements
@@ -760,45 +830,12 @@ def _branches_with_oos_buses(net, ppc):
     if n_oos_buses > 0:
         n_bus = len(ppc["bus"])
         future_buses = [ppc["bus"]]
-        # out of service buses
-        bus_oos = np.setdiff1d(net['bus'].index.values, bus_is_idx)
-        # from buses of line
-        line_buses = net["line"][["from_bus", "to_bus"]].loc[line_is_idx].values
-        f_bus = line_buses[:, 0]
-        t_bus = line_buses[:, 1]
-
-        # determine on which side of the line the oos bus is located
-        mask_from = np.in1d(f_bus, bus_oos)
-        mask_to = np.in1d(t_bus, bus_oos)
-
-        mask_and = mask_to & mask_from
-        if np.any(mask_and):
-            mask_from[mask_and] = False
-            mask_to[mask_and] = False
-
-        # get lines that are connected to oos bus at exactly one side
-        # buses that are connected to two oos buses will be removed by ext2int
-        mask_or = mask_to | mask_from
-        # check whether buses are connected to line
-        oos_buses_at_lines = np.r_[f_bus[mask_from], t_bus[mask_to]]
-        n_oos_buses_at_lines = len(oos_buses_at_lines)
+        ls_info = _get_topology_info(topology, "oos_bus_line_info", _get_oos_bus_line_info,
+                                     net, bus_is_idx, line_is_idx)
+        n_oos_buses_at_lines = len(ls_info)
 
         # only if oos_buses are at lines (they could be isolated as well)
         if n_oos_buses_at_lines > 0:
-            ls_info = np.zeros((n_oos_buses_at_lines, 3), dtype=int)
-            ls_info[:, 0] = mask_to[mask_or] & ~mask_from[mask_or]
-            ls_info[:, 1] = oos_buses_at_lines
-            ls_info[:, 2] = np.nonzero(np.in1d(net['line'].index, line_is_idx[mask_or]))[0]
-
-            # ls_info = list(map(mapfunc,
-            #               line_switches["bus"].values,
-            #               line_switches["element"].values))
-            # we now have the following matrix
-            # 0: 1 if switch is at to_bus, 0 else
-            # 1: bus of the switch
-            # 2: position of the line a switch is connected to
-            # ls_info = np.array(ls_info, dtype=int)
-
             # build new buses
             new_ls_buses = np.zeros(shape=(n_oos_buses_at_lines, ppc["bus"].shape[1]), dtype=float)
             new_indices = np.arange(n_bus, n_bus + n_oos_buses_at_lines)
@@ -831,12 +868,13 @@ def _update_trafo_trafo3w_ppc(net, ppc):
     trafo3w_end = trafo_end + len(net["trafo3w"]) * 3
 
     if trafo_end > line_end:
-        ppc["branch"][line_end:trafo_end,
-        [F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, SHIFT, BR_STATUS, RATE_A]] = \
-            _calc_trafo_parameter(net, ppc)
+        _set_branch_values(ppc["branch"], line_end, trafo_end,
+                           [F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, SHIFT, BR_STATUS, RATE_A],
+                           _calc_trafo_parameter(net, ppc))
     if trafo3w_end > trafo_end:
-        ppc["branch"][trafo_end:trafo3w_end, [F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, SHIFT, BR_STATUS]] = \
-            _calc_trafo3w_parameter(net, ppc)
+        _set_branch_values(ppc["branch"], trafo_end, trafo3w_end,
+                           [F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, SHIFT, BR_STATUS, RATE_A],
+                           _calc_trafo3w_parameter(net, ppc))
 
 
 def _calc_switch_parameter(net, ppc):
@@ -847,9 +885,9 @@ def _calc_switch_parameter(net, ppc):
         **net** -The pandapower format network
 
     **RETURN**:
-        **t** - Temporary line parameter. Which is a complex128
+        **t** - Temporary switch parameter. Which is a float64
                 Nunmpy array. with the following order:
-                0:bus_a; 1:bus_b; 2:r_pu; 3:x_pu; 4:b_pu
+                0:bus_a; 1:bus_b; 2:r_pu
     """
     r_switch = net["_options"]["r_switch"]
     bus_lookup = net["_pd2ppc_lookups"]["bus"]
@@ -857,7 +895,7 @@ def _calc_switch_parameter(net, ppc):
     fb = bus_lookup[switch["bus"].values]
     tb = bus_lookup[switch["element"].values]
     baseR = np.square(ppc["bus"][fb, BASE_KV]) / net.sn_kva * 1e3
-    t = np.zeros(shape=(len(switch), 3), dtype=np.complex128)
+    t = np.zeros(shape=(len(switch), 3), dtype=np.float64)
 
     t[:, 0] = fb
     t[:, 1] = tb
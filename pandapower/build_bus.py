@@ -4,19 +4,22 @@
 # and Energy System Technology (IEE), Kassel. All rights reserved.
 
 
-from collections import defaultdict, Counter
-from itertools import chain
+from collections import Counter
 
 import numpy as np
 import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 from pandapower.auxiliary import _sum_by_group
 from pandapower.idx_bus import BUS_I, BASE_KV, PD, QD, GS, BS, VMAX, VMIN, BUS_TYPE, NONE, VM, VA, CID, CZD, bus_cols
 
 try:
     from numba import jit
+    NUMBA_INSTALLED = True
 except ImportError:
     from .pf.no_numba import jit
+    NUMBA_INSTALLED = False
 
 
 @jit(nopython=True, cache=True)
@@ -76,8 +79,6 @@ def create_bus_lookup_numba(net, bus_is_idx, bus_index, gen_is_idx, eg_is_idx):
     bus_is_pv = np.zeros(max_bus_idx + 1, dtype=bool)
     bus_is_pv[net["ext_grid"]["bus"].values[eg_is_idx]] = True
     bus_is_pv[net["gen"]["bus"].values[gen_is_idx]] = True
-    if len(net["xward"]) > 0:
-        bus_is_pv[net["xward"][net["xward"].in_service == 1]["ad_bus"].values] = True
     # create array that represents the disjoint set
     ar = np.arange(max_bus_idx + 1)
     ds_create(ar, switch_bus, switch_elm, switch_et_bus, switch_closed, bus_is_pv, bus_in_service)
@@ -87,21 +88,26 @@ def create_bus_lookup_numba(net, bus_is_idx, bus_index, gen_is_idx, eg_is_idx):
     return bus_lookup
 
 
-class DisjointSet(dict):
-    def add(self, item):
-        self[item] = item
-
-    def find(self, item):
-        parent = self[item]
-        if self[parent] != parent:
-            parent = self.find(parent)
-            self[item] = parent
-        return parent
-
-    def union(self, item1, item2):
-        p1 = self.find(item1)
-        p2 = self.find(item2)
-        self[p1] = p2
+def fuse_buses(bus_lookup, fbus, tbus, pv_buses):
+    """
+    Updates the bus lookup so that all buses which are connected by the closed bus-bus switches
+    fbus - tbus are mapped to the same ppc bus. The fused buses are the connected components of
+    the switch graph. Each component is mapped to the ppc bus of one of its PV / slack buses, if
+    it contains any, otherwise to the ppc bus of its bus with the lowest index.
+    """
+    buses, nodes = np.unique(np.r_[fbus, tbus], return_inverse=True)
+    n_nodes = len(buses)
+    n_switches = len(fbus)
+    graph = coo_matrix((np.ones(n_switches, dtype=bool), (nodes[:n_switches], nodes[n_switches:])),
+                       shape=(n_nodes, n_nodes))
+    _, labels = connected_components(graph, directed=False)
+    # sort the buses by component, PV / slack buses first in each component
+    is_pv = np.in1d(buses, pv_buses)
+    order = np.lexsort((~is_pv, labels))
+    sorted_labels = labels[order]
+    first = np.r_[True, sorted_labels[1:] != sorted_labels[:-1]]
+    representative = buses[order[first]]
+    bus_lookup[buses] = bus_lookup[representative[labels]]
 
 
 def create_bus_lookup(net, n_bus, bus_index, bus_is_idx, gen_is_mask, eg_is_mask, r_switch):
@@ -129,56 +135,12 @@ def create_bus_lookup(net, n_bus, bus_index, bus_is_idx, gen_is_mask, eg_is_mask
         # quite some time in the average usecase, where #busses >> #bus-bus switches.
 
         # Find PV / Slack nodes -> their bus must be kept when fused with a PQ node
-        pv_list = [net["ext_grid"]["bus"].values[eg_is_mask], net["gen"]["bus"].values[gen_is_mask]]
-        if len(net["xward"]) > 0:
-            pv_list.append(net["xward"][net["xward"].in_service == 1]["ad_bus"].values)
-        pv_ref = np.unique(np.hstack(pv_list))
+        pv_ref = np.r_[net["ext_grid"]["bus"].values[eg_is_mask],
+                       net["gen"]["bus"].values[gen_is_mask]]
         # get the pp-indices of the buses which are connected to a switch
-        fbus = net["switch"]["bus"].values[slidx]
-        tbus = net["switch"]["element"].values[slidx]
-
-        # create a mapping to map each bus to itself at frist ...
-        ds = DisjointSet({e: e for e in chain(fbus, tbus)})
-
-        # ... to follow each bus along a possible chain of switches to its final bus and update the
-        # map
-        for f, t in zip(fbus, tbus):
-            ds.union(f, t)
-
-        # now we can find out how to fuse each bus by looking up the final bus of the chain they
-        # are connected to
-        v = defaultdict(set)
-        for a in ds:
-            v[ds.find(a)].add(a)
-        # build sets of buses which will be fused
-        disjoint_sets = [e for e in v.values() if len(e) > 1]
-
-        # check if PV buses need to be fused
-        # if yes: the sets with PV buses must be found (which is slow)
-        # if no: the check can be omitted
-        if any(i in fbus or i in tbus for i in pv_ref):
-            # for every disjoint set
-            for dj in disjoint_sets:
-                # check if pv buses are in the disjoint set dj
-                pv_buses_in_set = set(pv_ref) & dj
-                nr_pv_bus = len(pv_buses_in_set)
-                if nr_pv_bus == 0:
-                    # no pv buses. Use any bus in dj
-                    map_to = bus_lookup[dj.pop()]
-                else:
-                    # one pv bus. Get bus from pv_buses_in_set
-                    map_to = bus_lookup[pv_buses_in_set.pop()]
-                for bus in dj:
-                    # update lookup
-                    bus_lookup[bus] = map_to
-        else:
-            # no PV buses in set
-            for dj in disjoint_sets:
-                # use any bus in set
-                map_to = bus_lookup[dj.pop()]
-                for bus in dj:
-                    # update bus lookup
-                    bus_lookup[bus] = map_to
+        fbus = net["switch"]["bus"].values[slidx].astype(int)
+        tbus = net["switch"]["element"].values[slidx].astype(int)
+        fuse_buses(bus_lookup, fbus, tbus, pv_ref)
     return bus_lookup
 
 def get_voltage_init_vector(net, init_v, mode):
@@ -208,9 +170,34 @@ def get_voltage_init_vector(net, init_v, mode):
             raise UserWarning("Voltage starting vector indices do not match bus indices")
 
 
-def _build_bus_ppc(net, ppc):
+def _get_aux_buses(net, first_index):
     """
-    Generates the ppc["bus"] array and the lookup pandapower indices -> ppc indices
+    Returns the pandapower indices of the auxiliary buses, which are not part of net.bus but only
+    of the ppc: the star points of the three winding transformers and the internal buses of the
+    extended wards. They are numbered consecutively from first_index on.
+
+    OUTPUT:
+        **aux_buses** (dict) - indices of the auxiliary buses for "trafo3w" and "xward"
+
+        **main_buses** (array) - hv bus of the trafo3w / bus of the xward for each auxiliary bus
+
+        **in_service** (array) - in service status of the trafo3w / xward
+    """
+    trafo3w = net["trafo3w"]
+    xward = net["xward"]
+    n_trafo3w = len(trafo3w)
+    n_xward = len(xward)
+    aux_buses = {"trafo3w": np.arange(first_index, first_index + n_trafo3w),
+                 "xward": np.arange(first_index + n_trafo3w, first_index + n_trafo3w + n_xward)}
+    main_buses = np.r_[trafo3w["hv_bus"].values, xward["bus"].values].astype(int)
+    in_service = np.r_[trafo3w["in_service"].values, xward["in_service"].values].astype(bool)
+    return aux_buses, main_buses, in_service
+
+
+def _build_bus_ppc(net, ppc, topology=None):
+    """
+    Generates the ppc["bus"] array and the lookup pandapower indices -> ppc indices. The bus lookup
+    is taken from the topology cache of _pd2ppc if it contains one.
     """
     copy_constraints_to_ppc = net["_options"]["copy_constraints_to_ppc"]
     r_switch = net["_options"]["r_switch"]
@@ -227,25 +214,41 @@ def _build_bus_ppc(net, ppc):
     eg_is_mask = _is_elements['ext_grid']
     gen_is_mask = _is_elements['gen']
 
-    if numba and not r_switch:
-        bus_is_idx = _is_elements['bus_is_idx']
-        bus_lookup = create_bus_lookup_numba(net, bus_is_idx, bus_index, gen_is_mask, eg_is_mask)
+    if topology is not None and "bus_lookup" in topology:
+        bus_lookup = topology["bus_lookup"]
+        if "closed_bb_switches" in topology:
+            net._closed_bb_switches = topology["closed_bb_switches"]
     else:
-        bus_lookup = create_bus_lookup(net, n_bus, bus_index, _is_elements['bus_is_idx'],
-                                       gen_is_mask, eg_is_mask, r_switch)
-    # init ppc with empty values
+        if numba and NUMBA_INSTALLED and not r_switch:
+            bus_is_idx = _is_elements['bus_is_idx']
+            bus_lookup = create_bus_lookup_numba(net, bus_is_idx, bus_index, gen_is_mask,
+                                                 eg_is_mask)
+        else:
+            bus_lookup = create_bus_lookup(net, n_bus, bus_index, _is_elements['bus_is_idx'],
+                                           gen_is_mask, eg_is_mask, r_switch)
+            if topology is not None:
+                topology["closed_bb_switches"] = net._closed_bb_switches
+        if topology is not None:
+            topology["bus_lookup"] = bus_lookup
+    # the auxiliary buses of trafo3w and xward get the pandapower indices after the highest bus
+    # index and the ppc indices after the buses
+    aux_buses, aux_main_buses, aux_in_service = _get_aux_buses(net, len(bus_lookup))
+    n_aux = len(aux_main_buses)
+    bus_lookup = np.r_[bus_lookup, np.arange(n_bus, n_bus + n_aux)]
+    n_ppc_bus = n_bus + n_aux
 
-    ppc["bus"] = np.zeros(shape=(n_bus, bus_cols), dtype=float)
+    # init ppc with empty values
+    ppc["bus"] = np.zeros(shape=(n_ppc_bus, bus_cols), dtype=float)
     ppc["bus"][:, :15] = np.array([0, 1, 0, 0, 0, 0, 1, 1, 0, 0, 1, 2, 0, 0., 0.])  # changes of
     # voltage limits (2 and 0) must be considered in check_opf_data
     if mode == "sc":
         from pandapower.shortcircuit.idx_bus import bus_cols_sc
-        bus_sc = np.empty(shape=(n_bus, bus_cols_sc), dtype=float)
+        bus_sc = np.empty(shape=(n_ppc_bus, bus_cols_sc), dtype=float)
         bus_sc.fill(np.nan)
         ppc["bus"] = np.hstack((ppc["bus"], bus_sc))
 
     # apply consecutive bus numbers
-    ppc["bus"][:, BUS_I] = np.arange(n_bus)
+    ppc["bus"][:, BUS_I] = np.arange(n_ppc_bus)
 
     # init voltages from net
     ppc["bus"][:n_bus, BASE_KV] = net["bus"]["vn_kv"].values
@@ -261,6 +264,14 @@ def _build_bus_ppc(net, ppc):
     if va_degree is not None:
         ppc["bus"][:n_bus, VA] = va_degree
 
+    if n_aux:
+        # auxiliary buses take the voltage level and the initial voltage of their main bus
+        main_buses = bus_lookup[aux_main_buses]
+        ppc["bus"][n_bus:, BASE_KV] = ppc["bus"][main_buses, BASE_KV]
+        ppc["bus"][n_bus:, VM] = ppc["bus"][main_buses, VM]
+        ppc["bus"][n_bus:, VA] = ppc["bus"][main_buses, VA]
+        ppc["bus"][n_bus + np.flatnonzero(~aux_in_service), BUS_TYPE] = NONE
+
     if mode == "sc":
         _add_c_to_ppc(net, ppc)
 
@@ -274,10 +285,66 @@ def _build_bus_ppc(net, ppc):
         else:
             ppc["bus"][:n_bus, VMIN] = 0  # changes of VMIN must be considered in check_opf_data
 
+    net["_pd2ppc_lookups"]["aux"] = aux_buses
     net["_pd2ppc_lookups"]["bus"] = bus_lookup
 
 
 def _calc_pq_elements_and_add_on_ppc(net, ppc):
+    b, p, q = _get_pq_of_bus_elements(net, ppc)
+
+    # sum up p & q of bus elements
+    # if array is not empty
+    if b.size:
+        bus_lookup = net["_pd2ppc_lookups"]["bus"]
+        b = bus_lookup[b]
+        b, vp, vq = _sum_by_group(b, p, q)
+        ppc["bus"][b, PD] = vp
+        ppc["bus"][b, QD] = vq
+
+
+def _update_pq_elements_on_ppc(net, ppc):
+    """
+    Updates PD and QD of a ppc from the last power flow (recycle). The power values of all bus
+    elements are compared to the values of the last update, which are stored in
+    ppc["internal"]["pq_snapshot"]. Only the buses with changed elements are summed up again and
+    rewritten. If the elements or their buses changed, PD and QD are calculated from scratch.
+    """
+    snapshot = ppc["internal"].get("pq_snapshot", None)
+    voltage_depend_loads = net["_options"]["voltage_depend_loads"]
+    cz = net["load"]["const_z_percent"].values
+    ci = net["load"]["const_i_percent"].values
+    zip_changed = snapshot is None or snapshot["voltage_depend_loads"] != voltage_depend_loads \
+                  or not (np.array_equal(snapshot["cz"], cz) and np.array_equal(snapshot["ci"], ci))
+    b, p, q = _get_pq_of_bus_elements(net, ppc, calc_zip=zip_changed)
+    bus_lookup = net["_pd2ppc_lookups"]["bus"]
+    b = bus_lookup[b]
+
+    if snapshot is not None and np.array_equal(snapshot["bus"], b):
+        changed = (p != snapshot["p"]) | (q != snapshot["q"])
+        if changed.any():
+            n_bus = ppc["bus"].shape[0]
+            affected = np.zeros(n_bus, dtype=bool)
+            affected[b[changed]] = True
+            el = affected[b]
+            ppc["bus"][affected, PD] = np.bincount(b[el], weights=p[el], minlength=n_bus)[affected]
+            ppc["bus"][affected, QD] = np.bincount(b[el], weights=q[el], minlength=n_bus)[affected]
+    else:
+        ppc["bus"][:, [PD, QD]] = 0.
+        if b.size:
+            bg, vp, vq = _sum_by_group(b, p, q)
+            ppc["bus"][bg, PD] = vp
+            ppc["bus"][bg, QD] = vq
+
+    ppc["internal"]["pq_snapshot"] = {"bus": b, "p": p, "q": q, "cz": cz.copy(), "ci": ci.copy(),
+                                      "voltage_depend_loads": voltage_depend_loads}
+
+
+def _get_pq_of_bus_elements(net, ppc, calc_zip=True):
+    """
+    Returns the pandapower buses and the active and reactive power (in MW / MVar, considering
+    scaling and in service status) of all elements that are considered as PQ injections. If
+    calc_zip is True, the voltage-dependent load parameters are written to the ppc.
+    """
     # init values
     b, p, q = np.array([], dtype=int), np.array([]), np.array([])
 
@@ -293,7 +360,7 @@ def _calc_pq_elements_and_add_on_ppc(net, ppc):
         l = net["load"]
         if len(l) > 0:
             voltage_depend_loads = net["_options"]["voltage_depend_loads"]
-            if voltage_depend_loads:
+            if voltage_depend_loads and calc_zip:
                 cz = l["const_z_percent"].values / 100.
                 ci = l["const_i_percent"].values / 100.
                 if ((cz + ci) > 1).any():
@@ -383,14 +450,7 @@ def _calc_pq_elements_and_add_on_ppc(net, ppc):
             p = np.hstack([p, stor["p_kw"].values * vl])
             b = np.hstack([b, stor["bus"].values])
 
-    # sum up p & q of bus elements
-    # if array is not empty
-    if b.size:
-        bus_lookup = net["_pd2ppc_lookups"]["bus"]
-        b = bus_lookup[b]
-        b, vp, vq = _sum_by_group(b, p, q)
-        ppc["bus"][b, PD] = vp
-        ppc["bus"][b, QD] = vq
+    return b, p, q
 
 
 def _calc_shunts_and_add_on_ppc(net, ppc):
@@ -440,7 +500,7 @@ def _calc_shunts_and_add_on_ppc(net, ppc):
 
         q = np.hstack([q, q_kvar / np.float64(1000.) * v_ratio])
         p = np.hstack([p, pfe_kw / np.float64(1000.) * v_ratio])
-        b = np.hstack([b, trafo3w["ad_bus"].values])
+        b = np.hstack([b, net["_pd2ppc_lookups"]["aux"]["trafo3w"]])
 
     # if array is not empty
     if b.size:
@@ -36,18 +36,24 @@ def _build_gen_ppc(net, ppc):
         eg_end = np.sum(eg_is_mask)
         gen_end = eg_end + np.sum(gen_is_mask)
         xw_end = gen_end + len(net["xward"])
+        dc_end = xw_end + np.count_nonzero(_is_elements["dcline"])
 
         # define default q limits
         q_lim_default = 1e9  # which is 1000 TW - should be enough for distribution grids.
         p_lim_default = 1e9
 
-        _init_ppc_gen(ppc, xw_end, 0)
+        _init_ppc_gen(ppc, dc_end, 0)
+        _build_dcline_lookup(net, xw_end)
         if mode == "sc":
             return
         # add generator / pv data
         if gen_end > eg_end:
             _build_pp_gen(net, ppc, gen_is_mask, eg_end, gen_end, q_lim_default, p_lim_default)
 
+        # add dc line generators
+        if dc_end > xw_end:
+            _build_pp_dcline(net, ppc, xw_end, dc_end, q_lim_default, p_lim_default)
+
         _build_pp_ext_grid(net, ppc, eg_is_mask, eg_end)
 
         # add extended ward pv node data
@@ -81,13 +87,14 @@ def _build_gen_ppc(net, ppc):
         sg_end = gen_end + len(sg_is)
         l_end = sg_end + len(l_is)
         stor_end = l_end + len(stor_is)
+        dc_end = stor_end + np.count_nonzero(_is_elements["dcline"])
 
         q_lim_default = 1e9  # which is 1000 TW - should be enough for distribution grids.
         p_lim_default = 1e9  # changes must be considered in check_opf_data
         delta = net["_options"]["delta"]
 
         # initialize generator matrix
-        ppc["gen"] = zeros(shape=(stor_end, 21), dtype=float)
+        ppc["gen"] = zeros(shape=(dc_end, 21), dtype=float)
         ppc["gen"][:] = array([0, 0, 0, q_lim_default, -q_lim_default, 1., 1., 1, p_lim_default,
                                   -p_lim_default, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
 
@@ -256,6 +263,11 @@ def _build_gen_ppc(net, ppc):
             _replace_nans_with_default_q_limits_in_ppc(ppc, eg_end, gen_end, q_lim_default)
             _replace_nans_with_default_p_limits_in_ppc(ppc, eg_end, gen_end, p_lim_default)
 
+        # add dc line generators
+        _build_dcline_lookup(net, stor_end)
+        if dc_end > stor_end:
+            _build_pp_dcline(net, ppc, stor_end, dc_end, q_lim_default, p_lim_default)
+
 
 def _init_ppc_gen(ppc, xw_end, q_lim_default):
     # initialize generator matrix
@@ -311,24 +323,84 @@ def _build_pp_xward(net, ppc, gen_end, xw_end, q_lim_default, update_lookup=True
     bus_lookup = net["_pd2ppc_lookups"]["bus"]
     xw = net["xward"]
     xw_is = net["_is_elements"]['xward']
+    xward_buses = bus_lookup[net["_pd2ppc_lookups"]["aux"]["xward"]]
     if update_lookup:
-        ppc["gen"][gen_end:xw_end, GEN_BUS] = bus_lookup[xw["ad_bus"].values]
+        ppc["gen"][gen_end:xw_end, GEN_BUS] = xward_buses
     ppc["gen"][gen_end:xw_end, VG] = xw["vm_pu"].values
     ppc["gen"][gen_end:xw_end, GEN_STATUS] = xw_is
     ppc["gen"][gen_end:xw_end, QMIN] = -q_lim_default
     ppc["gen"][gen_end:xw_end, QMAX] = q_lim_default
 
-    xward_buses = bus_lookup[net["xward"]["ad_bus"].values]
     ppc["bus"][xward_buses[xw_is], BUS_TYPE] = PV
     ppc["bus"][xward_buses[~xw_is], BUS_TYPE] = NONE
     ppc["bus"][xward_buses, VM] = net["xward"]["vm_pu"].values
 
 
+def _build_dcline_lookup(net, dc_start):
+    """
+    Writes the lookup of the dc line generators, which are placed from dc_start on in the ppc:
+    one row per dc line with the ppc index of the generator at the from bus and at the to bus (-1
+    if the generator is out of service).
+    """
+    dcline_is = net["_is_elements"]["dcline"]
+    lookup = -np.ones(dcline_is.shape, dtype=int)
+    lookup[dcline_is] = np.arange(dc_start, dc_start + np.count_nonzero(dcline_is))
+    net["_pd2ppc_lookups"]["dcline"] = lookup
+
+
+def _get_dcline_gen_values(net, dcline_is):
+    """
+    Returns the active power and voltage setpoints of the in service dc line generators in the
+    order of the dcline lookup. The generator at the from bus draws the transmitted power, the
+    generator at the to bus feeds it in minus the losses.
+    """
+    dcline = net["dcline"]
+    p_from_kw = dcline["p_kw"].values
+    p_to_kw = - (p_from_kw * (1 - dcline["loss_percent"].values / 100) -
+                 dcline["loss_kw"].values)
+    p_kw = np.c_[p_from_kw, p_to_kw][dcline_is]
+    vm_pu = dcline[["vm_from_pu", "vm_to_pu"]].values[dcline_is]
+    return p_kw, vm_pu
+
+
+def _build_pp_dcline(net, ppc, dc_start, dc_end, q_lim_default, p_lim_default):
+    bus_lookup = net["_pd2ppc_lookups"]["bus"]
+    copy_constraints_to_ppc = net["_options"]["copy_constraints_to_ppc"]
+    delta = net["_options"]["delta"]
+    dcline = net["dcline"]
+    dcline_is = net["_is_elements"]["dcline"]
+
+    dc_buses = bus_lookup[dcline[["from_bus", "to_bus"]].values[dcline_is]]
+    p_kw, vm_pu = _get_dcline_gen_values(net, dcline_is)
+    ppc["gen"][dc_start:dc_end, GEN_BUS] = dc_buses
+    ppc["gen"][dc_start:dc_end, PG] = - p_kw * 1e-3
+    ppc["gen"][dc_start:dc_end, VG] = vm_pu
+
+    # set bus values for dc line buses
+    ppc["bus"][dc_buses, BUS_TYPE] = PV
+    ppc["bus"][dc_buses, VM] = vm_pu
+
+    # Note: Pypower has generator reference system, pandapower uses load reference system
+    ppc["gen"][dc_start:dc_end, QMIN] = - dcline[["max_q_from_kvar", "max_q_to_kvar"]].values[
+        dcline_is] * 1e-3 - delta
+    ppc["gen"][dc_start:dc_end, QMAX] = - dcline[["min_q_from_kvar", "min_q_to_kvar"]].values[
+        dcline_is] * 1e-3 + delta
+    _replace_nans_with_default_q_limits_in_ppc(ppc, dc_start, dc_end, q_lim_default)
+
+    if copy_constraints_to_ppc:
+        # the from bus generator draws between 0 and max_p_kw, the to bus generator feeds in
+        max_p_kw = dcline["max_p_kw"].values
+        no_p_kw = np.zeros(len(dcline))
+        ppc["gen"][dc_start:dc_end, PMIN] = - np.c_[max_p_kw, no_p_kw][dcline_is] * 1e-3 + delta
+        ppc["gen"][dc_start:dc_end, PMAX] = np.c_[no_p_kw, max_p_kw][dcline_is] * 1e-3 - delta
+        _replace_nans_with_default_p_limits_in_ppc(ppc, dc_start, dc_end, p_lim_default)
 
 
 def _update_gen_ppc(net, ppc):
     '''
-    Takes the ppc network and updates the gen values from the values in net.
+    Takes the ppc network and updates the gen values from the values in net. The setpoints of the
+    last update are stored in ppc["internal"]["gen_snapshot"], the ppc is only rewritten if any
+    of them changed.
 
     **INPUT**:
         **net** -The pandapower format network
@@ -340,49 +412,76 @@ def _update_gen_ppc(net, ppc):
     bus_lookup = net["_pd2ppc_lookups"]["bus"]
     # get in service elements
     _is_elements = net["_is_elements"]
+    eg_is_mask = _is_elements['ext_grid']
     gen_is_mask = _is_elements['gen']
-    # TODO maybe speed up things here, too
-    eg_is = net["ext_grid"][_is_elements['ext_grid']]
-    gen_is = net["gen"][_is_elements['gen']]
 
-    eg_end = len(eg_is)
-    gen_end = eg_end + len(gen_is)
+    eg_end = np.count_nonzero(eg_is_mask)
+    gen_end = eg_end + np.count_nonzero(gen_is_mask)
     xw_end = gen_end + len(net["xward"])
 
+    # add extended ward pv node data
+    if xw_end > gen_end:
+        # ToDo: this must be tested in combination with recycle. Maybe the placement of the updated value in ppc["gen"]
+        # ToDo: is wrong. -> I'll better raise en error
+        raise NotImplementedError("xwards in combination with recycle is not properly implemented")
+        # _build_pp_xward(net, ppc, gen_end, xw_end, q_lim_default,
+        #                           update_lookup=False)
+
+    eg = net["ext_grid"]
+    gen = net["gen"]
+    setpoints = [eg_is_mask, eg["vm_pu"].values, eg["va_degree"].values, gen_is_mask,
+                 gen["p_kw"].values, gen["scaling"].values, gen["vm_pu"].values]
+    for col in ["max_q_kvar", "min_q_kvar"]:
+        if col in gen.columns:
+            setpoints.append(gen[col].values)
+    dcline = net["dcline"]
+    dcline_is = _is_elements["dcline"] & (net["_pd2ppc_lookups"]["dcline"] >= 0)
+    setpoints += [dcline_is, dcline[["p_kw", "loss_percent", "loss_kw", "vm_from_pu",
+                                     "vm_to_pu"]].values]
+    snapshot = ppc["internal"].get("gen_snapshot", None)
+    # with enforce_q_lims the voltages of generator buses in the ppc may differ from the setpoints
+    if not net["_options"]["enforce_q_lims"] and snapshot is not None and \
+            len(snapshot) == len(setpoints) and \
+            all(np.array_equal(a, b) for a, b in zip(snapshot, setpoints)):
+        return
+    ppc["internal"]["gen_snapshot"] = [a.copy() for a in setpoints]
+
     q_lim_default = 1e9  # which is 1000 TW - should be enough for distribution grids.
 
     # add ext grid / slack data
     ext_grid_lookup = net["_pd2ppc_lookups"]["ext_grid"]
-    ext_grid_idx_ppc = ext_grid_lookup[eg_is.index]
-    ppc["gen"][ext_grid_idx_ppc, VG] = eg_is["vm_pu"].values
-    ppc["gen"][ext_grid_idx_ppc, GEN_STATUS] = eg_is["in_service"].values
+    ext_grid_idx_ppc = ext_grid_lookup[eg.index.values[eg_is_mask]]
+    ppc["gen"][ext_grid_idx_ppc, VG] = eg["vm_pu"].values[eg_is_mask]
+    ppc["gen"][ext_grid_idx_ppc, GEN_STATUS] = eg["in_service"].values[eg_is_mask]
 
     # set bus values for external grid buses
     if calculate_voltage_angles:
         # eg_buses = bus_lookup[eg_is["bus"].values]
-        ppc["bus"][ext_grid_idx_ppc, VA] = eg_is["va_degree"].values
+        ppc["bus"][ext_grid_idx_ppc, VA] = eg["va_degree"].values[eg_is_mask]
 
     # add generator / pv data
     if gen_end > eg_end:
         gen_lookup = net["_pd2ppc_lookups"]["gen"]
-        gen_idx_ppc = gen_lookup[gen_is.index]
-        ppc["gen"][gen_idx_ppc, PG] = - gen_is["p_kw"].values * 1e-3 * gen_is["scaling"].values
-        ppc["gen"][gen_idx_ppc, VG] = gen_is["vm_pu"].values
+        gen_idx_ppc = gen_lookup[gen.index.values[gen_is_mask]]
+        ppc["gen"][gen_idx_ppc, PG] = - gen["p_kw"].values[gen_is_mask] * 1e-3 * \
+                                      gen["scaling"].values[gen_is_mask]
+        ppc["gen"][gen_idx_ppc, VG] = gen["vm_pu"].values[gen_is_mask]
 
         # set bus values for generator buses
-        gen_buses = bus_lookup[gen_is["bus"].values]
-        ppc["bus"][gen_buses, VM] = gen_is["vm_pu"].values
+        gen_buses = bus_lookup[gen["bus"].values[gen_is_mask]]
+        ppc["bus"][gen_buses, VM] = gen["vm_pu"].values[gen_is_mask]
 
         _copy_q_limits_to_ppc(net, ppc, eg_end, gen_end, gen_is_mask)
         _replace_nans_with_default_q_limits_in_ppc(ppc, eg_end, gen_end, q_lim_default)
 
-    # add extended ward pv node data
-    if xw_end > gen_end:
-        # ToDo: this must be tested in combination with recycle. Maybe the placement of the updated value in ppc["gen"]
-        # ToDo: is wrong. -> I'll better raise en error
-        raise NotImplementedError("xwards in combination with recycle is not properly implemented")
-        # _build_pp_xward(net, ppc, gen_end, xw_end, q_lim_default,
-        #                           update_lookup=False)
+    # add dc line generators
+    if dcline_is.any():
+        dc_idx_ppc = net["_pd2ppc_lookups"]["dcline"][dcline_is]
+        p_kw, vm_pu = _get_dcline_gen_values(net, dcline_is)
+        ppc["gen"][dc_idx_ppc, PG] = - p_kw * 1e-3
+        ppc["gen"][dc_idx_ppc, VG] = vm_pu
+        dc_buses = bus_lookup[dcline[["from_bus", "to_bus"]].values[dcline_is]]
+        ppc["bus"][dc_buses, VM] = vm_pu
 
 
 def _copy_q_limits_to_ppc(net, ppc, eg_end, gen_end, gen_is_mask):
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+from collections import OrderedDict
+try:
+    from inspect import getfullargspec as getargspec
+except ImportError:
+    # python 2
+    from inspect import getargspec
+from itertools import groupby
+
+from pandapower import create
+from pandapower.auxiliary import get_free_id
+
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+# order in which the recorded tables are added to the net, so that the buses of all elements and
+# the lines / transformers of switches exist when they are created
+TABLE_ORDER = ["bus", "line", "trafo", "trafo3w", "impedance", "dcline", "switch", "load", "sgen",
+               "storage", "gen", "ext_grid", "shunt", "ward", "xward", "measurement",
+               "piecewise_linear_cost", "polynomial_cost"]
+
+# create functions that are committed with one call of the bulk create function and the
+# renaming of their parameters. All other create functions are called once per element.
+BULK_FUNCTIONS = {
+    "create_bus": (create.create_buses, {}),
+    "create_load": (create.create_loads, {"bus": "buses"}),
+    "create_sgen": (create.create_sgens, {"bus": "buses"}),
+    "create_storage": (create.create_storages, {"bus": "buses"}),
+    "create_gen": (create.create_gens, {"bus": "buses"}),
+    "create_line": (create.create_lines, {"from_bus": "from_buses", "to_bus": "to_buses"}),
+    "create_line_from_parameters": (create.create_lines_from_parameters,
+                                    {"from_bus": "from_buses", "to_bus": "to_buses"}),
+    "create_transformer": (create.create_transformers, {"hv_bus": "hv_buses",
+                                                        "lv_bus": "lv_buses"}),
+    "create_transformer_from_parameters": (create.create_transformers_from_parameters,
+                                           {"hv_bus": "hv_buses", "lv_bus": "lv_buses"}),
+    "create_switch": (create.create_switches, {"bus": "buses", "element": "elements"}),
+    "create_shunt": (create.create_shunts, {"bus": "buses"})}
+
+# parameter names, defaults and whether additional keyword arguments are allowed per function
+_signatures = {}
+
+
+def _get_params(func, args, kwargs):
+    """
+    Returns a dict of all parameters of a call func(net, \*args, \*\*kwargs) except net.
+    Additional keyword arguments are dropped, since the create functions ignore them.
+    """
+    if func not in _signatures:
+        spec = getargspec(func)
+        names = spec.args[1:]
+        defaults = dict(zip(names[len(names) - len(spec.defaults or ()):], spec.defaults or ()))
+        varkw = spec[2] is not None
+        _signatures[func] = (names, defaults, varkw)
+    names, defaults, varkw = _signatures[func]
+    if len(args) > len(names):
+        raise TypeError("%s() got too many positional arguments" % func.__name__)
+    params = dict(defaults)
+    params.update(zip(names, args))
+    for key, value in kwargs.items():
+        if key in names:
+            params[key] = value
+        elif not varkw:
+            raise TypeError("%s() got an unexpected keyword argument '%s'" % (func.__name__, key))
+    missing = [name for name in names if name not in params]
+    if missing:
+        raise TypeError("%s() missing arguments %s" % (func.__name__, missing))
+    return params
+
+
+class NetworkBuilder(object):
+    """
+    Records the elements that are created with the create functions (create_bus, create_line,
+    create_load, ...) of a net and adds them to the net tables at once when the builder is
+    committed. Each table is only concatenated once, which makes the creation of large networks
+    from element-wise sources linear in the number of elements.
+
+    While the builder is active, the create functions return the index of the element, but the
+    element is not yet part of the net. The indices are assigned with a counter per table, the
+    buses, lines and transformers that elements are connected to are checked when the builder is
+    committed.
+
+    INPUT:
+        **net** (pandapowerNet) - The pandapower network in which the elements are created
+
+    EXAMPLE:
+        builder = NetworkBuilder(net)
+        builder.start()
+        b1 = pp.create_bus(net, 0.4)
+        ...
+        builder.commit()
+    """
+
+    def __init__(self, net):
+        self.net = net
+        self._records = OrderedDict()
+        self._next_index = dict()
+        self._indices = dict()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    @property
+    def active(self):
+        return create._builders.get(id(self.net)) is self
+
+    def start(self):
+        """
+        Starts recording the created elements of the net.
+        """
+        if id(self.net) in create._builders:
+            raise UserWarning("A NetworkBuilder is already active for this net")
+        create._builders[id(self.net)] = self
+
+    def add(self, table, func, args, kwargs):
+        """
+        Records the element that is created with func(net, \*args, \*\*kwargs) in net[table] and
+        returns its index.
+        """
+        params = _get_params(func, args, kwargs)
+        if table not in self._next_index:
+            self._next_index[table] = get_free_id(self.net[table])
+            self._indices[table] = set()
+        index = params["index"]
+        if index is None:
+            index = self._next_index[table]
+        elif index in self._indices[table] or index in self.net[table].index:
+            raise UserWarning("A %s with index %s already exists" % (table, index))
+        self._indices[table].add(index)
+        self._next_index[table] = max(self._next_index[table], index + 1)
+        params["index"] = index
+
+        self._records.setdefault(table, []).append((func, params))
+        return index
+
+    def commit(self):
+        """
+        Stops recording and adds all recorded elements to the net. If one of the elements cannot
+        be created (e.g. because its bus does not exist), none of the recorded elements is added:
+        the touched tables are restored and the error is raised.
+        """
+        self._stop()
+        records, self._records = self._records, OrderedDict()
+        self._next_index.clear()
+        self._indices.clear()
+        tables = sorted(records, key=lambda t: TABLE_ORDER.index(t) if t in TABLE_ORDER
+                        else len(TABLE_ORDER))
+        touched = set(tables)
+        if "bus" in touched:
+            touched.add("bus_geodata")
+        if "line" in touched:
+            touched.add("line_geodata")
+        backup = {table: self.net[table].copy() for table in touched if table in self.net}
+        try:
+            for table in tables:
+                for func, group in groupby(records[table], key=lambda r: r[0]):
+                    params = [p for _, p in group]
+                    if func.__name__ in BULK_FUNCTIONS:
+                        self._create_bulk(func.__name__, params)
+                    else:
+                        for p in params:
+                            func(self.net, **p)
+        except Exception:
+            for table, df in backup.items():
+                self.net[table] = df
+            raise
+
+    def discard(self):
+        """
+        Stops recording without adding the recorded elements to the net.
+        """
+        self._stop()
+        self._records.clear()
+        self._next_index.clear()
+        self._indices.clear()
+
+    def _stop(self):
+        if self.active:
+            del create._builders[id(self.net)]
+
+    def _create_bulk(self, name, params):
+        bulk_func, renaming = BULK_FUNCTIONS[name]
+        columns = {key: [p[key] for p in params] for key in params[0]}
+        geodata = columns.pop("geodata", None)
+        kwargs = {renaming.get(key, key): values for key, values in columns.items()}
+        if name == "create_bus":
+            kwargs["nr_buses"] = len(params)
+        index = bulk_func(self.net, **kwargs)
+
+        if geodata is None:
+            return
+        with_geodata = [i for i, g in enumerate(geodata) if g is not None]
+        if not len(with_geodata):
+            return
+        geo_index = index[with_geodata]
+        if name == "create_bus":
+            if any(len(geodata[i]) != 2 for i in with_geodata):
+                raise UserWarning("geodata must be given as (x, y) tupel")
+            create._set_multiple_entries(self.net, "bus_geodata", {
+                "index": geo_index, "x": [geodata[i][0] for i in with_geodata],
+                "y": [geodata[i][1] for i in with_geodata]})
+        else:
+            create._set_multiple_entries(self.net, "line_geodata", {
+                "index": geo_index, "coords": [geodata[i] for i in with_geodata]})
+
+
+def bulk_create(net):
+    """
+    Returns a NetworkBuilder for the net that is used as context manager: all elements that are
+    created with the create functions inside the with block are added to the net at once when
+    the block is left. If an exception is raised inside the block, the recorded elements are
+    discarded.
+
+    Only the create functions of single elements are recorded, the net tables are not updated
+    before the end of the with block.
+
+    EXAMPLE:
+        with pp.bulk_create(net):
+            for record in source:
+                b = pp.create_bus(net, vn_kv=record.vn_kv)
+                pp.create_load(net, b, p_kw=record.p_kw)
+    """
+    return NetworkBuilder(net)
@@ -0,0 +1,2 @@
+from pandapower.contingency.contingency import run_contingency
+from pandapower.contingency.dc_screening import screen_contingencies
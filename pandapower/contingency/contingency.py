@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+from multiprocessing import Pool
+
+import numpy as np
+from scipy.sparse import csr_matrix, coo_matrix
+from scipy.sparse.csgraph import breadth_first_order
+
+from pandapower.pf.bustypes import bustypes
+from pandapower.pf.makeSbus import makeSbus
+from pandapower.pf.makeYbus_pypower import branch_vectors
+from pandapower.pf.newtonpf import newtonpf
+from pandapower.pf.ppci_variables import _get_branch_buses
+from pandapower.pf.run_batch_pf import _get_base_case_ppci, _get_line_loading, _get_trafo_loading
+from pandapower.run import runpp
+
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+# data of the base case in the worker processes, set by _init_worker
+_worker_data = None
+
+
+def run_contingency(net, outages=None, element="line", processes=1, **kwargs):
+    """
+    Runs a power flow for the outage of each branch in outages (N-1 contingency analysis).
+
+    A regular power flow is carried out first with the given keyword arguments. The ppci and the
+    admittance matrices of this base case are reused for all outages: the outage of a branch is
+    applied by subtracting its admittances from the nonzero entries of Ybus, so that the
+    sparsity structure of Ybus and of the Jacobian stays the same for all outages and the
+    ordering of the LU factorization is reused. Each outage is initialized with the voltages of
+    the base case. If check_connectivity is True (default), buses which are isolated from the
+    slack buses by an outage are excluded from the power flow of this outage.
+
+    INPUT:
+        **net** - The pandapower format network
+
+    OPTIONAL:
+        **outages** (list, None) - indices of the elements in net[element] that are taken out of
+        service one at a time. Defaults to all elements that are in service.
+
+        **element** (str, "line") - element table of the outages ("line" or "trafo")
+
+        **processes** (int, 1) - number of worker processes. The outages are distributed in
+        chunks, the base case data is sent to every worker process only once.
+
+        **kwargs** - power flow options that are passed to runpp. Only the Newton-Raphson
+        algorithms ("nr" and "iwamoto_nr") are supported, reactive power limits only with
+        enforce_q_lims="inner".
+
+    OUTPUT:
+        **results** (dict) - results of all outages with one row per outage:
+
+            - "outages": indices of the outaged elements
+            - "vm_pu": bus voltage magnitudes (columns in the order of net.bus)
+            - "va_degree": bus voltage angles (columns in the order of net.bus)
+            - "line_loading_percent": line loadings (columns in the order of net.line)
+            - "trafo_loading_percent": transformer loadings (columns in the order of net.trafo)
+            - "converged": boolean array which is True for converged outages
+            - "iterations": number of Newton-Raphson iterations per outage
+
+        Results of buses, lines and transformers that are out of service in the base case or
+        isolated by an outage as well as all results of outages that did not converge are NaN.
+        The result tables of net contain the results of the base case.
+
+    EXAMPLE:
+        import pandapower.networks as pn
+        from pandapower.contingency import run_contingency
+
+        net = pn.case118()
+        res = run_contingency(net, processes=4)
+        max_loading = res["line_loading_percent"].max(axis=1)
+    """
+    if element not in ["line", "trafo"]:
+        raise ValueError("run_contingency is not implemented for element %s" % element)
+    algorithm = kwargs.get("algorithm", "nr")
+    if algorithm not in ["nr", "iwamoto_nr"]:
+        raise NotImplementedError("run_contingency is only implemented for the Newton-Raphson "
+                                  "algorithms, not for algorithm %s" % algorithm)
+    if kwargs.get("enforce_q_lims", False) not in [False, "inner"]:
+        raise NotImplementedError("run_contingency only supports enforce_q_lims='inner'")
+    runpp(net, **kwargs)
+
+    if outages is None:
+        outages = net[element].index.values[net[element].in_service.values]
+    outages = np.asarray(outages)
+    data = _get_base_case_data(net)
+    outage_branches = _get_ppci_branches(net, element, outages, data["branch_is"])
+    data["stamps"] = _get_outage_stamps(data, outage_branches)
+    data["outage_branches"] = outage_branches
+
+    if processes > 1 and len(outages) > 1:
+        chunks = np.array_split(np.arange(len(outages)), min(processes * 4, len(outages)))
+        pool = Pool(processes, initializer=_init_worker, initargs=(data,))
+        try:
+            chunk_results = pool.map(_run_outages_in_worker, chunks)
+        finally:
+            pool.close()
+            pool.join()
+        V_all = np.hstack([r[0] for r in chunk_results])
+        converged = np.hstack([r[1] for r in chunk_results])
+        iterations = np.hstack([r[2] for r in chunk_results])
+    else:
+        V_all, converged, iterations = _run_outages(data, np.arange(len(outages)))
+
+    if not converged.all():
+        logger.warning("Power flow did not converge for %u of %u outages"
+                       % (np.count_nonzero(~converged), len(outages)))
+    results = _get_contingency_results(net, data, V_all, converged, outage_branches)
+    results.update({"outages": outages, "converged": converged, "iterations": iterations})
+    return results
+
+
+def _get_base_case_data(net):
+    """
+    Collects everything that is needed to solve the outages from the ppc of the base case. The
+    admittance matrices of the base case power flow are reused.
+    """
+    ppci, pv, pq, V0 = _get_base_case_ppci(net)
+    baseMVA, bus, gen, branch = ppci["baseMVA"], ppci["bus"], ppci["gen"], ppci["branch"]
+    ref, _, _ = bustypes(bus, gen)
+    internal = ppci["internal"]
+    Ybus = csr_matrix(internal["Ybus"])
+    Ybus.sum_duplicates()
+    Ybus.sort_indices()
+    options = dict(net["_options"])
+    return {"baseMVA": baseMVA, "bus": bus, "gen": gen, "branch": branch, "pv": pv, "pq": pq,
+            "V0": V0, "Ybus": Ybus, "Yf": internal["Yf"], "Yt": internal["Yt"],
+            "Sbus": makeSbus(baseMVA, bus, gen), "branch_is": internal["branch_is"],
+            "ref": ref, "options": options}
+
+
+def _get_ppci_branches(net, element, outages, branch_is):
+    """
+    Returns the ppci branch index of each element in outages.
+    """
+    if element not in net["_pd2ppc_lookups"]["branch"]:
+        raise ValueError("net.%s is empty" % element)
+    f, t = net["_pd2ppc_lookups"]["branch"][element]
+    position = net[element].index.get_indexer(outages)
+    if np.any(position < 0):
+        raise ValueError("Unknown %s indices %s" % (element, outages[position < 0]))
+    ppc_branch = f + position
+    if not np.all(branch_is[ppc_branch]):
+        raise ValueError("Outages of %s that are out of service: %s"
+                         % (element, outages[~branch_is[ppc_branch]]))
+    return (np.cumsum(branch_is) - 1)[ppc_branch]
+
+
+def _get_csr_positions(Y, rows, cols):
+    """
+    Returns the positions of the entries (rows[i], cols[i]) in Y.data.
+    """
+    positions = np.empty(len(rows), dtype=np.int64)
+    for i, (r, c) in enumerate(zip(rows, cols)):
+        start = Y.indptr[r]
+        positions[i] = start + np.searchsorted(Y.indices[start:Y.indptr[r + 1]], c)
+    return positions
+
+
+def _get_outage_stamps(data, outage_branches):
+    """
+    Returns the positions in Ybus.data and the admittances of the four Ybus entries of each
+    outaged branch.
+    """
+    branch = data["branch"][outage_branches]
+    Ytt, Yff, Yft, Ytf = branch_vectors(branch, branch.shape[0])
+    f, t = _get_branch_buses(branch)
+    rows = np.vstack([f, f, t, t]).T.ravel()
+    cols = np.vstack([f, t, f, t]).T.ravel()
+    positions = _get_csr_positions(data["Ybus"], rows, cols).reshape(-1, 4)
+    values = np.vstack([Yff, Yft, Ytf, Ytt]).T
+    return positions, values
+
+
+def _get_supplied_buses(data, outage_branch):
+    """
+    Returns a mask of the buses that are connected to a slack bus without the outaged branch.
+    A virtual bus connected to all slack buses is the start of the search, like in
+    _check_connectivity.
+    """
+    branch = data["branch"]
+    n_bus = data["bus"].shape[0]
+    connected = np.ones(branch.shape[0], dtype=bool)
+    connected[outage_branch] = False
+    ref = data["ref"]
+    f, t = _get_branch_buses(branch[connected])
+    f = np.r_[f, ref]
+    t = np.r_[t, np.full(len(ref), n_bus)]
+    adj = coo_matrix((np.ones(len(f)), (f, t)), shape=(n_bus + 1, n_bus + 1))
+    reachable = breadth_first_order(adj, n_bus, directed=False, return_predecessors=False)
+    supplied = np.zeros(n_bus + 1, dtype=bool)
+    supplied[reachable] = True
+    return supplied[:n_bus]
+
+
+def _init_worker(data):
+    global _worker_data
+    _worker_data = data
+
+
+def _run_outages_in_worker(outage_idx):
+    return _run_outages(_worker_data, outage_idx)
+
+
+def _run_outages(data, outage_idx):
+    """
+    Solves the power flow for the outages with the given positions in data["stamps"]. All outages
+    start from the voltages of the base case.
+    """
+    Ybus = data["Ybus"]
+    positions, values = data["stamps"]
+    # the cached LU ordering is shared by all outages, since the structure of J does not change
+    ppci = {"baseMVA": data["baseMVA"], "bus": data["bus"], "gen": data["gen"],
+            "internal": {}}
+    V_all = np.empty((len(data["V0"]), len(outage_idx)), dtype=np.complex128)
+    converged = np.zeros(len(outage_idx), dtype=bool)
+    iterations = np.zeros(len(outage_idx), dtype=int)
+    check_connectivity = data["options"]["check_connectivity"]
+    pv, pq = data["pv"], data["pq"]
+    for i, k in enumerate(outage_idx):
+        Y_data = Ybus.data.copy()
+        np.subtract.at(Y_data, positions[k], values[k])
+        Ybus_k = csr_matrix((Y_data, Ybus.indices, Ybus.indptr), shape=Ybus.shape)
+        if check_connectivity:
+            supplied = _get_supplied_buses(data, data["outage_branches"][k])
+            pv, pq = data["pv"][supplied[data["pv"]]], data["pq"][supplied[data["pq"]]]
+        if len(pv) or len(pq):
+            V, success, it, _, _, _ = newtonpf(Ybus_k, data["Sbus"], data["V0"].copy(), pv, pq,
+                                               ppci, data["options"])
+        else:
+            V, success, it = data["V0"].copy(), True, 0
+        if check_connectivity:
+            V[~supplied] = np.nan
+        V_all[:, i] = V
+        converged[i] = success
+        iterations[i] = it
+    return V_all, converged, iterations
+
+
+def _get_contingency_results(net, data, V_all, converged, outage_branches):
+    """
+    Calculates the bus voltages, line loadings and transformer loadings of all outages in the
+    order of net.bus, net.line and net.trafo.
+    """
+    n_outages = V_all.shape[1]
+    branch = data["branch"]
+    fb, tb = _get_branch_buses(branch)
+    Sf = V_all[fb] * np.conj(data["Yf"] * V_all) * data["baseMVA"]
+    St = V_all[tb] * np.conj(data["Yt"] * V_all) * data["baseMVA"]
+    # no flow over the outaged branch
+    Sf[outage_branches, np.arange(n_outages)] = 0
+    St[outage_branches, np.arange(n_outages)] = 0
+
+    n_bus = data["bus"].shape[0]
+    bus_lookup = net["_pd2ppc_lookups"]["bus"]
+    ppci_bus = bus_lookup[net.bus.index.values]
+    bus_is = (ppci_bus >= 0) & (ppci_bus < n_bus)
+    vm_pu = np.full((n_outages, len(net.bus)), np.nan)
+    va_degree = np.full((n_outages, len(net.bus)), np.nan)
+    vm_pu[:, bus_is] = np.abs(V_all[ppci_bus[bus_is]]).T
+    va_degree[:, bus_is] = np.angle(V_all[ppci_bus[bus_is]], deg=True).T
+    ppci = {"bus": data["bus"], "branch": branch, "internal": {"branch_is": data["branch_is"]}}
+    line_loading = _get_line_loading(net, ppci, Sf, St, V_all)
+    trafo_loading = _get_trafo_loading(net, ppci, Sf, St, V_all)
+    vm_pu[~converged] = np.nan
+    va_degree[~converged] = np.nan
+    line_loading[~converged] = np.nan
+    trafo_loading[~converged] = np.nan
+    return {"vm_pu": vm_pu, "va_degree": va_degree, "line_loading_percent": line_loading,
+            "trafo_loading_percent": trafo_loading}
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+from hashlib import sha1
+
+import numpy as np
+
+from pandapower.contingency.contingency import run_contingency, _get_ppci_branches
+from pandapower.idx_brch import PF, BR_X, TAP
+from pandapower.idx_bus import BUS_TYPE, REF
+from pandapower.pf.makePTDF import makePTDF, makeLODF
+from pandapower.pf.run_batch_pf import _ppci_from_ppc, _get_line_loading
+from pandapower.pf.warm_start import _get_topology_hash
+from pandapower.run import rundcpp
+
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+# number of buses from which the PTDF matrix is calculated with the sparse solver by default
+SPARSE_SOLVER_MIN_BUSES = 1000
+
+
+def screen_contingencies(net, outages=None, element="line", max_loading_percent=100.,
+                         run_ac=False, processes=1, using_sparse_solver=None, **kwargs):
+    """
+    Ranks branch outages by their maximum line loading in a DC power flow.
+
+    A DC power flow is carried out for the base case. The post-outage flows of all outages are
+    calculated from the base case flows with the line outage distribution factors (LODF), so that
+    only matrix-vector products are necessary per outage. The PTDF matrix is stored in
+    net["_dc_sensitivity_cache"] and reused as long as the topology and the branch reactances
+    do not change. The LODF columns are only calculated for the outages, in chunks of outages.
+
+    Outages that overload a line (max_loading_percent) or split the network are critical. With
+    run_ac=True, only the critical outages are calculated with the AC contingency analysis
+    (see run_contingency).
+
+    INPUT:
+        **net** - The pandapower format network
+
+    OPTIONAL:
+        **outages** (list, None) - indices of the elements in net[element] that are taken out of
+        service one at a time. Defaults to all elements that are in service.
+
+        **element** (str, "line") - element table of the outages ("line" or "trafo")
+
+        **max_loading_percent** (float, 100.) - outages with a higher DC line loading are critical
+
+        **run_ac** (bool, False) - runs the AC contingency analysis for the critical outages
+
+        **processes** (int, 1) - number of worker processes for the AC contingency analysis
+
+        **using_sparse_solver** (bool, None) - calculates the PTDF matrix with a sparse LU
+        factorization of the reduced Bbus instead of a dense solver, see makePTDF. By default,
+        the sparse solver is used for networks with at least SPARSE_SOLVER_MIN_BUSES buses.
+
+        **kwargs** - power flow options for the AC contingency analysis, see run_contingency.
+        The options trafo_model, check_connectivity, r_switch and trafo3w_losses are also used
+        for the DC power flow.
+
+    OUTPUT:
+        **results** (dict) - screening results, sorted by descending maximum loading:
+
+            - "outages": indices of the outaged elements
+            - "max_loading_percent": maximum DC line loading per outage (NaN if the outage splits the network)
+            - "max_loading_line": index of the line with the maximum loading per outage
+            - "critical": indices of the critical outages
+            - "ac": results of run_contingency for the critical outages (only if run_ac is True)
+    """
+    if element not in ["line", "trafo"]:
+        raise ValueError("screen_contingencies is not implemented for element %s" % element)
+    dc_options = {key: kwargs[key] for key in ["trafo_model", "check_connectivity", "r_switch",
+                                                "trafo3w_losses"] if key in kwargs}
+    rundcpp(net, **dc_options)
+    ppci = _ppci_from_ppc(net["_ppc"])
+    if using_sparse_solver is None:
+        using_sparse_solver = ppci["bus"].shape[0] >= SPARSE_SOLVER_MIN_BUSES
+    PTDF = _get_ptdf(net, ppci, using_sparse_solver)
+
+    if outages is None:
+        outages = net[element].index.values[net[element].in_service.values]
+    outages = np.asarray(outages)
+    outage_branches = _get_ppci_branches(net, element, outages, ppci["internal"]["branch_is"])
+    max_loading, max_loading_line = _get_max_post_outage_loading(net, ppci, PTDF,
+                                                                 outage_branches)
+
+    # islanding outages first, then in the order of descending loading
+    islanding = np.isnan(max_loading)
+    order = np.argsort(np.where(islanding, -np.inf, -max_loading), kind="mergesort")
+    with np.errstate(invalid="ignore"):
+        critical = islanding | (max_loading > max_loading_percent)
+    results = {"outages": outages[order],
+               "max_loading_percent": max_loading[order],
+               "max_loading_line": max_loading_line[order],
+               "critical": outages[order][critical[order]]}
+    logger.debug("%u of %u outages are critical" % (np.count_nonzero(critical), len(outages)))
+    if run_ac:
+        results["ac"] = run_contingency(net, outages=results["critical"], element=element,
+                                        processes=processes, **kwargs)
+    return results
+
+
+def _get_ptdf(net, ppci, using_sparse_solver):
+    """
+    Returns the PTDF matrix of the ppci from net["_dc_sensitivity_cache"] or calculates and
+    stores it if the topology or the branch reactances have changed.
+    """
+    h = sha1(_get_topology_hash(net, net["_ppc"], ppci).encode())
+    h.update(np.ascontiguousarray(ppci["branch"][:, [BR_X, TAP]].real).tobytes())
+    h.update(np.ascontiguousarray(ppci["bus"][:, BUS_TYPE] == REF).tobytes())
+    key = h.hexdigest()
+    cache = net["_dc_sensitivity_cache"] if "_dc_sensitivity_cache" in net else None
+    if cache is not None and cache["key"] == key:
+        return cache["PTDF"]
+    PTDF = makePTDF(ppci["bus"], ppci["branch"], using_sparse_solver=using_sparse_solver)
+    net["_dc_sensitivity_cache"] = {"key": key, "PTDF": PTDF}
+    return PTDF
+
+
+def _get_max_post_outage_loading(net, ppci, PTDF, outage_branches, chunk_size=500):
+    """
+    Returns the maximum line loading and the index of the most loaded line for each outage.
+    The LODF columns and the post-outage flows are calculated in chunks of outages to limit the
+    memory usage.
+    """
+    n_outages = len(outage_branches)
+    max_loading = np.full(n_outages, np.nan)
+    max_loading_line = np.full(n_outages, -1, dtype=np.int64)
+    if "line" not in net["_pd2ppc_lookups"]["branch"] or not len(net.line):
+        return max_loading, max_loading_line
+    Pf = ppci["branch"][:, PF].real
+    n_bus = ppci["bus"].shape[0]
+    for start in range(0, n_outages, chunk_size):
+        ob = outage_branches[start:start + chunk_size]
+        n = len(ob)
+        LODF = makeLODF(ppci["branch"], PTDF, ob)
+        Pf_post = Pf[:, np.newaxis] + LODF * Pf[ob]
+        Pf_post[ob, np.arange(n)] = 0.
+        # the DC line loading is calculated with a voltage magnitude of 1 p.u.
+        loading = _get_line_loading(net, ppci, Pf_post, -Pf_post, np.ones((n_bus, n)))
+        line = np.argmax(np.where(np.isnan(loading), -np.inf, loading), axis=1)
+        chunk_max = loading[np.arange(n), line]
+        # the LODF columns of outages which split the network are NaN
+        chunk_max[np.isnan(LODF[ob, np.arange(n)])] = np.nan
+        max_loading[start:start + n] = chunk_max
+        max_loading_line[start:start + n] = net.line.index.values[line]
+    return max_loading, max_loading_line
@@ -4,14 +4,37 @@
 # and Energy System Technology (IEE), Kassel. All rights reserved.
 
 
+from functools import wraps
+
 import pandas as pd
-from numpy import nan, isnan, arange, dtype, zeros
+from numpy import nan, isnan, arange, dtype, zeros, array, int64, unique, isin, setdiff1d, \
+    broadcast_to, ndim, float64
 
 from pandapower.auxiliary import pandapowerNet, get_free_id, _preserve_dtypes
 from pandapower.results import reset_results
 from pandapower.std_types import add_basic_std_types, load_std_type
 from pandapower import __version__
 
+# active NetworkBuilder per net (see pandapower.builder)
+_builders = {}
+
+
+def _buffered(table):
+    """
+    Decorator for the functions that create one element in net[table]: if a NetworkBuilder is
+    active for the net, the element is only recorded by the builder and added to the table when
+    the builder is committed.
+    """
+    def decorator(func):
+        @wraps(func)
+        def create(net, *args, **kwargs):
+            builder = _builders.get(id(net))
+            if builder is None:
+                return func(net, *args, **kwargs)
+            return builder.add(table, func, args, kwargs)
+        return create
+    return decorator
+
 
 def create_empty_network(name="", f_hz=50., sn_kva=1e3):
     """
@@ -319,6 +342,7 @@ def create_empty_network(name="", f_hz=50., sn_kva=1e3):
     return net
 
 
+@_buffered("bus")
 def create_bus(net, vn_kv, name=None, index=None, geodata=None, type="b",
                zone=None, in_service=True, max_vm_pu=nan,
                min_vm_pu=nan, **kwargs):
@@ -380,13 +404,13 @@ def create_bus(net, vn_kv, name=None, index=None, geodata=None, type="b",
 
     if not isnan(min_vm_pu):
         if "min_vm_pu" not in net.bus.columns:
-            net.bus.loc[:, "min_vm_pu"] = pd.Series()
+            _init_optional_column(net, "bus", "min_vm_pu")
 
         net.bus.loc[index, "min_vm_pu"] = float(min_vm_pu)
 
     if not isnan(max_vm_pu):
         if "max_vm_pu" not in net.bus.columns:
-            net.bus.loc[:, "max_vm_pu"] = pd.Series()
+            _init_optional_column(net, "bus", "max_vm_pu")
 
         net.bus.loc[index, "max_vm_pu"] = float(max_vm_pu)
 
@@ -433,48 +457,23 @@ def create_buses(net, nr_buses, vn_kv, index=None, name=None, type="b", geodata=
     EXAMPLE:
         create_bus(net, name = "bus1")
     """
-    if index is not None:
-        for idx in index:
-            if idx in net.bus.index:
-                raise UserWarning("A bus with index %s already exists" % index)
-    else:
-        bid = get_free_id(net["bus"])
-        index = arange(bid, bid + nr_buses, 1)
+    index = _get_multiple_index(net, "bus", index, nr_buses, "bus")
 
-    # TODO: not needed when concating anyways?
-    # store dtypes
-    # dtypes = net.bus.dtypes
-
-    dd = pd.DataFrame(index=index, columns=net.bus.columns)
-    dd["vn_kv"] = vn_kv
-    dd["type"] = type
-    dd["zone"] = zone
-    dd["in_service"] = in_service
-    dd["name"] = name
-    net["bus"] = net["bus"].append(dd)[net["bus"].columns.tolist()]
-    # and preserve dtypes
-    # _preserve_dtypes(net.bus, dtypes)
+    entries = {"index": index, "vn_kv": vn_kv, "type": type, "zone": zone,
+               "in_service": in_service, "name": name}
+    _add_optional_entries(net, "bus", entries, min_vm_pu=min_vm_pu, max_vm_pu=max_vm_pu)
+    _set_multiple_entries(net, "bus", entries)
 
     if geodata is not None:
         # works with a 2-tuple or a matching array
         net.bus_geodata = net.bus_geodata.append(pd.DataFrame(index=index,
                                                               columns=net.bus_geodata.columns))
         net.bus_geodata.loc[index, ["x", "y"]] = geodata
-    if not isnan(min_vm_pu):
-        if "min_vm_pu" not in net.bus.columns:
-            net.bus.loc[:, "min_vm_pu"] = pd.Series()
-
-        net.bus.loc[index, "min_vm_pu"] = float(min_vm_pu)
-
-    if not isnan(max_vm_pu):
-        if "max_vm_pu" not in net.bus.columns:
-            net.bus.loc[:, "max_vm_pu"] = pd.Series()
-
-        net.bus.loc[index, "max_vm_pu"] = float(max_vm_pu)
 
     return index
 
 
+@_buffered("load")
 def create_load(net, bus, p_kw, q_kvar=0, const_z_percent=0, const_i_percent=0, sn_kva=nan,
                 name=None, scaling=1., index=None,
                 in_service=True, type=None, max_p_kw=nan, min_p_kw=nan,
@@ -564,31 +563,31 @@ def create_load(net, bus, p_kw, q_kvar=0, const_z_percent=0, const_i_percent=0,
 
     if not isnan(min_p_kw):
         if "min_p_kw" not in net.load.columns:
-            net.load.loc[:, "min_p_kw"] = pd.Series()
+            _init_optional_column(net, "load", "min_p_kw")
 
         net.load.loc[index, "min_p_kw"] = float(min_p_kw)
 
     if not isnan(max_p_kw):
         if "max_p_kw" not in net.load.columns:
-            net.load.loc[:, "max_p_kw"] = pd.Series()
+            _init_optional_column(net, "load", "max_p_kw")
 
         net.load.loc[index, "max_p_kw"] = float(max_p_kw)
 
     if not isnan(min_q_kvar):
         if "min_q_kvar" not in net.load.columns:
-            net.load.loc[:, "min_q_kvar"] = pd.Series()
+            _init_optional_column(net, "load", "min_q_kvar")
 
         net.load.loc[index, "min_q_kvar"] = float(min_q_kvar)
 
     if not isnan(max_q_kvar):
         if "max_q_kvar" not in net.load.columns:
-            net.load.loc[:, "max_q_kvar"] = pd.Series()
+            _init_optional_column(net, "load", "max_q_kvar")
 
         net.load.loc[index, "max_q_kvar"] = float(max_q_kvar)
 
     if not isnan(controllable):
         if "controllable" not in net.load.columns:
-            net.load.loc[:, "controllable"] = pd.Series()
+            _init_optional_column(net, "load", "controllable")
 
         net.load.loc[index, "controllable"] = bool(controllable)
     else:
@@ -598,6 +597,49 @@ def create_load(net, bus, p_kw, q_kvar=0, const_z_percent=0, const_i_percent=0,
     return index
 
 
+def create_loads(net, buses, p_kw, q_kvar=0, const_z_percent=0, const_i_percent=0, sn_kva=nan,
+                 name=None, scaling=1., index=None, in_service=True, type=None, max_p_kw=nan,
+                 min_p_kw=nan, max_q_kvar=nan, min_q_kvar=nan, controllable=nan):
+    """create_loads(net, buses, p_kw, q_kvar=0, const_z_percent=0, const_i_percent=0, sn_kva=nan, \
+                    name=None, scaling=1., index=None, in_service=True, type=None, max_p_kw=nan, \
+                    min_p_kw=nan, max_q_kvar=nan, min_q_kvar=nan, controllable=nan)
+    Adds several loads in table net["load"] at once.
+
+    All parameters can be given as scalar or as array with one value per load, see create_load
+    for their description.
+
+    INPUT:
+        **net** - The net within this load should be created
+
+        **buses** (list of int) - The bus ids to which the loads are connected
+
+        **p_kw** (float or array) - The real power of the loads
+
+    OPTIONAL:
+        **index** (list of int, None) - Force specified IDs if they are available. If None, the \
+            indices higher than the highest already existing index are selected.
+
+    OUTPUT:
+        **index** (array) - The unique IDs of the created loads
+
+    EXAMPLE:
+        create_loads(net, buses=[0, 2], p_kw=[10., 20.], q_kvar=2.)
+
+    """
+    buses = array(buses, dtype=int64, ndmin=1)
+    _check_multiple_buses(net, buses, "load")
+    index = _get_multiple_index(net, "load", index, len(buses), "load")
+
+    entries = {"index": index, "name": name, "bus": buses, "p_kw": p_kw,
+               "const_z_percent": const_z_percent, "const_i_percent": const_i_percent,
+               "scaling": scaling, "q_kvar": q_kvar, "sn_kva": sn_kva, "in_service": in_service,
+               "type": type}
+    _add_optional_entries(net, "load", entries, min_p_kw=min_p_kw, max_p_kw=max_p_kw,
+                          min_q_kvar=min_q_kvar, max_q_kvar=max_q_kvar, controllable=controllable)
+    _set_multiple_entries(net, "load", entries)
+    return index
+
+
 def create_load_from_cosphi(net, bus, sn_kva, cos_phi, mode, **kwargs):
     """
     Creates a load element from rated power and power factor cos(phi).
@@ -627,6 +669,7 @@ def create_load_from_cosphi(net, bus, sn_kva, cos_phi, mode, **kwargs):
     return create_load(net, bus, sn_kva=sn_kva, p_kw=p_kw, q_kvar=q_kvar, **kwargs)
 
 
+@_buffered("sgen")
 def create_sgen(net, bus, p_kw, q_kvar=0, sn_kva=nan, name=None, index=None,
                 scaling=1., type=None, in_service=True, max_p_kw=nan, min_p_kw=nan,
                 max_q_kvar=nan, min_q_kvar=nan, controllable=nan, k=nan, rx=nan):
@@ -716,31 +759,31 @@ def create_sgen(net, bus, p_kw, q_kvar=0, sn_kva=nan, name=None, index=None,
 
     if not isnan(min_p_kw):
         if "min_p_kw" not in net.sgen.columns:
-            net.sgen.loc[:, "min_p_kw"] = pd.Series()
+            _init_optional_column(net, "sgen", "min_p_kw")
 
         net.sgen.loc[index, "min_p_kw"] = float(min_p_kw)
 
     if not isnan(max_p_kw):
         if "max_p_kw" not in net.sgen.columns:
-            net.sgen.loc[:, "max_p_kw"] = pd.Series()
+            _init_optional_column(net, "sgen", "max_p_kw")
 
         net.sgen.loc[index, "max_p_kw"] = float(max_p_kw)
 
     if not isnan(min_q_kvar):
         if "min_q_kvar" not in net.sgen.columns:
-            net.sgen.loc[:, "min_q_kvar"] = pd.Series()
+            _init_optional_column(net, "sgen", "min_q_kvar")
 
         net.sgen.loc[index, "min_q_kvar"] = float(min_q_kvar)
 
     if not isnan(max_q_kvar):
         if "max_q_kvar" not in net.sgen.columns:
-            net.sgen.loc[:, "max_q_kvar"] = pd.Series()
+            _init_optional_column(net, "sgen", "max_q_kvar")
 
         net.sgen.loc[index, "max_q_kvar"] = float(max_q_kvar)
 
     if not isnan(controllable):
         if "controllable" not in net.sgen.columns:
-            net.sgen.loc[:, "controllable"] = pd.Series()
+            _init_optional_column(net, "sgen", "controllable")
 
         net.sgen.loc[index, "controllable"] = bool(controllable)
     else:
@@ -749,19 +792,62 @@ def create_sgen(net, bus, p_kw, q_kvar=0, sn_kva=nan, name=None, index=None,
 
     if not isnan(k):
         if "k" not in net.sgen.columns:
-            net.sgen.loc[:, "k"] = pd.Series()
+            _init_optional_column(net, "sgen", "k")
 
         net.sgen.loc[index, "k"] = float(k)
 
     if not isnan(rx):
         if "rx" not in net.sgen.columns:
-            net.sgen.loc[:, "rx"] = pd.Series()
+            _init_optional_column(net, "sgen", "rx")
 
         net.sgen.loc[index, "rx"] = float(rx)
 
     return index
 
 
+def create_sgens(net, buses, p_kw, q_kvar=0, sn_kva=nan, name=None, index=None, scaling=1.,
+                 type=None, in_service=True, max_p_kw=nan, min_p_kw=nan, max_q_kvar=nan,
+                 min_q_kvar=nan, controllable=nan, k=nan, rx=nan):
+    """create_sgens(net, buses, p_kw, q_kvar=0, sn_kva=nan, name=None, index=None, scaling=1., \
+                    type=None, in_service=True, max_p_kw=nan, min_p_kw=nan, max_q_kvar=nan, \
+                    min_q_kvar=nan, controllable=nan, k=nan, rx=nan)
+    Adds several static generators in table net["sgen"] at once.
+
+    All parameters can be given as scalar or as array with one value per static generator, see
+    create_sgen for their description.
+
+    INPUT:
+        **net** - The net within this static generator should be created
+
+        **buses** (list of int) - The bus ids to which the static generators are connected
+
+        **p_kw** (float or array) - The real power of the static generators (negative for \
+            generation!)
+
+    OPTIONAL:
+        **index** (list of int, None) - Force specified IDs if they are available. If None, the \
+            indices higher than the highest already existing index are selected.
+
+    OUTPUT:
+        **index** (array) - The unique IDs of the created static generators
+
+    EXAMPLE:
+        create_sgens(net, buses=[1, 2], p_kw=-120)
+
+    """
+    buses = array(buses, dtype=int64, ndmin=1)
+    _check_multiple_buses(net, buses, "static generator")
+    index = _get_multiple_index(net, "sgen", index, len(buses), "static generator")
+
+    entries = {"index": index, "name": name, "bus": buses, "p_kw": p_kw, "scaling": scaling,
+               "q_kvar": q_kvar, "sn_kva": sn_kva, "in_service": in_service, "type": type}
+    _add_optional_entries(net, "sgen", entries, min_p_kw=min_p_kw, max_p_kw=max_p_kw,
+                          min_q_kvar=min_q_kvar, max_q_kvar=max_q_kvar, controllable=controllable,
+                          k=k, rx=rx)
+    _set_multiple_entries(net, "sgen", entries)
+    return index
+
+
 def create_sgen_from_cosphi(net, bus, sn_kva, cos_phi, mode, **kwargs):
     """
     Creates an sgen element from rated power and power factor cos(phi).
@@ -789,6 +875,7 @@ def create_sgen_from_cosphi(net, bus, sn_kva, cos_phi, mode, **kwargs):
     return create_sgen(net, bus, sn_kva=sn_kva, p_kw=p_kw, q_kvar=q_kvar, **kwargs)
 
 
+@_buffered("storage")
 def create_storage(net, bus, p_kw, max_e_kwh, q_kvar=0, sn_kva=nan, soc_percent=nan, min_e_kwh=0.0,
                    name=None, index=None, scaling=1., type=None, in_service=True, max_p_kw=nan,
                    min_p_kw=nan, max_q_kvar=nan, min_q_kvar=nan, controllable = nan):
@@ -886,31 +973,31 @@ def create_storage(net, bus, p_kw, max_e_kwh, q_kvar=0, sn_kva=nan, soc_percent=
     # check for OPF parameters and add columns to network table
     if not isnan(min_p_kw):
         if "min_p_kw" not in net.storage.columns:
-            net.storage.loc[:, "min_p_kw"] = pd.Series()
+            _init_optional_column(net, "storage", "min_p_kw")
 
         net.storage.loc[index, "min_p_kw"] = float(min_p_kw)
 
     if not isnan(max_p_kw):
         if "max_p_kw" not in net.storage.columns:
-            net.storage.loc[:, "max_p_kw"] = pd.Series()
+            _init_optional_column(net, "storage", "max_p_kw")
 
         net.storage.loc[index, "max_p_kw"] = float(max_p_kw)
 
     if not isnan(min_q_kvar):
         if "min_q_kvar" not in net.storage.columns:
-            net.storage.loc[:, "min_q_kvar"] = pd.Series()
+            _init_optional_column(net, "storage", "min_q_kvar")
 
         net.storage.loc[index, "min_q_kvar"] = float(min_q_kvar)
 
     if not isnan(max_q_kvar):
         if "max_q_kvar" not in net.storage.columns:
-            net.storage.loc[:, "max_q_kvar"] = pd.Series()
+            _init_optional_column(net, "storage", "max_q_kvar")
 
         net.storage.loc[index, "max_q_kvar"] = float(max_q_kvar)
 
     if not isnan(controllable):
         if "controllable" not in net.storage.columns:
-            net.storage.loc[:, "controllable"] = pd.Series()
+            _init_optional_column(net, "storage", "controllable")
 
         net.storage.loc[index, "controllable"] = bool(controllable)
     else:
@@ -920,6 +1007,54 @@ def create_storage(net, bus, p_kw, max_e_kwh, q_kvar=0, sn_kva=nan, soc_percent=
     return index
 
 
+def create_storages(net, buses, p_kw, max_e_kwh, q_kvar=0, sn_kva=nan, soc_percent=nan,
+                    min_e_kwh=0.0, name=None, index=None, scaling=1., type=None, in_service=True,
+                    max_p_kw=nan, min_p_kw=nan, max_q_kvar=nan, min_q_kvar=nan,
+                    controllable=nan):
+    """create_storages(net, buses, p_kw, max_e_kwh, q_kvar=0, sn_kva=nan, soc_percent=nan, \
+                       min_e_kwh=0.0, name=None, index=None, scaling=1., type=None, \
+                       in_service=True, max_p_kw=nan, min_p_kw=nan, max_q_kvar=nan, \
+                       min_q_kvar=nan, controllable=nan)
+    Adds several storages in table net["storage"] at once.
+
+    All parameters can be given as scalar or as array with one value per storage, see
+    create_storage for their description.
+
+    INPUT:
+        **net** - The net within this storage should be created
+
+        **buses** (list of int) - The bus ids to which the storages are connected
+
+        **p_kw** (float or array) - The real power of the storages
+
+        **max_e_kwh** (float or array) - The maximum energy content of the storages
+
+    OPTIONAL:
+        **index** (list of int, None) - Force specified IDs if they are available. If None, the \
+            indices higher than the highest already existing index are selected.
+
+    OUTPUT:
+        **index** (array) - The unique IDs of the created storages
+
+    EXAMPLE:
+        create_storages(net, buses=[1, 2], p_kw=-30, max_e_kwh=60)
+
+    """
+    buses = array(buses, dtype=int64, ndmin=1)
+    _check_multiple_buses(net, buses, "storage")
+    index = _get_multiple_index(net, "storage", index, len(buses), "storage")
+
+    entries = {"index": index, "name": name, "bus": buses, "p_kw": p_kw, "q_kvar": q_kvar,
+               "sn_kva": sn_kva, "scaling": scaling, "soc_percent": soc_percent,
+               "min_e_kwh": min_e_kwh, "max_e_kwh": max_e_kwh, "in_service": in_service,
+               "type": type}
+    _add_optional_entries(net, "storage", entries, min_p_kw=min_p_kw, max_p_kw=max_p_kw,
+                          min_q_kvar=min_q_kvar, max_q_kvar=max_q_kvar, controllable=controllable)
+    _set_multiple_entries(net, "storage", entries)
+    return index
+
+
+@_buffered("gen")
 def create_gen(net, bus, p_kw, vm_pu=1., sn_kva=nan, name=None, index=None, max_q_kvar=nan,
                min_q_kvar=nan, min_p_kw=nan, max_p_kw=nan, scaling=1., type=None,
                controllable=nan, vn_kv=nan, xdss=nan, rdss=nan, cos_phi=nan, in_service=True):
@@ -1002,54 +1137,98 @@ def create_gen(net, bus, p_kw, vm_pu=1., sn_kva=nan, name=None, index=None, max_
 
     if not isnan(min_p_kw):
         if "min_p_kw" not in net.gen.columns:
-            net.gen.loc[:, "min_p_kw"] = pd.Series()
+            _init_optional_column(net, "gen", "min_p_kw")
         net.gen.loc[index, "min_p_kw"] = float(min_p_kw)
 
     if not isnan(max_p_kw):
         if "max_p_kw" not in net.gen.columns:
-            net.gen.loc[:, "max_p_kw"] = pd.Series()
+            _init_optional_column(net, "gen", "max_p_kw")
         net.gen.loc[index, "max_p_kw"] = float(max_p_kw)
 
     if not isnan(min_q_kvar):
         if "min_q_kvar" not in net.gen.columns:
-            net.gen.loc[:, "min_q_kvar"] = pd.Series()
+            _init_optional_column(net, "gen", "min_q_kvar")
         net.gen.loc[index, "min_q_kvar"] = float(min_q_kvar)
 
     if not isnan(max_q_kvar):
         if "max_q_kvar" not in net.gen.columns:
-            net.gen.loc[:, "max_q_kvar"] = pd.Series()
+            _init_optional_column(net, "gen", "max_q_kvar")
         net.gen.loc[index, "max_q_kvar"] = float(max_q_kvar)
 
     if not isnan(controllable):
         if "controllable" not in net.gen.columns:
-            net.gen.loc[:, "controllable"] = pd.Series(False)
+            _init_optional_column(net, "gen", "controllable")
         net.gen.loc[index, "controllable"] = bool(controllable)
     elif "controllable" in net.gen.columns:
         net.gen.loc[index, "controllable"] = False
 
     if not isnan(vn_kv):
         if "vn_kv" not in net.gen.columns:
-            net.gen.loc[:, "vn_kv"] = pd.Series()
+            _init_optional_column(net, "gen", "vn_kv")
         net.gen.loc[index, "vn_kv"] = float(vn_kv)
 
     if not isnan(xdss):
         if "xdss" not in net.gen.columns:
-            net.gen.loc[:, "xdss"] = pd.Series()
+            _init_optional_column(net, "gen", "xdss")
         net.gen.loc[index, "xdss"] = float(xdss)
 
     if not isnan(rdss):
         if "rdss" not in net.gen.columns:
-            net.gen.loc[:, "rdss"] = pd.Series()
+            _init_optional_column(net, "gen", "rdss")
         net.gen.loc[index, "rdss"] = float(rdss)
 
     if not isnan(cos_phi):
         if "cos_phi" not in net.gen.columns:
-            net.gen.loc[:, "cos_phi"] = pd.Series()
+            _init_optional_column(net, "gen", "cos_phi")
         net.gen.loc[index, "cos_phi"] = float(cos_phi)
 
     return index
 
 
+def create_gens(net, buses, p_kw, vm_pu=1., sn_kva=nan, name=None, index=None, max_q_kvar=nan,
+                min_q_kvar=nan, min_p_kw=nan, max_p_kw=nan, scaling=1., type=None,
+                controllable=nan, vn_kv=nan, xdss=nan, rdss=nan, cos_phi=nan, in_service=True):
+    """create_gens(net, buses, p_kw, vm_pu=1., sn_kva=nan, name=None, index=None, max_q_kvar=nan, \
+                   min_q_kvar=nan, min_p_kw=nan, max_p_kw=nan, scaling=1., type=None, \
+                   controllable=nan, vn_kv=nan, xdss=nan, rdss=nan, cos_phi=nan, in_service=True)
+    Adds several generators in table net["gen"] at once.
+
+    All parameters can be given as scalar or as array with one value per generator, see
+    create_gen for their description.
+
+    INPUT:
+        **net** - The net within this generator should be created
+
+        **buses** (list of int) - The bus ids to which the generators are connected
+
+        **p_kw** (float or array) - The real power of the generators (negative for generation!)
+
+    OPTIONAL:
+        **index** (list of int, None) - Force specified IDs if they are available. If None, the \
+            indices higher than the highest already existing index are selected.
+
+    OUTPUT:
+        **index** (array) - The unique IDs of the created generators
+
+    EXAMPLE:
+        create_gens(net, buses=[1, 2], p_kw=[-120, -80], vm_pu=1.02)
+
+    """
+    buses = array(buses, dtype=int64, ndmin=1)
+    _check_multiple_buses(net, buses, "generator")
+    index = _get_multiple_index(net, "gen", index, len(buses), "generator")
+
+    entries = {"index": index, "name": name, "bus": buses, "p_kw": p_kw, "vm_pu": vm_pu,
+               "sn_kva": sn_kva, "type": type, "in_service": in_service, "scaling": scaling,
+               "min_q_kvar": min_q_kvar, "max_q_kvar": max_q_kvar}
+    _add_optional_entries(net, "gen", entries, min_p_kw=min_p_kw, max_p_kw=max_p_kw,
+                          controllable=controllable, vn_kv=vn_kv, xdss=xdss, rdss=rdss,
+                          cos_phi=cos_phi)
+    _set_multiple_entries(net, "gen", entries)
+    return index
+
+
+@_buffered("ext_grid")
 def create_ext_grid(net, bus, vm_pu=1.0, va_degree=0., name=None, in_service=True,
                     s_sc_max_mva=nan, s_sc_min_mva=nan, rx_max=nan, rx_min=nan,
                     max_p_kw=nan, min_p_kw=nan, max_q_kvar=nan, min_q_kvar=nan,
@@ -1119,49 +1298,49 @@ def create_ext_grid(net, bus, vm_pu=1.0, va_degree=0., name=None, in_service=Tru
 
     if not isnan(s_sc_max_mva):
         if "s_sc_max_mva" not in net.ext_grid.columns:
-            net.ext_grid.loc[:, "s_sc_max_mva"] = pd.Series()
+            _init_optional_column(net, "ext_grid", "s_sc_max_mva")
 
         net.ext_grid.at[index, "s_sc_max_mva"] = float(s_sc_max_mva)
 
     if not isnan(s_sc_min_mva):
         if "s_sc_min_mva" not in net.ext_grid.columns:
-            net.ext_grid.loc[:, "s_sc_min_mva"] = pd.Series()
+            _init_optional_column(net, "ext_grid", "s_sc_min_mva")
 
         net.ext_grid.at[index, "s_sc_min_mva"] = float(s_sc_min_mva)
 
     if not isnan(rx_min):
         if "rx_min" not in net.ext_grid.columns:
-            net.ext_grid.loc[:, "rx_min"] = pd.Series()
+            _init_optional_column(net, "ext_grid", "rx_min")
 
         net.ext_grid.at[index, "rx_min"] = float(rx_min)
 
     if not isnan(rx_max):
         if "rx_max" not in net.ext_grid.columns:
-            net.ext_grid.loc[:, "rx_max"] = pd.Series()
+            _init_optional_column(net, "ext_grid", "rx_max")
 
         net.ext_grid.at[index, "rx_max"] = float(rx_max)
 
     if not isnan(min_p_kw):
         if "min_p_kw" not in net.ext_grid.columns:
-            net.ext_grid.loc[:, "min_p_kw"] = pd.Series()
+            _init_optional_column(net, "ext_grid", "min_p_kw")
 
         net.ext_grid.loc[index, "min_p_kw"] = float(min_p_kw)
 
     if not isnan(max_p_kw):
         if "max_p_kw" not in net.ext_grid.columns:
-            net.ext_grid.loc[:, "max_p_kw"] = pd.Series()
+            _init_optional_column(net, "ext_grid", "max_p_kw")
 
         net.ext_grid.loc[index, "max_p_kw"] = float(max_p_kw)
 
     if not isnan(min_q_kvar):
         if "min_q_kvar" not in net.ext_grid.columns:
-            net.ext_grid.loc[:, "min_q_kvar"] = pd.Series()
+            _init_optional_column(net, "ext_grid", "min_q_kvar")
 
         net.ext_grid.loc[index, "min_q_kvar"] = float(min_q_kvar)
 
     if not isnan(max_q_kvar):
         if "max_q_kvar" not in net.ext_grid.columns:
-            net.ext_grid.loc[:, "max_q_kvar"] = pd.Series()
+            _init_optional_column(net, "ext_grid", "max_q_kvar")
 
         net.ext_grid.loc[index, "max_q_kvar"] = float(max_q_kvar)
 
@@ -1170,6 +1349,7 @@ def create_ext_grid(net, bus, vm_pu=1.0, va_degree=0., name=None, in_service=Tru
     return index
 
 
+@_buffered("line")
 def create_line(net, from_bus, to_bus, length_km, std_type, name=None, index=None, geodata=None,
                 df=1., parallel=1, in_service=True, max_loading_percent=nan):
     """ create_line(net, from_bus, to_bus, length_km, std_type, name=None, index=None, geodata=None, \
@@ -1261,13 +1441,74 @@ def create_line(net, from_bus, to_bus, length_km, std_type, name=None, index=Non
 
     if not isnan(max_loading_percent):
         if "max_loading_percent" not in net.line.columns:
-            net.line.loc[:, "max_loading_percent"] = pd.Series()
+            _init_optional_column(net, "line", "max_loading_percent")
 
         net.line.loc[index, "max_loading_percent"] = float(max_loading_percent)
 
     return index
 
 
+def create_lines(net, from_buses, to_buses, length_km, std_type, name=None, index=None,
+                 geodata=None, df=1., parallel=1, in_service=True, max_loading_percent=nan):
+    """create_lines(net, from_buses, to_buses, length_km, std_type, name=None, index=None, \
+                    geodata=None, df=1., parallel=1, in_service=True, max_loading_percent=nan)
+    Creates several line elements in net["line"] at once.
+    The line parameters are defined through the standard type library, each standard type is only
+    loaded once.
+
+    All parameters can be given as scalar or as array with one value per line, see create_line
+    for their description.
+
+    INPUT:
+        **net** - The net within this line should be created
+
+        **from_buses** (list of int) - IDs of the buses on one side which the lines will be \
+            connected with
+
+        **to_buses** (list of int) - IDs of the buses on the other side which the lines will be \
+            connected with
+
+        **length_km** (float or array) - The line lengths in km
+
+        **std_type** (string or array) - The linetypes of the lines
+
+    OPTIONAL:
+        **index** (list of int, None) - Force specified IDs if they are available. If None, the \
+            indices higher than the highest already existing index are selected.
+
+        **geodata** (list of arrays, None) - The linegeodata of each line
+
+    OUTPUT:
+        **index** (array) - The unique IDs of the created lines
+
+    EXAMPLE:
+        create_lines(net, from_buses=[0, 1], to_buses=[1, 2], length_km=0.1, \
+            std_type="NAYY 4x50 SE")
+
+    """
+    from_buses = array(from_buses, dtype=int64, ndmin=1)
+    to_buses = array(to_buses, dtype=int64, ndmin=1)
+    _check_multiple_buses(net, from_buses, "line")
+    _check_multiple_buses(net, to_buses, "line")
+    index = _get_multiple_index(net, "line", index, len(from_buses), "line")
+
+    entries = {"index": index, "name": name, "length_km": length_km, "from_bus": from_buses,
+               "to_bus": to_buses, "in_service": in_service, "std_type": std_type, "df": df,
+               "parallel": parallel}
+    entries.update(_get_multiple_std_type_parameters(
+        net, std_type, "line", len(index),
+        {"r_ohm_per_km": nan, "x_ohm_per_km": nan, "c_nf_per_km": nan, "max_i_ka": nan,
+         "g_us_per_km": 0., "type": None}))
+    _add_optional_entries(net, "line", entries, max_loading_percent=max_loading_percent)
+    _set_multiple_entries(net, "line", entries)
+
+    if geodata is not None:
+        _set_multiple_entries(net, "line_geodata", {"index": index, "coords": list(geodata)})
+
+    return index
+
+
+@_buffered("line")
 def create_line_from_parameters(net, from_bus, to_bus, length_km, r_ohm_per_km, x_ohm_per_km,
                                 c_nf_per_km, max_i_ka, name=None, index=None, type=None,
                                 geodata=None, in_service=True, df=1., parallel=1, g_us_per_km=0.,
@@ -1363,13 +1604,80 @@ def create_line_from_parameters(net, from_bus, to_bus, length_km, r_ohm_per_km,
 
     if not isnan(max_loading_percent):
         if "max_loading_percent" not in net.line.columns:
-            net.line.loc[:, "max_loading_percent"] = pd.Series()
+            _init_optional_column(net, "line", "max_loading_percent")
 
         net.line.loc[index, "max_loading_percent"] = float(max_loading_percent)
 
     return index
 
 
+def create_lines_from_parameters(net, from_buses, to_buses, length_km, r_ohm_per_km,
+                                 x_ohm_per_km, c_nf_per_km, max_i_ka, name=None, index=None,
+                                 type=None, geodata=None, in_service=True, df=1., parallel=1,
+                                 g_us_per_km=0., max_loading_percent=nan):
+    """create_lines_from_parameters(net, from_buses, to_buses, length_km, r_ohm_per_km, \
+                                    x_ohm_per_km, c_nf_per_km, max_i_ka, name=None, index=None, \
+                                    type=None, geodata=None, in_service=True, df=1., parallel=1, \
+                                    g_us_per_km=0., max_loading_percent=nan)
+    Creates several line elements in net["line"] from line parameters at once.
+
+    All parameters can be given as scalar or as array with one value per line, see
+    create_line_from_parameters for their description.
+
+    INPUT:
+        **net** - The net within this line should be created
+
+        **from_buses** (list of int) - IDs of the buses on one side which the lines will be \
+            connected with
+
+        **to_buses** (list of int) - IDs of the buses on the other side which the lines will be \
+            connected with
+
+        **length_km** (float or array) - The line lengths in km
+
+        **r_ohm_per_km** (float or array) - line resistance in ohm per km
+
+        **x_ohm_per_km** (float or array) - line reactance in ohm per km
+
+        **c_nf_per_km** (float or array) - line capacitance in nano Farad per km
+
+        **max_i_ka** (float or array) - maximum thermal current in kilo Ampere
+
+    OPTIONAL:
+        **index** (list of int, None) - Force specified IDs if they are available. If None, the \
+            indices higher than the highest already existing index are selected.
+
+        **geodata** (list of arrays, None) - The linegeodata of each line
+
+    OUTPUT:
+        **index** (array) - The unique IDs of the created lines
+
+    EXAMPLE:
+        create_lines_from_parameters(net, from_buses=[0, 1], to_buses=[1, 2], length_km=0.1, \
+            r_ohm_per_km=.01, x_ohm_per_km=0.05, c_nf_per_km=10, max_i_ka=0.4)
+
+    """
+    from_buses = array(from_buses, dtype=int64, ndmin=1)
+    to_buses = array(to_buses, dtype=int64, ndmin=1)
+    _check_multiple_buses(net, from_buses, "line")
+    _check_multiple_buses(net, to_buses, "line")
+    index = _get_multiple_index(net, "line", index, len(from_buses), "line")
+
+    entries = {"index": index, "name": name, "length_km": length_km, "from_bus": from_buses,
+               "to_bus": to_buses, "in_service": in_service, "std_type": None, "df": df,
+               "r_ohm_per_km": r_ohm_per_km, "x_ohm_per_km": x_ohm_per_km,
+               "c_nf_per_km": c_nf_per_km, "max_i_ka": max_i_ka, "parallel": parallel,
+               "type": type, "g_us_per_km": g_us_per_km}
+    _add_optional_entries(net, "line", entries, max_loading_percent=max_loading_percent)
+    _set_multiple_entries(net, "line", entries)
+
+    if geodata is not None:
+        _set_multiple_entries(net, "line_geodata", {"index": index, "coords": list(geodata)})
+
+    return index
+
+
+@_buffered("trafo")
 def create_transformer(net, hv_bus, lv_bus, std_type, name=None, tp_pos=nan, in_service=True,
                        index=None, max_loading_percent=nan, parallel=1, df=1.):
     """create_transformer(net, hv_bus, lv_bus, std_type, name=None, tp_pos=nan, in_service=True, \
@@ -1464,7 +1772,7 @@ def create_transformer(net, hv_bus, lv_bus, std_type, name=None, tp_pos=nan, in_
 
     if not isnan(max_loading_percent):
         if "max_loading_percent" not in net.trafo.columns:
-            net.trafo.loc[:, "max_loading_percent"] = pd.Series()
+            _init_optional_column(net, "trafo", "max_loading_percent")
 
         net.trafo.loc[index, "max_loading_percent"] = float(max_loading_percent)
 
@@ -1477,6 +1785,65 @@ def create_transformer(net, hv_bus, lv_bus, std_type, name=None, tp_pos=nan, in_
     return index
 
 
+def create_transformers(net, hv_buses, lv_buses, std_type, name=None, tp_pos=nan, in_service=True,
+                        index=None, max_loading_percent=nan, parallel=1, df=1.):
+    """create_transformers(net, hv_buses, lv_buses, std_type, name=None, tp_pos=nan, \
+                           in_service=True, index=None, max_loading_percent=nan, parallel=1, \
+                           df=1.)
+    Creates several two-winding transformers in table net["trafo"] at once.
+    The trafo parameters are defined through the standard type library, each standard type is
+    only loaded once.
+
+    All parameters can be given as scalar or as array with one value per transformer, see
+    create_transformer for their description.
+
+    INPUT:
+        **net** - The net within this transformer should be created
+
+        **hv_buses** (list of int) - The buses on the high-voltage side on which the \
+            transformers will be connected to
+
+        **lv_buses** (list of int) - The buses on the low-voltage side on which the \
+            transformers will be connected to
+
+        **std_type** (string or array) - The used standard types from the standard type library
+
+    OPTIONAL:
+        **index** (list of int, None) - Force specified IDs if they are available. If None, the \
+            indices higher than the highest already existing index are selected.
+
+    OUTPUT:
+        **index** (array) - The unique IDs of the created transformers
+
+    EXAMPLE:
+        create_transformers(net, hv_buses=[0, 0], lv_buses=[1, 2], std_type="0.4 MVA 10/0.4 kV")
+    """
+    hv_buses = array(hv_buses, dtype=int64, ndmin=1)
+    lv_buses = array(lv_buses, dtype=int64, ndmin=1)
+    _check_multiple_buses(net, hv_buses, "transformer")
+    _check_multiple_buses(net, lv_buses, "transformer")
+    if (array(df) <= 0).any():
+        raise UserWarning("derating factor df must be positive")
+    index = _get_multiple_index(net, "trafo", index, len(hv_buses), "transformer")
+
+    entries = {"index": index, "name": name, "hv_bus": hv_buses, "lv_bus": lv_buses,
+               "in_service": in_service, "std_type": std_type, "parallel": parallel, "df": df}
+    entries.update(_get_multiple_std_type_parameters(
+        net, std_type, "trafo", len(index),
+        {"sn_kva": nan, "vn_hv_kv": nan, "vn_lv_kv": nan, "vsc_percent": nan,
+         "vscr_percent": nan, "pfe_kw": nan, "i0_percent": nan, "shift_degree": 0,
+         "tp_phase_shifter": False, "tp_mid": nan, "tp_max": nan, "tp_min": nan,
+         "tp_side": None, "tp_st_percent": nan, "tp_st_degree": nan}))
+    entries["tp_phase_shifter"] = pd.Series(entries["tp_phase_shifter"]).fillna(False).values
+    # the tap position defaults to the medium position
+    entries["tp_pos"] = pd.Series(broadcast_to(array(tp_pos, dtype=float), (len(index),))).fillna(
+        pd.Series(entries["tp_mid"], dtype=float)).values
+    _add_optional_entries(net, "trafo", entries, max_loading_percent=max_loading_percent)
+    _set_multiple_entries(net, "trafo", entries)
+    return index
+
+
+@_buffered("trafo")
 def create_transformer_from_parameters(net, hv_bus, lv_bus, sn_kva, vn_hv_kv, vn_lv_kv,
                                        vscr_percent, vsc_percent, pfe_kw, i0_percent,
                                        shift_degree=0, tp_side=None, tp_mid=nan, tp_max=nan,
@@ -1606,13 +1973,92 @@ def create_transformer_from_parameters(net, hv_bus, lv_bus, sn_kva, vn_hv_kv, vn
 
     if not isnan(max_loading_percent):
         if "max_loading_percent" not in net.trafo.columns:
-            net.trafo.loc[:, "max_loading_percent"] = pd.Series()
+            _init_optional_column(net, "trafo", "max_loading_percent")
 
         net.trafo.loc[index, "max_loading_percent"] = float(max_loading_percent)
 
     return index
 
 
+def create_transformers_from_parameters(net, hv_buses, lv_buses, sn_kva, vn_hv_kv, vn_lv_kv,
+                                        vscr_percent, vsc_percent, pfe_kw, i0_percent,
+                                        shift_degree=0, tp_side=None, tp_mid=nan, tp_max=nan,
+                                        tp_min=nan, tp_st_percent=nan, tp_st_degree=nan,
+                                        tp_pos=nan, tp_phase_shifter=False, in_service=True,
+                                        name=None, index=None, max_loading_percent=nan,
+                                        parallel=1, df=1.):
+    """create_transformers_from_parameters(net, hv_buses, lv_buses, sn_kva, vn_hv_kv, vn_lv_kv, \
+                                           vscr_percent, vsc_percent, pfe_kw, i0_percent, \
+                                           shift_degree=0, tp_side=None, tp_mid=nan, \
+                                           tp_max=nan, tp_min=nan, tp_st_percent=nan, \
+                                           tp_st_degree=nan, tp_pos=nan, tp_phase_shifter=False, \
+                                           in_service=True, name=None, index=None, \
+                                           max_loading_percent=nan, parallel=1, df=1.)
+    Creates several two-winding transformers in table net["trafo"] from parameters at once.
+
+    All parameters can be given as scalar or as array with one value per transformer, see
+    create_transformer_from_parameters for their description.
+
+    INPUT:
+        **net** - The net within this transformer should be created
+
+        **hv_buses** (list of int) - The buses on the high-voltage side on which the \
+            transformers will be connected to
+
+        **lv_buses** (list of int) - The buses on the low-voltage side on which the \
+            transformers will be connected to
+
+        **sn_kva** (float or array) - rated apparent power
+
+        **vn_hv_kv** (float or array) - rated voltage on high voltage side
+
+        **vn_lv_kv** (float or array) - rated voltage on low voltage side
+
+        **vscr_percent** (float or array) - real part of relative short-circuit voltage
+
+        **vsc_percent** (float or array) - relative short-circuit voltage
+
+        **pfe_kw** (float or array)  - iron losses in kW
+
+        **i0_percent** (float or array) - open loop losses in percent of rated current
+
+    OPTIONAL:
+        **index** (list of int, None) - Force specified IDs if they are available. If None, the \
+            indices higher than the highest already existing index are selected.
+
+    OUTPUT:
+        **index** (array) - The unique IDs of the created transformers
+
+    EXAMPLE:
+        create_transformers_from_parameters(net, hv_buses=[0, 0], lv_buses=[1, 2], sn_kva=40, \
+            vn_hv_kv=110, vn_lv_kv=10, vsc_percent=10, vscr_percent=0.3, pfe_kw=30, \
+            i0_percent=0.1)
+    """
+    hv_buses = array(hv_buses, dtype=int64, ndmin=1)
+    lv_buses = array(lv_buses, dtype=int64, ndmin=1)
+    _check_multiple_buses(net, hv_buses, "transformer")
+    _check_multiple_buses(net, lv_buses, "transformer")
+    if (array(df) <= 0).any():
+        raise UserWarning("derating factor df must be positive")
+    index = _get_multiple_index(net, "trafo", index, len(hv_buses), "transformer")
+
+    # the tap position defaults to the medium position
+    tp_pos = pd.Series(broadcast_to(array(tp_pos, dtype=float), (len(index),))).fillna(
+        pd.Series(broadcast_to(array(tp_mid, dtype=float), (len(index),)))).values
+    entries = {"index": index, "name": name, "hv_bus": hv_buses, "lv_bus": lv_buses,
+               "in_service": in_service, "std_type": None, "sn_kva": sn_kva,
+               "vn_hv_kv": vn_hv_kv, "vn_lv_kv": vn_lv_kv, "vsc_percent": vsc_percent,
+               "vscr_percent": vscr_percent, "pfe_kw": pfe_kw, "i0_percent": i0_percent,
+               "tp_mid": tp_mid, "tp_max": tp_max, "tp_min": tp_min, "shift_degree": shift_degree,
+               "tp_side": tp_side, "tp_st_percent": tp_st_percent, "tp_st_degree": tp_st_degree,
+               "tp_phase_shifter": tp_phase_shifter, "parallel": parallel, "df": df,
+               "tp_pos": tp_pos}
+    _add_optional_entries(net, "trafo", entries, max_loading_percent=max_loading_percent)
+    _set_multiple_entries(net, "trafo", entries)
+    return index
+
+
+@_buffered("trafo3w")
 def create_transformer3w(net, hv_bus, mv_bus, lv_bus, std_type, name=None, tp_pos=nan,
                          in_service=True, index=None, max_loading_percent=nan,
                          tap_at_star_point=False):
@@ -1716,13 +2162,14 @@ def create_transformer3w(net, hv_bus, mv_bus, lv_bus, std_type, name=None, tp_po
 
     if not isnan(max_loading_percent):
         if "max_loading_percent" not in net.trafo3w.columns:
-            net.trafo3w.loc[:, "max_loading_percent"] = pd.Series()
+            _init_optional_column(net, "trafo3w", "max_loading_percent")
 
         net.trafo3w.loc[index, "max_loading_percent"] = float(max_loading_percent)
 
     return index
 
 
+@_buffered("trafo3w")
 def create_transformer3w_from_parameters(net, hv_bus, mv_bus, lv_bus, vn_hv_kv, vn_mv_kv, vn_lv_kv,
                                          sn_hv_kva, sn_mv_kva, sn_lv_kva, vsc_hv_percent,
                                          vsc_mv_percent, vsc_lv_percent, vscr_hv_percent,
@@ -1863,13 +2310,14 @@ def create_transformer3w_from_parameters(net, hv_bus, mv_bus, lv_bus, vn_hv_kv,
 
     if not isnan(max_loading_percent):
         if "max_loading_percent" not in net.trafo3w.columns:
-            net.trafo3w.loc[:, "max_loading_percent"] = pd.Series()
+            _init_optional_column(net, "trafo3w", "max_loading_percent")
 
         net.trafo3w.loc[index, "max_loading_percent"] = float(max_loading_percent)
 
     return index
 
 
+@_buffered("switch")
 def create_switch(net, bus, element, et, closed=True, type=None, name=None, index=None):
     """
     Adds a switch in the net["switch"] table.
@@ -1959,6 +2407,65 @@ def create_switch(net, bus, element, et, closed=True, type=None, name=None, inde
     return index
 
 
+def create_switches(net, buses, elements, et, closed=True, type=None, name=None, index=None):
+    """
+    Adds several switches in the net["switch"] table at once.
+
+    All parameters can be given as scalar or as array with one value per switch, see create_switch
+    for their description.
+
+    INPUT:
+        **net** (pandapowerNet) - The net within this switch should be created
+
+        **buses** (list of int) - The buses that the switches are connected to
+
+        **elements** (list of int) - indices of the elements: bus id if et == "b", line id if \
+            et == "l", trafo id if et == "t"
+
+        **et** - (string or array) element types: "l" = switch between bus and line, "t" = \
+            switch between bus and transformer, "b" = switch between two buses
+
+    OPTIONAL:
+        **index** (list of int, None) - Force specified IDs if they are available. If None, the \
+            indices higher than the highest already existing index are selected.
+
+    OUTPUT:
+        **index** (array) - The unique IDs of the created switches
+
+    EXAMPLE:
+        create_switches(net, buses=[0, 1], elements=[1, 2], et="l")
+
+    """
+    buses = array(buses, dtype=int64, ndmin=1)
+    elements = array(elements, dtype=int64, ndmin=1)
+    et = broadcast_to(array(et, dtype=object), buses.shape)
+    _check_multiple_buses(net, buses, "switch")
+    if (et == "t3").any():
+        raise NotImplementedError("Switches for three winding transformers are not implemented")
+    if not isin(et, ["l", "t", "b"]).all():
+        raise UserWarning("Unknown element type")
+    _check_multiple_buses(net, elements[et == "b"], "bus-bus switch")
+    for element_type, table, bus_columns in (("l", "line", ["from_bus", "to_bus"]),
+                                             ("t", "trafo", ["hv_bus", "lv_bus"])):
+        is_type = et == element_type
+        if not is_type.any():
+            continue
+        el = elements[is_type]
+        if not isin(el, net[table].index.values).all():
+            raise UserWarning("Unknown %s index" % table)
+        connected = (net[table][bus_columns].loc[el].values == buses[is_type][:, None]).any(axis=1)
+        if not connected.all():
+            raise UserWarning("%s %s not connected to buses %s" % (
+                table.capitalize(), el[~connected], buses[is_type][~connected]))
+    index = _get_multiple_index(net, "switch", index, len(buses), "switch")
+
+    entries = {"index": index, "bus": buses, "element": elements, "et": et, "closed": closed,
+               "type": type, "name": name}
+    _set_multiple_entries(net, "switch", entries)
+    return index
+
+
+@_buffered("shunt")
 def create_shunt(net, bus, q_kvar, p_kw=0., vn_kv=None, step=1, max_step=1, name=None,
                  in_service=True, index=None):
     """create_shunt(net, bus, q_kvar, p_kw=0., vn_kv=None, step=1, max_step=nan, name=None,
@@ -2019,6 +2526,48 @@ def create_shunt(net, bus, q_kvar, p_kw=0., vn_kv=None, step=1, max_step=1, name
     return index
 
 
+def create_shunts(net, buses, q_kvar, p_kw=0., vn_kv=None, step=1, max_step=1, name=None,
+                  in_service=True, index=None):
+    """create_shunts(net, buses, q_kvar, p_kw=0., vn_kv=None, step=1, max_step=1, name=None, \
+                     in_service=True, index=None)
+    Creates several shunt elements at once.
+
+    All parameters can be given as scalar or as array with one value per shunt, see create_shunt
+    for their description.
+
+    INPUT:
+        **net** (pandapowerNet) - The pandapower network in which the element is created
+
+        **buses** (list of int) - bus numbers of buses to whom the shunts are connected to
+
+        **q_kvar** (float or array) - shunt susceptance in kVAr at v= 1.0 p.u.
+
+    OPTIONAL:
+        **vn_kv** (float or array, None) - rated voltage of the shunts. Defaults to rated \
+            voltage of connected buses for None / NaN values
+
+        **index** (list of int, None) - Force specified IDs if they are available. If None, the \
+            indices higher than the highest already existing index are selected.
+
+    OUTPUT:
+        **index** (array) - The unique IDs of the created shunts
+
+    EXAMPLE:
+        create_shunts(net, [0, 1], 20)
+    """
+    buses = array(buses, dtype=int64, ndmin=1)
+    _check_multiple_buses(net, buses, "shunt")
+    index = _get_multiple_index(net, "shunt", index, len(buses), "shunt")
+
+    # missing rated voltages default to the rated voltage of the bus
+    vn_kv = pd.Series(vn_kv if ndim(vn_kv) else [vn_kv] * len(buses), dtype=float).fillna(
+        pd.Series(net.bus.vn_kv.loc[buses].values)).values
+    entries = {"index": index, "bus": buses, "name": name, "p_kw": p_kw, "q_kvar": q_kvar,
+               "vn_kv": vn_kv, "step": step, "max_step": max_step, "in_service": in_service}
+    _set_multiple_entries(net, "shunt", entries)
+    return index
+
+
 def create_shunt_as_capacitor(net, bus, q_kvar, loss_factor, **kwargs):
     """
     Creates a shunt element representing a capacitor bank.
@@ -2044,6 +2593,7 @@ def create_shunt_as_capacitor(net, bus, q_kvar, loss_factor, **kwargs):
     return create_shunt(net, bus, q_kvar=q_kvar, p_kw=p_kw, **kwargs)
 
 
+@_buffered("impedance")
 def create_impedance(net, from_bus, to_bus, rft_pu, xft_pu, sn_kva, rtf_pu=None, xtf_pu=None,
                      name=None, in_service=True, index=None):
     """
@@ -2128,6 +2678,7 @@ def create_series_reactor_as_impedance(net, from_bus, to_bus, r_ohm, x_ohm, sn_k
     return index
 
 
+@_buffered("ward")
 def create_ward(net, bus, ps_kw, qs_kvar, pz_kw, qz_kvar, name=None, in_service=True, index=None):
     """
     Creates a ward equivalent.
@@ -2171,6 +2722,7 @@ def create_ward(net, bus, ps_kw, qs_kvar, pz_kw, qz_kvar, name=None, in_service=
     return index
 
 
+@_buffered("xward")
 def create_xward(net, bus, ps_kw, qs_kvar, pz_kw, qz_kvar, r_ohm, x_ohm, vm_pu, in_service=True,
                  name=None, index=None):
     """
@@ -2219,6 +2771,7 @@ def create_xward(net, bus, ps_kw, qs_kvar, pz_kw, qz_kvar, r_ohm, x_ohm, vm_pu,
     return index
 
 
+@_buffered("dcline")
 def create_dcline(net, from_bus, to_bus, p_kw, loss_percent, loss_kw, vm_from_pu, vm_to_pu,
                   index=None, name=None, max_p_kw=nan, min_q_from_kvar=nan,
                   min_q_to_kvar=nan, max_q_from_kvar=nan, max_q_to_kvar=nan,
@@ -2295,6 +2848,7 @@ def create_dcline(net, from_bus, to_bus, p_kw, loss_percent, loss_kw, vm_from_pu
     return index
 
 
+@_buffered("measurement")
 def create_measurement(net, meas_type, element_type, value, std_dev, bus, element=None,
                        check_existing=True, index=None, name=None):
     """
@@ -2398,6 +2952,7 @@ def create_measurement(net, meas_type, element_type, value, std_dev, bus, elemen
     return index
 
 
+@_buffered("piecewise_linear_cost")
 def create_piecewise_linear_cost(net, element, element_type, data_points, type="p", index=None):
     """
     Creates an entry for piecewise linear costs for an element. The currently supported elements are
@@ -2506,6 +3061,7 @@ def create_piecewise_linear_cost(net, element, element_type, data_points, type="
     return index
 
 
+@_buffered("polynomial_cost")
 def create_polynomial_cost(net, element, element_type, coefficients, type="p", index=None):
     """
     Creates an entry for polynomial costs for an element. The currently supported elements are
@@ -2569,3 +3125,82 @@ def create_polynomial_cost(net, element, element_type, coefficients, type="p", i
     net.polynomial_cost.c.loc[index] = coefficients.reshape((1, -1))
 
     return index
+
+
+def _get_multiple_index(net, table, index, nr_elements, element_name):
+    """
+    Returns the indices of nr_elements new elements in net[table]. If index is None, the indices
+    following the highest existing index are used.
+    """
+    if index is None:
+        first = get_free_id(net[table])
+        return arange(first, first + nr_elements, dtype=int64)
+    index = array(index, dtype=int64, ndmin=1)
+    if len(index) != nr_elements:
+        raise UserWarning("%u indices given for %u %ss" % (len(index), nr_elements, element_name))
+    if len(unique(index)) != len(index):
+        raise UserWarning("The indices of the %ss are not unique" % element_name)
+    existing = index[isin(index, net[table].index.values)]
+    if len(existing):
+        raise UserWarning("%ss with indices %s already exist" % (element_name, existing))
+    return index
+
+
+def _check_multiple_buses(net, buses, element_name):
+    missing = setdiff1d(buses, net["bus"].index.values)
+    if len(missing):
+        raise UserWarning("%ss try to attach to non-existing buses %s" % (element_name, missing))
+
+
+def _add_optional_entries(net, table, entries, **optional):
+    """
+    Adds optional parameters (e.g. OPF limits) to entries if they are given for at least one
+    element or if the column already exists in net[table].
+    """
+    for column, value in optional.items():
+        if column in net[table].columns or not pd.isnull(array(value, ndmin=1)).all():
+            entries[column] = value
+    if "controllable" in entries:
+        entries["controllable"] = pd.Series(broadcast_to(
+            entries["controllable"], (len(entries["index"]),))).fillna(False).values.astype(bool)
+
+
+def _get_multiple_std_type_parameters(net, std_type, element, nr_elements, parameters):
+    """
+    Returns a dict with the values of the standard type parameters for a scalar or an array of
+    standard types. Each standard type is only loaded once. Parameters that are not defined in a
+    standard type are given as dict of parameter and default value.
+    """
+    std_type = pd.Series(broadcast_to(array(std_type, dtype=object), (nr_elements,)))
+    library = {name: load_std_type(net, name, element) for name in std_type.unique()}
+    return {par: std_type.map({name: typ.get(par, default)
+                               for name, typ in library.items()}).values
+            for par, default in parameters.items()}
+
+
+def _init_optional_column(net, table, column):
+    """
+    Adds an optional column (e.g. OPF limits or "controllable") to net[table]. "controllable" is
+    a bool column which is False for the existing elements, all other optional columns are float
+    columns which are NaN for the existing elements.
+    """
+    if column == "controllable":
+        net[table][column] = pd.Series(False, index=net[table].index, dtype=bool)
+    else:
+        net[table][column] = pd.Series(nan, index=net[table].index, dtype=float64)
+
+
+def _set_multiple_entries(net, table, entries):
+    """
+    Appends the elements given by entries (dict of column and scalar or array value, including
+    "index") to net[table] in a single concatenation and restores the dtypes of the table.
+    """
+    index = entries.pop("index")
+    dd = pd.DataFrame(entries, index=index)
+    for column in dd.columns:
+        if column not in net[table].columns:
+            _init_optional_column(net, table, column)
+    dtypes = net[table].dtypes
+    columns = net[table].columns.tolist()
+    net[table] = pd.concat([net[table], dd.reindex(columns=columns)])
+    _preserve_dtypes(net[table], dtypes)
@@ -5,20 +5,22 @@
 import numpy as np
 
 from scipy.sparse import csr_matrix
-from scipy.sparse.linalg import spsolve
 from scipy.stats import chi2
 
 from pandapower.estimation.wls_ppc_conversions import _add_measurements_to_ppc, \
     _build_measurement_vectors, _init_ppc
 from pandapower.estimation.results import _copy_power_flow_results, _rename_results
-from pandapower.idx_brch import F_BUS, T_BUS, BR_STATUS, PF, PT, QF, QT
+from pandapower.idx_brch import BR_STATUS, PF, PT, QF, QT
 from pandapower.auxiliary import _add_pf_options, get_values
+from pandapower.pf.linear_solver import _check_lin_solver, _solve_linear_system
 from pandapower.estimation.wls_matrix_ops import wls_matrix_ops
 from pandapower.pf.ppci_variables import _get_pf_variables_from_ppci, \
     _store_results_from_pf_in_ppci
 from pandapower.results import _copy_results_ppci_to_ppc, _extract_results_se
 from pandapower.topology import estimate_voltage_vector
+from pandapower.timing import _init_timings, _finish_timings, _timed, _add_time
 from time import time
+from timeit import default_timer
 try:
     import pplog as logging
 except ImportError:
@@ -27,7 +29,7 @@ std_logger = logging.getLogger(__name__)
 
 
 def estimate(net, init='flat', tolerance=1e-6, maximum_iterations=10,
-             calculate_voltage_angles=True, ref_power=1e6):
+             calculate_voltage_angles=True, ref_power=1e6, lin_solver="superlu", profile=False):
     """
     Wrapper function for WLS state estimation.
 
@@ -47,10 +49,18 @@ def estimate(net, init='flat', tolerance=1e-6, maximum_iterations=10,
         **calculate_voltage_angles** - (boolean) - Take into account absolute voltage angles and phase
         shifts in transformers, if init is 'slack'. Default is True.
 
+        **lin_solver** - (string) - Sparse linear solver for the gain matrix equation
+        ("superlu", "umfpack", "gmres" or "bicgstab"). Default is "superlu".
+
+        **profile** - (bool/callable) - Records the wall time of each stage, the number of
+        iterations, the maximum state change per iteration and the number of nonzeros of Ybus and
+        the measurement jacobian in net["_timings"] (see runpp). Default is False.
+
     OUTPUT:
         **successful** (boolean) - Was the state estimation successful?
     """
-    wls = state_estimation(tolerance, maximum_iterations, net, ref_power=ref_power)
+    wls = state_estimation(tolerance, maximum_iterations, net, ref_power=ref_power,
+                           lin_solver=lin_solver, profile=profile)
     v_start = None
     delta_start = None
     if init == 'results':
@@ -165,7 +175,8 @@ class state_estimation(object):
     system according to the users needs while one function is used for the actual estimation
     process.
     """
-    def __init__(self, tolerance=1e-6, maximum_iterations=10, net=None, logger=None, ref_power=1e6):
+    def __init__(self, tolerance=1e-6, maximum_iterations=10, net=None, logger=None, ref_power=1e6,
+                 lin_solver="superlu", profile=False):
         self.logger = logger
         if self.logger is None:
             self.logger = std_logger
@@ -174,6 +185,8 @@ class state_estimation(object):
         self.max_iterations = maximum_iterations
         self.net = net
         self.s_ref = ref_power
+        self.lin_solver = _check_lin_solver(lin_solver)
+        self.profile = profile
         self.s_node_powers = None
         # variables for chi^2 / rn_max tests
         self.hx = None
@@ -229,6 +242,17 @@ class state_estimation(object):
         """
         if self.net is None:
             raise UserWarning("Component was not initialized with a network.")
+        timings = _init_timings(self.net, "estimate", self.profile)
+        try:
+            successful = self._estimate_wls(v_start, delta_start, calculate_voltage_angles,
+                                            timings)
+            if timings is not None:
+                timings["success"] = successful
+            return successful
+        finally:
+            _finish_timings(self.net, timings, self.profile)
+
+    def _estimate_wls(self, v_start, delta_start, calculate_voltage_angles, timings):
         t0 = time()
         # add initial values for V and delta
         # node voltages
@@ -242,13 +266,15 @@ class state_estimation(object):
         _copy_power_flow_results(self.net)
 
         # initialize ppc
-        ppc, ppci = _init_ppc(self.net, v_start, delta_start, calculate_voltage_angles)
+        with _timed(timings, "pd2ppc"):
+            ppc, ppci = _init_ppc(self.net, v_start, delta_start, calculate_voltage_angles)
 
-        # add measurements to ppci structure
-        ppci = _add_measurements_to_ppc(self.net, ppci, self.s_ref)
+        with _timed(timings, "measurements"):
+            # add measurements to ppci structure
+            ppci = _add_measurements_to_ppc(self.net, ppci, self.s_ref)
 
-        # calculate relevant vectors from ppci measurements
-        z, self.pp_meas_indices, r_cov = _build_measurement_vectors(ppci)
+            # calculate relevant vectors from ppci measurements
+            z, self.pp_meas_indices, r_cov = _build_measurement_vectors(ppci)
 
         # number of nodes
         n_active = len(np.where(ppci["bus"][:, 1] != 4)[0])
@@ -269,7 +295,8 @@ class state_estimation(object):
         non_slack_buses = np.arange(len(delta))[~delta_masked.mask]
 
         # matrix calculation object
-        sem = wls_matrix_ops(ppci, slack_buses, non_slack_buses, self.s_ref)
+        with _timed(timings, "makeYbus"):
+            sem = wls_matrix_ops(ppci, slack_buses, non_slack_buses, self.s_ref)
 
         # state vector
         E = np.concatenate((delta_masked.compressed(), v_m))
@@ -279,27 +306,31 @@ class state_estimation(object):
 
         current_error = 100.
         cur_it = 0
+        lin_solver_cache = {}
         G_m, r, H, h_x = None, None, None, None
 
         while current_error > self.tolerance and cur_it < self.max_iterations:
             self.logger.debug(" Starting iteration %d" % (1 + cur_it))
             try:
-                # create h(x) for the current iteration
-                h_x = sem.create_hx(v_m, delta)
+                with _timed(timings, "create_jacobian"):
+                    # create h(x) for the current iteration
+                    h_x = sem.create_hx(v_m, delta)
 
-                # residual r
-                r = csr_matrix(z - h_x).T
+                    # residual r
+                    r = csr_matrix(z - h_x).T
 
-                # jacobian matrix H
-                H = csr_matrix(sem.create_jacobian(v_m, delta))
+                    # jacobian matrix H
+                    H = csr_matrix(sem.create_jacobian(v_m, delta))
 
-                # gain matrix G_m
-                # G_m = H^t * R^-1 * H
-                G_m = H.T * (r_inv * H)
+                    # gain matrix G_m
+                    # G_m = H^t * R^-1 * H
+                    G_m = H.T * (r_inv * H)
 
-                # state vector difference d_E
-                # d_E = G_m^-1 * (H' * R^-1 * r)
-                d_E = spsolve(G_m, H.T * (r_inv * r))
+                    # state vector difference d_E
+                    # d_E = G_m^-1 * (H' * R^-1 * r)
+                    rhs = np.asarray((H.T * (r_inv * r)).todense()).ravel()
+                with _timed(timings, "solve_linear_system"):
+                    d_E = _solve_linear_system(G_m, rhs, lin_solver_cache, self.lin_solver)
                 E += d_E
 
                 # update V/delta
@@ -310,6 +341,8 @@ class state_estimation(object):
                 cur_it += 1
                 current_error = np.max(np.abs(d_E))
                 self.logger.debug("Current error: %.7f" % current_error)
+                if timings is not None:
+                    timings["mismatch"].append(current_error)
 
             except np.linalg.linalg.LinAlgError:
                 self.logger.error("A problem appeared while using the linear algebra methods."
@@ -342,13 +375,18 @@ class state_estimation(object):
         out = np.flatnonzero(branch[:, BR_STATUS] == 0)  # out-of-service branches
         br = np.flatnonzero(branch[:, BR_STATUS]).astype(int)  # in-service branches
         # complex power at "from" bus
-        Sf = v_cpx[np.real(branch[br, F_BUS]).astype(int)] * np.conj(sem.Yf[br, :] * v_cpx) * s_ref
+        Sf = v_cpx[sem.fb[br]] * np.conj(sem.Yf[br, :] * v_cpx) * s_ref
         # complex power injected at "to" bus
-        St = v_cpx[np.real(branch[br, T_BUS]).astype(int)] * np.conj(sem.Yt[br, :] * v_cpx) * s_ref
+        St = v_cpx[sem.tb[br]] * np.conj(sem.Yt[br, :] * v_cpx) * s_ref
         branch[np.ix_(br, [PF, QF, PT, QT])] = np.c_[Sf.real, Sf.imag, St.real, St.imag]
         branch[np.ix_(out, [PF, QF, PT, QT])] = np.zeros((len(out), 4))
         et = time() - t0
         ppci = _store_results_from_pf_in_ppci(ppci, bus, gen, branch, successful, cur_it, et)
+        if timings is not None:
+            timings["iterations"] = cur_it
+            timings["nnz_Ybus"] = np.count_nonzero(sem.Y_bus)
+            timings["nnz_J"] = H.nnz if H is not None else None
+        t_results = default_timer() if timings is not None else None
 
         # convert to pandapower indices
         ppc = _copy_results_ppci_to_ppc(ppci, ppc, mode="se")
@@ -384,6 +422,8 @@ class state_estimation(object):
             if k.startswith("res_") and k.endswith("_est") and \
                     k not in ("res_bus_est", "res_line_est", "res_trafo_est", "res_trafo3w_est"):
                 del self.net[k]
+        if timings is not None:
+            _add_time(timings, "extract_results", default_timer() - t_results)
 
         return successful
 
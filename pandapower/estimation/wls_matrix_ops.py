@@ -8,12 +8,13 @@ import warnings
 import numpy as np
 from pandapower.estimation.idx_bus import *
 from pandapower.estimation.idx_brch import *
-from pandapower.idx_brch import branch_cols
+from pandapower.idx_brch import BR_B, branch_cols
 from pandapower.idx_bus import bus_cols
 try:
     from pandapower.pf.makeYbus import makeYbus
 except ImportError:
     from pandapower.pf.makeYbus_pypower import makeYbus
+from pandapower.pf.ppci_variables import _get_branch_buses
 
 
 class wls_matrix_ops:
@@ -41,8 +42,7 @@ class wls_matrix_ops:
     # Function which builds a node admittance matrix out of the topology data
     # In addition, it provides the series admittances of lines as G_series and B_series
     def create_y(self):
-        self.fb = self.ppc["branch"][:, 0].real.astype(int)
-        self.tb = self.ppc["branch"][:, 1].real.astype(int)
+        self.fb, self.tb = _get_branch_buses(self.ppc["branch"])
 
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
@@ -64,7 +64,7 @@ class wls_matrix_ops:
         self.B_shunt = np.zeros((n, n))
         from_to = np.concatenate((self.fb, self.tb))
         to_from = np.concatenate((self.tb, self.fb))
-        self.B_shunt[from_to, to_from] = np.tile(0.5 * self.ppc["branch"][:, 4].real, 2)
+        self.B_shunt[from_to, to_from] = np.tile(0.5 * self.ppc["branch"][:, BR_B], 2)
 
     # Get Y as tuple (real, imaginary)
     def get_y(self):
@@ -98,27 +98,27 @@ class wls_matrix_ops:
 
         # P line
         not_nan = ~np.isnan(self.ppc["branch"][:, branch_cols + P_FROM])
-        p_first_ix = self.ppc["branch"][not_nan, 0].real.astype(int)
-        p_second_ix = self.ppc["branch"][not_nan, 1].real.astype(int)
+        p_first_ix = self.fb[not_nan]
+        p_second_ix = self.tb[not_nan]
         not_nan = ~np.isnan(self.ppc["branch"][:, branch_cols + P_TO])
-        p_first_ix = np.append(p_first_ix, self.ppc["branch"][not_nan, 1].real.astype(int))
-        p_second_ix = np.append(p_second_ix, self.ppc["branch"][not_nan, 0].real.astype(int))
+        p_first_ix = np.append(p_first_ix, self.tb[not_nan])
+        p_second_ix = np.append(p_second_ix, self.fb[not_nan])
 
         # Q line
         not_nan = ~np.isnan(self.ppc["branch"][:, branch_cols + Q_FROM])
-        q_first_ix = self.ppc["branch"][not_nan, 0].real.astype(int)
-        q_second_ix = self.ppc["branch"][not_nan, 1].real.astype(int)
+        q_first_ix = self.fb[not_nan]
+        q_second_ix = self.tb[not_nan]
         not_nan = ~np.isnan(self.ppc["branch"][:, branch_cols + Q_TO])
-        q_first_ix = np.append(q_first_ix, self.ppc["branch"][not_nan, 1].real.astype(int))
-        q_second_ix = np.append(q_second_ix, self.ppc["branch"][not_nan, 0].real.astype(int))
+        q_first_ix = np.append(q_first_ix, self.tb[not_nan])
+        q_second_ix = np.append(q_second_ix, self.fb[not_nan])
 
         # I line
         not_nan = ~np.isnan(self.ppc["branch"][:, branch_cols + IM_FROM])
-        i_first_ix = self.ppc["branch"][not_nan, 0].real.astype(int)
-        i_second_ix = self.ppc["branch"][not_nan, 1].real.astype(int)
+        i_first_ix = self.fb[not_nan]
+        i_second_ix = self.tb[not_nan]
         not_nan = ~np.isnan(self.ppc["branch"][:, branch_cols + IM_TO])
-        i_first_ix = np.append(i_first_ix, self.ppc["branch"][not_nan, 1].real.astype(int))
-        i_second_ix = np.append(i_second_ix, self.ppc["branch"][not_nan, 0].real.astype(int))
+        i_first_ix = np.append(i_first_ix, self.tb[not_nan])
+        i_second_ix = np.append(i_second_ix, self.fb[not_nan])
 
         v_bus_not_nan = ~np.isnan(self.ppc["bus"][:, bus_cols + VM])
         p_bus_not_nan = ~np.isnan(self.ppc["bus"][:, bus_cols + P])
@@ -235,11 +235,11 @@ class wls_matrix_ops:
         # if P line measurements exist
         # and so on ..
         p_line_not_nan = ~np.isnan(self.ppc["branch"][:, branch_cols + 4])
-        node1 = self.ppc["branch"][p_line_not_nan, 0].real.astype(int)
-        node2 = self.ppc["branch"][p_line_not_nan, 1].real.astype(int)
+        node1 = self.fb[p_line_not_nan]
+        node2 = self.tb[p_line_not_nan]
         p_line_not_nan = ~np.isnan(self.ppc["branch"][:, branch_cols + 6])
-        node1 = np.append(node1, self.ppc["branch"][p_line_not_nan, 1].real.astype(int))
-        node2 = np.append(node2, self.ppc["branch"][p_line_not_nan, 0].real.astype(int))
+        node1 = np.append(node1, self.tb[p_line_not_nan])
+        node2 = np.append(node2, self.fb[p_line_not_nan])
         if len(node1):
             nr = range(0, len(node1))
             h_ = np.zeros((len(node1), columns + len(self.slack_buses)))
@@ -261,11 +261,11 @@ class wls_matrix_ops:
             h_mat = np.vstack((h_mat, h_))
 
         q_line_not_nan = ~np.isnan(self.ppc["branch"][:, branch_cols + 8])
-        node1 = self.ppc["branch"][q_line_not_nan, 0].real.astype(int)
-        node2 = self.ppc["branch"][q_line_not_nan, 1].real.astype(int)
+        node1 = self.fb[q_line_not_nan]
+        node2 = self.tb[q_line_not_nan]
         q_line_not_nan = ~np.isnan(self.ppc["branch"][:, branch_cols + 10])
-        node1 = np.append(node1, self.ppc["branch"][q_line_not_nan, 1].real.astype(int))
-        node2 = np.append(node2, self.ppc["branch"][q_line_not_nan, 0].real.astype(int))
+        node1 = np.append(node1, self.tb[q_line_not_nan])
+        node2 = np.append(node2, self.fb[q_line_not_nan])
         if len(node1):
             nr = range(0, len(node1))
             h_ = np.zeros((len(node1), columns + len(self.slack_buses)))
@@ -287,11 +287,11 @@ class wls_matrix_ops:
             h_mat = np.vstack((h_mat, h_))
 
         i_line_not_nan = ~np.isnan(self.ppc["branch"][:, branch_cols + 0])
-        node1 = self.ppc["branch"][i_line_not_nan, 0].real.astype(int)
-        node2 = self.ppc["branch"][i_line_not_nan, 1].real.astype(int)
+        node1 = self.fb[i_line_not_nan]
+        node2 = self.tb[i_line_not_nan]
         i_line_not_nan = ~np.isnan(self.ppc["branch"][:, branch_cols + 2])
-        node1 = np.append(node1, self.ppc["branch"][i_line_not_nan, 1].real.astype(int))
-        node2 = np.append(node2, self.ppc["branch"][i_line_not_nan, 0].real.astype(int))
+        node1 = np.append(node1, self.tb[i_line_not_nan])
+        node2 = np.append(node2, self.fb[i_line_not_nan])
         if len(node1):
             nr = range(0, len(node1))
             h_ = np.zeros((len(node1), columns + len(self.slack_buses)))
@@ -28,7 +28,8 @@ from pandapower.auxiliary import pandapowerNet
 from pandapower.create import create_empty_network
 from pandapower.toolbox import convert_format
 from pandapower.io_utils import to_dict_of_dfs, dicts_to_pandas, from_dict_of_dfs, \
-    PPJSONEncoder, PPJSONDecoder
+    PPJSONEncoder, PPJSONDecoder, write_binary, read_binary_header, read_binary_table, \
+    is_loaded_table, decode_json_object
 
 
 def to_pickle(net, filename):
@@ -146,6 +147,30 @@ def to_json(net, filename=None):
         text_file.write(json_string)
 
 
+def to_binary(net, filename):
+    """
+    Saves a pandapower Network in a columnar binary format. Each column of the DataFrames is stored
+    as a separate data block (raw arrays for numerical columns, flat point arrays for line
+    coordinates and pickled lists for all other columns), which are described by a JSON header.
+    net elements which name begins with "_" (internal elements) will not be saved.
+
+    In contrast to to_json and to_pickle, the tables are written without conversion to text or
+    dicts, and from_binary can read single tables with memory mapping.
+
+    INPUT:
+        **net** (dict) - The pandapower format network
+
+        **filename** (string) - The absolute or relative path to the output file
+
+    EXAMPLE:
+
+        >>> pp.to_binary(net, "example.ppb")
+
+    """
+    with open(filename, "wb") as f:
+        write_binary(net, f)
+
+
 def to_sql(net, con, include_results=True):
     dodfs = to_dict_of_dfs(net, include_results=include_results)
     for name, data in dodfs.items():
@@ -159,13 +184,22 @@ def to_sqlite(net, filename, include_results=True):
     conn.close()
 
 
-def from_pickle(filename, convert=True):
+def from_pickle(filename, convert=True, tables=None, exclude_tables=None, include_results=True):
     """
-    Load a pandapower format Network from pickle file
+    Load a pandapower format Network from pickle file. The pickle file is always read completely,
+    but the tables that are not selected are not converted to DataFrames.
 
     INPUT:
         **filename** (string or file) - The absolute or relative path to the input file or file-like object
 
+    OPTIONAL:
+        **tables** (list, None) - names of the tables that are loaded (e.g. ["bus", "line"]), all
+        tables if None. The other element tables of the network are empty.
+
+        **exclude_tables** (list, None) - names of the tables that are not loaded
+
+        **include_results** (bool, True) - the result tables (res_*) are loaded
+
     OUTPUT:
         **net** (dict) - The pandapower format network
 
@@ -191,6 +225,19 @@ def from_pickle(filename, convert=True):
             net = read(f)
     net = pandapowerNet(net)
 
+    empty_net = None
+    for key in list(net.keys()):
+        item = net[key]
+        if not isinstance(item, pd.DataFrame) and not (isinstance(item, dict) and "DF" in item):
+            continue
+        if not is_loaded_table(key, tables, exclude_tables, include_results):
+            if empty_net is None:
+                empty_net = create_empty_network()
+            if key in empty_net:
+                net[key] = empty_net[key]
+            else:
+                del net[key]
+
     try:
         epsg = net.gis_epsg_code
     except AttributeError:
@@ -246,13 +293,22 @@ def from_pickle(filename, convert=True):
     return net
 
 
-def from_excel(filename, convert=True):
+def from_excel(filename, convert=True, tables=None, exclude_tables=None, include_results=True):
     """
-    Load a pandapower network from an excel file
+    Load a pandapower network from an excel file. Only the sheets of the selected tables are
+    parsed.
 
     INPUT:
         **filename** (string) - The absolute or relative path to the input file.
 
+    OPTIONAL:
+        **tables** (list, None) - names of the tables that are loaded (e.g. ["bus", "line"]), all
+        tables if None. The other element tables of the network are empty.
+
+        **exclude_tables** (list, None) - names of the tables that are not loaded
+
+        **include_results** (bool, True) - the result tables (res_*) are loaded
+
     OUTPUT:
         **convert** (bool) - use the convert format function to
 
@@ -267,12 +323,15 @@ def from_excel(filename, convert=True):
 
     if not os.path.isfile(filename):
         raise UserWarning("File %s does not exist!" % filename)
+    xls_file = pd.ExcelFile(filename)
+    sheets = [sheet for sheet in xls_file.sheet_names
+              if is_loaded_table(sheet, tables, exclude_tables, include_results)]
     try:
         # pandas < 0.21
-        xls = pd.ExcelFile(filename).parse(sheetname=None)
+        xls = xls_file.parse(sheetname=sheets)
     except TypeError:
         # pandas 0.21
-        xls = pd.ExcelFile(filename).parse(sheet_name=None)
+        xls = xls_file.parse(sheet_name=sheets)
 
     try:
         net = from_dict_of_dfs(xls)
@@ -306,15 +365,24 @@ def _from_excel_old(xls):
     return net
 
 
-def from_json(filename, convert=True):
+def from_json(filename, convert=True, tables=None, exclude_tables=None, include_results=True):
     """
     Load a pandapower network from a JSON file.
     The index of the returned network is not necessarily in the same order as the original network.
     Index columns of all pandas DataFrames are sorted in ascending order.
+    The DataFrames of the tables that are not selected are not decoded.
 
     INPUT:
         **filename** (string or file) - The absolute or relative path to the input file or file-like object
 
+    OPTIONAL:
+        **tables** (list, None) - names of the tables that are loaded (e.g. ["bus", "line"]), all
+        tables if None. The other element tables of the network are empty.
+
+        **exclude_tables** (list, None) - names of the tables that are not loaded
+
+        **include_results** (bool, True) - the result tables (res_*) are loaded
+
     OUTPUT:
         **convert** (bool) - use the convert format function to
 
@@ -326,12 +394,20 @@ def from_json(filename, convert=True):
 
     """
     if hasattr(filename, 'read'):
-        data = json.load(filename, cls=PPJSONDecoder)
+        data = json.load(filename)
     elif not os.path.isfile(filename):
         raise UserWarning("File %s does not exist!!" % filename)
     else:
         with open(filename) as data_file:
-            data = json.load(data_file, cls=PPJSONDecoder)
+            data = json.load(data_file)
+    return _from_json_data(data, convert, tables, exclude_tables, include_results)
+
+
+def _from_json_data(data, convert, tables, exclude_tables, include_results):
+    # the file is parsed without the PPJSONDecoder, so that only the selected tables are decoded
+    data = {key: decode_json_object(value) for key, value in data.items()
+            if not isinstance(value, dict) or
+            is_loaded_table(key, tables, exclude_tables, include_results)}
     try:
         pd_dicts = dicts_to_pandas(data)
         net = from_dict_of_dfs(pd_dicts)
@@ -343,7 +419,8 @@ def from_json(filename, convert=True):
         return from_json_dict(data, convert=convert)
 
 
-def from_json_string(json_string, convert=True):
+def from_json_string(json_string, convert=True, tables=None, exclude_tables=None,
+                     include_results=True):
     """
     Load a pandapower network from a JSON string.
     The index of the returned network is not necessarily in the same order as the original network.
@@ -352,6 +429,14 @@ def from_json_string(json_string, convert=True):
     INPUT:
         **json_string** (string) - The json string representation of the network
 
+    OPTIONAL:
+        **tables** (list, None) - names of the tables that are loaded (e.g. ["bus", "line"]), all
+        tables if None. The other element tables of the network are empty.
+
+        **exclude_tables** (list, None) - names of the tables that are not loaded
+
+        **include_results** (bool, True) - the result tables (res_*) are loaded
+
     OUTPUT:
         **convert** (bool) - use the convert format function to
 
@@ -362,19 +447,12 @@ def from_json_string(json_string, convert=True):
         >>> net = pp.from_json_string(json_str)
 
     """
-    data = json.loads(json_string, cls=PPJSONDecoder)
-    try:
-        pd_dicts = dicts_to_pandas(data)
-        net = from_dict_of_dfs(pd_dicts)
-        if convert:
-            convert_format(net)
-        return net
-    except UserWarning:
-        # Can be deleted in the future, maybe now
-        return from_json_dict(data, convert=convert)
+    data = json.loads(json_string)
+    return _from_json_data(data, convert, tables, exclude_tables, include_results)
 
 
-def from_json_dict(json_dict, convert=True):
+def from_json_dict(json_dict, convert=True, tables=None, exclude_tables=None,
+                   include_results=True):
     """
     Load a pandapower network from a JSON string.
     The index of the returned network is not necessarily in the same order as the original network.
@@ -383,6 +461,14 @@ def from_json_dict(json_dict, convert=True):
     INPUT:
         **json_dict** (json) - The json object representation of the network
 
+    OPTIONAL:
+        **tables** (list, None) - names of the tables that are loaded (e.g. ["bus", "line"]), all
+        tables if None. The other element tables of the network are empty.
+
+        **exclude_tables** (list, None) - names of the tables that are not loaded
+
+        **include_results** (bool, True) - the result tables (res_*) are loaded
+
     OUTPUT:
         **convert** (bool) - use the convert format function to
 
@@ -400,6 +486,9 @@ def from_json_dict(json_dict, convert=True):
     for key in sorted(json_dict.keys()):
         if key == 'dtypes':
             continue
+        if isinstance(json_dict[key], (dict, pd.DataFrame)) and \
+                not is_loaded_table(key, tables, exclude_tables, include_results):
+            continue
         if key in net and isinstance(net[key], pd.DataFrame) and isinstance(json_dict[key], dict):
             net[key] = pd.DataFrame.from_dict(json_dict[key], orient="columns")
             net[key].set_index(net[key].index.astype(numpy.int64), inplace=True)
@@ -411,11 +500,59 @@ def from_json_dict(json_dict, convert=True):
     return net
 
 
-def from_sql(con):
+def from_binary(filename, tables=None, mmap=True, convert=True, exclude_tables=None,
+                include_results=True):
+    """
+    Load a pandapower network from a binary file that was written with to_binary. Only the header
+    and the data blocks of the loaded tables are read from the file.
+
+    INPUT:
+        **filename** (string) - The absolute or relative path to the input file
+
+    OPTIONAL:
+        **tables** (list, None) - names of the tables that are loaded (e.g. ["bus", "line"]), all
+        tables if None. The other element tables of the network are empty.
+
+        **mmap** (bool, True) - the numerical columns are read with memory mapping instead of
+        reading the data blocks into memory first
+
+        **convert** (bool, True) - use the convert format function
+
+        **exclude_tables** (list, None) - names of the tables that are not loaded
+
+        **include_results** (bool, True) - the result tables (res_*) are loaded
+
+    OUTPUT:
+        **net** (dict) - The pandapower format network
+
+    EXAMPLE:
+
+        >>> net = pp.from_binary("example.ppb")
+        >>> net = pp.from_binary("example.ppb", tables=["bus", "line", "load"])
+
+    """
+    if not os.path.isfile(filename):
+        raise UserWarning("File %s does not exist!!" % filename)
+    net = create_empty_network()
+    with open(filename, "rb") as f:
+        header, data_start = read_binary_header(f)
+        net.update(json.loads(header["items"], cls=PPJSONDecoder))
+        for name, table in header["tables"].items():
+            if not is_loaded_table(name, tables, exclude_tables, include_results):
+                continue
+            net[name] = read_binary_table(f, filename, data_start, table, mmap=mmap)
+    if convert:
+        convert_format(net)
+    return net
+
+
+def from_sql(con, tables=None, exclude_tables=None, include_results=True):
     cursor = con.cursor()
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
     dodfs = dict()
     for t, in cursor.fetchall():
+        if not is_loaded_table(t, tables, exclude_tables, include_results):
+            continue
         table = pd.read_sql_query("SELECT * FROM %s" % t, con, index_col="index")
         table.index.name = None
         dodfs[t] = table
@@ -423,9 +560,9 @@ def from_sql(con):
     return net
 
 
-def from_sqlite(filename, netname=""):
+def from_sqlite(filename, netname="", tables=None, exclude_tables=None, include_results=True):
     import sqlite3
     con = sqlite3.connect(filename)
-    net = from_sql(con)
+    net = from_sql(con, tables, exclude_tables, include_results)
     con.close()
     return net
@@ -55,6 +55,11 @@ they are typically not present in the input matrix
     19. C{MU_ANGMIN}   Kuhn-Tucker multiplier lower angle difference limit
     20. C{MU_ANGMAX}   Kuhn-Tucker multiplier upper angle difference limit
 
+columns 21-23 are pandapower specific
+    21. C{BR_R_ASYM}   resistance difference of the "to" and "from" side (p.u.)
+    22. C{BR_X_ASYM}   reactance difference of the "to" and "from" side (p.u.)
+    23. C{BR_G}        total line charging conductance (p.u.)
+
 @author: Ray Zimmerman (PSERC Cornell)
 @author: Richard Lincoln
 """
@@ -89,6 +94,7 @@ MU_ANGMAX   = 20   # Kuhn-Tucker multiplier upper angle difference limit
 
 BR_R_ASYM = 21
 BR_X_ASYM = 22
+BR_G = 23  # total line charging conductance (p.u.), e.g. line conductance and trafo iron losses
 
 
-branch_cols = 23
+branch_cols = 24
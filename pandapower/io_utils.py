@@ -12,6 +12,9 @@ import numbers
 import json
 import copy
 import importlib
+import pickle
+import sys
+from collections import OrderedDict
 
 try:
     from functools import singledispatch
@@ -135,6 +138,33 @@ def restore_all_dtypes(net, dtypes):
         except KeyError:
             pass
 
+
+def is_loaded_table(name, tables=None, exclude_tables=None, include_results=True):
+    """
+    Checks if the table name is loaded with the table selection of the from_* functions. The
+    parameters, dtypes, standard types and power flow options are always loaded.
+    """
+    if name in ("parameters", "dtypes", "std_types", "user_pf_options") or \
+            name.endswith("_std_types"):
+        return True
+    if tables is not None and name not in tables:
+        return False
+    if exclude_tables is not None and name in exclude_tables:
+        return False
+    return include_results or not name.startswith("res_")
+
+
+def decode_json_object(obj):
+    """
+    Applies the PPJSONDecoder hook to an object that was loaded with the standard JSON decoder,
+    so that the decoding of DataFrames can be restricted to the loaded tables.
+    """
+    if isinstance(obj, dict):
+        return pp_hook({k: decode_json_object(v) for k, v in obj.items()})
+    elif isinstance(obj, list):
+        return [decode_json_object(v) for v in obj]
+    return obj
+
 from json.encoder import _make_iterencode
 from json.encoder import *
 
@@ -351,4 +381,162 @@ def json_set(obj):
 def json_frozenset(obj):
     logger.debug("frozenset")
     d = with_signature(obj, list(obj), obj_module='builtins', obj_class='frozenset')
-    return d
\ No newline at end of file
+    return d
+
+# --- columnar binary format (see pandapower.file_io.to_binary)
+
+BINARY_MAGIC = b"PPBINARY"
+BINARY_FORMAT_VERSION = 1
+# data blocks start at multiples of BINARY_ALIGNMENT bytes, so that they can be memory-mapped
+BINARY_ALIGNMENT = 64
+
+
+def _aligned(nbytes):
+    return -(-nbytes // BINARY_ALIGNMENT) * BINARY_ALIGNMENT
+
+
+class BinaryBlockWriter(object):
+    """
+    Collects the data blocks of a binary network file and their descriptions for the header.
+    Numerical columns are stored as raw arrays, line coordinates as flat array of points with
+    offsets per line and all other columns as pickled lists.
+    """
+
+    def __init__(self):
+        self.blocks = []
+        self.size = 0
+
+    def _add(self, data, nbytes, desc):
+        desc["offset"] = self.size
+        desc["nbytes"] = nbytes
+        self.blocks.append((self.size, data))
+        self.size = _aligned(self.size + nbytes)
+        return desc
+
+    def add_array(self, values):
+        values = numpy.ascontiguousarray(values)
+        return self._add(values, values.nbytes, {"kind": "array", "dtype": values.dtype.str,
+                                                 "shape": list(values.shape)})
+
+    def add_object(self, values):
+        data = pickle.dumps(list(values), protocol=2)
+        return self._add(data, len(data), {"kind": "pickle"})
+
+    def add_coords(self, values):
+        lengths = numpy.array([len(c) for c in values], dtype=numpy.int64)
+        offsets = numpy.r_[0, numpy.cumsum(lengths)]
+        points = numpy.array([xy for coords in values for xy in coords],
+                             dtype=numpy.float64).reshape(-1, 2)
+        return {"kind": "coords", "offsets": self.add_array(offsets),
+                "points": self.add_array(points)}
+
+    def add_column(self, values, coords=False):
+        if values.dtype.kind in "biufcmM":
+            return self.add_array(values)
+        if coords:
+            try:
+                return self.add_coords(values)
+            except (TypeError, ValueError):
+                pass
+        return self.add_object(values)
+
+    def write(self, f, data_start):
+        for offset, data in self.blocks:
+            f.write(b"\0" * (data_start + offset - f.tell()))
+            if isinstance(data, numpy.ndarray):
+                f.write(data.tobytes())
+            else:
+                f.write(data)
+
+
+def write_binary(net, f):
+    """
+    Writes the net to the binary file object f: the magic bytes, the length of the header, the
+    JSON header with the description of all tables and all other items of the net and the
+    aligned data blocks of the table columns.
+    """
+    writer = BinaryBlockWriter()
+    tables = OrderedDict()
+    items = dict()
+    for key in sorted(net.keys()):
+        if key.startswith("_"):
+            continue
+        value = net[key]
+        if isinstance(value, pd.DataFrame):
+            tables[key] = {
+                "length": len(value),
+                "index": writer.add_column(value.index.values),
+                "columns": [dict(writer.add_column(value[col].values, coords=col == "coords"),
+                                 name=col, dtype_name=str(value[col].dtype))
+                            for col in value.columns]}
+        else:
+            items[key] = value
+    header = json.dumps({"format_version": BINARY_FORMAT_VERSION, "tables": tables,
+                         "items": json.dumps(items, cls=PPJSONEncoder)}).encode("utf-8")
+    f.write(BINARY_MAGIC)
+    f.write(numpy.array(len(header), dtype="<u8").tobytes())
+    f.write(header)
+    writer.write(f, _aligned(len(BINARY_MAGIC) + 8 + len(header)))
+
+
+def read_binary_header(f):
+    """
+    Reads the header of a binary network file and returns it together with the position of the
+    first data block.
+    """
+    if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+        raise UserWarning("The file is not a pandapower binary network file")
+    length = int(numpy.frombuffer(f.read(8), dtype="<u8")[0])
+    header = json.loads(f.read(length).decode("utf-8"))
+    if header["format_version"] > BINARY_FORMAT_VERSION:
+        raise UserWarning("The binary network file was written with a newer pandapower version")
+    return header, _aligned(len(BINARY_MAGIC) + 8 + length)
+
+
+def _read_binary_array(f, filename, data_start, desc, mmap):
+    shape = tuple(desc["shape"])
+    if mmap and desc["nbytes"] > 0:
+        return numpy.memmap(filename, dtype=desc["dtype"], mode="r",
+                            offset=data_start + desc["offset"], shape=shape)
+    f.seek(data_start + desc["offset"])
+    return numpy.frombuffer(f.read(desc["nbytes"]), dtype=desc["dtype"]).reshape(shape)
+
+
+def _read_binary_column(f, filename, data_start, desc, mmap):
+    if desc["kind"] == "array":
+        return _read_binary_array(f, filename, data_start, desc, mmap)
+    elif desc["kind"] == "coords":
+        offsets = _read_binary_array(f, filename, data_start, desc["offsets"], mmap)
+        points = _read_binary_array(f, filename, data_start, desc["points"], mmap)
+        return [points[offsets[i]:offsets[i + 1]].tolist() for i in range(len(offsets) - 1)]
+    f.seek(data_start + desc["offset"])
+    data = f.read(desc["nbytes"])
+    if sys.version_info >= (3, 0):
+        return pickle.loads(data, encoding="latin1")
+    return pickle.loads(data)
+
+
+def read_binary_table(f, filename, data_start, table, mmap=True):
+    """
+    Reads a table that is described by table (an entry of the header tables) from a binary
+    network file. Only the data blocks of this table are read. With mmap, numerical columns are
+    memory-mapped and only copied into the DataFrame.
+    """
+    index = _read_binary_column(f, filename, data_start, table["index"], mmap)
+    data = OrderedDict()
+    for desc in table["columns"]:
+        values = _read_binary_column(f, filename, data_start, desc, mmap)
+        if isinstance(values, numpy.ndarray):
+            # copy the memory-mapped data, the DataFrame must not depend on the file
+            data[desc["name"]] = numpy.array(values)
+        else:
+            data[desc["name"]] = pd.Series(values, dtype=object).values
+    df = pd.DataFrame(data, index=numpy.array(index), columns=[d["name"] for d in table["columns"]])
+    for desc in table["columns"]:
+        if str(df[desc["name"]].dtype) != desc["dtype_name"]:
+            try:
+                df[desc["name"]] = df[desc["name"]].astype(desc["dtype_name"])
+            except (TypeError, ValueError):
+                logger.debug("dtype %s of %s could not be restored" % (desc["dtype_name"],
+                                                                       desc["name"]))
+    return df
@@ -7,7 +7,7 @@
 # Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
 # and Energy System Technology (IEE), Kassel. All rights reserved.
 
-from numpy import zeros, array, concatenate, power, ndarray
+from numpy import zeros, ones, array, concatenate, power, ndarray
 import pandas as pd
 from pandapower.idx_cost import MODEL, NCOST, COST
 
@@ -52,10 +52,10 @@ def _make_objective(ppci, net):
         net._pd2ppc_lookups else None
     stor_idx = net._pd2ppc_lookups["storage_controllable"] if "storage_controllable" in \
         net._pd2ppc_lookups else None
-    dc_gens = net.gen.index[(len(net.gen) - len(net.dcline) * 2):]
-    from_gens = net.gen.loc[dc_gens[1::2]]
-    if gen_idx is not None:
-        dcline_idx = gen_idx[from_gens.index]
+    # the costs of dc lines are assigned to the generator at the from bus
+    if len(net.dcline):
+        dcline_idx = -ones(max(net.dcline.index) + 1, dtype=int)
+        dcline_idx[net.dcline.index] = net._pd2ppc_lookups["dcline"][:, 0]
     else:
         dcline_idx = None
 
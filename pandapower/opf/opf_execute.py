@@ -19,7 +19,7 @@ from pandapower.idx_brch import MU_ANGMIN, MU_ANGMAX
 from pandapower.idx_bus import VM
 from pandapower.idx_gen import GEN_BUS, VG
 from pypower.ipoptopf_solver import ipoptopf_solver
-from pypower.makeYbus import makeYbus
+from pandapower.pf.makeYbus_pypower import makeYbus
 from pypower.opf_consfcn import opf_consfcn
 from pypower.opf_costfcn import opf_costfcn
 from pypower.ppver import ppver
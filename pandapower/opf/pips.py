@@ -16,7 +16,8 @@ from numpy import array, Inf, any, isnan, ones, r_, finfo, \
 from numpy.linalg import norm
 from pypower.pipsver import pipsver
 from scipy.sparse import vstack, hstack, eye, csr_matrix as sparse
-from scipy.sparse.linalg import spsolve
+
+from pandapower.pf.linear_solver import _solve_linear_system
 
 
 EPS = finfo(float).eps
@@ -143,6 +144,8 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
                     value is also passed as the 3rd argument to the Hessian
                     evaluation function so that it can appropriately scale the
                     objective function term in the Hessian of the Lagrangian.
+                  - C{lin_solver} ("superlu") - sparse linear solver for the
+                    Newton steps, see L{pandapower.pf.linear_solver}
     @type opt: dict
 
     @rtype: dict
@@ -221,9 +224,13 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
         opt["cost_mult"] = 1
     if "verbose" not in opt:
         opt["verbose"] = 0
+    if "lin_solver" not in opt:
+        opt["lin_solver"] = "superlu"
 
     # initialize history
     hist = []
+    # reusable parts of the factorization of the KKT matrix
+    lin_solver_cache = {}
 
     # constants
     xi = 0.99995
@@ -391,7 +398,7 @@ def pips(f_fcn, x0=None, A=None, l=None, u=None, xmin=None, xmax=None,
         ])
         bb = r_[-N, -g]
 
-        dxdlam = spsolve(Ab.tocsr(), bb)
+        dxdlam = _solve_linear_system(Ab.tocsr(), bb, lin_solver_cache, opt["lin_solver"])
 
         if any(isnan(dxdlam)):
             if opt["verbose"]:
@@ -16,7 +16,7 @@ from pandapower.idx_brch import F_BUS, T_BUS, RATE_A, PF, QF, PT, QT, MU_SF, MU_
 from pandapower.idx_bus import BUS_TYPE, REF, VM, VA, MU_VMAX, MU_VMIN, LAM_P, LAM_Q
 from pandapower.idx_cost import MODEL, PW_LINEAR, NCOST
 from pandapower.idx_gen import GEN_BUS, PG, QG, VG, MU_PMAX, MU_PMIN, MU_QMAX, MU_QMIN
-from pypower.makeYbus import makeYbus
+from pandapower.pf.makeYbus_pypower import makeYbus
 from pypower.opf_consfcn import opf_consfcn
 from pypower.opf_costfcn import opf_costfcn
 from pypower.util import sub2ind
@@ -91,6 +91,7 @@ def pipsopf_solver(om, ppopt, out_opt=None):
              'max_red': max_red,
              'step_control': step_control,
              'cost_mult': 1e-4,
+             'lin_solver': ppopt['LIN_SOLVER'],
              'verbose': verbose  }
 
     ## unpack data
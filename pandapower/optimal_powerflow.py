@@ -6,18 +6,19 @@
 
 import warnings
 
+import numpy as np
 from pypower.add_userfcn import add_userfcn
 from pypower.ppoption import ppoption
 from scipy.sparse import csr_matrix as sparse
 
-from pandapower.auxiliary import ppException, _clean_up
+from pandapower.auxiliary import ppException
 from pandapower.idx_bus import VM
 from pandapower.opf.opf import opf
 from pandapower.pd2ppc import _pd2ppc
 from pandapower.pf.run_newton_raphson_pf import _run_newton_raphson_pf
-from pandapower.powerflow import _add_auxiliary_elements
 from pandapower.results import _copy_results_ppci_to_ppc, reset_results, \
     _extract_results_opf
+from pandapower.timing import _timed
 
 
 class OPFNotConverged(ppException):
@@ -30,14 +31,16 @@ class OPFNotConverged(ppException):
 def _optimal_powerflow(net, verbose, suppress_warnings, **kwargs):
     ac = net["_options"]["ac"]
     init = net["_options"]["init"]
+    timings = net["_options"].get("timings")
 
-    ppopt = ppoption(VERBOSE=verbose, OPF_FLOW_LIM=2, PF_DC=not ac, INIT=init, **kwargs)
+    ppopt = ppoption(VERBOSE=verbose, OPF_FLOW_LIM=2, PF_DC=not ac, INIT=init,
+                     LIN_SOLVER=net["_options"]["lin_solver"], **kwargs)
     net["OPF_converged"] = False
     net["converged"] = False
-    _add_auxiliary_elements(net)
     reset_results(net)
 
-    ppc, ppci = _pd2ppc(net)
+    with _timed(timings, "pd2ppc"):
+        ppc, ppci = _pd2ppc(net)
     if not ac:
         ppci["bus"][:, VM] = 1.0
     net["_ppc_opf"] = ppc
@@ -45,14 +48,18 @@ def _optimal_powerflow(net, verbose, suppress_warnings, **kwargs):
         ppci = add_userfcn(ppci, 'formulation', _add_dcline_constraints, args=net)
 
     if init == "pf":
-        ppci = _run_pf_before_opf(net, ppci)
-    if suppress_warnings:
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
+        with _timed(timings, "init_pf"):
+            ppci = _run_pf_before_opf(net, ppci)
+    with _timed(timings, "opf_solver"):
+        if suppress_warnings:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                result = opf(ppci, ppopt)
+        else:
             result = opf(ppci, ppopt)
-    else:
-        result = opf(ppci, ppopt)
     net["_ppc_opf"] = result
+    if timings is not None:
+        _add_opf_counters(timings, result)
 
     if not result["success"]:
         raise OPFNotConverged("Optimal Power Flow did not converge!")
@@ -63,27 +70,39 @@ def _optimal_powerflow(net, verbose, suppress_warnings, **kwargs):
 
     net["_ppc_opf"] = result
     net["OPF_converged"] = True
-    _extract_results_opf(net, result)
-    _clean_up(net)
+    with _timed(timings, "extract_results"):
+        _extract_results_opf(net, result)
+
+
+def _add_opf_counters(timings, result):
+    """
+    Adds the number of iterations and the feasibility condition per iteration of the interior
+    point solver to the timings.
+    """
+    output = result.get("raw", {}).get("output", {})
+    if not isinstance(output, dict):
+        return
+    timings["iterations"] = output.get("iterations")
+    timings["mismatch"] = [h["feascond"] for h in output.get("hist", []) if "feascond" in h]
 
 
 def _add_dcline_constraints(om, net):
     # from numpy import hstack, diag, eye, zeros
     ppc = om.get_ppc()
-    ndc = len(net.dcline)  ## number of in-service DC lines
+    # ppc indices of the generators at the from and to bus of the in-service DC lines
+    dcline_lookup = net._pd2ppc_lookups["dcline"]
+    dcline_is = (dcline_lookup >= 0).all(axis=1)
+    gens_from, gens_to = dcline_lookup[dcline_is].T
+    ndc = len(gens_from)  ## number of in-service DC lines
     ng = ppc['gen'].shape[0]  ## number of total gens
-    Adc = sparse((ndc, ng))
-    gen_lookup = net._pd2ppc_lookups["gen"]
-
-    dcline_gens_from = net.gen.index[-2 * ndc::2]
-    dcline_gens_to = net.gen.index[-2 * ndc + 1::2]
-    for i, (f, t, loss) in enumerate(zip(dcline_gens_from, dcline_gens_to,
-                                         net.dcline.loss_percent.values)):
-        Adc[i, gen_lookup[f]] = 1. + loss * 1e-2
-        Adc[i, gen_lookup[t]] = 1.
+    rows = np.arange(ndc)
+    loss = net.dcline.loss_percent.values[dcline_is]
+    Adc = sparse((np.r_[np.ones(ndc), 1. + loss * 1e-2], (np.r_[rows, rows],
+                                                          np.r_[gens_from, gens_to])),
+                 shape=(ndc, ng))
 
     ## constraints
-    nL0 = -net.dcline.loss_kw.values * 1e-3  # absolute losses
+    nL0 = -net.dcline.loss_kw.values[dcline_is] * 1e-3  # absolute losses
     #    L1  = -net.dcline.loss_percent.values * 1e-2 #relative losses
     #    Adc = sparse(hstack([zeros((ndc, ng)), diag(1-L1), eye(ndc)]))
 
@@ -23,7 +23,7 @@ import pandapower.auxiliary as aux
 from pandapower.build_branch import _build_branch_ppc, _switch_branches, _branches_with_oos_buses, \
     _update_trafo_trafo3w_ppc
 from pandapower.build_bus import _build_bus_ppc, _calc_pq_elements_and_add_on_ppc, \
-    _calc_shunts_and_add_on_ppc, _add_gen_impedances_ppc, _add_motor_impedances_ppc
+    _update_pq_elements_on_ppc, _calc_shunts_and_add_on_ppc, _add_gen_impedances_ppc, _add_motor_impedances_ppc
 from pandapower.build_gen import _build_gen_ppc, _update_gen_ppc, _check_voltage_setpoints_at_same_bus, \
                                  _check_voltage_angles_at_same_bus
 from pandapower.opf.make_objective import _make_objective
@@ -51,7 +51,7 @@ def _pd2ppc(net):
                         "baseMVA": 1., *float*
                         "version": 2,  *int*
                         "bus": np.array([], dtype=float),
-                        "branch": np.array([], dtype=np.complex128),
+                        "branch": np.array([], dtype=np.float64),
                         "gen": np.array([], dtype=float),
                         "gencost" =  np.array([], dtype=float), only for OPF
                         "internal": {
@@ -63,8 +63,12 @@ def _pd2ppc(net):
                               }
         **ppci** - The "internal" pypower format network for PF calculations
     """
+    # the structures which only depend on the topology are reused from the last conversion if
+    # the switch states, in service flags and element buses did not change
+    topology = aux._get_topology_cache(net)
+
     # select elements in service (time consuming, so we do it once)
-    net["_is_elements"] = aux._select_is_elements_numba(net)
+    net["_is_elements"] = _select_is_elements(net, topology, "is_elements")
 
     # get options
     mode = net["_options"]["mode"]
@@ -80,7 +84,7 @@ def _pd2ppc(net):
     # init empty ppci
     ppci = copy.deepcopy(ppc)
     # generate ppc['bus'] and the bus lookup
-    _build_bus_ppc(net, ppc)
+    _build_bus_ppc(net, ppc, topology)
     # generate ppc['gen'] and fills ppc['bus'] with generator values (PV, REF nodes)
     _build_gen_ppc(net, ppc)
     # generate ppc['branch'] and directly generates branch values
@@ -95,16 +99,22 @@ def _pd2ppc(net):
         _calc_shunts_and_add_on_ppc(net, ppc)
 
     # adds auxilary buses for open switches at branches
-    _switch_branches(net, ppc)
+    _switch_branches(net, ppc, topology)
 
     # add auxilary buses for out of service buses at in service lines.
     # Also sets lines out of service if they are connected to two out of service buses
-    _branches_with_oos_buses(net, ppc)
+    _branches_with_oos_buses(net, ppc, topology)
 
     if check_connectivity:
         # sets islands (multiple isolated nodes) out of service
-        isolated_nodes, _, _ = aux._check_connectivity(ppc)
-        net["_is_elements"] = aux._select_is_elements_numba(net, isolated_nodes)
+        if "isolated_nodes" in topology:
+            isolated_nodes = topology["isolated_nodes"]
+            ppc["bus"][isolated_nodes, BUS_TYPE] = NONE
+        else:
+            isolated_nodes, _, _ = aux._check_connectivity(ppc)
+            topology["isolated_nodes"] = isolated_nodes
+        net["_is_elements"] = _select_is_elements(net, topology, "is_elements_connected",
+                                                  isolated_nodes)
 
     # sets buses out of service, which aren't connected to branches / REF buses
     aux._set_isolated_buses_out_of_service(net, ppc)
@@ -126,12 +136,25 @@ def _pd2ppc(net):
     return ppc, ppci
 
 
+def _select_is_elements(net, topology, key, isolated_nodes=None):
+    """
+    Returns the in service elements from the topology cache. They are selected and added to the
+    cache if they are not cached yet. The controllable elements of the OPF are not cached.
+    """
+    if key not in topology:
+        is_elements = aux._select_is_elements_numba(net, isolated_nodes)
+        topology[key] = {k: v for k, v in is_elements.items() if not k.endswith("_controllable")}
+    is_elements = dict(topology[key])
+    aux._add_controllable_is_elements(net, is_elements)
+    return is_elements
+
+
 def _init_ppc(net):
     # init empty ppc
     ppc = {"baseMVA": net.sn_kva * 1e-3
         , "version": 2
         , "bus": np.array([], dtype=float)
-        , "branch": np.array([], dtype=np.complex128)
+        , "branch": np.array([], dtype=np.float64)
         , "gen": np.array([], dtype=float)
         , "internal": {
             "Ybus": np.array([], dtype=np.complex128)
@@ -219,6 +242,10 @@ def _ppc2ppci(ppc, ppci, net):
         _build_gen_lookups(net, "load_controllable", sgen_end, load_end, new_gen_positions)
     if storage_end > load_end:
         _build_gen_lookups(net, "storage_controllable", load_end, storage_end, new_gen_positions)
+    # the dc line generators are looked up by their ppc index before sorting
+    dcline_lookup = net["_pd2ppc_lookups"]["dcline"]
+    dcline_in_ppc = dcline_lookup >= 0
+    dcline_lookup[dcline_in_ppc] = new_gen_positions[dcline_lookup[dcline_in_ppc]]
 
     # determine which buses, branches, gens are connected and
     # in-service
@@ -282,6 +309,11 @@ def _update_ppc(net):
     """
     Updates P, Q values of the ppc with changed values from net
 
+    The ppc of the last power flow is updated in place and only the P / Q values of buses with
+    changed elements are rewritten. The ppci is not deep copied from the ppc, but assembled from
+    the in service rows of bus, branch and gen. It shares the "internal" dict with the ppc, so
+    Ybus and the cached factorization data are reused without copying.
+
     @param _is_elements:
     @return:
     """
@@ -291,9 +323,9 @@ def _update_ppc(net):
     recycle = net["_options"]["recycle"]
     # get the old ppc and lookup
     ppc = net["_ppc"]
-    ppci = copy.deepcopy(ppc)
-    # adds P and Q for loads / sgens in ppc['bus'] (PQ nodes)
-    _calc_pq_elements_and_add_on_ppc(net, ppc)
+    ppci = {key: val for key, val in ppc.items() if key not in ["bus", "branch", "gen"]}
+    # adds P and Q for loads / sgens in ppc['bus'] (PQ nodes) of changed elements
+    _update_pq_elements_on_ppc(net, ppc)
     # adds P and Q for shunts, wards and xwards (to PQ nodes)
     _calc_shunts_and_add_on_ppc(net, ppc)
     # updates values for gen
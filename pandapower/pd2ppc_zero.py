@@ -11,7 +11,8 @@ from pandapower.pd2ppc import _init_ppc
 from pandapower.build_bus import _build_bus_ppc
 from pandapower.build_gen import _build_gen_ppc
 from pandapower.pd2ppc import _ppc2ppci
-from pandapower.idx_brch import BR_B, BR_R, BR_X, F_BUS, T_BUS, branch_cols, BR_STATUS, SHIFT, TAP
+from pandapower.idx_brch import BR_B, BR_G, BR_R, BR_X, F_BUS, T_BUS, branch_cols, BR_STATUS, SHIFT, \
+    TAP
 from pandapower.idx_bus import BASE_KV, BS, GS
 from pandapower.build_branch import _calc_tap_from_dataframe, _transformer_correction_factor, _calc_nominal_ratio_from_dataframe
 from pandapower.build_branch import _switch_branches, _branches_with_oos_buses, _initialize_branch_lookup
@@ -51,7 +52,7 @@ def _pd2ppc_zero(net):
 def _build_branch_ppc_zero(net, ppc):
     """
     Takes the empty ppc network and fills it with the zero imepdance branch values. The branch
-    datatype will be np.complex 128 afterwards.
+    datatype will be np.float64 afterwards.
 
     .. note:: The order of branches in the ppc is:
             1. Lines
@@ -66,7 +67,7 @@ def _build_branch_ppc_zero(net, ppc):
     length = _initialize_branch_lookup(net)
     lookup = net._pd2ppc_lookups["branch"]
     mode = net._options["mode"]
-    ppc["branch"] = np.zeros(shape=(length, branch_cols), dtype=np.complex128)
+    ppc["branch"] = np.zeros(shape=(length, branch_cols), dtype=np.float64)
     if mode == "sc":
         from pandapower.shortcircuit.idx_brch import branch_cols_sc
         branch_sc = np.empty(shape=(length, branch_cols_sc), dtype=float)
@@ -176,7 +177,8 @@ def _add_trafo_sc_impedance_zero(net, ppc, trafo_df=None):
             ppc["branch"][ppc_idx, BR_R] = zc.real
             ppc["branch"][ppc_idx, BR_X] = zc.imag
             y = 2 / za
-            ppc["branch"][ppc_idx, BR_B] = y.imag - y.real*1j
+            ppc["branch"][ppc_idx, BR_B] = y.imag
+            ppc["branch"][ppc_idx, BR_G] = y.real
             # add a shunt element parallel to zb if the leakage impedance distribution is unequal
             #TODO: this only necessary if si0_hv_partial!=0.5 --> test
             zs = (za * zb)/(za - zb)
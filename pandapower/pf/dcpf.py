@@ -12,9 +12,10 @@
 """
 
 from numpy import copy, r_, transpose, real, array
-from scipy.sparse.linalg import spsolve
 
-def dcpf(B, Pbus, Va0, ref, pv, pq):
+from pandapower.pf.linear_solver import _solve_linear_system
+
+def dcpf(B, Pbus, Va0, ref, pv, pq, lin_solver="superlu", cache=None):
     """Solves a DC power flow.
 
     Solves for the bus voltage angles at all but the reference bus, given the
@@ -23,6 +24,9 @@ def dcpf(B, Pbus, Va0, ref, pv, pq):
     the lists of bus indices for the swing bus, PV buses, and PQ buses,
     respectively. Returns a vector of bus voltage angles in radians.
 
+    The linear system is solved with lin_solver (see pandapower.pf.linear_solver). Reusable parts
+    of the factorization are stored in the dict cache.
+
     @see: L{rundcpf}, L{runpf}
 
     @author: Carlos E. Murillo-Sanchez (PSERC Cornell & Universidad
@@ -41,6 +45,8 @@ def dcpf(B, Pbus, Va0, ref, pv, pq):
         pvpq = array(pvpq).flatten()
     pvpq_matrix = B[pvpq.T,:].tocsc()[:,pvpq]
     ref_matrix = transpose(Pbus[pvpq] - B[pvpq.T,:].tocsc()[:,ref] * Va0[ref])
-    Va[pvpq] = real(spsolve(pvpq_matrix, ref_matrix))
+    if cache is None:
+        cache = {}
+    Va[pvpq] = real(_solve_linear_system(pvpq_matrix, ref_matrix, cache, lin_solver))
 
     return Va
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+from numba import jit
+
+
+@jit(nopython=True, cache=True)
+def _mis_of_row(Yx, Yp, Yj, V, Sbus, r):  # pragma: no cover
+    # Ibus[r] = (Ybus * V)[r]
+    I = 0j
+    for k in range(Yp[r], Yp[r + 1]):
+        I += Yx[k] * V[Yj[k]]
+    return V[r] * I.conjugate() - Sbus[r]
+
+
+@jit(nopython=True, cache=True)
+def _update_norm(norm, x):  # pragma: no cover
+    # NaN is propagated, so that a diverged power flow is not considered as converged
+    a = abs(x)
+    if a > norm or a != a:
+        return a
+    return norm
+
+
+@jit(nopython=True, cache=True)
+def evaluate_Fx_numba(Yx, Yp, Yj, V, Sbus, pv, pq, F):  # pragma: no cover
+    """Evaluates the mismatch vector F of the Newton-Raphson power flow and its infinity norm.
+
+    Only the rows of the PV and PQ buses of Ybus are walked through once, no temporary arrays
+    are allocated.
+
+    Input: Ybus in CSR sparse form (Yx = data, Yp = indptr, Yj = indices), V, Sbus, pv, pq and
+    the preallocated vector F with len(pv) + 2 * len(pq) entries
+
+    OUTPUT: infinity norm of F. F is filled in place.
+
+    Translation of: mis = V * conj(Ybus * V) - Sbus
+                    F = r_[mis[pv].real, mis[pq].real, mis[pq].imag]
+                    norm(F, Inf)
+    """
+    npv = len(pv)
+    npq = len(pq)
+    norm = 0.
+    for i in range(npv):
+        mis = _mis_of_row(Yx, Yp, Yj, V, Sbus, pv[i])
+        F[i] = mis.real
+        norm = _update_norm(norm, mis.real)
+    for i in range(npq):
+        mis = _mis_of_row(Yx, Yp, Yj, V, Sbus, pq[i])
+        F[npv + i] = mis.real
+        F[npv + npq + i] = mis.imag
+        norm = _update_norm(_update_norm(norm, mis.real), mis.imag)
+    return norm
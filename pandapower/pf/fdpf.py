@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 1996-2015 PSERC. All rights reserved.
+# Use of this source code is governed by a BSD-style
+# license that can be found in the LICENSE file.
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+"""Solves the power flow using a fast decoupled method.
+"""
+
+from numpy import angle, exp, linalg, conj, r_, Inf, column_stack
+from scipy.sparse.linalg import splu
+
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+from pandapower.idx_brch import BR_B, BR_G, BR_R, BR_X, BR_R_ASYM, TAP, SHIFT
+from pandapower.idx_bus import BS
+from pandapower.pf.makeSbus import makeSbus
+
+
+def fdpf(Ybus, Sbus, V0, pv, pq, ppci, options, makeYbus):
+    """Solves the power flow using a fast decoupled method.
+
+    Solves for bus voltages given the full system admittance matrix (for
+    all buses), the complex bus power injection vector (for all buses),
+    the initial vector of complex bus voltages and column vectors with
+    the lists of bus indices for the PV buses and PQ buses. The matrices
+    B prime and B double prime as well as their LU factors are stored in
+    ppci["internal"]["fdpf_cache"] and reused in recycled power flows
+    with the same admittance matrix.
+
+    The "fdxb" algorithm neglects the branch resistances in B prime, the
+    "fdbx" algorithm neglects them in B double prime.
+
+    @see: L{newtonpf}
+
+    @author: Ray Zimmerman (PSERC Cornell)
+    @author: Richard Lincoln
+
+    Modified by University of Kassel to reuse the factorizations of B prime and B double prime.
+    If B prime or B double prime is singular, the power flow is reported as not converged.
+    """
+
+    ## options
+    tol = options['tolerance_kva'] * 1e-3
+    max_it = options["max_iteration"]
+    voltage_depend_loads = options["voltage_depend_loads"]
+    v_debug = options["v_debug"]
+
+    baseMVA = ppci['baseMVA']
+    bus = ppci['bus']
+    gen = ppci['gen']
+
+    ## initialize
+    i = 0
+    V = V0
+    Va = angle(V)
+    Vm = abs(V)
+
+    if voltage_depend_loads:
+        Sbus = makeSbus(baseMVA, bus, gen, vm=Vm)
+
+    if v_debug:
+        Vm_it = Vm.copy()
+        Va_it = Va.copy()
+    else:
+        Vm_it = None
+        Va_it = None
+
+    ## set up indexing for updating V
+    pvpq = r_[pv, pq]
+    try:
+        Bp_lu, Bpp_lu = _get_B_factorizations(ppci, options, pvpq, pq, makeYbus)
+    except RuntimeError as e:
+        # splu raises a RuntimeError if B prime or B double prime is singular
+        logger.warning("The fast decoupled power flow failed, B prime or B double prime is "
+                       "singular: %s" % e)
+        return V, False, i, Vm_it, Va_it
+
+    ## evaluate initial mismatch
+    P, Q = _evaluate_mis(Ybus, V, Sbus, Vm, pvpq, pq)
+    converged = _check_for_convergence(P, Q, tol)
+
+    ## do P and Q iterations
+    while (not converged and i < max_it):
+        ## update iteration counter
+        i = i + 1
+
+        ## -----  do P iteration, update Va  -----
+        Va[pvpq] = Va[pvpq] - Bp_lu.solve(P)
+        V = Vm * exp(1j * Va)
+
+        P, Q = _evaluate_mis(Ybus, V, Sbus, Vm, pvpq, pq)
+        converged = _check_for_convergence(P, Q, tol)
+
+        ## -----  do Q iteration, update Vm  -----
+        if not converged and len(pq):
+            Vm[pq] = Vm[pq] - Bpp_lu.solve(Q)
+            V = Vm * exp(1j * Va)
+
+            if voltage_depend_loads:
+                Sbus = makeSbus(baseMVA, bus, gen, vm=Vm)
+
+            P, Q = _evaluate_mis(Ybus, V, Sbus, Vm, pvpq, pq)
+            converged = _check_for_convergence(P, Q, tol)
+
+        if v_debug:
+            Vm_it = column_stack((Vm_it, Vm))
+            Va_it = column_stack((Va_it, Va))
+
+    return V, converged, i, Vm_it, Va_it
+
+
+def makeB(baseMVA, bus, branch, algorithm, makeYbus):
+    """Builds the FDPF matrices, B prime and B double prime.
+
+    Returns the two matrices B prime and B double prime used in the fast
+    decoupled power flow. Does appropriate conversions to p.u. The
+    algorithm is either "fdxb" (resistances neglected in B prime) or
+    "fdbx" (resistances neglected in B double prime). Resistances of
+    branches without reactance are kept, so that B stays regular.
+
+    @author: Ray Zimmerman (PSERC Cornell)
+    """
+    ## -----  form Bp (B prime)  -----
+    temp_branch = branch.copy()
+    temp_bus = bus.copy()
+    temp_bus[:, BS] = 0.  ## zero out shunts at buses
+    temp_branch[:, BR_B] = 0.  ## zero out line charging shunts
+    temp_branch[:, BR_G] = 0.
+    temp_branch[:, TAP] = 1.  ## cancel out taps
+    if algorithm == "fdxb":
+        _neglect_resistances(temp_branch)
+    Bp = -1 * makeYbus(baseMVA, temp_bus, temp_branch)[0].imag
+
+    ## -----  form Bpp (B double prime)  -----
+    temp_branch = branch.copy()
+    temp_branch[:, SHIFT] = 0.  ## zero out phase shifters
+    if algorithm == "fdbx":
+        _neglect_resistances(temp_branch)
+    Bpp = -1 * makeYbus(baseMVA, bus, temp_branch)[0].imag
+
+    return Bp, Bpp
+
+
+def _neglect_resistances(branch):
+    has_x = branch[:, BR_X] != 0
+    branch[has_x, BR_R] = 0.
+    branch[has_x, BR_R_ASYM] = 0.
+
+
+def _get_B_factorizations(ppci, options, pvpq, pq, makeYbus):
+    """
+    Returns the LU factors of B prime (reduced to the PV and PQ buses) and B double prime (reduced
+    to the PQ buses). B prime and B double prime are only built again if the admittance matrix is
+    not recycled. The factors are stored per bus type configuration, so that they are also reused
+    if bus types are changed by the enforcement of reactive power limits.
+    """
+    algorithm = options["algorithm"]
+    cache = ppci["internal"].get("fdpf_cache", None)
+    if cache is None or not options["recycle"]["Ybus"] or cache["algorithm"] != algorithm:
+        Bp, Bpp = makeB(ppci["baseMVA"], ppci["bus"], ppci["branch"], algorithm, makeYbus)
+        cache = {"algorithm": algorithm, "Bp": Bp.tocsc(), "Bpp": Bpp.tocsc(), "Bp_lu": {},
+                 "Bpp_lu": {}}
+        ppci["internal"]["fdpf_cache"] = cache
+    return _get_lu(cache["Bp"], pvpq, cache["Bp_lu"]), _get_lu(cache["Bpp"], pq, cache["Bpp_lu"])
+
+
+def _get_lu(B, idx, lu_cache):
+    if not len(idx):
+        return None
+    key = idx.tobytes()
+    if key not in lu_cache:
+        lu_cache[key] = splu(B[idx, :][:, idx].tocsc())
+    return lu_cache[key]
+
+
+def _evaluate_mis(Ybus, V, Sbus, Vm, pvpq, pq):
+    ## evaluate mismatch
+    mis = (V * conj(Ybus * V) - Sbus) / Vm
+    return mis[pvpq].real, mis[pq].imag
+
+
+def _check_for_convergence(P, Q, tol):
+    # calc infinity norm
+    return (not len(P) or linalg.norm(P, Inf) < tol) and (not len(Q) or linalg.norm(Q, Inf) < tol)
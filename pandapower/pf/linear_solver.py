@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+import numpy as np
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import splu, spilu, gmres, bicgstab, LinearOperator
+
+try:
+    import scikits.umfpack as umfpack
+    UMFPACK_INSTALLED = True
+except ImportError:
+    UMFPACK_INSTALLED = False
+
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+LIN_SOLVERS = ["superlu", "umfpack", "gmres", "bicgstab"]
+
+# maximum number of iterations of gmres / bicgstab with a cached incomplete LU preconditioner
+ILU_REUSE_MAXITER = 20
+
+
+def _check_lin_solver(lin_solver):
+    """
+    Checks if the linear solver is known and its dependencies are installed. Falls back to SuperLU
+    if UMFPACK is requested but scikit-umfpack is not installed.
+    """
+    if lin_solver not in LIN_SOLVERS:
+        raise ValueError("Linear solver %s is unknown. Available solvers are %s"
+                         % (lin_solver, LIN_SOLVERS))
+    if lin_solver == "umfpack" and not UMFPACK_INSTALLED:
+        logger.warning("scikit-umfpack is not installed, SuperLU is used as linear solver instead")
+        return "superlu"
+    return lin_solver
+
+
+def _solve_linear_system(A, b, cache, lin_solver="superlu"):
+    """
+    Solves A * x = b with the selected sparse linear solver.
+
+    INPUT:
+        **A** (sparse matrix) - square system matrix
+
+        **b** (array) - right hand side
+
+        **cache** (dict) - storage for the reusable parts of the factorization of A. The same
+        dict should be passed for all systems with the same matrix structure, e.g. for all
+        Jacobians of a Newton-Raphson power flow.
+
+        **lin_solver** (str, "superlu") - linear solver:
+
+            - "superlu" - SuperLU direct solver (scipy), reuses the column ordering
+            - "umfpack" - UMFPACK direct solver (requires scikit-umfpack), reuses the symbolic factorization
+            - "gmres" - GMRES with incomplete LU preconditioner, reuses the preconditioner
+            - "bicgstab" - BiCGSTAB with incomplete LU preconditioner, reuses the preconditioner
+    """
+    if lin_solver == "superlu":
+        return _solve_with_superlu(A, b, cache.setdefault("superlu", {}))
+    elif lin_solver == "umfpack":
+        return _solve_with_umfpack(A, b, cache.setdefault("umfpack", {}))
+    elif lin_solver in ["gmres", "bicgstab"]:
+        return _solve_iterative(A, b, cache, lin_solver)
+    raise ValueError("Linear solver %s is unknown" % lin_solver)
+
+
+def _get_column_permuted_structure(indptr, indices, perm_c):
+    """
+    Returns the structure of the matrix A[:, perm_c] for a matrix A given in CSC format as well as
+    the index array that maps the data of A to the data of the permuted matrix.
+    """
+    lengths = np.diff(indptr)[perm_c]
+    indptr_p = np.zeros(len(perm_c) + 1, dtype=indptr.dtype)
+    np.cumsum(lengths, out=indptr_p[1:])
+    data_idx = np.arange(indptr_p[-1]) + np.repeat(indptr[perm_c] - indptr_p[:-1], lengths)
+    return indptr_p, indices[data_idx], data_idx
+
+
+def _structure_unchanged(cache, A):
+    return "indptr" in cache and np.array_equal(cache["indptr"], A.indptr) \
+           and np.array_equal(cache["indices"], A.indices)
+
+
+def _to_sorted_csr(A):
+    A = A.tocsr()
+    if not A.has_sorted_indices:
+        A.sort_indices()
+    return A
+
+
+def _solve_with_superlu(A, b, cache):
+    """
+    Solves A * x = b with SuperLU and reuses the fill-reducing column ordering of A.
+
+    The sparsity pattern of the Jacobian does not change between the Newton-Raphson iterations
+    (and between recycled power flows with the same Ybus and bus types). The column
+    ordering of the first factorization is therefore stored in the cache together
+    with the structure of A. Following factorizations are carried out on the pre-permuted matrix
+    with the natural ordering, so that only the numerical factorization (with partial pivoting)
+    is repeated. The minimum degree ordering on the structure of A + A^T is used, since the
+    Jacobian is structurally symmetric.
+
+    The CSR arrays of A are the CSC arrays of the transposed matrix, so no format conversion is
+    necessary: the transposed system is factorized and solved with trans="T".
+    """
+    A = _to_sorted_csr(A)
+    try:
+        if _structure_unchanged(cache, A):
+            At = csc_matrix((A.data[cache["data_idx"]], cache["indices_p"], cache["indptr_p"]),
+                            shape=A.shape)
+            lu = splu(At, permc_spec="NATURAL")
+            return lu.solve(b[cache["perm_c"]], trans="T")
+
+        lu = splu(csc_matrix((A.data, A.indices, A.indptr), shape=A.shape),
+                  permc_spec="MMD_AT_PLUS_A")
+        # lu.perm_c maps the original to the permuted column positions
+        perm_c = np.argsort(lu.perm_c)
+        indptr_p, indices_p, data_idx = _get_column_permuted_structure(A.indptr, A.indices, perm_c)
+        cache.update({"indptr": A.indptr.copy(), "indices": A.indices.copy(), "perm_c": perm_c,
+                      "indptr_p": indptr_p, "indices_p": indices_p, "data_idx": data_idx})
+        return lu.solve(b, trans="T")
+    except RuntimeError:
+        # singular matrix: return NaN like spsolve, the power flow does not converge
+        return np.full(len(b), np.nan)
+
+
+def _solve_with_umfpack(A, b, cache):
+    """
+    Solves A * x = b with UMFPACK. The symbolic factorization is stored in the cache and reused as
+    long as the structure of A does not change, only the numerical factorization is repeated.
+    SuperLU is used if scikit-umfpack is not installed.
+    """
+    if not UMFPACK_INSTALLED:
+        logger.warning("scikit-umfpack is not installed, SuperLU is used as linear solver instead")
+        return _solve_with_superlu(A, b, cache.setdefault("superlu", {}))
+    A = _to_sorted_csr(A)
+    if not _structure_unchanged(cache, A):
+        family = "di" if A.indices.dtype == np.int32 else "dl"
+        context = umfpack.UmfpackContext(family)
+        context.symbolic(A)
+        cache.update({"indptr": A.indptr.copy(), "indices": A.indices.copy(),
+                      "context": context})
+    context = cache["context"]
+    try:
+        context.numeric(A)
+        return context.solve(umfpack.UMFPACK_A, A, b, autoTranspose=True)
+    except RuntimeError:
+        return np.full(len(b), np.nan)
+
+
+def _solve_iterative(A, b, cache, lin_solver):
+    """
+    Solves A * x = b with GMRES or BiCGSTAB, preconditioned with an incomplete LU factorization.
+
+    The incomplete LU factorization is stored in the cache and reused as preconditioner for the
+    following systems with the same structure, e.g. the Jacobians of the next Newton-Raphson
+    iterations. It is only recomputed if the structure of A changes or if the solver does not
+    converge within ILU_REUSE_MAXITER iterations with the outdated preconditioner. If the
+    solver does not converge with a new incomplete LU factorization of A either, the system is
+    solved with SuperLU.
+    """
+    A = _to_sorted_csr(A).tocsc()
+    ilu_cache = cache.setdefault("ilu", {})
+    solver = gmres if lin_solver == "gmres" else bicgstab
+    if _structure_unchanged(ilu_cache, A):
+        x, info = solver(A, b, tol=1e-10, M=ilu_cache["M"], maxiter=ILU_REUSE_MAXITER)
+        if info == 0:
+            return x
+        logger.debug("%s did not converge with the cached preconditioner (info=%i), the "
+                     "incomplete LU factorization is recomputed" % (lin_solver, info))
+    try:
+        ilu = spilu(A, drop_tol=1e-5, fill_factor=10)
+    except RuntimeError:
+        ilu_cache.clear()
+        return _solve_with_superlu(A, b, cache.setdefault("superlu", {}))
+    M = LinearOperator(A.shape, ilu.solve)
+    ilu_cache.update({"indptr": A.indptr.copy(), "indices": A.indices.copy(), "M": M})
+    x, info = solver(A, b, tol=1e-10, M=M)
+    if info != 0:
+        logger.debug("%s did not converge (info=%i), SuperLU is used instead" % (lin_solver, info))
+        x = _solve_with_superlu(A, b, cache.setdefault("superlu", {}))
+    return x
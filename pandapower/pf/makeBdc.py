@@ -11,10 +11,12 @@
 """Builds the B matrices and phase shift injections for DC power flow.
 """
 from numpy import ones, r_, pi, flatnonzero as find, real
-from pandapower.idx_brch import F_BUS, T_BUS, BR_X, TAP, SHIFT, BR_STATUS
+from pandapower.idx_brch import BR_X, TAP, SHIFT, BR_STATUS
 from pandapower.idx_bus import BUS_I
 from scipy.sparse import csr_matrix as sparse
 
+from pandapower.pf.ppci_variables import _get_branch_buses
+
 try:
     import pplog as logging
 except ImportError:
@@ -65,8 +67,7 @@ def makeBdc(bus, branch):
     b = b / tap
 
     ## build connection matrix Cft = Cf - Ct for line and from - to buses
-    f = real(branch[:, F_BUS]).astype(int)                           ## list of "from" buses
-    t = real(branch[:, T_BUS]).astype(int)                           ## list of "to" buses
+    f, t = _get_branch_buses(branch)                 ## lists of "from" and "to" buses
     i = r_[range(nl), range(nl)]                   ## double set of row indices
     ## connection matrix
     Cft = sparse((r_[ones(nl), -ones(nl)], (i, r_[f, t])), (nl, nb))
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+"""Builds the DC PTDF and LODF matrices.
+"""
+
+import numpy as np
+from scipy.sparse.linalg import splu
+
+from pandapower.idx_bus import BUS_TYPE, REF
+from pandapower.pf.makeBdc import makeBdc
+from pandapower.pf.ppci_variables import _get_branch_buses
+
+
+def makePTDF(bus, branch, slack=None, using_sparse_solver=True):
+    """Builds the DC power transfer distribution factor matrix.
+
+    Returns the DC PTDF matrix (number of branches x number of buses) for the given slack buses
+    (default: all reference buses). The column of bus k contains the change of the real power
+    flows at the from ends of all branches for an injection of 1 p.u. at bus k that is withdrawn
+    at the slack. The columns of the slack buses are zero.
+
+    By default, the reduced Bbus is factorized with SuperLU. If using_sparse_solver is False, a
+    dense copy of the reduced Bbus (number of buses x number of buses) is built and solved with
+    numpy instead. The returned PTDF matrix is dense with both solvers.
+    """
+    nb = bus.shape[0]
+    nl = branch.shape[0]
+    if slack is None:
+        slack = np.flatnonzero(bus[:, BUS_TYPE] == REF)
+    noslack = np.setdiff1d(np.arange(nb), slack)
+
+    Bbus, Bf, _, _ = makeBdc(bus, branch)
+    B_red = Bbus[noslack, :].tocsc()[:, noslack]
+    Bf_red = Bf.tocsc()[:, noslack]
+
+    # PTDF[:, noslack] = Bf_red * inv(B_red), solved as B_red^T * PTDF[:, noslack]^T = Bf_red^T
+    H = np.zeros((nl, nb))
+    if using_sparse_solver:
+        lu = splu(B_red)
+        H[:, noslack] = lu.solve(Bf_red.T.toarray(), trans="T").T
+    else:
+        H[:, noslack] = np.linalg.solve(B_red.toarray().T, Bf_red.T.toarray()).T
+    return H
+
+
+def makeLODF(branch, PTDF, outage_branches=None):
+    """Builds the DC line outage distribution factor matrix.
+
+    Returns the DC LODF matrix (number of branches x number of outages). The column of outage k
+    contains the change of the real power flows of all branches per unit of the pre-outage flow
+    of the outaged branch if it is taken out of service, so that the post-outage flows are
+
+        Pf_post = Pf + LODF[:, k] * Pf[outage_branches[k]]
+
+    The entries of the outaged branches are -1. The columns of branches whose outage splits the
+    network are NaN. If outage_branches is None, the columns of all branches are calculated
+    (number of branches x number of branches), otherwise only the columns of the given branches.
+    """
+    f, t = _get_branch_buses(branch)
+    if outage_branches is None:
+        outage_branches = np.arange(branch.shape[0])
+    outage_branches = np.asarray(outage_branches, dtype=np.int64)
+    n_outages = len(outage_branches)
+    # flow changes for a transfer of 1 p.u. from the from bus to the to bus of each outage
+    H = PTDF[:, f[outage_branches]] - PTDF[:, t[outage_branches]]
+    h = 1 - H[outage_branches, np.arange(n_outages)]
+    radial = np.abs(h) < 1e-10
+    h[radial] = np.nan
+    LODF = H / h
+    LODF[outage_branches, np.arange(n_outages)] = -1.
+    LODF[:, radial] = np.nan
+    return LODF
@@ -11,11 +11,11 @@
 
 import numpy as np
 from numba import jit
-from pandapower.idx_brch import F_BUS, T_BUS
 from pandapower.idx_bus import GS, BS
 from scipy.sparse import csr_matrix, coo_matrix
 
 from pandapower.pf.makeYbus_pypower import branch_vectors
+from pandapower.pf.ppci_variables import _get_branch_buses
 
 
 @jit(nopython=True, cache=True)
@@ -151,8 +151,7 @@ def makeYbus(baseMVA, bus, branch):
     Ysh = (bus[:, GS] + 1j * bus[:, BS]) / baseMVA
 
     ## build connection matrices
-    f = np.real(branch[:, F_BUS]).astype(int)                           ## list of "from" buses
-    t = np.real(branch[:, T_BUS]).astype(int)                           ## list of "to" buses
+    f, t = _get_branch_buses(branch)                                    ## lists of "from" and "to" buses
 
     ## build Yf and Yt such that Yf * V is the vector of complex branch currents injected
     ## at each branch's "from" bus, and Yt is the same for the "to" bus end
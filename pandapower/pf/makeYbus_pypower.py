@@ -13,10 +13,13 @@
 """
 
 from numpy import ones, conj, nonzero, any, exp, pi, r_, real
-from pandapower.idx_brch import F_BUS, T_BUS, BR_R, BR_X, BR_B, BR_STATUS, SHIFT, TAP, BR_R_ASYM, BR_X_ASYM
+from pandapower.idx_brch import BR_R, BR_X, BR_B, BR_G, BR_STATUS, SHIFT, TAP, BR_R_ASYM, BR_X_ASYM
 from pandapower.idx_bus import GS, BS
 from scipy.sparse import csr_matrix
 
+from pandapower.pf.ppci_variables import _get_branch_buses
+
+
 def makeYbus(baseMVA, bus, branch):
     """Builds the bus admittance matrix and branch admittance matrices.
 
@@ -51,8 +54,7 @@ def makeYbus(baseMVA, bus, branch):
     Ysh = (bus[:, GS] + 1j * bus[:, BS]) / baseMVA
 
     ## build connection matrices
-    f = real(branch[:, F_BUS]).astype(int)                           ## list of "from" buses
-    t = real(branch[:, T_BUS]).astype(int)                           ## list of "to" buses
+    f, t = _get_branch_buses(branch)                                 ## lists of "from" and "to" buses
     ## connection matrix for line & from buses
     Cf = csr_matrix((ones(nl), (range(nl), f)), (nl, nb))
     ## connection matrix for line & to buses
@@ -81,7 +83,7 @@ def branch_vectors(branch, nl):
         Yst = stat / ((branch[:, BR_R] + branch[:, BR_R_ASYM]) + 1j * (branch[:, BR_X] + branch[:, BR_X_ASYM]))  ## series admittance
     else:
         Yst = Ysf
-    Bc = stat * branch[:, BR_B]  ## line charging susceptance
+    Bc = stat * (branch[:, BR_B] - 1j * branch[:, BR_G])  ## line charging susceptance
     tap = ones(nl)  ## default tap ratio = 1
     i = nonzero(real(branch[:, TAP]))  ## indices of non-zero tap ratios
     tap[i] = real(branch[i, TAP])  ## assign non-zero tap ratios
@@ -11,12 +11,24 @@
 """Solves the power flow using a full Newton's method.
 """
 
-from numpy import angle, exp, linalg, conj, r_, Inf, arange, zeros, max, zeros_like, column_stack
-from scipy.sparse.linalg import spsolve
+from numpy import angle, exp, linalg, conj, r_, Inf, arange, zeros, max, zeros_like, column_stack, \
+    empty, bincount, flatnonzero as find, sort, setdiff1d, int8
+
+from pandapower.idx_gen import GEN_BUS, GEN_STATUS, QG, QMAX, QMIN
 
 from pandapower.pf.iwamoto_multiplier import _iwamoto_step
 from pandapower.pf.makeSbus import makeSbus
 from pandapower.pf.create_jacobian import create_jacobian_matrix, get_fastest_jacobian_function
+from pandapower.pf.linear_solver import _solve_linear_system
+from pandapower.timing import _timed
+
+try:
+    from pandapower.pf.evaluate_Fx_numba import evaluate_Fx_numba
+except ImportError:
+    pass
+
+# maximum number of times a bus is switched back from pq to pv with enforce_q_lims="inner"
+MAX_PQ_PV_SWITCHES = 3
 
 
 def newtonpf(Ybus, Sbus, V0, pv, pq, ppci, options):
@@ -46,6 +58,9 @@ def newtonpf(Ybus, Sbus, V0, pv, pq, ppci, options):
     iwamoto = options["algorithm"] == "iwamoto_nr"
     voltage_depend_loads = options["voltage_depend_loads"]
     v_debug = options["v_debug"]
+    lin_solver = options["lin_solver"]
+    q_lims_inner = options["enforce_q_lims"] == "inner"
+    timings = options.get("timings")
 
     baseMVA = ppci['baseMVA']
     bus = ppci['bus']
@@ -57,6 +72,8 @@ def newtonpf(Ybus, Sbus, V0, pv, pq, ppci, options):
     Va = angle(V)
     Vm = abs(V)
     dVa, dVm = None, None
+    if voltage_depend_loads:
+        Sbus = makeSbus(baseMVA, bus, gen, vm=Vm)
     if iwamoto:
         dVm, dVa = zeros_like(Vm), zeros_like(Va)
 
@@ -68,38 +85,51 @@ def newtonpf(Ybus, Sbus, V0, pv, pq, ppci, options):
         Va_it=None
 
     ## set up indexing for updating V
-    pvpq = r_[pv, pq]
-    # generate lookup pvpq -> index pvpq (used in createJ)
-    pvpq_lookup = zeros(max(Ybus.indices) + 1, dtype=int)
-    pvpq_lookup[pvpq] = arange(len(pvpq))
+    pvpq, pvpq_lookup, createJ, npv, npq, j1, j2, j3, j4, j5, j6 = \
+        _get_pvpq_indexing(Ybus, pv, pq, numba)
 
-    # get jacobian function
-    createJ = get_fastest_jacobian_function(pvpq, pq, numba)
-
-    npv = len(pv)
-    npq = len(pq)
-    j1 = 0
-    j2 = npv  ## j1:j2 - V angle of pv buses
-    j3 = j2
-    j4 = j2 + npq  ## j3:j4 - V angle of pq buses
-    j5 = j4
-    j6 = j4 + npq  ## j5:j6 - V mag of pq buses
+    Ybus = Ybus.tocsr()
+    # the mismatch is written into a preallocated vector if numba is used
+    F = empty(j6) if numba else None
+
+    if q_lims_inner:
+        # reactive power limits of the pv buses and the reactive power of generators in Sbus
+        q_max, q_min, q_gen = _get_bus_q_lims(baseMVA, bus, gen)
+        # the reactive power injection of pv buses that are switched to pq is corrected by dQ
+        dQ = zeros(len(V))
+        # 1 / -1 for pv buses that are switched to pq at the upper / lower limit
+        lim_state = zeros(len(V), dtype=int8)
+        # number of times each bus is switched back from pq to pv
+        n_back = zeros(len(V), dtype=int)
+        vm_set = Vm.copy()
 
     ## evaluate F(x0)
-    F = _evaluate_Fx(Ybus, V, Sbus, pv, pq)
-    converged = _check_for_convergence(F, tol)
-
-    Ybus = Ybus.tocsr()
+    F, converged = _evaluate_Fx_and_check_convergence(Ybus, V, Sbus, pv, pq, F, tol, numba)
+    if timings is not None:
+        timings["mismatch"].append(linalg.norm(F, Inf))
     J = None
+    J_cache = ppci["internal"].setdefault("J_lu_cache", {})
+
+    if converged and q_lims_inner:
+        F, converged, V, pv, pq, max_it = _switch_pv_buses_at_q_lims(
+            Ybus, V, Sbus, pv, pq, F, tol, numba, q_max, q_min, q_gen, dQ, lim_state,
+            n_back, vm_set, i, max_it, options)
+        if not converged:
+            Sbus = Sbus + 1j * dQ
+            pvpq, pvpq_lookup, createJ, npv, npq, j1, j2, j3, j4, j5, j6 = \
+                _get_pvpq_indexing(Ybus, pv, pq, numba)
+            F = empty(j6) if numba else None
+            F, converged = _evaluate_Fx_and_check_convergence(Ybus, V, Sbus, pv, pq, F, tol, numba)
 
     ## do Newton iterations
     while (not converged and i < max_it):
         ## update iteration counter
         i = i + 1
 
-        J = create_jacobian_matrix(Ybus, V, pvpq, pq, createJ, pvpq_lookup, npv, npq, numba)
-
-        dx = -1 * spsolve(J, F)
+        with _timed(timings, "create_jacobian"):
+            J = create_jacobian_matrix(Ybus, V, pvpq, pq, createJ, pvpq_lookup, npv, npq, numba)
+        with _timed(timings, "solve_linear_system"):
+            dx = -1 * _solve_linear_system(J, F, J_cache, lin_solver)
         ## update voltage
         if npv and not iwamoto:
             Va[pv] = Va[pv] + dx[j1:j2]
@@ -122,12 +152,130 @@ def newtonpf(Ybus, Sbus, V0, pv, pq, ppci, options):
 
         if voltage_depend_loads:
             Sbus = makeSbus(baseMVA, bus, gen, vm=Vm)
+            if q_lims_inner:
+                Sbus = Sbus + 1j * dQ
+
+        F, converged = _evaluate_Fx_and_check_convergence(Ybus, V, Sbus, pv, pq, F, tol, numba)
+        if timings is not None:
+            timings["mismatch"].append(linalg.norm(F, Inf))
+
+        if converged and q_lims_inner:
+            # switch pv buses with violated reactive power limits to pq and continue the iterations
+            dQ_old = dQ.copy()
+            F, converged, V, pv, pq, max_it = _switch_pv_buses_at_q_lims(
+                Ybus, V, Sbus, pv, pq, F, tol, numba, q_max, q_min, q_gen, dQ, lim_state,
+                n_back, vm_set, i, max_it, options)
+            if not converged:
+                # buses that are switched back to pv are set to their voltage set point
+                Vm = abs(V)
+                Va = angle(V)
+                if iwamoto:
+                    # the voltage magnitude steps of the pv buses are zero
+                    dVm[:] = 0.
+                Sbus = Sbus + 1j * (dQ - dQ_old)
+                pvpq, pvpq_lookup, createJ, npv, npq, j1, j2, j3, j4, j5, j6 = \
+                    _get_pvpq_indexing(Ybus, pv, pq, numba)
+                F = empty(j6) if numba else None
+                F, converged = _evaluate_Fx_and_check_convergence(Ybus, V, Sbus, pv, pq, F, tol,
+                                                                  numba)
 
-        F = _evaluate_Fx(Ybus, V, Sbus, pv, pq)
+    return V, converged, i, J, Vm_it, Va_it
 
-        converged = _check_for_convergence(F, tol)
 
-    return V, converged, i, J, Vm_it, Va_it
+def _get_pvpq_indexing(Ybus, pv, pq, numba):
+    pvpq = r_[pv, pq]
+    # generate lookup pvpq -> index pvpq (used in createJ)
+    pvpq_lookup = zeros(max(Ybus.indices) + 1, dtype=int)
+    pvpq_lookup[pvpq] = arange(len(pvpq))
+
+    # get jacobian function
+    createJ = get_fastest_jacobian_function(pvpq, pq, numba)
+
+    npv = len(pv)
+    npq = len(pq)
+    j1 = 0
+    j2 = npv  ## j1:j2 - V angle of pv buses
+    j3 = j2
+    j4 = j2 + npq  ## j3:j4 - V angle of pq buses
+    j5 = j4
+    j6 = j4 + npq  ## j5:j6 - V mag of pq buses
+    return pvpq, pvpq_lookup, createJ, npv, npq, j1, j2, j3, j4, j5, j6
+
+
+def _get_bus_q_lims(baseMVA, bus, gen):
+    """
+    Returns the sum of the reactive power limits and of the reactive power of all generators in
+    service at each bus in p.u.
+    """
+    nb = bus.shape[0]
+    on = find(gen[:, GEN_STATUS] > 0)
+    gbus = gen[on, GEN_BUS].real.astype(int)
+    q_max = bincount(gbus, weights=gen[on, QMAX].real, minlength=nb) / baseMVA
+    q_min = bincount(gbus, weights=gen[on, QMIN].real, minlength=nb) / baseMVA
+    q_gen = bincount(gbus, weights=gen[on, QG].real, minlength=nb) / baseMVA
+    return q_max, q_min, q_gen
+
+
+def _switch_pv_buses_at_q_lims(Ybus, V, Sbus, pv, pq, F, tol, numba, q_max, q_min, q_gen, dQ,
+                               lim_state, n_back, vm_set, i, max_it, options):
+    """
+    Switches all pv buses at which the generators violate their reactive power limits to pq buses
+    with the generator reactive power fixed at the limit. dQ is updated in place with the
+    correction of the reactive power injection of the switched buses and lim_state with the limit
+    they are fixed at (1: upper, -1: lower limit).
+
+    A switched bus is switched back to a pv bus with its voltage set point vm_set if its voltage
+    exceeds the set point at the upper limit or falls below it at the lower limit, i.e. if the
+    generator can hold the set point within its limits. Each bus is switched back at most
+    MAX_PQ_PV_SWITCHES times (counted in n_back), so that the bus types cannot oscillate.
+
+    If buses are switched, the power flow is not converged anymore and the maximum number of
+    iterations is extended by max_iteration.
+    """
+    # pq buses at a limit whose voltage passed the set point are switched back to pv
+    at_lim = find(lim_state)
+    vm = abs(V[at_lim])
+    back = at_lim[(n_back[at_lim] < MAX_PQ_PV_SWITCHES) &
+                  (((lim_state[at_lim] == 1) & (vm > vm_set[at_lim])) |
+                   ((lim_state[at_lim] == -1) & (vm < vm_set[at_lim])))]
+
+    to_pq = zeros(len(pv), dtype=bool)
+    if len(pv):
+        # reactive power of the generators = injection + load (the load part is q_gen - Sbus.imag)
+        q_inj = (V[pv] * conj(Ybus[pv, :] * V)).imag
+        q = q_inj + q_gen[pv] - Sbus[pv].imag
+        at_max = q > q_max[pv] + tol
+        at_min = q < q_min[pv] - tol
+        to_pq = at_max | at_min
+    if not to_pq.any() and not len(back):
+        return F, True, V, pv, pq, max_it
+
+    if to_pq.any():
+        switched = pv[to_pq]
+        dQ[pv[at_max]] = q_max[pv[at_max]] - q_gen[pv[at_max]]
+        dQ[pv[at_min]] = q_min[pv[at_min]] - q_gen[pv[at_min]]
+        lim_state[pv[at_max]] = 1
+        lim_state[pv[at_min]] = -1
+        pv = pv[~to_pq]
+        pq = sort(r_[pq, switched])
+    if len(back):
+        dQ[back] = 0.
+        lim_state[back] = 0
+        n_back[back] += 1
+        V = V.copy()
+        V[back] = vm_set[back] * exp(1j * angle(V[back]))
+        pv = sort(r_[pv, back])
+        pq = setdiff1d(pq, back)
+    return F, False, V, pv, pq, i + options["max_iteration"]
+
+
+def _evaluate_Fx_and_check_convergence(Ybus, V, Sbus, pv, pq, F, tol, numba):
+    if numba:
+        # fills F and returns the infinity norm in one pass through Ybus
+        normF = evaluate_Fx_numba(Ybus.data, Ybus.indptr, Ybus.indices, V, Sbus, pv, pq, F)
+        return F, normF < tol
+    F = _evaluate_Fx(Ybus, V, Sbus, pv, pq)
+    return F, _check_for_convergence(F, tol)
 
 
 def _evaluate_Fx(Ybus, V, Sbus, pv, pq):
@@ -11,17 +11,18 @@
 """Updates bus, gen, branch data structures to match power flow soln.
 """
 
-from numpy import pi, finfo, c_, real, flatnonzero as find, angle, conj, zeros, complex128
+from numpy import pi, finfo, c_, flatnonzero as find, angle, conj, zeros, complex128
 
 try:
     from numba import jit
 except ImportError:
     from pandapower.pf.no_numba import jit
 
-from pandapower.idx_brch import F_BUS, T_BUS, PF, PT, QF, QT
+from pandapower.idx_brch import PF, PT, QF, QT
 from pandapower.idx_bus import VM, VA, PD, QD
 from pandapower.idx_gen import GEN_BUS, GEN_STATUS, PG, QG
 from pandapower.pf.pfsoln_pypower import _update_v, _update_q, _update_p
+from pandapower.pf.ppci_variables import _get_branch_buses
 
 EPS = finfo(float).eps
 
@@ -46,12 +47,11 @@ def pfsoln(baseMVA, bus, gen, branch, Ybus, Yf, Yt, V, ref, ref_gens, Ibus=None)
 
     ##----- update/compute branch power flows -----
 
+    f, t = _get_branch_buses(branch)
     ## complex power at "from" bus
-    Sf = V[real(branch[:, F_BUS]).astype(int)] * calc_branch_flows(Yf.data, Yf.indptr, Yf.indices, V, baseMVA,
-                                                                   Yf.shape[0])
+    Sf = V[f] * calc_branch_flows(Yf.data, Yf.indptr, Yf.indices, V, baseMVA, Yf.shape[0])
     ## complex power injected at "to" bus
-    St = V[real(branch[:, T_BUS]).astype(int)] * calc_branch_flows(Yt.data, Yt.indptr, Yt.indices, V, baseMVA,
-                                                                   Yt.shape[0])
+    St = V[t] * calc_branch_flows(Yt.data, Yt.indptr, Yt.indices, V, baseMVA, Yt.shape[0])
     branch[:, [PF, QF, PT, QT]] = c_[Sf.real, Sf.imag, St.real, St.imag]
     return bus, gen, branch
 
@@ -70,12 +70,11 @@ def pf_solution_single_slack(baseMVA, bus, gen, branch, Ybus, Yf, Yt, V, ref, re
 
     ##----- update/compute branch power flows -----
 
+    f, t = _get_branch_buses(branch)
     ## complex power at "from" bus
-    Sf = V[real(branch[:, F_BUS]).astype(int)] * calc_branch_flows(Yf.data, Yf.indptr, Yf.indices, V, baseMVA,
-                                                                   Yf.shape[0])
+    Sf = V[f] * calc_branch_flows(Yf.data, Yf.indptr, Yf.indices, V, baseMVA, Yf.shape[0])
     ## complex power injected at "to" bus
-    St = V[real(branch[:, T_BUS]).astype(int)] * calc_branch_flows(Yt.data, Yt.indptr, Yt.indices, V, baseMVA,
-                                                                   Yt.shape[0])
+    St = V[t] * calc_branch_flows(Yt.data, Yt.indptr, Yt.indices, V, baseMVA, Yt.shape[0])
 
     branch[:, [PF, QF, PT, QT]] = c_[Sf.real, Sf.imag, St.real, St.imag]
 
@@ -12,11 +12,12 @@
 """Updates bus, gen, branch data structures to match power flow soln.
 """
 
-from numpy import asarray, angle, pi, conj, zeros, ones, finfo, c_, ix_, real, flatnonzero as find,\
+from numpy import asarray, angle, pi, conj, zeros, ones, finfo, c_, ix_, flatnonzero as find,\
                   setdiff1d, intersect1d
-from pandapower.idx_brch import F_BUS, T_BUS, BR_STATUS, PF, PT, QF, QT
+from pandapower.idx_brch import BR_STATUS, PF, PT, QF, QT
 from pandapower.idx_bus import VM, VA, PD, QD
 from pandapower.idx_gen import GEN_BUS, GEN_STATUS, PG, QG, QMIN, QMAX
+from pandapower.pf.ppci_variables import _get_branch_buses
 from scipy.sparse import csr_matrix
 
 EPS = finfo(float).eps
@@ -53,10 +54,11 @@ def pfsoln(baseMVA, bus0, gen0, branch0, Ybus, Yf, Yt, V, ref, ref_gens, Ibus=No
 
     if len(out):
         raise RuntimeError
+    f_bus, t_bus = _get_branch_buses(branch[br])
     ## complex power at "from" bus
-    Sf = V[ real(branch[br, F_BUS]).astype(int) ] * conj(Yf[br, :] * V) * baseMVA
+    Sf = V[ f_bus ] * conj(Yf[br, :] * V) * baseMVA
     ## complex power injected at "to" bus
-    St = V[ real(branch[br, T_BUS]).astype(int) ] * conj(Yt[br, :] * V) * baseMVA
+    St = V[ t_bus ] * conj(Yt[br, :] * V) * baseMVA
     branch[ ix_(br, [PF, QF, PT, QT]) ] = c_[Sf.real, Sf.imag, St.real, St.imag]
     branch[ ix_(out, [PF, QF, PT, QT]) ] = zeros((len(out), 4))
 
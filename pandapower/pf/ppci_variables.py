@@ -3,10 +3,11 @@
 # Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
 # and Energy System Technology (IEE), Kassel. All rights reserved.
 
+from pandapower.idx_brch import F_BUS, T_BUS
 from pandapower.idx_bus import VM, VA
 from pandapower.idx_gen import GEN_BUS, GEN_STATUS, VG
 from pandapower.pf.bustypes import bustypes
-from numpy import flatnonzero as find, pi, exp
+from numpy import flatnonzero as find, pi, exp, int32
 
 def _get_pf_variables_from_ppci(ppci):
     ## default arguments
@@ -33,6 +34,12 @@ def _get_pf_variables_from_ppci(ppci):
     ref_gens = ppci["internal"]["ref_gens"]
     return baseMVA, bus, gen, branch, ref, pv, pq, on, gbus, V0, ref_gens
 
+def _get_branch_buses(branch):
+    """
+    Returns the from and to buses of the (real or complex) branch matrix as int32 index arrays.
+    """
+    return branch[:, F_BUS].real.astype(int32), branch[:, T_BUS].real.astype(int32)
+
 def _store_results_from_pf_in_ppci(ppci, bus, gen, branch, success, iterations, et):
     ppci["bus"], ppci["gen"], ppci["branch"] = bus, gen, branch
     ppci["success"] = bool(success)
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from pandapower.idx_bus import PD, QD, BASE_KV, BUS_TYPE, NONE
+from pandapower.pf.makeSbus import makeSbus
+from pandapower.pf.makeYbus_pypower import makeYbus
+from pandapower.pf.newtonpf import newtonpf
+from pandapower.pf.ppci_variables import _get_pf_variables_from_ppci, _get_branch_buses
+
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _ppci_from_ppc(ppc):
+    """
+    Restores the internal ppci from a ppc with results. The in service buses are always the first
+    rows of ppc["bus"], branches and gens are selected with the in service masks in ppc["internal"]
+    """
+    internal = ppc["internal"]
+    gen_is = internal["gen_is"]
+    branch_is = internal["branch_is"]
+    nb = np.count_nonzero(ppc["bus"][:, BUS_TYPE] != NONE)
+    ppci = {"baseMVA": ppc["baseMVA"],
+            "version": ppc["version"],
+            "bus": ppc["bus"][:nb].copy(),
+            "gen": ppc["gen"][gen_is].copy(),
+            "branch": ppc["branch"][branch_is].copy(),
+            "internal": internal}
+    return ppci
+
+
+def _get_base_case_ppci(net):
+    """
+    Returns the ppci of the last power flow together with its pv and pq buses and initial voltages.
+    The admittance matrices are built if the power flow did not store them.
+    """
+    ppci = _ppci_from_ppc(net["_ppc"])
+    baseMVA, bus, gen, branch, ref, pv, pq, _, _, V0, _ = _get_pf_variables_from_ppci(ppci)
+    internal = ppci["internal"]
+    if isinstance(internal["Ybus"], np.ndarray):
+        # power flow without branches does not store Ybus
+        internal["Ybus"], internal["Yf"], internal["Yt"] = makeYbus(baseMVA, bus, branch)
+    return ppci, pv, pq, V0
+
+
+def _get_injection_matrix(net, element, n_bus):
+    """
+    Returns the sparse matrix that maps the power values of an element table (in kW / kVar) to the
+    internal bus demand (in MW / MVar), considering the element scaling and in service status
+    """
+    el = net[element]
+    bus_lookup = net["_pd2ppc_lookups"]["bus"]
+    el_bus = bus_lookup[el["bus"].values]
+    active = net["_is_elements"][element] & (el_bus < n_bus) & (el_bus >= 0)
+    rows = el_bus[active]
+    cols = np.flatnonzero(active)
+    data = el["scaling"].values[active] * 1e-3
+    return csr_matrix((data, (rows, cols)), shape=(n_bus, len(el)))
+
+
+def _get_line_loading(net, ppci, Sf, St, V):
+    """
+    Calculates the loading of all lines in percent for a matrix of branch flows (one column per
+    scenario). Lines which are not part of the ppci get a NaN loading.
+    """
+    n_scenarios = V.shape[1]
+    line_loading = np.full((n_scenarios, len(net.line)), np.nan)
+    if "line" not in net._pd2ppc_lookups["branch"]:
+        return line_loading
+    f, t = net._pd2ppc_lookups["branch"]["line"]
+    branch_is = ppci["internal"]["branch_is"]
+    # position of each ppc branch in the ppci
+    ppci_branch = np.cumsum(branch_is) - 1
+    line_is = branch_is[f:t]
+    line_ppci = ppci_branch[f:t][line_is]
+
+    branch = ppci["branch"][line_ppci]
+    fb, tb = _get_branch_buses(branch)
+    u_f = np.abs(V[fb]) * ppci["bus"][fb, BASE_KV][:, np.newaxis] * np.sqrt(3)
+    u_t = np.abs(V[tb]) * ppci["bus"][tb, BASE_KV][:, np.newaxis] * np.sqrt(3)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        i_ka = np.maximum(np.abs(Sf[line_ppci]) / u_f, np.abs(St[line_ppci]) / u_t)
+    line_df = net["line"]
+    i_max = line_df["max_i_ka"].values * line_df["df"].values * line_df["parallel"].values
+    line_loading[:, line_is] = (i_ka / i_max[line_is][:, np.newaxis] * 100.).T
+    return line_loading
+
+
+def _get_trafo_loading(net, ppci, Sf, St, V):
+    """
+    Calculates the loading of all transformers in percent for a matrix of branch flows (one column
+    per scenario), based on the current or the power according to the trafo_loading option.
+    Transformers which are not part of the ppci get a NaN loading.
+    """
+    n_scenarios = V.shape[1]
+    trafo_loading = np.full((n_scenarios, len(net.trafo)), np.nan)
+    if "trafo" not in net._pd2ppc_lookups["branch"]:
+        return trafo_loading
+    f, t = net._pd2ppc_lookups["branch"]["trafo"]
+    branch_is = ppci["internal"]["branch_is"]
+    ppci_branch = np.cumsum(branch_is) - 1
+    trafo_is = branch_is[f:t]
+    trafo_ppci = ppci_branch[f:t][trafo_is]
+
+    trafo_df = net["trafo"]
+    sn_kva = trafo_df["sn_kva"].values[trafo_is][:, np.newaxis]
+    s_hv, s_lv = np.abs(Sf[trafo_ppci]), np.abs(St[trafo_ppci])
+    if net["_options"]["trafo_loading"] == "current":
+        branch = ppci["branch"][trafo_ppci]
+        fb, tb = _get_branch_buses(branch)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            i_hv_ka = s_hv / (np.abs(V[fb]) * ppci["bus"][fb, BASE_KV][:, np.newaxis] * np.sqrt(3))
+            i_lv_ka = s_lv / (np.abs(V[tb]) * ppci["bus"][tb, BASE_KV][:, np.newaxis] * np.sqrt(3))
+        s_hv = i_hv_ka * trafo_df["vn_hv_kv"].values[trafo_is][:, np.newaxis] * np.sqrt(3)
+        s_lv = i_lv_ka * trafo_df["vn_lv_kv"].values[trafo_is][:, np.newaxis] * np.sqrt(3)
+    with np.errstate(invalid='ignore'):
+        loading = np.maximum(s_hv, s_lv) * 1e3 / sn_kva * 100.
+    rating = trafo_df["parallel"].values * trafo_df["df"].values
+    trafo_loading[:, trafo_is] = (loading / rating[trafo_is][:, np.newaxis]).T
+    return trafo_loading
+
+
+def _run_batch_pf(net, element, p_kw, q_kvar=None):
+    """
+    Solves the power flow for each row of p_kw / q_kvar on the ppc of the last power flow.
+
+    The scenarios are solved sequentially: newtonpf is called once per scenario, starting from the
+    solution of the previous scenario, with the admittance matrices and the bus type index sets of
+    the last power flow. The bus demands of all scenarios and the branch flows of the solutions
+    are set up / evaluated as matrix products over all scenarios.
+    """
+    options = net["_options"]
+    ppci, pv, pq, V0 = _get_base_case_ppci(net)
+    baseMVA, bus, gen, branch = ppci["baseMVA"], ppci["bus"], ppci["gen"], ppci["branch"]
+    n_bus = bus.shape[0]
+    internal = ppci["internal"]
+    Ybus, Yf, Yt = internal["Ybus"], internal["Yf"], internal["Yt"]
+
+    p_kw = np.atleast_2d(np.asarray(p_kw, dtype=float))
+    n_scenarios, n_el = p_kw.shape
+    if n_el != len(net[element]):
+        raise ValueError("The number of columns in p_kw (%u) does not match the number of "
+                         "elements in net.%s (%u)" % (n_el, element, len(net[element])))
+    if q_kvar is None:
+        q_kvar = np.tile(net[element]["q_kvar"].values.astype(float), (n_scenarios, 1))
+    else:
+        q_kvar = np.atleast_2d(np.asarray(q_kvar, dtype=float))
+        if q_kvar.shape != p_kw.shape:
+            raise ValueError("p_kw and q_kvar need to have the same shape")
+
+    # demand of all other elements stays constant, only the demand of element is replaced
+    C = _get_injection_matrix(net, element, n_bus)
+    pd_base = bus[:, PD] - C * net[element]["p_kw"].values
+    qd_base = bus[:, QD] - C * net[element]["q_kvar"].values
+    pd_all = pd_base[:, np.newaxis] + C * p_kw.T
+    qd_all = qd_base[:, np.newaxis] + C * q_kvar.T
+
+    V_all = np.empty((n_bus, n_scenarios), dtype=np.complex128)
+    converged = np.zeros(n_scenarios, dtype=bool)
+    iterations = np.zeros(n_scenarios, dtype=int)
+    V = V0
+    for s in range(n_scenarios):
+        bus[:, PD] = pd_all[:, s]
+        bus[:, QD] = qd_all[:, s]
+        Sbus = makeSbus(baseMVA, bus, gen)
+        V_s, success, it, _, _, _ = newtonpf(Ybus, Sbus, V, pv, pq, ppci, options)
+        converged[s] = success
+        iterations[s] = it
+        V_all[:, s] = V_s
+        # start the next scenario from this solution if it was successful
+        V = V_s if success else V0
+    if not converged.all():
+        logger.warning("Power flow did not converge for %u of %u scenarios"
+                       % (np.count_nonzero(~converged), n_scenarios))
+
+    # branch flows for all scenarios at once
+    fb, tb = _get_branch_buses(branch)
+    Sf = V_all[fb] * np.conj(Yf * V_all) * baseMVA
+    St = V_all[tb] * np.conj(Yt * V_all) * baseMVA
+
+    # results in the order of net.bus, NaN for buses that are not in the ppci
+    bus_lookup = net["_pd2ppc_lookups"]["bus"]
+    ppci_bus = bus_lookup[net.bus.index.values]
+    bus_is = (ppci_bus >= 0) & (ppci_bus < n_bus)
+    vm_pu = np.full((n_scenarios, len(net.bus)), np.nan)
+    va_degree = np.full((n_scenarios, len(net.bus)), np.nan)
+    vm_pu[:, bus_is] = np.abs(V_all[ppci_bus[bus_is]]).T
+    va_degree[:, bus_is] = np.angle(V_all[ppci_bus[bus_is]], deg=True).T
+    not_converged = ~converged
+    vm_pu[not_converged] = np.nan
+    va_degree[not_converged] = np.nan
+    line_loading = _get_line_loading(net, ppci, Sf, St, V_all)
+    line_loading[not_converged] = np.nan
+
+    return {"vm_pu": vm_pu, "va_degree": va_degree, "line_loading_percent": line_loading,
+            "converged": converged, "iterations": iterations}
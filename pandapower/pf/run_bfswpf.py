@@ -9,7 +9,7 @@ from time import time  # alternatively use import timeit.default_timer as time
 
 import numpy as np
 import scipy as sp
-from pandapower.idx_brch import F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, BR_STATUS, SHIFT
+from pandapower.idx_brch import BR_R, BR_X, BR_B, BR_G, TAP, BR_STATUS, SHIFT
 from pandapower.idx_bus import BUS_I, BUS_TYPE, GS, BS
 from pandapower.idx_gen import GEN_BUS, QG, QMAX, QMIN, GEN_STATUS, VG
 from pandapower.pf.makeSbus import makeSbus
@@ -22,7 +22,7 @@ from pandapower.pf.newtonpf import _evaluate_Fx, _check_for_convergence
 from pandapower.pf.pfsoln import pfsoln
 from pandapower.pf.run_newton_raphson_pf import _get_Y_bus
 from pandapower.pf.runpf_pypower import _import_numba_extensions_if_flag_is_true
-from pandapower.pf.ppci_variables import _get_pf_variables_from_ppci
+from pandapower.pf.ppci_variables import _get_pf_variables_from_ppci, _get_branch_buses
 
 
 class LoadflowNotConverged(ppException):
@@ -56,13 +56,14 @@ def _make_bibc_bcbv(bus, branch, graph):
 
     # dictionary with impedance values keyed by branch tuple (frombus, tobus)
     # TODO use list or array, not both
-    branches_lst = list(zip(branch[:, F_BUS].real.astype(int), branch[:, T_BUS].real.astype(int)))
-    branches_arr = branch[:, F_BUS:T_BUS + 1].real.astype(int)
-    branches_ind_dict = dict(zip(zip(branches_arr[:, 0], branches_arr[:, 1]), range(0, nobranch)))
-    branches_ind_dict.update(dict(zip(zip(branches_arr[:, 1], branches_arr[:, 0]), range(0, nobranch))))
+    f, t = _get_branch_buses(branch)
+    branches_lst = list(zip(f, t))
+    branches_arr = np.c_[f, t]
+    branches_ind_dict = dict(zip(zip(f, t), range(0, nobranch)))
+    branches_ind_dict.update(dict(zip(zip(t, f), range(0, nobranch))))
 
     tap = branch[:, TAP]  # * np.exp(1j * np.pi / 180 * branch[:, SHIFT])
-    z_ser = (branch[:, BR_R].real + 1j * branch[:, BR_X].real) * tap  # series impedance
+    z_ser = (branch[:, BR_R] + 1j * branch[:, BR_X]) * tap  # series impedance
     z_brch_dict = dict(zip(branches_lst, z_ser))
 
     # initialization of lists for building sparse BIBC and BCBV matrices
@@ -196,16 +197,17 @@ def _makeYsh_bfsw(bus, branch, baseMVA):
     # summation of charging susceptances per each bus
     stat = branch[:, BR_STATUS]  ## ones at in-service branches
     Ys = stat / (branch[:, BR_R] + 1j * branch[:, BR_X])
-    ysh = (- branch[:, BR_B].imag + 1j * (branch[:, BR_B].real)) / 2
+    ysh = (branch[:, BR_G] + 1j * branch[:, BR_B]) / 2
     tap = branch[:, TAP]  # * np.exp(1j * np.pi / 180 * branch[:, SHIFT])
 
     ysh_f = Ys * (1 - tap) / (tap * np.conj(tap)) + ysh / (tap * np.conj(tap))
     ysh_t = Ys * (tap - 1) / tap + ysh
 
-    Gch = (np.bincount(branch[:, F_BUS].real.astype(int), weights=ysh_f.real, minlength=nobus) +
-           np.bincount(branch[:, T_BUS].real.astype(int), weights=ysh_t.real, minlength=nobus))
-    Bch = (np.bincount(branch[:, F_BUS].real.astype(int), weights=ysh_f.imag, minlength=nobus) +
-           np.bincount(branch[:, T_BUS].real.astype(int), weights=ysh_t.imag, minlength=nobus))
+    f, t = _get_branch_buses(branch)
+    Gch = (np.bincount(f, weights=ysh_f.real, minlength=nobus) +
+           np.bincount(t, weights=ysh_t.real, minlength=nobus))
+    Bch = (np.bincount(f, weights=ysh_f.imag, minlength=nobus) +
+           np.bincount(t, weights=ysh_t.imag, minlength=nobus))
 
     Ysh += Gch + 1j * Bch
 
@@ -395,8 +397,7 @@ def _run_bfswpf(ppci, options, **kwargs):
     ppci, Ybus, Yf, Yt = _get_Y_bus(ppci, options, makeYbus, baseMVA, bus, branch)
 
     # creating network graph from list of branches
-    bus_from = branch[:, F_BUS].real.astype(int)
-    bus_to = branch[:, T_BUS].real.astype(int)
+    bus_from, bus_to = _get_branch_buses(branch)
     G = csr_matrix((np.ones(nobranch), (bus_from, bus_to)),
                    shape=(nobus, nobus))
     # create spanning trees using breadth-first-search
@@ -425,9 +426,8 @@ def _run_bfswpf(ppci, options, **kwargs):
     # if phase-shifting trafos are present adjust final state vector angles accordingly
     if calculate_voltage_angles and any_trafo_shift:
         brch_shift_mask = branch[:, SHIFT] != 0
-        trafos_shift = dict(list(zip(list(zip(branch[brch_shift_mask, F_BUS].real.astype(int),
-                                              branch[brch_shift_mask, T_BUS].real.astype(int))),
-                                     branch[brch_shift_mask, SHIFT].real)))
+        bus_from, bus_to = _get_branch_buses(branch[brch_shift_mask])
+        trafos_shift = dict(list(zip(list(zip(bus_from, bus_to)), branch[brch_shift_mask, SHIFT])))
         for trafo_ind, shift_degree in iteritems(trafos_shift):
             neti = 0
             # if multiple reference nodes, find in which network trafo is located
@@ -17,7 +17,7 @@ from pandapower.pf.makeBdc import makeBdc
 from pandapower.pf.makeSbus import makeSbus
 from pandapower.pf.ppci_variables import _get_pf_variables_from_ppci, _store_results_from_pf_in_ppci
 
-def _run_dc_pf(ppci):
+def _run_dc_pf(ppci, lin_solver="superlu"):
     t0 = time()
     baseMVA, bus, gen, branch, ref, pv, pq, on, gbus, _, _ = _get_pf_variables_from_ppci(ppci)
 
@@ -29,10 +29,11 @@ def _run_dc_pf(ppci):
 
     ## compute complex bus power injections [generation - load]
     ## adjusted for phase shifters and real shunts
-    Pbus = makeSbus(baseMVA, bus, gen) - Pbusinj - bus[:, GS] / baseMVA
+    Pbus = real(makeSbus(baseMVA, bus, gen)) - Pbusinj - bus[:, GS] / baseMVA
 
     ## "run" the power flow
-    Va = dcpf(B, Pbus, Va0, ref, pv, pq)
+    Va = dcpf(B, Pbus, Va0, ref, pv, pq, lin_solver,
+              ppci["internal"].setdefault("B_lu_cache", {}))
 
     ## update data matrices with solution
     branch[:, [QF, QT]] = zeros((branch.shape[0], 2))
@@ -7,17 +7,19 @@
 
 from time import time
 
-from numpy import flatnonzero as find, r_, zeros, argmax, setdiff1d
+from numpy import flatnonzero as find, r_, zeros, argmax, setdiff1d, subtract, add
 
 from pandapower.idx_bus import PD, QD, BUS_TYPE, PQ, REF
 from pandapower.idx_gen import PG, QG, QMAX, QMIN, GEN_BUS, GEN_STATUS
 from pandapower.pf.bustypes import bustypes
+from pandapower.pf.fdpf import fdpf
 from pandapower.pf.makeSbus import makeSbus
 from pandapower.pf.makeYbus_pypower import makeYbus as makeYbus_pypower
 from pandapower.pf.newtonpf import newtonpf
 from pandapower.pf.pfsoln_pypower import pfsoln as pfsoln_pypower
 from pandapower.pf.run_dc_pf import _run_dc_pf
 from pandapower.pf.ppci_variables import _get_pf_variables_from_ppci, _store_results_from_pf_in_ppci
+from pandapower.timing import _timed
 
 try:
     from pandapower.pf.makeYbus import makeYbus as makeYbus_numba
@@ -34,16 +36,19 @@ logger = logging.getLogger(__name__)
 
 
 def _run_newton_raphson_pf(ppci, options):
-    """Runs a newton raphson power flow.
+    """Runs a newton raphson power flow or a fast-decoupled power flow ("fdbx", "fdxb").
     """
 
     ##-----  run the power flow  -----
 
 
     t0 = time()
-    if options["init_va_degree"] == "dc":
-        ppci = _run_dc_pf(ppci)
-    if options["enforce_q_lims"]:
+    init_va_degree = options["init_va_degree"]
+    if isinstance(init_va_degree, str) and init_va_degree == "dc":
+        with _timed(options.get("timings"), "init_dc_pf"):
+            ppci = _run_dc_pf(ppci, options["lin_solver"])
+    if options["enforce_q_lims"] and options["enforce_q_lims"] != "inner":
+        # "inner": pv buses are switched to pq inside the newton raphson iterations
         ppci, success, iterations, bus, gen, branch = _run_ac_pf_with_qlims_enforced(ppci, options)
     else:
         ppci, success, iterations, bus, gen, branch = _run_ac_pf_without_qlims_enforced(ppci, options)
@@ -79,20 +84,26 @@ def _get_numba_functions(ppci, options):
 
 def _run_ac_pf_without_qlims_enforced(ppci, options):
     makeYbus, pfsoln = _get_numba_functions(ppci, options)
+    timings = options.get("timings")
 
     baseMVA, bus, gen, branch, ref, pv, pq, _, _, V0, ref_gens = _get_pf_variables_from_ppci(ppci)
 
-    ppci, Ybus, Yf, Yt = _get_Y_bus(ppci, options, makeYbus, baseMVA, bus, branch)
+    with _timed(timings, "makeYbus"):
+        ppci, Ybus, Yf, Yt = _get_Y_bus(ppci, options, makeYbus, baseMVA, bus, branch)
 
     ## compute complex bus power injections [generation - load]
     Sbus = makeSbus(baseMVA, bus, gen)
 
-    ## run the newton power  flow
-
-    V, success, iterations, ppci["internal"]["J"], ppci["internal"]["Vm_it"], ppci["internal"]["Va_it"] = newtonpf(Ybus, Sbus, V0, pv, pq, ppci, options)
+    if options["algorithm"] in ["fdbx", "fdxb"]:
+        ## run the fast-decoupled power flow
+        V, success, iterations, ppci["internal"]["Vm_it"], ppci["internal"]["Va_it"] = fdpf(Ybus, Sbus, V0, pv, pq, ppci, options, makeYbus)
+    else:
+        ## run the newton power  flow
+        V, success, iterations, ppci["internal"]["J"], ppci["internal"]["Vm_it"], ppci["internal"]["Va_it"] = newtonpf(Ybus, Sbus, V0, pv, pq, ppci, options)
 
     ## update data matrices with solution
-    bus, gen, branch = pfsoln(baseMVA, bus, gen, branch, Ybus, Yf, Yt, V, ref, ref_gens)
+    with _timed(timings, "pfsoln"):
+        bus, gen, branch = pfsoln(baseMVA, bus, gen, branch, Ybus, Yf, Yt, V, ref, ref_gens)
 
     return ppci, success, iterations, bus, gen, branch
 
@@ -134,10 +145,10 @@ def _run_ac_pf_with_qlims_enforced(ppci, options):
 
             ## convert to PQ bus
             gen[mx, QG] = fixedQg[mx]  ## set Qg to binding
-            for i in range(len(mx)):  ## [one at a time, since they may be at same bus]
-                gen[mx[i], GEN_STATUS] = 0  ## temporarily turn off gen,
-                bi = gen[mx[i], GEN_BUS].astype(int)  ## adjust load accordingly,
-                bus[bi, [PD, QD]] = (bus[bi, [PD, QD]] - gen[mx[i], [PG, QG]])
+            gen[mx, GEN_STATUS] = 0  ## temporarily turn off gens,
+            bi = gen[mx, GEN_BUS].astype(int)  ## adjust load accordingly (unbuffered, since
+            subtract.at(bus, (bi, PD), gen[mx, PG])  ## several gens may be at the same bus)
+            subtract.at(bus, (bi, QD), gen[mx, QG])
 
 #            if len(ref) > 1 and any(bus[gen[mx, GEN_BUS].astype(int), BUS_TYPE] == REF):
 #                raise ValueError('Sorry, pandapower cannot enforce Q '
@@ -157,9 +168,9 @@ def _run_ac_pf_with_qlims_enforced(ppci, options):
     if len(limited) > 0:
         ## restore injections from limited gens [those at Q limits]
         gen[limited, QG] = fixedQg[limited]  ## restore Qg value,
-        for i in range(len(limited)):  ## [one at a time, since they may be at same bus]
-            bi = gen[limited[i], GEN_BUS].astype(int)  ## re-adjust load,
-            bus[bi, [PD, QD]] = bus[bi, [PD, QD]] + gen[limited[i], [PG, QG]]
-            gen[limited[i], GEN_STATUS] = 1  ## and turn gen back on
+        bi = gen[limited, GEN_BUS].astype(int)  ## re-adjust load,
+        add.at(bus, (bi, PD), gen[limited, PG])
+        add.at(bus, (bi, QD), gen[limited, QG])
+        gen[limited, GEN_STATUS] = 1  ## and turn gens back on
 
     return ppci, success, iterations, bus, gen, branch
@@ -53,13 +53,13 @@ def _runpf_pypower(ppci, options, **kwargs):
     init_va_degree, ac, numba, recycle, ppopt = _get_options(options, **kwargs)
 
     if ac:  # AC formulation
-        if init_va_degree == "dc":
-            ppci = _run_dc_pf(ppci)
+        if isinstance(init_va_degree, str) and init_va_degree == "dc":
+            ppci = _run_dc_pf(ppci, options["lin_solver"])
             success = True
 
         ppci, success, bus, gen, branch, it = _ac_runpf(ppci, ppopt, numba, recycle)
     else:  ## DC formulation
-        ppci = _run_dc_pf(ppci)
+        ppci = _run_dc_pf(ppci, options["lin_solver"])
         success = True
 
     et = time() - t0
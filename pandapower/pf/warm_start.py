@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+from collections import OrderedDict
+from hashlib import sha1
+
+import numpy as np
+
+from pandapower.idx_brch import F_BUS, T_BUS, BR_STATUS
+from pandapower.idx_bus import VM, VA, BUS_TYPE, NONE, PQ, REF
+
+
+def _get_topology_hash(net, ppc, ppci):
+    """
+    Returns a hash of the in service topology of the ppci. It considers the bus lookup (which
+    reflects closed bus-bus switches and auxiliary buses), the out of service buses and the
+    connectivity and status of the branches (which reflect open line and trafo switches). The
+    voltage angles of power flows with and without calculate_voltage_angles are not comparable,
+    so the option is part of the hash.
+    """
+    h = sha1()
+    h.update(np.bool_(net["_options"]["calculate_voltage_angles"]).tobytes())
+    h.update(np.ascontiguousarray(net["_pd2ppc_lookups"]["bus"], dtype=np.int64).tobytes())
+    h.update(np.ascontiguousarray(ppc["bus"][:, BUS_TYPE] == NONE).tobytes())
+    h.update(np.ascontiguousarray(ppc["internal"]["branch_is"]).tobytes())
+    h.update(np.ascontiguousarray(ppc["branch"][:, [F_BUS, T_BUS, BR_STATUS]].real).tobytes())
+    h.update(np.int64(ppci["bus"].shape[0]).tobytes())
+    return h.hexdigest()
+
+
+def _init_from_warm_start_cache(net, ppci, topology_hash):
+    """
+    Initializes the bus voltages of the ppci with the voltages of the last converged power flow
+    with the same topology. Returns True if the topology was found in the cache.
+
+    The setpoints of the ppci are kept: the voltage magnitudes are only initialized at PQ buses
+    and the voltage angles of the slack buses are not changed. The cached angles of all other
+    buses are shifted by the change of the slack angle since the cached power flow.
+    """
+    cache = net["_warm_start_cache"] if "_warm_start_cache" in net else None
+    if cache is None or topology_hash not in cache:
+        return False
+    # reinsert the entry, so that it is the most recently used one
+    vm, va = cache.pop(topology_hash)
+    cache[topology_hash] = (vm, va)
+    bus = ppci["bus"]
+    bus_type = bus[:, BUS_TYPE].real
+    pq = bus_type == PQ
+    ref = bus_type == REF
+    shift = np.mean(bus[ref, VA].real - va[ref]) if np.any(ref) else 0.
+    bus[pq, VM] = vm[pq]
+    bus[~ref, VA] = va[~ref] + shift
+    return True
+
+
+def _store_in_warm_start_cache(net, ppci, topology_hash, max_topologies):
+    """
+    Stores the bus voltages of a converged power flow for the topology. If more than
+    max_topologies topologies are stored, the least recently used one is removed.
+    """
+    if "_warm_start_cache" not in net or net["_warm_start_cache"] is None:
+        net["_warm_start_cache"] = OrderedDict()
+    cache = net["_warm_start_cache"]
+    cache.pop(topology_hash, None)
+    cache[topology_hash] = (ppci["bus"][:, VM].real.copy(), ppci["bus"][:, VA].real.copy())
+    while len(cache) > max_topologies:
+        cache.popitem(last=False)
@@ -4,18 +4,20 @@
 # and Energy System Technology (IEE), Kassel. All rights reserved.
 
 from pandapower.idx_bus import VM
-from pandapower.auxiliary import ppException, _clean_up
-from pandapower.create import create_gen
+from pandapower.auxiliary import ppException
 from pandapower.pd2ppc import _pd2ppc, _update_ppc
 from pandapower.pf.run_bfswpf import _run_bfswpf
 from pandapower.pf.run_dc_pf import _run_dc_pf
 from pandapower.pf.run_newton_raphson_pf import _run_newton_raphson_pf
 from pandapower.pf.runpf_pypower import _runpf_pypower
-from pandapower.results import _extract_results, _copy_results_ppci_to_ppc, reset_results, verify_results
+from pandapower.results import _extract_results, _copy_results_ppci_to_ppc, reset_results, \
+    verify_results, _discard_lazy_results
 from pandapower.pf.makeYbus_pypower import makeYbus as makeYbus_pypower
 from pandapower.pf.pfsoln_pypower import pfsoln as pfsoln_pypower
 from pandapower.pf.ppci_variables import _get_pf_variables_from_ppci
-import pandas as pd
+from pandapower.pf.warm_start import _get_topology_hash, _init_from_warm_start_cache, \
+    _store_in_warm_start_cache
+from pandapower.timing import _timed
 
 
 class AlgorithmUnknown(ppException):
@@ -44,10 +46,13 @@ def _powerflow(net, **kwargs):
     mode = net["_options"]["mode"]
     algorithm = net["_options"]["algorithm"]
     max_iteration = net["_options"]["max_iteration"]
+    warm_start = net["_options"].get("warm_start", 0) if ac else 0
+    timings = net["_options"].get("timings")
 
     net["converged"] = False
     net["OPF_converged"] = False
-    _add_auxiliary_elements(net)
+    # bus results that were not calculated yet are still needed for the initialization
+    _discard_lazy_results(net, calculate_bus_results=init_results)
 
     if not ac or init_results:
         verify_results(net)
@@ -55,15 +60,17 @@ def _powerflow(net, **kwargs):
         reset_results(net)
 
     # TODO remove this when zip loads are integrated for all PF algorithms
-    if algorithm not in ['nr', 'bfsw']:
+    if algorithm not in ['nr', 'bfsw', 'fdbx', 'fdxb']:
         net["_options"]["voltage_depend_loads"] = False
 
-    if recycle["ppc"] and "_ppc" in net and net["_ppc"] is not None and "_pd2ppc_lookups" in net:
-        # update the ppc from last cycle
-        ppc, ppci = _update_ppc(net)
-    else:
-        # convert pandapower net to ppc
-        ppc, ppci = _pd2ppc(net)
+    with _timed(timings, "pd2ppc"):
+        if recycle["ppc"] and "_ppc" in net and net["_ppc"] is not None and \
+                "_pd2ppc_lookups" in net:
+            # update the ppc from last cycle
+            ppc, ppci = _update_ppc(net)
+        else:
+            # convert pandapower net to ppc
+            ppc, ppci = _pd2ppc(net)
 
     # store variables
     net["_ppc"] = ppc
@@ -71,23 +78,47 @@ def _powerflow(net, **kwargs):
     if not "VERBOSE" in kwargs:
         kwargs["VERBOSE"] = 0
 
+    options = net["_options"]
+    if warm_start:
+        topology_hash = _get_topology_hash(net, ppc, ppci)
+        if _init_from_warm_start_cache(net, ppci, topology_hash):
+            # the voltages of the last power flow with this topology replace the dc initialization
+            options = dict(options, init_va_degree="warm_start")
+
     # ----- run the powerflow -----
-    result = _run_pf_algorithm(ppci, net["_options"], **kwargs)
+    with _timed(timings, "pf_algorithm"):
+        result = _run_pf_algorithm(ppci, options, **kwargs)
+    if timings is not None:
+        _add_pf_counters(timings, result)
+    if warm_start and result["success"]:
+        _store_in_warm_start_cache(net, result, topology_hash, warm_start)
 
     # ppci doesn't contain out of service elements, but ppc does -> copy results accordingly
     result = _copy_results_ppci_to_ppc(result, ppc, mode)
 
     # raise if PF was not successful. If DC -> success is always 1
     if result["success"] != 1:
-        _clean_up(net, res=False)
         raise LoadflowNotConverged("Power Flow {0} did not converge after "
                                    "{1} iterations!".format(algorithm, max_iteration))
     else:
         net["_ppc"] = result
         net["converged"] = True
 
-    _extract_results(net, result)
-    _clean_up(net)
+    with _timed(timings, "extract_results"):
+        _extract_results(net, result)
+
+
+def _add_pf_counters(timings, ppci):
+    """
+    Adds the number of iterations and the number of nonzeros of Ybus and the Jacobian of the
+    power flow result to the timings.
+    """
+    timings["iterations"] = ppci.get("iterations")
+    internal = ppci.get("internal", {})
+    if hasattr(internal.get("Ybus"), "nnz"):
+        timings["nnz_Ybus"] = internal["Ybus"].nnz
+    if hasattr(internal.get("J"), "nnz"):
+        timings["nnz_J"] = internal["J"].nnz
 
 
 def _run_pf_algorithm(ppci, options, **kwargs):
@@ -100,14 +131,14 @@ def _run_pf_algorithm(ppci, options, **kwargs):
             result = _pf_without_branches(ppci, options)
         elif algorithm == 'bfsw':  # forward/backward sweep power flow algorithm
             result = _run_bfswpf(ppci, options, **kwargs)[0]
-        elif algorithm in ['nr', 'iwamoto_nr']:
+        elif algorithm in ['nr', 'iwamoto_nr', 'fdbx', 'fdxb']:
             result = _run_newton_raphson_pf(ppci, options)
-        elif algorithm in ['fdbx', 'fdxb', 'gs']:  # algorithms existing within pypower
+        elif algorithm in ['gs']:  # algorithms existing within pypower
             result = _runpf_pypower(ppci, options, **kwargs)[0]
         else:
             raise AlgorithmUnknown("Algorithm {0} is unknown!".format(algorithm))
     else:
-        result = _run_dc_pf(ppci)
+        result = _run_dc_pf(ppci, options["lin_solver"])
 
     return result
 
@@ -122,57 +153,3 @@ def _pf_without_branches(ppci, options):
     ppci["iterations"] = 1
     ppci["et"] = 0
     return ppci
-
-def _add_auxiliary_elements(net):
-    # TODO: include directly in pd2ppc so that buses are only in ppc, not in pandapower
-    if len(net["trafo3w"]) > 0:
-        _create_trafo3w_buses(net)
-    if len(net.dcline) > 0:
-        _add_dcline_gens(net)
-    if len(net["xward"]) > 0:
-        _create_xward_buses(net)
-
-
-def _create_xward_buses(net):
-    from pandapower.create import create_buses
-    init_results = net["_options"]["init_results"]
-
-    main_buses = net.bus.loc[net.xward.bus.values]
-    bid = create_buses(net, nr_buses=len(main_buses),
-                       vn_kv=main_buses.vn_kv.values,
-                       in_service=net["xward"]["in_service"].values)
-    net.xward["ad_bus"] = bid
-    if init_results:
-        # TODO: this is probably slow, but the whole auxiliary bus creation should be included in
-        #      pd2ppc anyways. LT
-        net.res_bus=net.res_bus.append(pd.DataFrame(index=bid,data=net.res_bus.loc[main_buses.index].values,columns=net.res_bus.columns))
-
-
-def _create_trafo3w_buses(net):
-    from pandapower.create import create_buses
-    init_results = net["_options"]["init_results"]
-
-    hv_buses = net.bus.loc[net.trafo3w.hv_bus.values]
-    bid = create_buses(net, nr_buses=len(net["trafo3w"]),
-                       vn_kv=hv_buses.vn_kv.values,
-                       in_service=net.trafo3w.in_service.values)
-    net.trafo3w["ad_bus"] = bid
-    if init_results:
-        # TODO: this is probably slow, but the whole auxiliary bus creation should be included in
-        #      pd2ppc anyways. LT
-        net.res_bus=net.res_bus.append(pd.DataFrame(index=bid,data=net.res_bus.loc[hv_buses.index].values,columns=net.res_bus.columns))
-
-
-def _add_dcline_gens(net):
-    for _, dctab in net.dcline.iterrows():
-        pfrom = dctab.p_kw
-        pto = - (pfrom * (1 - dctab.loss_percent / 100) - dctab.loss_kw)
-        pmax = dctab.max_p_kw
-        create_gen(net, bus=dctab.to_bus, p_kw=pto, vm_pu=dctab.vm_to_pu,
-                   min_p_kw=-pmax, max_p_kw=0.,
-                   max_q_kvar=dctab.max_q_to_kvar, min_q_kvar=dctab.min_q_to_kvar,
-                   in_service=dctab.in_service)
-        create_gen(net, bus=dctab.from_bus, p_kw=pfrom, vm_pu=dctab.vm_from_pu,
-                   min_p_kw=0, max_p_kw=pmax,
-                   max_q_kvar=dctab.max_q_from_kvar, min_q_kvar=dctab.min_q_from_kvar,
-                   in_service=dctab.in_service)
\ No newline at end of file
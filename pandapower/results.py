@@ -5,28 +5,154 @@
 
 
 import copy
+from functools import partial
 
 import numpy as np
 import pandas as pd
 
-from pandapower.results_branch import _get_branch_results
+from pandapower.results_branch import _get_branch_results, _get_branch_flows, _get_line_results, \
+    _get_trafo_results, _get_trafo3w_results, _get_impedance_results, _get_switch_results, \
+    _get_xward_branch_results
 from pandapower.results_bus import _get_bus_results, _get_p_q_results, _set_buses_out_of_service, \
     _get_shunt_results, _get_p_q_results_opf, _get_bus_v_results
 from pandapower.results_gen import _get_gen_results
 
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+# the results of these elements all contribute to the power injections in res_bus and are
+# therefore always calculated together
+BUS_RESULT_ELEMENTS = ["bus", "ext_grid", "gen", "load", "sgen", "storage", "shunt", "ward",
+                       "xward", "dcline"]
+BRANCH_RESULT_ELEMENTS = ["line", "trafo", "trafo3w", "impedance", "switch"]
+
 
 def _extract_results(net, ppc):
     _set_buses_out_of_service(ppc)
+    elements = _get_result_elements(net)
+    lazy = net["_options"]["results"] == "lazy"
+
+    bus_results = any(element in elements for element in BUS_RESULT_ELEMENTS)
+    branch_elements = [element for element in BRANCH_RESULT_ELEMENTS if element in elements]
+    if "switch" not in net["_pd2ppc_lookups"]["branch"]:
+        # switch results only exist for bus-bus switches that are modelled as branches
+        branch_elements = [element for element in branch_elements if element != "switch"]
+    # tables which are not calculated must not contain the results of previous power flows
+    not_calculated = [element for element in BRANCH_RESULT_ELEMENTS
+                      if element not in branch_elements]
+    if not bus_results:
+        not_calculated += BUS_RESULT_ELEMENTS
+    for element in not_calculated:
+        _empty_result_table(net, element)
+
+    if lazy:
+        for element in branch_elements:
+            _add_lazy_results(net, [element], partial(_extract_branch_results, net, ppc,
+                                                      [element]))
+    else:
+        _extract_branch_results(net, ppc, branch_elements)
+    if bus_results:
+        if lazy:
+            _add_lazy_results(net, BUS_RESULT_ELEMENTS, partial(_extract_bus_results, net, ppc))
+        else:
+            _extract_bus_results(net, ppc)
+
+
+def _extract_bus_results(net, ppc):
     bus_lookup_aranged = _get_aranged_lookup(net)
 
     _get_bus_v_results(net, ppc)
     bus_pq = _get_p_q_results(net, bus_lookup_aranged)
     _get_shunt_results(net, ppc, bus_lookup_aranged, bus_pq)
-    _get_branch_results(net, ppc, bus_lookup_aranged, bus_pq)
+    _get_xward_branch_results(net, ppc, bus_lookup_aranged, bus_pq)
     _get_gen_results(net, ppc, bus_lookup_aranged, bus_pq)
     _get_bus_results(net, ppc, bus_pq)
 
 
+def _extract_branch_results(net, ppc, elements):
+    if not len(elements):
+        return
+    i_ft, s_ft = _get_branch_flows(ppc)
+    if "line" in elements:
+        _get_line_results(net, ppc, i_ft)
+    if "trafo" in elements:
+        _get_trafo_results(net, ppc, s_ft, i_ft)
+    if "trafo3w" in elements:
+        _get_trafo3w_results(net, ppc, s_ft, i_ft)
+    if "impedance" in elements:
+        _get_impedance_results(net, ppc, i_ft)
+    if "switch" in elements:
+        _get_switch_results(net, i_ft)
+
+
+def _get_result_elements(net):
+    """
+    Returns the elements whose result tables are selected with the option result_tables (element
+    names with or without "res_" prefix). All result tables are selected by default.
+    """
+    result_tables = net["_options"]["result_tables"]
+    if result_tables is None:
+        return BUS_RESULT_ELEMENTS + BRANCH_RESULT_ELEMENTS
+    if isinstance(result_tables, str):
+        result_tables = [result_tables]
+    elements = [table[4:] if table.startswith("res_") else table for table in result_tables]
+    unknown = set(elements) - set(BUS_RESULT_ELEMENTS + BRANCH_RESULT_ELEMENTS)
+    if len(unknown):
+        raise ValueError("Unknown result tables %s" % sorted(unknown))
+    return elements
+
+
+def _empty_result_table(net, element):
+    if element == "switch":
+        if "res_switch" in net:
+            net["res_switch"] = pd.DataFrame(columns=["i_ka"], dtype=float)
+    elif element in get_elements_to_init():
+        init_element(net, element)
+    else:
+        empty_res_element(net, "res_" + element)
+
+
+def _add_lazy_results(net, elements, extract):
+    """
+    Registers the result tables of the elements, which are calculated with extract() when one of
+    them is accessed for the first time (see pandapowerNet.__getitem__).
+    """
+    tables = ["res_" + element for element in elements]
+    lazy_results = net.__dict__.setdefault("_lazy_results", {})
+
+    def calculate():
+        for table in tables:
+            if lazy_results.get(table) is calculate:
+                del lazy_results[table]
+        extract()
+
+    for table in tables:
+        lazy_results[table] = calculate
+
+
+def _discard_lazy_results(net, calculate_bus_results=False):
+    """
+    Removes the result tables of the last power flow that have not been calculated yet. If
+    calculate_bus_results is True, the bus results are calculated before, e.g. to initialize the
+    next power flow with them.
+    """
+    lazy_results = net.__dict__.get("_lazy_results")
+    if not lazy_results:
+        return
+    if calculate_bus_results and "res_bus" in lazy_results:
+        try:
+            lazy_results["res_bus"]()
+        except (IndexError, ValueError):
+            # buses or elements were added after the last power flow, its results do not fit
+            logger.debug("The lazy bus results of the last power flow could not be calculated")
+            empty_res_element(net, "res_bus")
+    lazy_results.clear()
+
+
 def _extract_results_opf(net, ppc):
     # get options
     bus_lookup_aranged = _get_aranged_lookup(net)
@@ -100,6 +226,7 @@ def get_elements_to_init():
 
 
 def reset_results(net):
+    _discard_lazy_results(net)
     elements_to_empty = get_elements_to_empty()
     for element in elements_to_empty:
         empty_res_element(net, "res_" + element)
@@ -8,8 +8,9 @@ import numpy as np
 import pandas as pd
 
 from pandapower.auxiliary import _sum_by_group
-from pandapower.idx_brch import F_BUS, T_BUS, PF, QF, PT, QT
+from pandapower.idx_brch import PF, QF, PT, QT
 from pandapower.idx_bus import BASE_KV
+from pandapower.pf.ppci_variables import _get_branch_buses
 
 
 def _get_branch_results(net, ppc, bus_lookup_aranged, pq_buses):
@@ -33,7 +34,7 @@ def _get_branch_results(net, ppc, bus_lookup_aranged, pq_buses):
 
 
 def _get_branch_flows(ppc):
-    br_idx = ppc["branch"][:, (F_BUS, T_BUS)].real.astype(int)
+    br_idx = np.column_stack(_get_branch_buses(ppc["branch"]))
     u_ft = ppc["bus"][br_idx, 7] * ppc["bus"][br_idx, BASE_KV]
     s_ft = (np.sqrt(ppc["branch"][:, (PF, PT)].real ** 2 +
                     ppc["branch"][:, (QF, QT)].real ** 2) * 1e3)
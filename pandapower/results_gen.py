@@ -23,11 +23,9 @@ def _get_gen_results(net, ppc, bus_lookup_aranged, pq_bus):
     if gen_end > eg_end:
         b, p, q = _get_pp_gen_results(net, ppc, b, p, q)
 
+    # the power of dc lines is not part of the bus power
     if len(net.dcline) > 0:
-        _get_dcline_results(net)
-        b = np.hstack([b, net.dcline[["from_bus", "to_bus"]].values.flatten()])
-        p = np.hstack([p, -net.res_dcline[["p_from_kw", "p_to_kw"]].values.flatten()])
-        q = np.hstack([q, -net.res_dcline[["q_from_kvar", "q_to_kvar"]].values.flatten()])
+        _get_dcline_results(net, ppc)
 
     if not ac:
         q = np.zeros(len(p))
@@ -131,21 +129,36 @@ def _get_pp_gen_results(net, ppc, b, p, q):
     return b, p, q
 
 
-def _get_dcline_results(net):
-    dc_gens = net.gen.index[(len(net.gen) - len(net.dcline) * 2):]
-    from_gens = net.res_gen.loc[dc_gens[1::2]]
-    to_gens = net.res_gen.loc[dc_gens[::2]]
+def _get_dcline_results(net, ppc):
+    ac = net["_options"]["ac"]
+    bus_lookup = net["_pd2ppc_lookups"]["bus"]
+    dcline = net["dcline"]
+    # ppc indices of the generators at the from and to bus of each dc line
+    dcline_lookup = net["_pd2ppc_lookups"]["dcline"]
+    dcline_is = net["_is_elements"]["dcline"] & (dcline_lookup >= 0)
+    gen_idx_ppc = dcline_lookup[dcline_is]
+    bus_idx_ppc = bus_lookup[dcline[["from_bus", "to_bus"]].values[dcline_is]]
+
+    p_kw = np.zeros(dcline_is.shape)
+    q_kvar = np.zeros(dcline_is.shape)
+    vm_pu = np.zeros(dcline_is.shape)
+    va_degree = np.zeros(dcline_is.shape)
+    p_kw[dcline_is] = -ppc["gen"][gen_idx_ppc, PG] * 1e3
+    if ac:
+        q_kvar[dcline_is] = -ppc["gen"][gen_idx_ppc, QG] * 1e3
+    vm_pu[dcline_is] = ppc["bus"][bus_idx_ppc, VM]
+    va_degree[dcline_is] = ppc["bus"][bus_idx_ppc, VA]
 
-    net.res_dcline.p_from_kw = from_gens.p_kw.values
-    net.res_dcline.p_to_kw = to_gens.p_kw.values
-    net.res_dcline.pl_kw = from_gens.p_kw.values + to_gens.p_kw.values
+    net.res_dcline.p_from_kw = p_kw[:, 0]
+    net.res_dcline.p_to_kw = p_kw[:, 1]
+    net.res_dcline.pl_kw = p_kw[:, 0] + p_kw[:, 1]
 
-    net.res_dcline.q_from_kvar = from_gens.q_kvar.values
-    net.res_dcline.q_to_kvar = to_gens.q_kvar.values
+    net.res_dcline.q_from_kvar = q_kvar[:, 0]
+    net.res_dcline.q_to_kvar = q_kvar[:, 1]
 
-    net.res_dcline.vm_from_pu = from_gens.vm_pu.values
-    net.res_dcline.vm_to_pu = to_gens.vm_pu.values
-    net.res_dcline.va_from_degree = from_gens.va_degree.values
-    net.res_dcline.va_to_degree = to_gens.va_degree.values
+    net.res_dcline.vm_from_pu = vm_pu[:, 0]
+    net.res_dcline.vm_to_pu = vm_pu[:, 1]
+    net.res_dcline.va_from_degree = va_degree[:, 0]
+    net.res_dcline.va_to_degree = va_degree[:, 1]
 
-    net.res_dcline.index = net.dcline.index
+    net.res_dcline.index = dcline.index
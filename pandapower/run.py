@@ -12,6 +12,10 @@ from pandapower.auxiliary import _add_pf_options, _add_ppc_options, _add_opf_opt
 from pandapower.optimal_powerflow import _optimal_powerflow
 from pandapower.opf.validate_opf_input import _check_necessary_opf_parameters
 from pandapower.powerflow import _powerflow
+from pandapower.pf.linear_solver import _check_lin_solver
+from pandapower.pf.run_batch_pf import _run_batch_pf
+from pandapower.timing import _run_profiled
+from pandapower.topology.graph_searches import estimate_voltage_vector
 import inspect
 
 try:
@@ -39,7 +43,8 @@ def set_user_pf_options(net, overwrite=False, **kwargs):
                            'copy_constraints_to_ppc', 'r_switch', 'init', 'enforce_q_lims',
                            'recycle', 'voltage_depend_loads', 'delta', 'tolerance_kva',
                            'trafo_loading', 'numba', 'ac', 'algorithm', 'max_iteration',
-                           'trafo3w_losses', 'init_vm_pu', 'init_va_degree']
+                           'trafo3w_losses', 'init_vm_pu', 'init_va_degree', 'lin_solver',
+                           'warm_start', 'results', 'result_tables', 'profile']
 
     if overwrite or 'user_pf_options' not in net.keys():
         net['user_pf_options'] = dict()
@@ -58,6 +63,13 @@ def set_user_pf_options(net, overwrite=False, **kwargs):
         net.user_pf_options.update(additional_kwargs)
 
 
+def _check_result_options(kwargs):
+    results = kwargs.get("results", "all")
+    if results not in ["all", "lazy"]:
+        raise ValueError("results must be 'all' or 'lazy', not %s" % results)
+    return results, kwargs.get("result_tables", None)
+
+
 def _passed_runpp_parameters(local_parameters):
     """
     Internal function to distinguish arguments for pandapower.runpp() that are explicitly passed by
@@ -98,8 +110,8 @@ def runpp(net, algorithm='nr', calculate_voltage_angles="auto", init="auto",
                 - "iwamoto_nr" Newton-Raphson with Iwamoto multiplier (maybe slower than NR but more robust)
                 - "bfsw" backward/forward sweep (specially suited for radial and weakly-meshed networks)
                 - "gs" gauss-seidel (pypower implementation)
-                - "fdbx" fast-decoupled (pypower implementation)
-                - "fdxb" fast-decoupled (pypower implementation)
+                - "fdbx" fast-decoupled, BX version (factorizations of B' and B'' are reused with recycle)
+                - "fdxb" fast-decoupled, XB version (factorizations of B' and B'' are reused with recycle)
 
         **calculate_voltage_angles** (bool, "auto") - consider voltage angles in loadflow calculation
 
@@ -115,12 +127,13 @@ def runpp(net, algorithm='nr', calculate_voltage_angles="auto", init="auto",
             is connected to a line.
 
         **init** (str, "auto") - initialization method of the loadflow
-        pandapower supports four methods for initializing the loadflow:
+        pandapower supports five methods for initializing the loadflow:
 
             - "auto" - init defaults to "dc" if calculate_voltage_angles is True or "flat" otherwise
             - "flat"- flat start with voltage of 1.0pu and angle of 0° at all PQ-buses and 0° for PV buses as initial solution
             - "dc" - initial DC loadflow before the AC loadflow. The results of the DC loadflow are used as initial solution for the AC loadflow.
             - "results" - voltage vector of last loadflow from net.res_bus is used as initial solution. This can be useful to accelerate convergence in iterative loadflows like time series calculations.
+            - "estimate" - the voltages of the ext_grids are propagated through the transformers considering their voltage ratios (and phase shifts if calculate_voltage_angles is True), see topology.estimate_voltage_vector
 
         Considering the voltage angles might lead to non-convergence of the power flow in flat start.
         That is why in "auto" mode, init defaults to "dc" if calculate_voltage_angles is True or "flat" otherwise
@@ -150,14 +163,26 @@ def runpp(net, algorithm='nr', calculate_voltage_angles="auto", init="auto",
             - "current"- transformer loading is given as ratio of current flow and rated current of the transformer. This is the recommended setting, since thermal as well as magnetic effects in the transformer depend on the current.
             - "power" - transformer loading is given as ratio of apparent power flow to the rated apparent power of the transformer.
 
-        **enforce_q_lims** (bool, False) - respect generator reactive power limits
+        **enforce_q_lims** (bool/str, False) - respect generator reactive power limits
 
             If True, the reactive power limits in net.gen.max_q_kvar/min_q_kvar are respected in the
             loadflow. This is done by running a second loadflow if reactive power limits are
             violated at any generator, so that the runtime for the loadflow will increase if reactive
-            power has to be curtailed.
+            power has to be curtailed. Buses that are switched from PV to PQ are not switched back,
+            even if the generator could hold its voltage set point within the limits in the final
+            solution.
+
+            If "inner", the buses of generators that violate their reactive power limits are
+            switched from PV to PQ inside the Newton-Raphson iterations. The iterations are
+            continued from the current voltages with the same Ybus, so that no further power flows
+            are necessary. This is considerably faster if many generators reach their limits.
+            PQ buses at a limit are switched back to PV if the voltage passes the set point (at
+            most three times per bus). Only supported by "nr" and "iwamoto_nr".
 
-            Note: enforce_q_lims only works if algorithm="nr"!
+            Note: enforce_q_lims=True is supported by the algorithms "nr", "iwamoto_nr", "fdbx"
+            and "fdxb" (repeated power flows as described above), "gs" (repeated power flows of
+            PYPOWER) and "bfsw" (the reactive power limits are checked in the iterations of the PV
+            buses).
 
 
         **check_connectivity** (bool, True) - Perform an extra connectivity test after the conversion from pandapower to PYPOWER
@@ -183,6 +208,23 @@ def runpp(net, algorithm='nr', calculate_voltage_angles="auto", init="auto",
 
         **v_debug** (bool, False) - if True, voltage values in each newton-raphson iteration are logged in the ppc
 
+        **lin_solver** (str, "superlu") - sparse linear solver that is used in the Newton-Raphson iterations and in the DC power flow
+
+            - "superlu" - SuperLU direct solver from scipy. The fill-reducing ordering is reused in all iterations.
+            - "umfpack" - UMFPACK direct solver (requires scikit-umfpack). The symbolic factorization is reused in all iterations.
+            - "gmres" - GMRES with incomplete LU preconditioner
+            - "bicgstab" - BiCGSTAB with incomplete LU preconditioner
+
+            See pandapower/benchmark/lin_solver.py for a comparison of the solvers.
+
+        **results** (str, "all") - "all" writes all result tables after the power flow. With "lazy", each result table is only calculated from net["_ppc"] when it is accessed for the first time, which saves the result extraction for tables that are not needed. The element tables must not be changed before the lazy results are accessed. The results of buses and bus elements (ext_grid, gen, load, sgen, storage, shunt, ward, xward, dcline) are calculated together, since they all contribute to the bus power injections.
+
+        **result_tables** (list, None) - result tables that are written (e.g. ["bus", "line"] or ["res_bus", "res_line"]). All other result tables are emptied. The results of buses and bus elements are always written together. None writes all result tables.
+
+        **warm_start** (int, 0) - number of network topologies for which the bus voltages of the last converged power flow are cached in net["_warm_start_cache"]. The topology is identified by the in service buses and branches and the states of the switches. If a cached topology reappears, the power flow is initialized with the cached voltages instead of the init method, the least recently used topology is removed if the cache is full. 0 disables the cache.
+
+        **profile** (bool/callable, False) - records the wall time of each calculation stage (pd2ppc, makeYbus, Jacobian, linear solver, pfsoln, result extraction), the number of iterations, the mismatch norm per iteration and the number of nonzeros of Ybus and the Jacobian in net["_timings"]. If profile is a callable, it is called with the timings after the power flow, e.g. to export them to a monitoring system.
+
         **init_vm_pu** (string/float/array/Series, None) - Allows to define initialization specifically for voltage magnitudes. Only works with init == "auto"!
 
             - "auto": all buses are initialized with the mean value of all voltage controlled elements in the grid
@@ -230,6 +272,9 @@ def runpp(net, algorithm='nr', calculate_voltage_angles="auto", init="auto",
     init_vm_pu = kwargs.get("init_vm_pu", None)
     init_va_degree = kwargs.get("init_va_degree", None)
     recycle = kwargs.get("recycle", None)
+    lin_solver = _check_lin_solver(kwargs.get("lin_solver", "superlu"))
+    warm_start = kwargs.get("warm_start", 0)
+    results, result_tables = _check_result_options(kwargs)
     if "init" in overrule_options:
         init = overrule_options["init"]
 
@@ -242,7 +287,7 @@ def runpp(net, algorithm='nr', calculate_voltage_angles="auto", init="auto",
                     np.any(net["load"]["const_i_percent"].values)):
             voltage_depend_loads = False
 
-    if algorithm not in ['nr', 'bfsw', 'iwamoto_nr'] and voltage_depend_loads == True:
+    if algorithm not in ['nr', 'bfsw', 'iwamoto_nr', 'fdbx', 'fdxb'] and voltage_depend_loads == True:
         logger.warning("voltage-dependent loads not supported for {0} power flow algorithm -> "
                        "loads will be considered as constant power".format(algorithm))
 
@@ -262,6 +307,10 @@ def runpp(net, algorithm='nr', calculate_voltage_angles="auto", init="auto",
     if max_iteration == "auto":
         max_iteration = default_max_iteration[algorithm]
 
+    if enforce_q_lims == "inner" and algorithm not in ["nr", "iwamoto_nr"]:
+        raise ValueError("enforce_q_lims='inner' is only supported by the algorithms 'nr' and "
+                         "'iwamoto_nr'")
+
     if init != "auto" and ((init_va_degree != None) or (init_vm_pu != None)) :
         raise ValueError("Either define initialization through 'init' or through 'init_vm_pu' and 'init_va_degree'.")
 
@@ -274,6 +323,10 @@ def runpp(net, algorithm='nr', calculate_voltage_angles="auto", init="auto",
     elif init == "dc":
         init_vm_pu = "flat"
         init_va_degree = "dc"
+    elif init == "estimate":
+        res_bus = estimate_voltage_vector(net)
+        init_vm_pu = res_bus.vm_pu.values
+        init_va_degree = res_bus.va_degree.values if calculate_voltage_angles else "flat"
     else:
         init_vm_pu = init
         init_va_degree = init
@@ -290,11 +343,73 @@ def runpp(net, algorithm='nr', calculate_voltage_angles="auto", init="auto",
                      trafo3w_losses=trafo3w_losses)
     _add_pf_options(net, tolerance_kva=tolerance_kva, trafo_loading=trafo_loading,
                     numba=numba, ac=ac, algorithm=algorithm, max_iteration=max_iteration,
-                    v_debug=v_debug)
+                    v_debug=v_debug, lin_solver=lin_solver, warm_start=warm_start,
+                    results=results, result_tables=result_tables)
     net._options.update(overrule_options)
+    # the user option lin_solver is only used after the check (e.g. fallback to superlu)
+    net._options["lin_solver"] = lin_solver
     _check_bus_index_and_print_warning_if_high(net)
     _check_gen_index_and_print_warning_if_high(net)
-    _powerflow(net, **kwargs)
+    _run_profiled(net, "runpp", kwargs.pop("profile", False), _powerflow, **kwargs)
+
+
+def runpp_batch(net, p_kw, q_kvar=None, element="load", **kwargs):
+    """
+    Runs a power flow for a batch of power injection scenarios of one element type.
+
+    A regular power flow is carried out first with the given keyword arguments. The ppc and the
+    admittance matrices of this power flow are then reused for all scenarios, so that the
+    conversion from pandapower to PYPOWER format is only carried out once. The scenarios are
+    solved one after another with the Newton-Raphson algorithm, each scenario is initialized with
+    the solution of the previous one.
+
+    INPUT:
+        **net** - The pandapower format network
+
+        **p_kw** (2d array) - active power of the elements for each scenario. One row per scenario,
+        one column per row of net[element].
+
+    OPTIONAL:
+        **q_kvar** (2d array, None) - reactive power of the elements for each scenario (same shape
+        as p_kw). If None, the reactive power in net[element] is used for all scenarios.
+
+        **element** (str, "load") - element table that the power values refer to ("load", "sgen"
+        or "storage")
+
+        **kwargs** - power flow options that are passed to runpp. Only the Newton-Raphson
+        algorithms ("nr" and "iwamoto_nr") without enforce_q_lims are supported.
+
+    OUTPUT:
+        **results** (dict) - results of all scenarios with one row per scenario:
+
+            - "vm_pu": bus voltage magnitudes (columns in the order of net.bus)
+            - "va_degree": bus voltage angles (columns in the order of net.bus)
+            - "line_loading_percent": line loadings (columns in the order of net.line)
+            - "converged": boolean array which is True for converged scenarios
+            - "iterations": number of Newton-Raphson iterations per scenario
+
+        Results of buses and lines that are out of service or not supplied as well as all results
+        of scenarios that did not converge are NaN. The result tables of net contain the results
+        of the base power flow.
+
+    EXAMPLE:
+        import numpy as np
+        import pandapower.networks as pn
+
+        net = pn.create_cigre_network_mv()
+        factors = np.linspace(0.5, 1.5, 100)[:, np.newaxis]
+        res = pp.runpp_batch(net, factors * net.load.p_kw.values)
+    """
+    if element not in ["load", "sgen", "storage"]:
+        raise ValueError("runpp_batch is not implemented for element %s" % element)
+    algorithm = kwargs.get("algorithm", "nr")
+    if algorithm not in ["nr", "iwamoto_nr"]:
+        raise NotImplementedError("runpp_batch is only implemented for the Newton-Raphson "
+                                  "algorithms, not for algorithm %s" % algorithm)
+    if kwargs.get("enforce_q_lims", False):
+        raise NotImplementedError("enforce_q_lims is not supported by runpp_batch")
+    runpp(net, **kwargs)
+    return _run_batch_pf(net, element, p_kw, q_kvar)
 
 
 def rundcpp(net, trafo_model="t", trafo_loading="current", recycle=None, check_connectivity=True,
@@ -333,10 +448,20 @@ def rundcpp(net, trafo_model="t", trafo_loading="current", recycle=None, check_c
 
         **r_switch** (float, 0.0) - resistance of bus-bus-switches. If impedance is zero, buses connected by a closed bus-bus switch are fused to model an ideal bus. Otherwise, they are modelled as branches with resistance r_switch
 
+        **lin_solver** (str, "superlu") - sparse linear solver for the DC power flow, see runpp
+
+        **results** (str, "all") - "lazy" calculates each result table on first access, see runpp
+
+        **result_tables** (list, None) - result tables that are written, see runpp
+
+        **profile** (bool/callable, False) - records the wall time of each calculation stage in net["_timings"], see runpp
+
         ****kwargs** - options to use for PYPOWER.runpf
     """
     ac = False
     numba = True
+    lin_solver = _check_lin_solver(kwargs.get("lin_solver", "superlu"))
+    results, result_tables = _check_result_options(kwargs)
     mode = "pf"
     init = 'flat'
 
@@ -359,15 +484,16 @@ def rundcpp(net, trafo_model="t", trafo_loading="current", recycle=None, check_c
                      enforce_q_lims=enforce_q_lims, recycle=recycle,
                      voltage_depend_loads=False, delta=0, trafo3w_losses=trafo3w_losses)
     _add_pf_options(net, tolerance_kva=tolerance_kva, trafo_loading=trafo_loading,
-                    numba=numba, ac=ac, algorithm=algorithm, max_iteration=max_iteration)
+                    numba=numba, ac=ac, algorithm=algorithm, max_iteration=max_iteration,
+                    lin_solver=lin_solver, results=results, result_tables=result_tables)
     _check_bus_index_and_print_warning_if_high(net)
     _check_gen_index_and_print_warning_if_high(net)
-    _powerflow(net, **kwargs)
+    _run_profiled(net, "rundcpp", kwargs.pop("profile", False), _powerflow, **kwargs)
 
 
 def runopp(net, verbose=False, calculate_voltage_angles=False, check_connectivity=False,
            suppress_warnings=True, r_switch=0.0, delta=1e-10, init="flat", numba=True,
-           trafo3w_losses="hv", **kwargs):
+           trafo3w_losses="hv", profile=False, **kwargs):
     """
     Runs the  pandapower Optimal Power Flow.
     Flexibilities, constraints and cost parameters are defined in the pandapower element tables.
@@ -417,11 +543,16 @@ def runopp(net, verbose=False, calculate_voltage_angles=False, check_connectivit
             "flat" (default): starting vector is (upper bound - lower bound) / 2
             "pf": a power flow is executed prior to the opf and the pf solution is the starting vector. This may improve
             convergence, but takes a longer runtime (which are probably neglectible for opf calculations)
+
+        **lin_solver** (str, "superlu") - sparse linear solver for the interior point steps of the OPF and the initial power flow, see runpp
+
+        **profile** (bool/callable, False) - records the wall time of each calculation stage, the number of interior point iterations and the feasibility condition per iteration in net["_timings"], see runpp
     """
     logger.warning("The OPF cost definition has changed! Please check out the tutorial 'opf_changes-may18.ipynb' or the documentation!")
     _check_necessary_opf_parameters(net, logger)
     if numba:
         numba = _check_if_numba_is_installed(numba)
+    lin_solver = _check_lin_solver(kwargs.pop("lin_solver", "superlu"))
     mode = "opf"
     ac = True
     copy_constraints_to_ppc = True
@@ -437,14 +568,16 @@ def runopp(net, verbose=False, calculate_voltage_angles=False, check_connectivit
                      r_switch=r_switch, init_vm_pu=init, init_va_degree=init,
                      enforce_q_lims=enforce_q_lims, recycle=recycle,
                      voltage_depend_loads=False, delta=delta, trafo3w_losses=trafo3w_losses)
-    _add_opf_options(net, trafo_loading=trafo_loading, ac=ac, init=init, numba=numba)
+    _add_opf_options(net, trafo_loading=trafo_loading, ac=ac, init=init, numba=numba,
+                     lin_solver=lin_solver)
     _check_bus_index_and_print_warning_if_high(net)
     _check_gen_index_and_print_warning_if_high(net)
-    _optimal_powerflow(net, verbose, suppress_warnings, **kwargs)
+    _run_profiled(net, "runopp", profile, _optimal_powerflow, verbose, suppress_warnings,
+                  **kwargs)
 
 
 def rundcopp(net, verbose=False, check_connectivity=True, suppress_warnings=True, r_switch=0.0,
-             delta=1e-10, trafo3w_losses="hv", **kwargs):
+             delta=1e-10, trafo3w_losses="hv", profile=False, **kwargs):
     """
     Runs the  pandapower Optimal Power Flow.
     Flexibilities, constraints and cost parameters are defined in the pandapower element tables.
@@ -474,6 +607,8 @@ def rundcopp(net, verbose=False, check_connectivity=True, suppress_warnings=True
             processed in pypower, ComplexWarnings are raised during the loadflow.
             These warnings are suppressed by this option, however keep in mind all other pypower
             warnings are suppressed, too.
+
+        **profile** (bool/callable, False) - records the wall time of each calculation stage in net["_timings"], see runopp
     """
 
     if (not net.sgen.empty) & (not "controllable" in net.sgen.columns):
@@ -500,7 +635,8 @@ def rundcopp(net, verbose=False, check_connectivity=True, suppress_warnings=True
                      r_switch=r_switch, init_vm_pu=init, init_va_degree=init,
                      enforce_q_lims=enforce_q_lims, recycle=recycle,
                      voltage_depend_loads=False, delta=delta, trafo3w_losses=trafo3w_losses)
-    _add_opf_options(net, trafo_loading=trafo_loading, init=init, ac=ac)
+    _add_opf_options(net, trafo_loading=trafo_loading, init=init, ac=ac, lin_solver="superlu")
     _check_bus_index_and_print_warning_if_high(net)
     _check_gen_index_and_print_warning_if_high(net)
-    _optimal_powerflow(net, verbose, suppress_warnings, **kwargs)
+    _run_profiled(net, "rundcopp", profile, _optimal_powerflow, verbose, suppress_warnings,
+                  **kwargs)
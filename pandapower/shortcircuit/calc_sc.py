@@ -10,22 +10,21 @@ except ImportError:
     import logging
 
 logger = logging.getLogger(__name__)
-#import time
 
-from pandapower.auxiliary import _clean_up, _add_ppc_options, _add_sc_options
+from pandapower.auxiliary import _add_ppc_options, _add_sc_options
 from pandapower.pd2ppc import _pd2ppc
 from pandapower.pd2ppc_zero import _pd2ppc_zero
-from pandapower.powerflow import _add_auxiliary_elements
 from pandapower.results import _copy_results_ppci_to_ppc
 from pandapower.shortcircuit.currents import _calc_ikss, _calc_ikss_1ph, _calc_ip, _calc_ith, _calc_branch_currents
 from pandapower.shortcircuit.impedance import _calc_zbus, _calc_ybus, _calc_rx
 from pandapower.shortcircuit.kappa import _add_kappa_to_ppc
 from pandapower.shortcircuit.results import _extract_results
+from pandapower.timing import _run_profiled, _timed
 
 
 def calc_sc(net, fault="3ph", case='max', lv_tol_percent=10, topology="auto", ip=False,
             ith=False, tk_s=1., kappa_method="C", r_fault_ohm=0., x_fault_ohm=0.,
-            branch_results=False):
+            branch_results=False, profile=False):
     """
     Calculates minimal or maximal symmetrical short-circuit currents.
     The calculation is based on the method of the equivalent voltage source
@@ -79,6 +78,8 @@ def calc_sc(net, fault="3ph", case='max', lv_tol_percent=10, topology="auto", ip
 
         **x_fault_ohm** (float, 0) fault reactance in Ohm
 
+        **profile** (bool/callable, False) records the wall time of each calculation stage and the number of nonzeros of Ybus in net["_timings"] (see runpp)
+
         **consider_sgens** (bool, True) defines if short-circuit contribution of static generators should be considered or not
 
 
@@ -118,73 +119,56 @@ def calc_sc(net, fault="3ph", case='max', lv_tol_percent=10, topology="auto", ip
                     topology=topology, r_fault_ohm=r_fault_ohm, kappa_method=kappa_method,
                     x_fault_ohm=x_fault_ohm, kappa=kappa, ip=ip, ith=ith,
                     consider_sgens=False, branch_results=branch_results)
-    if fault == "3ph":
-        _calc_sc(net)
-    if fault == "2ph":
-        _calc_sc(net)
+    if fault == "1ph" and case == "min":
+        raise NotImplementedError("Minimum 1ph short-circuits are not yet implemented")
+    if fault == "3ph" or fault == "2ph":
+        _run_profiled(net, "calc_sc", profile, _calc_sc)
     if fault == "1ph":
-        if case == "min":
-            raise NotImplementedError("Minimum 1ph short-circuits are not yet implemented")
-        _calc_sc_1ph(net)
+        _run_profiled(net, "calc_sc", profile, _calc_sc_1ph)
 
 
 def _calc_sc(net):
-    #    t0 = time.perf_counter()
-    _add_auxiliary_elements(net)
-    ppc, ppci = _pd2ppc(net)
-#    t1 = time.perf_counter()
-    _calc_ybus(ppci)
-#    t2 = time.perf_counter()
-    try:
+    timings = net["_options"].get("timings")
+    with _timed(timings, "pd2ppc"):
+        ppc, ppci = _pd2ppc(net)
+    with _timed(timings, "makeYbus"):
+        _calc_ybus(ppci)
+    with _timed(timings, "zbus"):
         _calc_zbus(ppci)
-    except Exception as e:
-        _clean_up(net, res=False)
-        raise(e)
-    _calc_rx(net, ppci)
-#    t3 = time.perf_counter()
-    _add_kappa_to_ppc(net, ppci)
-#    t4 = time.perf_counter()
-    _calc_ikss(net, ppci)
-    if net["_options"]["ip"]:
-        _calc_ip(net, ppci)
-    if net["_options"]["ith"]:
-        _calc_ith(net, ppci)
-    if net._options["branch_results"]:
-        _calc_branch_currents(net, ppci)
-    ppc = _copy_results_ppci_to_ppc(ppci, ppc, "sc")
-    _extract_results(net, ppc, ppc_0=None)
-    _clean_up(net)
-#    t5 = time.perf_counter()
-#    net._et = {"sum": t5-t0, "model": t1-t0, "ybus": t2-t1, "zbus": t3-t2, "kappa": t4-t3,
-#               "currents": t5-t4}
+    with _timed(timings, "kappa"):
+        _calc_rx(net, ppci)
+        _add_kappa_to_ppc(net, ppci)
+    with _timed(timings, "currents"):
+        _calc_ikss(net, ppci)
+        if net["_options"]["ip"]:
+            _calc_ip(net, ppci)
+        if net["_options"]["ith"]:
+            _calc_ith(net, ppci)
+        if net._options["branch_results"]:
+            _calc_branch_currents(net, ppci)
+    if timings is not None:
+        timings["nnz_Ybus"] = ppci["internal"]["Ybus"].nnz
+    with _timed(timings, "extract_results"):
+        ppc = _copy_results_ppci_to_ppc(ppci, ppc, "sc")
+        _extract_results(net, ppc, ppc_0=None)
 
 
 def _calc_sc_1ph(net):
     """
     calculation method for single phase to ground short-circuit currents
     """
-    _add_auxiliary_elements(net)
 # pos. seq bus impedance
     ppc, ppci = _pd2ppc(net)
     _calc_ybus(ppci)
-    try:
-        _calc_zbus(ppci)
-    except Exception as e:
-        _clean_up(net, res=False)
-        raise(e)
+    _calc_zbus(ppci)
     _calc_rx(net, ppci)
     _add_kappa_to_ppc(net, ppci)
 # zero seq bus impedance
     ppc_0, ppci_0 = _pd2ppc_zero(net)
     _calc_ybus(ppci_0)
-    try:
-        _calc_zbus(ppci_0)
-    except Exception as e:
-        _clean_up(net, res=False)
-        raise(e)
+    _calc_zbus(ppci_0)
     _calc_rx(net, ppci_0)
     _calc_ikss_1ph(net, ppci, ppci_0)
     ppc_0 = _copy_results_ppci_to_ppc(ppci_0, ppc_0, "sc")
     ppc = _copy_results_ppci_to_ppc(ppci, ppc, "sc")
     _extract_results(net, ppc, ppc_0)
-    _clean_up(net)
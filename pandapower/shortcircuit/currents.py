@@ -11,6 +11,7 @@ import pandas as pd
 from pandapower.shortcircuit.idx_brch import IKSS_F, IKSS_T, IP_F, IP_T, ITH_F, ITH_T
 from pandapower.shortcircuit.idx_bus import C_MIN, C_MAX, KAPPA, R_EQUIV, IKSS1, IP, ITH, X_EQUIV, IKSS2, IKCV, M
 from pandapower.auxiliary import _sum_by_group
+from pandapower.pf.ppci_variables import _get_branch_buses
 
 
 def _calc_ikss(net, ppc):
@@ -97,8 +98,7 @@ def _calc_branch_currents(net, ppc):
     Yt = ppc["internal"]["Yf"]
     baseI = ppc["internal"]["baseI"]
     n = ppc["bus"].shape[0]
-    fb = np.real(ppc["branch"][:, 0]).astype(int)
-    tb = np.real(ppc["branch"][:, 1]).astype(int)
+    fb, tb = _get_branch_buses(ppc["branch"])
     minmax = np.nanmin if case == "min" else np.nanmax
     # calculate voltage source branch current
     V_ikss = (ppc["bus"][:, IKSS1] * baseI) * Zbus
@@ -113,8 +113,6 @@ def _calc_branch_currents(net, ppc):
         current = np.tile(-ppc["bus"][:, IKCV], (n, 1))
         np.fill_diagonal(current, current.diagonal() + ppc["bus"][:, IKSS2])
         V = np.dot((current * baseI), Zbus).T
-        fb = np.real(ppc["branch"][:, 0]).astype(int)
-        tb = np.real(ppc["branch"][:, 1]).astype(int)
         ikss2_all_f = np.conj(Yf.dot(V))
         ikss2_all_t = np.conj(Yt.dot(V))
         ikss_all_f = abs(ikss1_all_f + ikss2_all_f)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+import numpy as np
+import pytest
+
+import pandapower as pp
+from pandapower.toolbox import nets_equal
+
+
+def _create_elements(net):
+    b1 = pp.create_bus(net, 110., geodata=(0, 0))
+    b2 = pp.create_bus(net, 20., max_vm_pu=1.05)
+    b3 = pp.create_bus(net, 20.)
+    b4 = pp.create_bus(net, 20., index=10)
+    b5 = pp.create_bus(net, 0.4, name="lv")
+    pp.create_ext_grid(net, b1)
+    pp.create_transformer(net, b1, b2, "25 MVA 110/20 kV")
+    pp.create_transformer_from_parameters(net, b3, b5, 400, 20, 0.4, 1.5, 6, 0.5, 0.2,
+                                          tp_mid=0, tp_pos=1)
+    l1 = pp.create_line(net, b2, b3, 1., "NA2XS2Y 1x95 RM/25 12/20 kV", geodata=[(0, 0), (1, 1)])
+    pp.create_line_from_parameters(net, b3, b4, 2., 0.2, 0.1, 200, 0.3)
+    pp.create_line(net, b2, b4, 1.5, "NA2XS2Y 1x185 RM/25 12/20 kV", in_service=False)
+    pp.create_switch(net, b2, l1, "l", type="LS")
+    pp.create_switch(net, b3, b4, "b")
+    pp.create_load(net, b3, 1000., q_kvar=200.)
+    pp.create_load_from_cosphi(net, b4, 500., 0.95, "ind")
+    pp.create_sgen(net, b4, -300., controllable=True, max_p_kw=0.)
+    pp.create_gen(net, b5, -50., vm_pu=1.01)
+    pp.create_shunt(net, b3, 100.)
+    pp.create_shunt(net, b5, 10., vn_kv=0.42)
+    pp.create_xward(net, b4, 100, 100, 100, 100, 0.1, 0.1, 1.0)
+    pp.create_measurement(net, "v", "bus", 1.01, 0.01, b3)
+
+
+def test_bulk_create_equals_single_create():
+    single = pp.create_empty_network()
+    _create_elements(single)
+
+    bulk = pp.create_empty_network()
+    with pp.bulk_create(bulk):
+        _create_elements(bulk)
+        # the elements are only added when the builder is committed
+        assert len(bulk.bus) == 0
+    assert nets_equal(single, bulk, check_only_results=False)
+    for table in ["bus", "line", "trafo", "switch", "load", "sgen", "gen", "shunt", "xward"]:
+        assert single[table].dtypes.equals(bulk[table].dtypes), table
+
+    pp.runpp(single)
+    pp.runpp(bulk)
+    assert np.allclose(single.res_bus.vm_pu.values, bulk.res_bus.vm_pu.values)
+
+
+def test_bulk_create_index():
+    net = pp.create_empty_network()
+    pp.create_buses(net, 3, 0.4)
+    with pp.bulk_create(net):
+        assert pp.create_bus(net, 0.4) == 3
+        assert pp.create_bus(net, 0.4, index=7) == 7
+        assert pp.create_bus(net, 0.4) == 8
+        with pytest.raises(UserWarning):
+            pp.create_bus(net, 0.4, index=7)
+        with pytest.raises(UserWarning):
+            pp.create_bus(net, 0.4, index=1)
+    assert list(net.bus.index) == [0, 1, 2, 3, 7, 8]
+
+
+def test_network_builder():
+    net = pp.create_empty_network()
+    builder = pp.NetworkBuilder(net)
+    builder.start()
+    with pytest.raises(UserWarning):
+        pp.NetworkBuilder(net).start()
+    b = pp.create_bus(net, 0.4)
+    pp.create_load(net, b, 10.)
+    assert builder.active
+    builder.commit()
+    assert not builder.active
+    assert len(net.bus) == 1
+    assert len(net.load) == 1
+
+    # elements are created directly after the commit
+    pp.create_load(net, b, 10.)
+    assert len(net.load) == 2
+
+    # elements are discarded if an exception is raised
+    with pytest.raises(ValueError):
+        with pp.bulk_create(net):
+            pp.create_bus(net, 0.4)
+            raise ValueError()
+    assert len(net.bus) == 1
+
+    # the buses of elements are checked when the builder is committed
+    with pytest.raises(UserWarning):
+        with pp.bulk_create(net):
+            pp.create_load(net, 5, 10.)
+
+
+def test_commit_is_atomic():
+    net = pp.create_empty_network()
+    b = pp.create_bus(net, 20., geodata=(0, 0))
+    pp.create_load(net, b, 10.)
+    expected = pp.copy.deepcopy(net)
+    with pytest.raises(UserWarning):
+        with pp.bulk_create(net):
+            b1 = pp.create_bus(net, 20., geodata=(1, 1))
+            pp.create_line(net, b, b1, 1., "NA2XS2Y 1x95 RM/25 12/20 kV")
+            pp.create_sgen(net, b1, -100., controllable=True)
+            # the to bus of the second line does not exist
+            pp.create_line(net, b1, 5, 1., "NA2XS2Y 1x95 RM/25 12/20 kV")
+            pp.create_load(net, b1, 10.)
+    assert nets_equal(net, expected)
+    assert len(net.line) == 0 and len(net.sgen) == 0
+    assert len(net.bus) == 1 and len(net.bus_geodata) == 1
+
+
+if __name__ == "__main__":
+    pytest.main(["test_builder.py"])
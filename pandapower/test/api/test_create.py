@@ -157,5 +157,115 @@ def test_create_buses():
         pp.create_buses(net, 2, 110, geodata=geodata)
 
 
+def _create_single_and_bulk_nets():
+    nets = []
+    for _ in range(2):
+        net = pp.create_empty_network()
+        pp.create_buses(net, 2, 20.)
+        pp.create_buses(net, 4, 0.4)
+        pp.create_ext_grid(net, 0)
+        nets.append(net)
+    single, bulk = nets
+
+    pp.create_transformer(single, 0, 2, "0.4 MVA 20/0.4 kV")
+    pp.create_transformer(single, 1, 3, "0.63 MVA 20/0.4 kV", tp_pos=1, max_loading_percent=80.)
+    pp.create_transformers(bulk, [0, 1], [2, 3], ["0.4 MVA 20/0.4 kV", "0.63 MVA 20/0.4 kV"],
+                           tp_pos=[np.nan, 1], max_loading_percent=[np.nan, 80.])
+    pp.create_transformer_from_parameters(single, 0, 5, 400, 20, 0.4, 1.5, 6, 0.5, 0.2)
+    pp.create_transformers_from_parameters(bulk, [0], [5], 400, 20, 0.4, 1.5, 6, 0.5, 0.2)
+
+    for b in [2, 3]:
+        pp.create_line(single, b, 4, 0.1, "NAYY 4x50 SE", geodata=[(0, 0), (b, 1)])
+    pp.create_line(single, 4, 5, 0.2, "NAYY 4x150 SE", parallel=2)
+    pp.create_lines(bulk, [2, 3], 4, 0.1, "NAYY 4x50 SE", geodata=[[(0, 0), (2, 1)],
+                                                                   [(0, 0), (3, 1)]])
+    pp.create_lines(bulk, [4], [5], 0.2, "NAYY 4x150 SE", parallel=2)
+    pp.create_line_from_parameters(single, 2, 5, 0.3, 0.2, 0.1, 200, 0.3, name="l")
+    pp.create_lines_from_parameters(bulk, [2], [5], 0.3, 0.2, 0.1, 200, 0.3, name="l")
+
+    pp.create_switch(single, 2, 0, "l", closed=False)
+    pp.create_switch(single, 0, 1, "b")
+    pp.create_switch(single, 1, 1, "t")
+    pp.create_switches(bulk, [2, 0, 1], [0, 1, 1], ["l", "b", "t"], closed=[False, True, True])
+
+    for b, p in zip([3, 4, 5], [10., 20., 30.]):
+        pp.create_load(single, b, p, q_kvar=2., max_p_kw=p * 2, controllable=b == 5)
+        pp.create_sgen(single, b, -p, name="pv", k=1.2)
+        pp.create_gen(single, b, -p, vm_pu=1.01)
+        pp.create_storage(single, b, -p, max_e_kwh=100.)
+        pp.create_shunt(single, b, 5.)
+    pp.create_loads(bulk, [3, 4, 5], [10., 20., 30.], q_kvar=2., max_p_kw=[20., 40., 60.],
+                    controllable=[False, False, True])
+    pp.create_sgens(bulk, [3, 4, 5], [-10., -20., -30.], name="pv", k=1.2)
+    pp.create_gens(bulk, [3, 4, 5], [-10., -20., -30.], vm_pu=1.01)
+    pp.create_storages(bulk, [3, 4, 5], [-10., -20., -30.], max_e_kwh=100.)
+    pp.create_shunts(bulk, [3, 4, 5], 5.)
+    return single, bulk
+
+
+def test_create_multiple_elements():
+    single, bulk = _create_single_and_bulk_nets()
+    for table in ["trafo", "line", "line_geodata", "switch", "load", "sgen", "gen", "storage",
+                  "shunt"]:
+        expected = single[table]
+        created = bulk[table]
+        assert sorted(created.columns) == sorted(expected.columns)
+        created = created[expected.columns]
+        assert created.dtypes.equals(expected.dtypes), table
+        assert pp.dataframes_equal(created, expected), table
+
+    pp.runpp(single)
+    pp.runpp(bulk)
+    assert np.allclose(single.res_bus.vm_pu.values, bulk.res_bus.vm_pu.values)
+
+
+def test_create_optional_columns_in_filled_tables():
+    single = pp.create_empty_network()
+    bulk = pp.create_empty_network()
+    for net in [single, bulk]:
+        b = pp.create_bus(net, 0.4)
+        pp.create_load(net, b, 10.)
+        pp.create_sgen(net, b, -10.)
+    pp.create_load(single, 0, 5., controllable=True, max_p_kw=10.)
+    pp.create_load(single, 0, 5., controllable=False, max_p_kw=10.)
+    pp.create_sgen(single, 0, -5., controllable=True)
+    pp.create_loads(bulk, [0, 0], 5., controllable=[True, False], max_p_kw=10.)
+    pp.create_sgens(bulk, [0], -5., controllable=True)
+
+    for net in [single, bulk]:
+        # the existing elements are not controllable and have no limits
+        assert net.load.controllable.dtype == bool
+        assert net.load.controllable.tolist() == [False, True, False]
+        assert net.load.max_p_kw.dtype == float
+        assert np.isnan(net.load.max_p_kw.at[0])
+        assert net.sgen.controllable.dtype == bool
+        assert net.sgen.controllable.tolist() == [False, True]
+    for table in ["load", "sgen"]:
+        assert single[table].dtypes.equals(bulk[table].dtypes)
+        assert pp.dataframes_equal(single[table], bulk[table]), table
+
+
+def test_create_multiple_elements_errors():
+    net = pp.create_empty_network()
+    pp.create_buses(net, 3, 0.4)
+    pp.create_loads(net, [0, 1], 10., index=[5, 7])
+    assert list(net.load.index) == [5, 7]
+    assert list(pp.create_loads(net, [2], 10.)) == [8]
+    with pytest.raises(UserWarning):
+        pp.create_loads(net, [0, 3], 10.)
+    with pytest.raises(UserWarning):
+        pp.create_loads(net, [0, 1], 10., index=[7, 9])
+    with pytest.raises(UserWarning):
+        pp.create_loads(net, [0, 1], 10., index=[9, 9])
+    with pytest.raises(UserWarning):
+        pp.create_lines(net, [0], [1], 1., "unknown type")
+    l = pp.create_lines(net, [0], [1], 1., "NAYY 4x50 SE")
+    with pytest.raises(UserWarning):
+        pp.create_switches(net, [2], l, "l")
+    with pytest.raises(NotImplementedError):
+        pp.create_switches(net, [0], [0], "t3")
+    assert len(net.switch) == 0
+
+
 if __name__ == '__main__':
     pytest.main(["test_create.py"])
@@ -71,6 +71,54 @@ def test_json(net_in, tempdir):
     assert_net_equal(net_in, net_out)
 
 
+def test_binary(net_in, tempdir):
+    filename = os.path.join(tempdir, "testfile.ppb")
+    net_in.line['test'] = 123
+    pp.set_user_pf_options(net_in, tolerance_kva=1e3)
+    pp.to_binary(net_in, filename)
+    for mmap in [True, False]:
+        net_out = pp.from_binary(filename, mmap=mmap)
+        assert_net_equal(net_in, net_out)
+        assert net_out.user_pf_options == net_in.user_pf_options
+        assert net_out.std_types == net_in.std_types
+        for table in ["bus", "line", "load", "res_bus", "line_geodata"]:
+            assert (net_out[table].dtypes == net_in[table].dtypes).all()
+        assert net_out.line_geodata.coords.apply(np.array).apply(np.shape).equals(
+            net_in.line_geodata.coords.apply(np.array).apply(np.shape))
+
+    net_out = pp.from_binary(filename, tables=["bus", "line"])
+    assert pp.dataframes_equal(net_out.line, net_in.line)
+    assert len(net_out.load) == 0
+    assert len(net_out.res_bus) == 0
+    assert net_out.name == net_in.name
+
+
+@pytest.mark.parametrize("file_format", ["p", "json", "db", "ppb"])
+def test_selective_loading(net_in, tempdir, file_format):
+    filename = os.path.join(tempdir, "testfile." + file_format)
+    pp.runpp(net_in)
+    save, load = {"p": (pp.to_pickle, pp.from_pickle), "json": (pp.to_json, pp.from_json),
+                  "db": (pp.to_sqlite, pp.from_sqlite), "ppb": (pp.to_binary, pp.from_binary)
+                  }[file_format]
+    save(net_in, filename)
+
+    net_out = load(filename, tables=["bus", "line", "load", "res_bus"])
+    for table in ["bus", "line", "load", "res_bus"]:
+        assert pp.dataframes_equal(net_out[table], net_in[table])
+    for table in ["trafo", "sgen", "line_geodata", "res_line"]:
+        assert len(net_in[table])
+        assert len(net_out[table]) == 0
+    for element, std_types in net_in.std_types.items():
+        assert set(net_out.std_types[element]) == set(std_types)
+
+    net_out = load(filename, exclude_tables=["line_geodata", "bus_geodata"],
+                   include_results=False)
+    excluded = ["line_geodata", "bus_geodata"] + [t for t in net_in.keys() if t.startswith("res_")]
+    assert pp.nets_equal(net_in, net_out, exclude_elms=excluded)
+    for table in excluded:
+        assert len(net_out[table]) == 0
+
+
 def test_type_casting_json(net_in, tempdir):
     filename = os.path.join(tempdir, "testfile.json")
     net_in.sn_kva = 1000
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+from collections import OrderedDict
+
+import pytest
+
+import pandapower.networks as pn
+from pandapower.benchmark import run_benchmarks, compare_benchmarks
+from pandapower.benchmark.__main__ import main
+
+
+def test_run_benchmarks():
+    cases = OrderedDict([("case9", pn.case9), ("example_simple", pn.example_simple)])
+    benchmarks = ["create", "runpp_nr", "runpp_fdbx", "rundcpp", "calc_sc", "estimate",
+                  "to_json", "from_json", "to_binary", "from_binary"]
+    results = run_benchmarks(cases, benchmarks, repetitions=1, max_buses={"estimate": 8})
+    assert len(results) == 2 * len(benchmarks) - 1
+    assert results.success.all()
+    assert not ((results.case == "case9") & (results.benchmark == "estimate")).any()
+    case9 = results[results.case == "case9"].set_index("benchmark")
+    assert (case9.time_s > 0).all()
+    assert case9.at["runpp_nr", "iterations"] > 0
+    assert case9.at["runpp_nr", "stage_pf_algorithm"] > 0
+    assert case9.at["calc_sc", "stage_zbus"] > 0
+    simple = results[results.case == "example_simple"].set_index("benchmark")
+    assert simple.at["estimate", "stage_solve_linear_system"] > 0
+
+
+def test_unknown_benchmark():
+    with pytest.raises(ValueError):
+        run_benchmarks({"case9": pn.case9}, ["runpp_xyz"])
+
+
+def test_failed_benchmark_is_reported():
+    results = run_benchmarks({"case9": pn.case9}, ["runpp_nr"], repetitions=1)
+    assert results.success.all()
+
+    def failing_case():
+        raise ValueError("no network")
+    results = run_benchmarks({"failing": failing_case}, ["runpp_nr"], repetitions=1)
+    assert not results.success.any()
+    assert "no network" in results.error.iloc[0]
+
+
+def test_compare_benchmarks():
+    results = run_benchmarks({"case9": pn.case9}, ["runpp_nr", "rundcpp"], repetitions=1)
+    baseline = results.copy()
+    assert len(compare_benchmarks(results, baseline)) == 0
+    baseline["time_s"] = results.time_s / 2.
+    slowdowns = compare_benchmarks(results, baseline, min_time_s=0.)
+    assert len(slowdowns) == 2
+    assert (slowdowns.ratio > 1.9).all()
+
+
+def test_main(tmpdir):
+    output = str(tmpdir.join("results.csv"))
+    assert main(["--cases", "case9", "--benchmarks", "runpp_nr", "--repetitions", "1",
+                 "--output", output]) == 0
+    assert main(["--cases", "case9", "--benchmarks", "runpp_nr", "--repetitions", "1",
+                 "--baseline", output, "--tolerance", "1000"]) == 0
+
+
+if __name__ == "__main__":
+    pytest.main(["-xs", __file__])
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+import numpy as np
+import pytest
+
+import pandapower as pp
+import pandapower.networks as pn
+from pandapower.contingency import run_contingency
+
+
+def _compare_with_runpp(net, res, element="line", **kwargs):
+    for k, idx in enumerate(res["outages"]):
+        net[element].at[idx, "in_service"] = False
+        try:
+            pp.runpp(net, **kwargs)
+            converged = net.converged
+        except pp.LoadflowNotConverged:
+            converged = False
+        finally:
+            net[element].at[idx, "in_service"] = True
+        assert res["converged"][k] == converged
+        if not converged:
+            assert np.all(np.isnan(res["vm_pu"][k]))
+            continue
+        assert np.allclose(res["vm_pu"][k], net.res_bus.vm_pu.values, equal_nan=True)
+        assert np.allclose(res["va_degree"][k], net.res_bus.va_degree.values, equal_nan=True)
+        # runpp reports a zero loading for some lines at isolated buses
+        loading = net.res_line.loading_percent.values
+        supplied = ~np.isnan(res["line_loading_percent"][k])
+        assert np.allclose(res["line_loading_percent"][k][supplied], loading[supplied], atol=1e-5)
+        assert np.all(np.isnan(loading[~supplied]) | (loading[~supplied] == 0))
+        loading = net.res_trafo.loading_percent.values
+        supplied = ~np.isnan(res["trafo_loading_percent"][k])
+        assert np.allclose(res["trafo_loading_percent"][k][supplied], loading[supplied], atol=1e-5)
+        assert np.all(np.isnan(loading[~supplied]) | (loading[~supplied] == 0))
+
+
+def test_line_outages_case9():
+    net = pn.case9()
+    res = run_contingency(net)
+    assert len(res["outages"]) == len(net.line)
+    assert res["vm_pu"].shape == (len(net.line), len(net.bus))
+    assert res["line_loading_percent"].shape == (len(net.line), len(net.line))
+    assert res["converged"].all()
+    # the outages of the generator lines isolate the generator buses (all buses for line 0)
+    assert np.array_equal(np.isnan(res["vm_pu"]).sum(axis=1), [8, 0, 0, 1, 0, 0, 1, 0, 0])
+    # the outaged line is not loaded
+    loading = np.diag(res["line_loading_percent"][:, res["outages"]])
+    assert np.allclose(loading[[1, 2, 4, 5, 7, 8]], 0)
+    _compare_with_runpp(net, res)
+
+
+def test_outages_cigre_mv():
+    net = pn.create_cigre_network_mv(with_der="pv_wind")
+    # open rings: the outage of a radial line isolates buses
+    outages = net.line.index[net.line.in_service].values
+    res = run_contingency(net, outages=outages, processes=2)
+    assert np.any(np.isnan(res["vm_pu"][res["converged"]]))
+    _compare_with_runpp(net, res)
+
+    res = run_contingency(net, element="trafo")
+    assert res["trafo_loading_percent"].shape == (len(net.trafo), len(net.trafo))
+    _compare_with_runpp(net, res, element="trafo")
+
+    res = run_contingency(net, trafo_loading="power")
+    _compare_with_runpp(net, res, trafo_loading="power")
+
+
+def test_contingency_errors():
+    net = pn.case9()
+    with pytest.raises(NotImplementedError):
+        run_contingency(net, algorithm="bfsw")
+    net.line.at[0, "in_service"] = False
+    with pytest.raises(ValueError):
+        run_contingency(net, outages=[0])
+    with pytest.raises(ValueError):
+        run_contingency(net, element="bus")
+
+
+if __name__ == "__main__":
+    pytest.main(["test_contingency.py", "-xs"])
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+import numpy as np
+import pytest
+
+import pandapower as pp
+import pandapower.networks as pn
+from pandapower.contingency import screen_contingencies
+from pandapower.contingency.dc_screening import _get_ptdf, _get_max_post_outage_loading
+from pandapower.idx_brch import PF
+from pandapower.pf.makePTDF import makePTDF, makeLODF
+from pandapower.pf.run_batch_pf import _ppci_from_ppc
+
+
+def test_ptdf_lodf_case30():
+    net = pn.case30()
+    pp.rundcpp(net)
+    ppci = _ppci_from_ppc(net._ppc)
+    bus, branch = ppci["bus"], ppci["branch"]
+    PTDF = makePTDF(bus, branch)
+    assert np.allclose(makePTDF(bus, branch, using_sparse_solver=False), PTDF)
+
+    # flow change for an additional load at a bus is given by the PTDF column
+    load_bus = 7
+    pf_base = branch[:, PF].real.copy()
+    pp.create_load(net, load_bus, p_kw=10e3)
+    pp.rundcpp(net)
+    ppc_bus = net._pd2ppc_lookups["bus"][load_bus]
+    assert np.allclose(net._ppc["branch"][:, PF].real - pf_base, -PTDF[:, ppc_bus] * 10.)
+
+    # post outage flows are given by the LODF column
+    net.load.drop(net.load.index[-1], inplace=True)
+    LODF = makeLODF(branch, PTDF)
+    assert np.allclose(np.diag(LODF)[~np.isnan(np.diag(LODF))], -1)
+    for k in [0, 5, 20]:
+        idx = net.line.index[k]
+        net.line.at[idx, "in_service"] = False
+        pp.rundcpp(net)
+        net.line.at[idx, "in_service"] = True
+        pf_post = pf_base + LODF[:, k] * pf_base[k]
+        pf_post[k] = 0
+        assert np.allclose(net.res_line.p_from_kw.values * 1e-3, pf_post[:len(net.line)])
+
+    # only the columns of the given outages
+    outages = np.array([20, 3, 5])
+    assert np.allclose(makeLODF(branch, PTDF, outages), LODF[:, outages], equal_nan=True)
+
+
+def test_screen_contingencies():
+    net = pn.case30()
+    res = screen_contingencies(net)
+    assert len(res["outages"]) == len(net.line)
+    # islanding outages are ranked first, then by descending loading
+    islanding = np.isnan(res["max_loading_percent"])
+    assert islanding.any()
+    assert np.all(islanding[:islanding.sum()])
+    assert np.all(np.diff(res["max_loading_percent"][~islanding]) <= 0)
+    # the chunks and the dense solver give the same results
+    res_dense = screen_contingencies(net, using_sparse_solver=False)
+    assert np.allclose(res_dense["max_loading_percent"], res["max_loading_percent"],
+                       equal_nan=True)
+    chunked = _get_max_post_outage_loading(net, _ppci_from_ppc(net._ppc),
+                                           net["_dc_sensitivity_cache"]["PTDF"],
+                                           np.arange(len(net.line)), chunk_size=7)
+    assert np.allclose(np.sort(chunked[0]), np.sort(res["max_loading_percent"]), equal_nan=True)
+
+    # compare with DC power flows with the line out of service
+    for idx, max_loading in zip(res["outages"][~islanding], res["max_loading_percent"][~islanding]):
+        net.line.at[idx, "in_service"] = False
+        pp.rundcpp(net)
+        net.line.at[idx, "in_service"] = True
+        assert np.isclose(net.res_line.loading_percent.max(), max_loading)
+
+    limit = np.nanmedian(res["max_loading_percent"])
+    res = screen_contingencies(net, max_loading_percent=limit, run_ac=True)
+    critical = islanding | (res["max_loading_percent"] > limit)
+    assert np.array_equal(res["critical"], res["outages"][critical])
+    assert np.array_equal(res["ac"]["outages"], res["critical"])
+
+
+def test_dc_sensitivity_cache():
+    net = pn.case30()
+    screen_contingencies(net)
+    cache = net["_dc_sensitivity_cache"]
+    screen_contingencies(net)
+    assert net["_dc_sensitivity_cache"] is cache
+
+    # a changed reactance or topology invalidates the cache
+    net.line.at[3, "x_ohm_per_km"] *= 1.1
+    screen_contingencies(net)
+    assert net["_dc_sensitivity_cache"] is not cache
+    cache = net["_dc_sensitivity_cache"]
+    net.line.at[3, "in_service"] = False
+    screen_contingencies(net)
+    assert net["_dc_sensitivity_cache"] is not cache
+    ppci = _ppci_from_ppc(net._ppc)
+    assert net["_dc_sensitivity_cache"]["PTDF"].shape == (ppci["branch"].shape[0],
+                                                         ppci["bus"].shape[0])
+    assert _get_ptdf(net, ppci, True) is net["_dc_sensitivity_cache"]["PTDF"]
+
+
+if __name__ == "__main__":
+    pytest.main(["test_dc_screening.py", "-xs"])
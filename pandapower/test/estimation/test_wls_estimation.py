@@ -506,6 +506,21 @@ def test_init_slack_with_multiple_transformers_angles_off():
     test_init_slack_with_multiple_transformers(False)
 
 
+def test_estimate_profile():
+    net = load_3bus_network()
+    hook = []
+    success = estimate(net, profile=hook.append)
+    timings = net["_timings"]
+    assert success and timings["success"] and hook == [timings]
+    assert timings["calculation"] == "estimate"
+    for stage in ["pd2ppc", "measurements", "create_jacobian", "solve_linear_system",
+                  "extract_results"]:
+        assert stage in timings["stages"]
+    assert len(timings["mismatch"]) == timings["iterations"]
+    assert timings["mismatch"][-1] < 1e-6
+    assert timings["nnz_J"] > 0 and timings["nnz_Ybus"] > 0
+
+
 def test_check_existing_measurements():
     np.random.seed(2017)
     net = pp.create_empty_network()
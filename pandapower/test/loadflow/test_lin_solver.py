@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+import numpy as np
+import pytest
+
+import pandapower as pp
+import pandapower.networks as pn
+from pandapower.estimation import estimate
+from pandapower.pf import linear_solver
+from pandapower.pf.linear_solver import LIN_SOLVERS, UMFPACK_INSTALLED, _solve_linear_system
+
+lin_solvers = [s for s in LIN_SOLVERS if s != "umfpack" or UMFPACK_INSTALLED]
+
+
+@pytest.mark.parametrize("lin_solver", lin_solvers)
+def test_solve_linear_system(lin_solver):
+    net = pn.case118()
+    pp.runpp(net)
+    J = net._ppc["internal"]["J"]
+    b = np.linspace(-1, 1, J.shape[0])
+    cache = {}
+    for scale in [1., 2.]:
+        x = _solve_linear_system(J * scale, b, cache, lin_solver)
+        assert np.allclose(J * scale * x, b)
+
+
+@pytest.mark.parametrize("lin_solver", ["gmres", "bicgstab"])
+def test_iterative_solver_reuses_preconditioner(lin_solver):
+    net = pn.case118()
+    pp.runpp(net)
+    J = net._ppc["internal"]["J"]
+    b = np.linspace(-1, 1, J.shape[0])
+    cache = {}
+    _solve_linear_system(J, b, cache, lin_solver)
+    M = cache["ilu"]["M"]
+    # the preconditioner of J is sufficient for a slightly changed matrix with the same structure
+    x = _solve_linear_system(J * 1.01, b, cache, lin_solver)
+    assert cache["ilu"]["M"] is M
+    assert np.allclose(J * 1.01 * x, b)
+
+
+@pytest.mark.parametrize("lin_solver", lin_solvers)
+def test_runpp_lin_solver(lin_solver):
+    net = pn.case118()
+    pp.runpp(net)
+    vm, va = net.res_bus.vm_pu.values.copy(), net.res_bus.va_degree.values.copy()
+    for algorithm in ["nr", "iwamoto_nr", "fdbx"]:
+        pp.runpp(net, lin_solver=lin_solver, algorithm=algorithm, init="dc")
+        assert np.allclose(net.res_bus.vm_pu.values, vm)
+        assert np.allclose(net.res_bus.va_degree.values, va)
+
+
+@pytest.mark.parametrize("lin_solver", lin_solvers)
+def test_rundcpp_lin_solver(lin_solver):
+    net = pn.case118()
+    pp.rundcpp(net)
+    va = net.res_bus.va_degree.values.copy()
+    pp.rundcpp(net, lin_solver=lin_solver)
+    assert np.allclose(net.res_bus.va_degree.values, va)
+
+
+def test_runopp_lin_solver():
+    net = pn.case9()
+    pp.runopp(net)
+    p_gen = net.res_gen.p_kw.values.copy()
+    pp.runopp(net, lin_solver="superlu", init="pf")
+    assert np.allclose(net.res_gen.p_kw.values, p_gen, atol=1e-2)
+
+
+def test_estimate_lin_solver():
+    net = pp.create_empty_network()
+    for _ in range(3):
+        pp.create_bus(net, vn_kv=1.)
+    pp.create_ext_grid(net, 0)
+    pp.create_line_from_parameters(net, 0, 1, 1, r_ohm_per_km=0.7, x_ohm_per_km=0.2, c_nf_per_km=0,
+                                   max_i_ka=1)
+    pp.create_line_from_parameters(net, 0, 2, 1, r_ohm_per_km=0.8, x_ohm_per_km=0.8, c_nf_per_km=0,
+                                   max_i_ka=1)
+    pp.create_line_from_parameters(net, 1, 2, 1, r_ohm_per_km=1, x_ohm_per_km=0.6, c_nf_per_km=0,
+                                   max_i_ka=1)
+    pp.create_measurement(net, "p", "line", -0.0011e3, 0.01e3, bus=0, element=0)
+    pp.create_measurement(net, "q", "line", 0.024e3, 0.01e3, bus=0, element=0)
+    pp.create_measurement(net, "p", "bus", 0.018e3, 0.01e3, bus=2)
+    pp.create_measurement(net, "q", "bus", -0.1e3, 0.01e3, bus=2)
+    pp.create_measurement(net, "v", "bus", 1.08, 0.05, 0)
+    pp.create_measurement(net, "v", "bus", 1.015, 0.05, 2)
+
+    for lin_solver in lin_solvers:
+        assert estimate(net, init='flat', lin_solver=lin_solver)
+        assert np.allclose(net.res_bus_est.vm_pu.values, [1.0627, 1.0589, 1.0317], atol=1e-4)
+
+
+def test_lin_solver_options():
+    net = pn.case9()
+    with pytest.raises(ValueError):
+        pp.runpp(net, lin_solver="unknown")
+    pp.set_user_pf_options(net, lin_solver="gmres")
+    pp.runpp(net)
+    assert net._options["lin_solver"] == "gmres"
+
+
+
+def test_umfpack_fallback(monkeypatch):
+    monkeypatch.setattr(linear_solver, "UMFPACK_INSTALLED", False)
+    net = pn.case9()
+    pp.set_user_pf_options(net, lin_solver="umfpack")
+    pp.runpp(net)
+    assert net.converged
+    assert net._options["lin_solver"] == "superlu"
+
+    J = net._ppc["internal"]["J"]
+    b = np.linspace(-1, 1, J.shape[0])
+    x = _solve_linear_system(J, b, {}, "umfpack")
+    assert np.allclose(J * x, b)
+
+
+if __name__ == "__main__":
+    pytest.main(["test_lin_solver.py"])
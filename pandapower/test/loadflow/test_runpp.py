@@ -12,11 +12,20 @@ import pandas as pd
 import pytest
 
 import pandapower as pp
+import pandapower.networks as pn
 from pandapower.auxiliary import _check_connectivity, _add_ppc_options
+from pandapower.build_bus import fuse_buses
+from pandapower.idx_brch import BR_G
+from pandapower.idx_gen import PG
 from pandapower.networks import create_cigre_network_mv, four_loads_with_branches_out, \
     example_simple, simple_four_bus_system
 from pandapower.pd2ppc import _pd2ppc
 from pandapower.pf.create_jacobian import _create_J_without_numba
+from pandapower.pf.makeSbus import makeSbus
+from pandapower.pf.makeYbus_pypower import makeYbus
+from pandapower.pf.fdpf import fdpf
+from pandapower.pf.newtonpf import _evaluate_Fx, newtonpf
+from pandapower.pf.run_batch_pf import _get_base_case_ppci
 from pandapower.pf.run_newton_raphson_pf import _get_pf_variables_from_ppci
 from pandapower.powerflow import LoadflowNotConverged
 from pandapower.test.consistency_checks import runpp_with_consistency_checks
@@ -99,6 +108,8 @@ def test_runpp_init():
     assert np.allclose(va - net.trafo.shift_degree.at[tidx], net.res_bus.va_degree.at[4])
     pp.runpp(net, calculate_voltage_angles=True, init_va_degree="results")
     assert np.allclose(va - net.trafo.shift_degree.at[tidx], net.res_bus.va_degree.at[4])
+    pp.runpp(net, calculate_voltage_angles=True, init="estimate")
+    assert np.allclose(va - net.trafo.shift_degree.at[tidx], net.res_bus.va_degree.at[4])
 
 
 def test_runpp_init_auxiliary_buses():
@@ -124,6 +135,11 @@ def test_runpp_init_auxiliary_buses():
                        atol=2)
     assert np.allclose(va - net.trafo3w.shift_lv_degree.at[tidx], net.res_bus.va_degree.at[b4],
                        atol=2)
+    pp.runpp(net, calculate_voltage_angles=True, init="estimate")
+    assert np.allclose(va - net.trafo3w.shift_mv_degree.at[tidx], net.res_bus.va_degree.at[b3],
+                       atol=2)
+    assert np.allclose(va - net.trafo3w.shift_lv_degree.at[tidx], net.res_bus.va_degree.at[b4],
+                       atol=2)
 
 
 def test_result_iter():
@@ -136,6 +152,158 @@ def test_result_iter():
             raise UserWarning("Power flow did not converge after adding %s" % net.last_added_case)
 
 
+def test_lazy_results():
+    net = example_simple()
+    pp.runpp(net)
+    net_ref = copy.deepcopy(net)
+    pp.runpp(net, results="lazy")
+    # the result tables are only calculated on first access
+    assert "res_line" in net.__dict__["_lazy_results"]
+    assert np.allclose(net.res_line.loading_percent.values, net_ref.res_line.loading_percent.values)
+    assert "res_line" not in net.__dict__["_lazy_results"]
+    assert "res_bus" in net.__dict__["_lazy_results"]
+    for table in ["res_bus", "res_load", "res_sgen", "res_gen", "res_ext_grid", "res_trafo"]:
+        assert np.allclose(net[table].values, net_ref[table].values, equal_nan=True)
+        assert net[table].index.equals(net_ref[table].index)
+
+    # copies and saved networks contain all results
+    pp.runpp(net, results="lazy")
+    assert_net_equal(copy.deepcopy(net), net_ref)
+
+    # the pending results of the last power flow are used for the initialization
+    pp.runpp(net, results="lazy")
+    pp.runpp(net, results="lazy", init="results")
+    assert np.allclose(net.res_bus.vm_pu.values, net_ref.res_bus.vm_pu.values)
+
+
+def test_result_tables():
+    net = example_simple()
+    pp.runpp(net)
+    vm_pu = net.res_bus.vm_pu.values.copy()
+    pp.runpp(net, result_tables=["res_bus", "line"])
+    assert np.allclose(net.res_bus.vm_pu.values, vm_pu)
+    assert len(net.res_load) == len(net.load)
+    assert not net.res_line.loading_percent.isnull().any()
+    # tables that are not selected are emptied
+    assert net.res_trafo.isnull().all().all()
+
+    pp.rundcpp(net, result_tables=["trafo"], results="lazy")
+    assert not len(net.res_bus)
+    assert not net.res_trafo.loading_percent.isnull().any()
+
+    with pytest.raises(ValueError):
+        pp.runpp(net, result_tables=["cable"])
+    with pytest.raises(ValueError):
+        pp.runpp(net, results="some")
+
+
+def test_profile():
+    net = example_simple()
+    pp.runpp(net)
+    assert "_timings" not in net
+
+    timings_hook = []
+    pp.runpp(net, profile=timings_hook.append)
+    timings = net["_timings"]
+    assert timings_hook == [timings]
+    assert timings["calculation"] == "runpp" and timings["success"]
+    for stage in ["pd2ppc", "makeYbus", "create_jacobian",
+                  "solve_linear_system", "pfsoln", "extract_results"]:
+        assert timings["stages"][stage] >= 0
+    assert timings["calls"]["create_jacobian"] == timings["iterations"] == net._ppc["iterations"]
+    # mismatch before and after each iteration, the last one is below the tolerance
+    assert len(timings["mismatch"]) == timings["iterations"] + 1
+    assert timings["mismatch"][-1] < net._options["tolerance_kva"] * 1e-3
+    assert timings["nnz_Ybus"] == net._ppc["internal"]["Ybus"].nnz
+    assert timings["nnz_J"] == net._ppc["internal"]["J"].nnz
+    stages = timings["stages"]
+    assert stages["pf_algorithm"] >= stages["create_jacobian"] + stages["solve_linear_system"]
+    assert timings["total"] >= stages["pd2ppc"] + stages["pf_algorithm"] + stages["extract_results"]
+    # the options of the power flow do not keep the timings
+    assert "timings" not in net._options
+
+    with pytest.raises(LoadflowNotConverged):
+        pp.runpp(net, max_iteration=1, profile=True)
+    assert not net["_timings"]["success"]
+    assert net["_timings"]["iterations"] == 1
+
+    pp.rundcpp(net, profile=True)
+    assert net["_timings"]["calculation"] == "rundcpp" and net["_timings"]["success"]
+
+
+def test_branch_conductance():
+    net = pp.create_empty_network()
+    b1 = pp.create_bus(net, vn_kv=20.)
+    b2 = pp.create_bus(net, vn_kv=.4)
+    b3 = pp.create_bus(net, vn_kv=.4)
+    pp.create_ext_grid(net, b1)
+    pp.create_transformer_from_parameters(net, b1, b2, sn_kva=400, vn_hv_kv=20, vn_lv_kv=0.4,
+                                          vsc_percent=6, vscr_percent=1.4, pfe_kw=1.45,
+                                          i0_percent=0.3)
+    pp.create_line_from_parameters(net, b2, b3, length_km=1., r_ohm_per_km=0.2, x_ohm_per_km=0.1,
+                                   c_nf_per_km=200, max_i_ka=0.2, g_us_per_km=10.)
+    pp.create_load(net, b3, p_kw=50)
+    pp.runpp(net)
+    branch = net._ppc["branch"]
+    assert branch.dtype == np.float64
+    # the conductance of the line and the iron losses of the trafo are stored in BR_G
+    assert np.all(branch[:, BR_G] > 0)
+    p_loss_kw = net.res_line.pl_kw.values[0] + net.res_trafo.pl_kw.values[0]
+    for algorithm in ["bfsw", "fdbx"]:
+        net_alg = copy.deepcopy(net)
+        pp.runpp(net_alg, algorithm=algorithm)
+        assert np.isclose(net_alg.res_line.pl_kw.values[0] + net_alg.res_trafo.pl_kw.values[0],
+                          p_loss_kw, atol=1e-3)
+    net.line.g_us_per_km = 0.
+    net.trafo.pfe_kw = 0.
+    pp.runpp(net)
+    assert net.res_line.pl_kw.values[0] + net.res_trafo.pl_kw.values[0] < p_loss_kw - 1.
+
+
+def _count_wrong_q_lim_buses(net):
+    """
+    Counts the generators that do not hold their voltage set point although their reactive power
+    is within the limits or the voltage is on the wrong side of the set point for their limit
+    """
+    q = net.res_gen.q_kvar.values
+    vm = net.res_bus.vm_pu.loc[net.gen.bus.values].values
+    vm_set = net.gen.vm_pu.values
+    # load convention: at min_q_kvar the generator feeds in its maximum reactive power
+    at_min = np.isclose(q, net.gen.min_q_kvar.values, atol=1e-2)
+    at_max = np.isclose(q, net.gen.max_q_kvar.values, atol=1e-2)
+    free = ~at_min & ~at_max
+    return np.sum(vm[at_min] > vm_set[at_min] + 1e-6) + \
+        np.sum(vm[at_max] < vm_set[at_max] - 1e-6) + \
+        np.sum(~np.isclose(vm[free], vm_set[free]))
+
+
+def test_enforce_q_lims_inner():
+    net = pn.case118()
+    pp.runpp(net)
+    # tighten the reactive power limits, so that many generators reach them
+    q_lim = abs(net.res_gen.q_kvar.values) * 0.97 + 100
+    net.gen.max_q_kvar = q_lim
+    net.gen.min_q_kvar = -q_lim
+
+    pp.runpp(net, enforce_q_lims=True)
+    # enforce_q_lims=True does not switch buses back from pq to pv, so that some generators stay
+    # at their limits although they could hold the voltage set point
+    assert _count_wrong_q_lim_buses(net) > 0
+    vm = None
+    for algorithm in ["nr", "iwamoto_nr"]:
+        pp.runpp(net, enforce_q_lims="inner", algorithm=algorithm)
+        assert np.all(net.res_gen.q_kvar.values <= net.gen.max_q_kvar.values + 1e-3)
+        assert np.all(net.res_gen.q_kvar.values >= net.gen.min_q_kvar.values - 1e-3)
+        # buses at a limit are switched back to pv if the set point can be held
+        assert _count_wrong_q_lim_buses(net) == 0
+        if vm is not None:
+            assert np.allclose(net.res_bus.vm_pu.values, vm)
+        vm = net.res_bus.vm_pu.values.copy()
+
+    with pytest.raises(ValueError):
+        pp.runpp(net, enforce_q_lims="inner", algorithm="fdbx")
+
+
 @pytest.fixture
 def bus_bus_net():
     net = pp.create_empty_network()
@@ -187,6 +355,72 @@ def test_bus_bus_switches_throws_exception_for_two_gen_with_diff_vm(bus_bus_net)
         pp.runpp(net)
 
 
+def test_fuse_buses():
+    bus_lookup = np.arange(11)
+    # switch ring 1-2-3-1 with PV bus 3, chain 5-6, chain 9-8-7-10 with PV bus 8
+    fbus = np.array([1, 2, 3, 5, 9, 8, 7])
+    tbus = np.array([2, 3, 1, 6, 8, 7, 10])
+    fuse_buses(bus_lookup, fbus, tbus, np.array([8, 3, 0]))
+    assert np.array_equal(bus_lookup, [0, 3, 3, 3, 4, 5, 5, 8, 8, 8, 8])
+
+
+def test_bus_bus_switch_chain():
+    net = pp.create_empty_network()
+    b = pp.create_buses(net, 50, vn_kv=20.)
+    pp.create_ext_grid(net, b[0])
+    for f, t in zip(b[:24], b[1:25]):
+        pp.create_switch(net, f, t, et="b")
+    create_test_line(net, b[24], b[25])
+    for f, t in zip(b[25:-1], b[26:]):
+        pp.create_switch(net, t, f, et="b")
+    pp.create_gen(net, b[40], p_kw=-500, vm_pu=1.01)
+    pp.create_load(net, b[-1], p_kw=1000)
+    pp.runpp(net)
+    assert net.converged
+    bus_lookup = net._pd2ppc_lookups["bus"]
+    assert len(np.unique(bus_lookup[b])) == 2
+    assert np.allclose(net.res_bus.vm_pu.values[25:], 1.01)
+    assert np.allclose(net.res_bus.vm_pu.values[:25], 1.)
+
+
+def test_topology_cache():
+    net = create_cigre_network_mv(with_der="all")
+    # open line and trafo switch, out of service bus at a line and an isolated bus
+    net.switch.closed.at[net.switch.index[net.switch.et == "l"][0]] = False
+    pp.create_switch(net, net.trafo.lv_bus.at[0], 0, et="t", closed=False)
+    net.bus.in_service.at[14] = False
+    pp.create_bus(net, 20.)
+    pp.runpp(net)
+    fingerprint = net._pd2ppc_topology["fingerprint"]
+    assert "bus_lookup" in net._pd2ppc_topology
+
+    def runpp_without_cache(net):
+        net_ref = copy.deepcopy(net)
+        del net_ref["_pd2ppc_topology"]
+        pp.runpp(net_ref)
+        return net_ref
+
+    # changed injections do not change the topology, the cache is reused
+    net.load.p_kw *= 1.2
+    net.sgen.in_service.at[0] = True
+    pp.runpp(net)
+    assert net._pd2ppc_topology["fingerprint"] == fingerprint
+    assert_net_equal(net, runpp_without_cache(net))
+
+    # changed switch states, in service flags and element buses change the topology
+    for table, column, index in [("switch", "closed", net.switch.index[net.switch.et == "l"][0]),
+                                 ("line", "in_service", 0), ("load", "bus", 0),
+                                 ("bus", "in_service", 14)]:
+        if column == "bus":
+            net[table][column].at[index] += 1
+        else:
+            net[table][column].at[index] = not net[table][column].at[index]
+        pp.runpp(net)
+        assert net._pd2ppc_topology["fingerprint"] != fingerprint
+        fingerprint = net._pd2ppc_topology["fingerprint"]
+        assert_net_equal(net, runpp_without_cache(net))
+
+
 @pytest.fixture
 def r_switch_net():
     net = pp.create_empty_network()
@@ -432,6 +666,110 @@ def test_pypower_algorithms_iter():
                                   net.last_added_case)
 
 
+@pytest.mark.parametrize("algorithm", ["fdbx", "fdxb"])
+def test_fast_decoupled_recycle(algorithm):
+    net = create_cigre_network_mv(with_der="pv_wind")
+    net.load["const_z_percent"] = 40.
+    recycle = dict(_is_elements=True, ppc=True, Ybus=True)
+    for voltage_depend_loads in [False, True]:
+        pp.runpp(net, voltage_depend_loads=voltage_depend_loads)
+        vm_nr = net.res_bus.vm_pu.values.copy()
+        pp.runpp(net, algorithm=algorithm, voltage_depend_loads=voltage_depend_loads)
+        assert np.allclose(net.res_bus.vm_pu.values, vm_nr)
+
+    pp.runpp(net, algorithm=algorithm, recycle=recycle)
+    cache = net._ppc["internal"]["fdpf_cache"]
+    net.load.p_kw *= 1.3
+    pp.runpp(net, algorithm=algorithm, recycle=recycle)
+    # B' and B'' are not factorized again
+    assert net._ppc["internal"]["fdpf_cache"] is cache
+    assert len(cache["Bp_lu"]) == len(cache["Bpp_lu"]) == 1
+    vm_recycle = net.res_bus.vm_pu.values.copy()
+    pp.runpp(net)
+    assert np.allclose(net.res_bus.vm_pu.values, vm_recycle)
+
+
+
+def test_voltage_depend_loads_initial_mismatch():
+    net = create_cigre_network_mv(with_der="pv_wind")
+    net.load["const_z_percent"] = 40.
+    net.load["const_i_percent"] = 20.
+    pp.runpp(net, voltage_depend_loads=True)
+    ppci, pv, pq, V = _get_base_case_ppci(net)
+    Sbus = makeSbus(ppci["baseMVA"], ppci["bus"], ppci["gen"])
+    options = dict(net._options, algorithm="fdbx")
+    # the initial mismatch considers the voltage dependent loads at the initial voltages, so that
+    # the solution is converged without iteration
+    assert newtonpf(ppci["internal"]["Ybus"], Sbus, V.copy(), pv, pq, ppci, options)[1:3] == \
+        (True, 0)
+    assert fdpf(ppci["internal"]["Ybus"], Sbus, V.copy(), pv, pq, ppci, options,
+                makeYbus)[1:3] == (True, 0)
+
+
+@pytest.mark.parametrize("algorithm", ["fdbx", "fdxb"])
+def test_fast_decoupled_singular_B(algorithm):
+    net = pp.create_empty_network()
+    b1 = pp.create_bus(net, 20.)
+    b2 = pp.create_bus(net, 20.)
+    pp.create_ext_grid(net, b1)
+    # line without reactance, so that B prime is singular
+    pp.create_line_from_parameters(net, b1, b2, 1., 0.2, 0., 0., 0.4)
+    pp.create_load(net, b2, 100.)
+    pp.runpp(net)
+    with pytest.raises(LoadflowNotConverged):
+        pp.runpp(net, algorithm=algorithm)
+
+
+def test_warm_start_cache():
+    net = create_cigre_network_mv(with_der="pv_wind")
+    configurations = [(True, False), (False, True), (False, False)]
+    vm = {}
+    for closed in configurations:
+        net.switch.closed.iloc[[3, 5]] = closed
+        pp.runpp(net, calculate_voltage_angles=True)
+        vm[closed] = net.res_bus.vm_pu.values.copy()
+
+    for closed in configurations[:2] * 2:
+        net.switch.closed.iloc[[3, 5]] = closed
+        pp.runpp(net, calculate_voltage_angles=True, warm_start=2)
+        assert np.allclose(net.res_bus.vm_pu.values, vm[closed])
+    # known topologies are initialized with the last converged voltages
+    assert net._ppc["iterations"] == 0
+    assert len(net._warm_start_cache) == 2
+
+    net.load.p_kw *= 1.1
+    pp.runpp(net, calculate_voltage_angles=True, warm_start=2)
+    assert 0 < net._ppc["iterations"] < 4
+
+    # the least recently used topology is removed
+    net.switch.closed.iloc[[3, 5]] = configurations[2]
+    pp.runpp(net, calculate_voltage_angles=True, warm_start=2)
+    net.switch.closed.iloc[[3, 5]] = configurations[0]
+    pp.runpp(net, calculate_voltage_angles=True, warm_start=2)
+    assert net._ppc["iterations"] > 0
+    assert len(net._warm_start_cache) == 2
+
+
+def test_warm_start_cache_setpoints():
+    net = create_cigre_network_mv(with_der="pv_wind")
+    pp.create_gen(net, 12, p_kw=-500, vm_pu=1.01)
+    pp.runpp(net, calculate_voltage_angles=True, warm_start=1)
+    assert len(net._warm_start_cache) == 1
+
+    # changed setpoints at the same topology are not overwritten by the cached voltages
+    net.ext_grid.vm_pu.at[0] = 1.02
+    net.gen.vm_pu.at[0] = 1.03
+    for va_degree in [20., -10.]:
+        net.ext_grid.va_degree.at[0] = va_degree
+        pp.runpp(net, calculate_voltage_angles=True, warm_start=1)
+        warm = net.res_bus[["vm_pu", "va_degree"]].values.copy()
+        assert np.isclose(net.res_bus.va_degree.at[net.ext_grid.bus.at[0]], va_degree)
+        assert np.isclose(net.res_bus.vm_pu.at[net.ext_grid.bus.at[0]], 1.02)
+        assert np.isclose(net.res_bus.vm_pu.at[12], 1.03)
+        pp.runpp(net, calculate_voltage_angles=True)
+        assert np.allclose(warm, net.res_bus[["vm_pu", "va_degree"]].values)
+
+
 def test_recycle():
     # Note: Only calls recycle functions and tests if load and gen are updated.
     # Todo: To fully test the functionality, it must be checked if the recycle methods are being
@@ -472,6 +810,47 @@ def test_recycle():
     assert np.allclose(net.res_gen.vm_pu.iloc[0], u_set)
 
 
+def test_recycle_jacobian_ordering():
+    net = create_cigre_network_mv(with_der="pv_wind")
+    pp.runpp(net)
+    cache = net._ppc["internal"]["J_lu_cache"]["superlu"]
+    assert np.array_equal(cache["indptr"], net._ppc["internal"]["J"].indptr)
+
+    net.load.p_kw *= 1.2
+    net.sgen.p_kw *= 0.5
+    pp.runpp(net, recycle=dict(_is_elements=True, ppc=True, Ybus=True))
+    # the ordering of the last power flow was reused
+    assert np.array_equal(net._ppc["internal"]["J_lu_cache"]["superlu"]["perm_c"],
+                          cache["perm_c"])
+    vm_recycle = net.res_bus.vm_pu.values.copy()
+    pp.runpp(net)
+    assert np.allclose(net.res_bus.vm_pu.values, vm_recycle)
+
+
+def test_recycle_incremental_update():
+    net = create_cigre_network_mv(with_der="pv_wind")
+    pp.create_gen(net, 12, p_kw=-500, vm_pu=1.01)
+    recycle = dict(_is_elements=True, ppc=True, Ybus=True)
+    pp.runpp(net, recycle=recycle)
+    internal = net._ppc["internal"]
+
+    for step in range(4):
+        net.load.p_kw.iloc[step] *= 1.5
+        net.sgen.q_kvar.iloc[-step] = 10. * step
+        if step % 2:
+            net.gen.vm_pu.iloc[0] = 1.01 - 0.005 * step
+        pp.runpp(net, recycle=recycle)
+        # the internal data of the last power flow is updated, not copied
+        assert net._ppc["internal"] is internal
+        vm_recycle = net.res_bus.vm_pu.values.copy()
+        va_recycle = net.res_bus.va_degree.values.copy()
+        pp.runpp(net)
+        assert np.allclose(net.res_bus.vm_pu.values, vm_recycle)
+        assert np.allclose(net.res_bus.va_degree.values, va_recycle)
+        pp.runpp(net, recycle=recycle)
+        internal = net._ppc["internal"]
+
+
 @pytest.mark.xfail
 def test_zip_loads_gridcal():
     # Tests newton power flow considering zip loads against GridCal's pf result
@@ -663,6 +1042,43 @@ def test_xward_buses():
     assert bus_num3 == bus_num1
 
 
+def test_auxiliary_elements_not_in_net():
+    net = pp.create_empty_network()
+    b1, b2, l1 = add_grid_connection(net, vn_kv=110.)
+    b3 = pp.create_bus(net, vn_kv=20.)
+    b4 = pp.create_bus(net, vn_kv=10.)
+    pp.create_transformer3w(net, b2, b3, b4, std_type='63/25/38 MVA 110/20/10 kV')
+    pp.create_load(net, b3, 5e3)
+    pp.create_load(net, b4, 5e3)
+    pp.create_xward(net, b4, 1000, 1000, 1000, 1000, 0.1, 0.1, 1.0)
+    pp.create_dcline(net, b2, b3, p_kw=1e3, loss_percent=1., loss_kw=50., vm_from_pu=1.01,
+                     vm_to_pu=1.02)
+    pp.create_gen(net, b4, p_kw=-1e3, vm_pu=1.0)
+    tables = ["bus", "gen", "trafo3w", "xward", "dcline"]
+    before = {table: net[table].copy() for table in tables}
+
+    pp.runpp(net)
+    for table in tables:
+        assert net[table].equals(before[table])
+    assert len(net.res_bus) == len(net.bus)
+    assert len(net.res_gen) == len(net.gen)
+    assert np.isclose(net.res_dcline.p_from_kw.at[0], 1e3)
+    assert np.isclose(net.res_dcline.p_to_kw.at[0], -(1e3 * 0.99 - 50.))
+    assert np.isclose(net.res_bus.vm_pu.at[b3], 1.02)
+    assert np.isclose(net.res_bus.p_kw.at[b3], 5e3)
+    dcline_lookup = net._pd2ppc_lookups["dcline"]
+    assert dcline_lookup.shape == (1, 2)
+    assert np.allclose(net._ppc["gen"][dcline_lookup[0], PG], [-1., 0.94])
+
+    net.xward.in_service.at[0] = False
+    net.dcline.in_service.at[0] = False
+    pp.runpp(net)
+    for table in ["bus", "gen", "trafo3w"]:
+        assert net[table].equals(before[table])
+    assert net.res_dcline.p_from_kw.at[0] == 0
+    assert np.all(np.isfinite(net.res_bus.vm_pu.values))
+
+
 def test_pvpq_lookup():
     net = pp.create_empty_network()
 
@@ -729,6 +1145,31 @@ def test_get_internal():
     # get J for all other algorithms
 
 
+def test_evaluate_Fx_numba():
+    pytest.importorskip("numba")
+    from pandapower.pf.evaluate_Fx_numba import evaluate_Fx_numba
+
+    net = create_cigre_network_mv(with_der="pv_wind")
+    pp.create_gen(net, 12, p_kw=-500, vm_pu=1.01)
+    pp.runpp(net)
+    _, ppci = _pd2ppc(net)
+    baseMVA, bus, gen, branch, ref, pv, pq, _, _, V0, _ = _get_pf_variables_from_ppci(ppci)
+    Ybus = makeYbus(baseMVA, bus, branch)[0].tocsr()
+    Sbus = makeSbus(baseMVA, bus, gen)
+    V = V0 * np.exp(1j * np.linspace(-0.1, 0.1, len(V0)))
+
+    F = _evaluate_Fx(Ybus, V, Sbus, pv, pq)
+    F_numba = np.empty(len(pv) + 2 * len(pq))
+    norm = evaluate_Fx_numba(Ybus.data, Ybus.indptr, Ybus.indices, V, Sbus, pv, pq, F_numba)
+    assert np.allclose(F_numba, F)
+    assert np.isclose(norm, abs(F).max())
+
+    # a diverged power flow must not be considered as converged
+    V[pq[0]] = np.nan
+    assert np.isnan(evaluate_Fx_numba(Ybus.data, Ybus.indptr, Ybus.indices, V, Sbus, pv, pq,
+                                      F_numba))
+
+
 def test_storage_pf():
     net = pp.create_empty_network()
 
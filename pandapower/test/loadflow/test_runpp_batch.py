@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+import numpy as np
+import pytest
+
+import pandapower as pp
+from pandapower.networks import create_cigre_network_mv, example_simple
+
+
+def _compare_with_runpp(net, res, p_kw, q_kvar, element="load", **kwargs):
+    for s in range(p_kw.shape[0]):
+        net[element]["p_kw"] = p_kw[s]
+        if q_kvar is not None:
+            net[element]["q_kvar"] = q_kvar[s]
+        pp.runpp(net, **kwargs)
+        assert res["converged"][s]
+        assert np.allclose(res["vm_pu"][s], net.res_bus.vm_pu.values, equal_nan=True)
+        assert np.allclose(res["va_degree"][s], net.res_bus.va_degree.values, equal_nan=True)
+        assert np.allclose(res["line_loading_percent"][s],
+                           net.res_line.loading_percent.values, equal_nan=True)
+
+
+def test_runpp_batch_loads():
+    net = create_cigre_network_mv(with_der="pv_wind")
+    factors = np.linspace(0.2, 1.6, 8)[:, np.newaxis]
+    p_kw = factors * net.load.p_kw.values
+    q_kvar = factors * net.load.q_kvar.values
+    res = pp.runpp_batch(net, p_kw, q_kvar)
+    assert res["vm_pu"].shape == (8, len(net.bus))
+    assert res["line_loading_percent"].shape == (8, len(net.line))
+    _compare_with_runpp(net, res, p_kw, q_kvar)
+
+
+def test_runpp_batch_sgen_with_oos_elements():
+    net = create_cigre_network_mv(with_der="pv_wind")
+    net.line.in_service.at[10] = False
+    net.bus.in_service.at[14] = False
+    p_kw = np.outer(np.linspace(0, 2, 5), net.sgen.p_kw.values)
+    res = pp.runpp_batch(net, p_kw, element="sgen", calculate_voltage_angles=True)
+    assert np.isnan(res["line_loading_percent"][:, 10]).all()
+    assert np.isnan(res["vm_pu"][:, 14]).all()
+    _compare_with_runpp(net, res, p_kw, None, element="sgen", calculate_voltage_angles=True)
+
+
+def test_runpp_batch_voltage_dependent_loads():
+    net = create_cigre_network_mv()
+    net.load["const_z_percent"] = 40.
+    net.load["const_i_percent"] = 20.
+    p_kw = np.outer(np.linspace(0.5, 1.2, 4), net.load.p_kw.values)
+    res = pp.runpp_batch(net, p_kw)
+    _compare_with_runpp(net, res, p_kw, None)
+
+
+def test_runpp_batch_input_errors():
+    net = example_simple()
+    with pytest.raises(ValueError):
+        pp.runpp_batch(net, np.ones((2, len(net.load) + 1)))
+    with pytest.raises(NotImplementedError):
+        pp.runpp_batch(net, np.ones((2, len(net.load))), algorithm="bfsw")
+
+
+if __name__ == "__main__":
+    pytest.main(["test_runpp_batch.py"])
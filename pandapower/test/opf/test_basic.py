@@ -442,6 +442,18 @@ def test_dcopf_poly(simple_opf_test_net):
     assert abs(100 * net.res_gen.p_kw.values - net.res_cost) < 1e-3
 
 
+def test_opf_profile(simple_opf_test_net):
+    net = simple_opf_test_net
+    pp.create_polynomial_cost(net, 0, "gen", np.array([100, 0]))
+    pp.runopp(net, verbose=False, profile=True)
+    timings = net["_timings"]
+    assert timings["calculation"] == "runopp" and timings["success"]
+    for stage in ["pd2ppc", "opf_solver", "extract_results"]:
+        assert stage in timings["stages"]
+    assert timings["iterations"] > 0
+    assert len(timings["mismatch"]) == timings["iterations"] + 1
+
+
 def test_opf_poly(simple_opf_test_net):
     net = simple_opf_test_net
     pp.create_polynomial_cost(net, 0, "gen", np.array([100, 0]))
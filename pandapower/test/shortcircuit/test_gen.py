@@ -50,5 +50,14 @@ def test_max_gen_fault_impedance(one_line_one_generator):
     assert abs(net.res_bus_sc.ikss_ka.at[2] - 0.4450868) < 1e-7
     assert pd.isnull(net.res_bus_sc.ikss_ka.at[3])
 
+def test_max_gen_profile(one_line_one_generator):
+    net = one_line_one_generator
+    sc.calc_sc(net, case="max", profile=True)
+    timings = net["_timings"]
+    assert timings["calculation"] == "calc_sc" and timings["success"]
+    for stage in ["pd2ppc", "makeYbus", "zbus", "currents", "extract_results"]:
+        assert stage in timings["stages"]
+    assert timings["nnz_Ybus"] > 0
+
 if __name__ == '__main__':
     pytest.main(['test_gen.py'])
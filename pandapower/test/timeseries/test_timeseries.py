@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pandapower as pp
+import pandapower.networks as pn
+from pandapower.timeseries import run_timeseries, OutputWriter, ArrayProfile, CSVProfile, \
+    HDF5Profile, read_npz_output
+
+LOG_VARIABLES = [("res_bus", "vm_pu"), ("res_bus", "va_degree"), ("res_line", "loading_percent"),
+                 ("res_line", "i_ka"), ("res_line", "p_from_kw"), ("res_line", "q_to_kvar"),
+                 ("res_trafo", "loading_percent"), ("res_trafo", "p_hv_kw"),
+                 ("res_trafo", "q_lv_kvar")]
+
+
+def _get_profiles(net, n_steps=24):
+    np.random.seed(0)
+    load_p = np.random.uniform(0.5, 1.5, (n_steps, len(net.load))) * net.load.p_kw.values
+    sgen_idx = net.sgen.index.values[::2]
+    sgen_p = np.random.uniform(0., 1., (n_steps, len(sgen_idx))) * net.sgen.p_kw.values[::2]
+    return load_p, sgen_idx, sgen_p
+
+
+def _run_loop(net, load_p, sgen_idx, sgen_p):
+    net = pp.copy.deepcopy(net)
+    results = {key: [] for key in LOG_VARIABLES}
+    for s in range(load_p.shape[0]):
+        net.load.p_kw = load_p[s]
+        net.sgen.loc[sgen_idx, "p_kw"] = sgen_p[s]
+        pp.runpp(net)
+        for table, variable in LOG_VARIABLES:
+            results[(table, variable)].append(net[table][variable].values.copy())
+    return {key: np.array(values) for key, values in results.items()}
+
+
+def test_timeseries_in_memory():
+    net = pn.create_cigre_network_mv(with_der="pv_wind")
+    net.line.at[3, "in_service"] = False
+    load_p, sgen_idx, sgen_p = _get_profiles(net)
+    expected = _run_loop(net, load_p, sgen_idx, sgen_p)
+
+    p_kw = net.load.p_kw.values.copy()
+    ow = OutputWriter(LOG_VARIABLES)
+    profiles = {("load", "p_kw"): load_p,
+                ("sgen", "p_kw"): pd.DataFrame(sgen_p, columns=sgen_idx)}
+    run_timeseries(net, profiles, ow, chunk_size=10)
+    assert np.all(ow.output[("pf", "converged")])
+    for key in LOG_VARIABLES:
+        assert np.allclose(ow.output[key], expected[key], atol=1e-5, equal_nan=True), key
+    # the element tables are not changed
+    assert np.array_equal(net.load.p_kw.values, p_kw)
+    vm_pu = ow.get_dataframe("res_bus", "vm_pu")
+    assert np.array_equal(vm_pu.columns, net.bus.index)
+    assert vm_pu.shape == (24, len(net.bus))
+
+
+def test_timeseries_gen():
+    net = pn.case9()
+    np.random.seed(1)
+    gen_p = np.random.uniform(0.8, 1.2, (10, len(net.gen))) * net.gen.p_kw.values
+    ow = OutputWriter([("res_bus", "vm_pu"), ("res_line", "loading_percent")])
+    run_timeseries(net, {("gen", "p_kw"): ArrayProfile(gen_p)}, ow)
+    for s in range(gen_p.shape[0]):
+        net.gen.p_kw = gen_p[s]
+        pp.runpp(net)
+        assert np.allclose(ow.output[("res_bus", "vm_pu")][s], net.res_bus.vm_pu.values)
+        assert np.allclose(ow.output[("res_line", "loading_percent")][s],
+                           net.res_line.loading_percent.values)
+
+
+def test_timeseries_csv_npz(tmpdir):
+    net = pn.create_cigre_network_mv()
+    load_p, _, _ = _get_profiles(net, n_steps=30)
+    path = str(tmpdir.join("load_p.csv"))
+    pd.DataFrame(load_p, columns=net.load.index).to_csv(path, index=False)
+
+    # the number of time steps of csv profiles is unknown in advance
+    ow = OutputWriter([("res_bus", "vm_pu")])
+    run_timeseries(net, {("load", "p_kw"): CSVProfile(path)}, ow, chunk_size=7)
+    ref = OutputWriter([("res_bus", "vm_pu")])
+    run_timeseries(net, {("load", "p_kw"): load_p}, ref)
+    assert np.allclose(ow.output[("res_bus", "vm_pu")], ref.output[("res_bus", "vm_pu")])
+
+    out = str(tmpdir.join("results"))
+    ow = OutputWriter([("res_bus", "vm_pu")], output_path=out, output_format="npz")
+    run_timeseries(net, {("load", "p_kw"): CSVProfile(path)}, ow, chunk_size=7)
+    vm_pu = read_npz_output(out, "res_bus", "vm_pu")
+    assert np.array_equal(vm_pu.index, np.arange(30))
+    assert np.allclose(vm_pu.values, ref.output[("res_bus", "vm_pu")])
+    assert np.all(read_npz_output(out, "pf", "converged"))
+
+    # the chunk files of the longer simulation are not read together with the new results
+    with pytest.raises(ValueError):
+        run_timeseries(net, {("load", "p_kw"): load_p[:10]}, ow)
+    ow = OutputWriter([("res_bus", "vm_pu")], output_path=out, output_format="npz",
+                      overwrite=True)
+    run_timeseries(net, {("load", "p_kw"): load_p[:10]}, ow, chunk_size=7)
+    vm_pu = read_npz_output(out, "res_bus", "vm_pu")
+    assert np.array_equal(vm_pu.index, np.arange(10))
+    assert np.allclose(vm_pu.values, ref.output[("res_bus", "vm_pu")][:10])
+
+
+def test_timeseries_hdf5(tmpdir):
+    pytest.importorskip("tables")
+    net = pn.create_cigre_network_mv()
+    load_p, _, _ = _get_profiles(net, n_steps=20)
+    path = str(tmpdir.join("profiles.h5"))
+    pd.DataFrame(load_p, columns=[str(i) for i in net.load.index]).to_hdf(path, "load_p",
+                                                                          format="table")
+    out = str(tmpdir.join("results.h5"))
+    ow = OutputWriter([("res_bus", "vm_pu")], output_path=out, output_format="hdf5")
+    run_timeseries(net, {("load", "p_kw"): HDF5Profile(path, "load_p")}, ow, chunk_size=6)
+    ref = OutputWriter([("res_bus", "vm_pu")])
+    run_timeseries(net, {("load", "p_kw"): load_p}, ref)
+    vm_pu = pd.read_hdf(out, "res_bus/vm_pu")
+    assert np.allclose(vm_pu.values, ref.output[("res_bus", "vm_pu")])
+
+    # an existing file is only replaced with overwrite=True
+    with pytest.raises(ValueError):
+        run_timeseries(net, {("load", "p_kw"): load_p[:5]}, ow)
+    ow.overwrite = True
+    run_timeseries(net, {("load", "p_kw"): load_p[:5]}, ow)
+    assert pd.read_hdf(out, "res_bus/vm_pu").shape == (5, len(net.bus))
+
+
+def test_timeseries_errors():
+    net = pn.create_cigre_network_mv()
+    load_p, _, _ = _get_profiles(net)
+    with pytest.raises(ValueError):
+        run_timeseries(net, {("line", "length_km"): load_p})
+    with pytest.raises(ValueError):
+        OutputWriter([("res_bus", "p_kw")])
+    with pytest.raises(ValueError):
+        run_timeseries(net, {("load", "p_kw"): load_p, ("load", "q_kvar"): load_p[:10]})
+    with pytest.raises(ValueError):
+        run_timeseries(net, {("load", "p_kw"): ArrayProfile(load_p[:, :2], index=[100, 101])})
+    with pytest.raises(NotImplementedError):
+        run_timeseries(net, {("load", "p_kw"): load_p}, algorithm="bfsw")
+
+
+if __name__ == "__main__":
+    pytest.main(["test_timeseries.py", "-xs"])
@@ -162,6 +162,132 @@ def test_graph_characteristics(feeder_network):
     assert notn1_areas == {8: {9, 10}, 3: {4, 5, 6}, 2: {11, 12, 13}}
 
 
+def test_csgraph_searches(feeder_network):
+    net = feeder_network
+    # meshed area behind the bridge (3, 4) and a stub at bus 6
+    buses = pp.create_buses(net, 3, vn_kv=20.)
+    for fb, tb in [(3, buses[0]), (buses[0], buses[1]), (buses[1], buses[2]),
+                   (buses[2], buses[0])]:
+        pp.create_line(net, fb, tb, length_km=1., std_type="NA2XS2Y 1x185 RM/25 12/20 kV")
+    isolated = pp.create_bus(net, vn_kv=20.)
+    oos = pp.create_bus(net, vn_kv=20., in_service=False)
+    pp.create_line(net, isolated, oos, length_km=1., std_type="NA2XS2Y 1x185 RM/25 12/20 kV")
+
+    cg = top.create_csgraph(net)
+    mg = top.create_nxgraph(net)
+    assert len(cg) == len(mg.nodes())
+    assert len(cg.from_nodes) == len(mg.edges())
+
+    for notravbuses in [set(), {1, 3}]:
+        cs_ccs = sorted(sorted(cc) for cc in top.connected_components(cg, notravbuses))
+        nx_ccs = sorted(sorted(cc) for cc in top.connected_components(mg, notravbuses))
+        assert cs_ccs == nx_ccs
+        assert sorted(top.connected_component(cg, 3, notravbuses)) == \
+            sorted(top.connected_component(mg, 3, notravbuses))
+
+    assert top.unsupplied_buses(net) == top.unsupplied_buses(net, mg=mg) == {isolated}
+
+    roots = net.ext_grid.bus.values
+    assert top.get_2connected_buses(cg, roots) == top.get_2connected_buses(mg, roots)
+    assert top.determine_stubs(net) == top.determine_stubs(net, mg=mg)
+
+
+def test_determine_stubs_backends():
+    net = pp.create_empty_network()
+    buses = pp.create_buses(net, 9, vn_kv=20.)
+    pp.create_ext_grid(net, buses[0])
+    # bus 1 is fed by two parallel lines, buses 2-4 are meshed, bus 5-6 is a parallel double
+    # line behind the mesh and buses 7-8 form a meshed area with parallel lines behind bus 5
+    for fb, tb in [(0, 1), (0, 1), (1, 2), (2, 3), (3, 4), (4, 2), (4, 5), (5, 6), (5, 6),
+                   (5, 7), (7, 8), (8, 5), (7, 8)]:
+        pp.create_line(net, buses[fb], buses[tb], length_km=1.,
+                       std_type="NA2XS2Y 1x185 RM/25 12/20 kV")
+    pp.create_switch(net, buses[3], buses[1], et="b", closed=False)
+
+    for respect_switches in [False, True]:
+        mg = top.create_nxgraph(net, respect_switches=respect_switches)
+        cg = top.create_csgraph(net, respect_switches=respect_switches)
+        nx_stubs = top.determine_stubs(net, mg=mg)
+        nx_on_stub = net.bus.on_stub.copy()
+        nx_is_stub = net.line.is_stub.copy()
+        assert top.determine_stubs(net, mg=cg) == nx_stubs
+        assert top.determine_stubs(net, respect_switches=respect_switches) == nx_stubs
+        assert net.bus.on_stub.equals(nx_on_stub)
+        assert net.line.is_stub.equals(nx_is_stub)
+        assert top.get_2connected_buses(cg, [0]) == top.get_2connected_buses(mg, [0])
+
+
+def test_topology_graph(feeder_network):
+    net = feeder_network
+    sw = pp.create_switch(net, bus=3, element=2, et="l", closed=True)
+    lv_bus = pp.create_bus(net, vn_kv=0.4)
+    pp.create_transformer(net, 3, lv_bus, "0.63 MVA 20/0.4 kV")
+    tg = top.TopologyGraph(net)
+    assert tg.unsupplied_buses() == set()
+    assert list(top.connected_components(tg)) == [{0, 1, 2, 3, lv_bus}]
+
+    # the ring is opened, all buses are still supplied
+    tg.set_switch(sw, False)
+    assert not net.switch.closed.at[sw]
+    assert tg.unsupplied_buses() == set()
+    tg.set_in_service("line", 3, False)
+    assert tg.unsupplied_buses() == {3, lv_bus}
+    assert top.unsupplied_buses(net, mg=tg) == top.unsupplied_buses(net) == {3, lv_bus}
+    assert set(top.connected_component(tg, lv_bus)) == {3, lv_bus}
+    assert not tg.is_supplied(lv_bus)
+
+    # changes of the net are applied by update
+    net.switch.closed.at[sw] = True
+    net.bus.in_service.at[1] = False
+    tg.update()
+    assert tg.unsupplied_buses() == top.unsupplied_buses(net) == {2, 3, lv_bus}
+    assert not tg.is_supplied(1)
+    tg.set_in_service("ext_grid", 0, False)
+    assert tg.unsupplied_buses() == {0, 2, 3, lv_bus}
+    tg.set_in_service("bus", 1, True)
+    tg.set_in_service("ext_grid", 0, True)
+    assert tg.unsupplied_buses() == set()
+
+    # new elements lead to a rebuild
+    new_bus = pp.create_bus(net, vn_kv=20.)
+    tg.update()
+    assert tg.unsupplied_buses() == {new_bus}
+    with pytest.raises(NotImplementedError):
+        list(top.connected_components(tg, notravbuses={1}))
+
+
+def test_estimate_voltage_vector():
+    net = pp.create_empty_network()
+    b1, b2, b3, b4 = pp.create_buses(net, 4, vn_kv=110.)
+    mv1, mv2 = pp.create_buses(net, 2, vn_kv=20.)
+    lv = pp.create_bus(net, vn_kv=10.)
+    isolated = pp.create_bus(net, vn_kv=20.)
+    pp.create_ext_grid(net, mv1, vm_pu=1.02, va_degree=10.)
+    pp.create_line(net, b1, b2, 1., "N2XS(FL)2Y 1x300 RM/35 64/110 kV")
+    pp.create_switch(net, b2, b3, "b")
+    pp.create_line(net, mv1, mv2, 1., "NA2XS2Y 1x185 RM/25 12/20 kV")
+    # ext_grid at the low voltage side of a transformer with off-nominal ratio
+    t = pp.create_transformer(net, b1, mv1, "40 MVA 110/20 kV")
+    net.trafo.vn_hv_kv.at[t] = 115.
+    net.trafo.shift_degree.at[t] = 150.
+    t3 = pp.create_transformer3w(net, b3, mv2, lv, "63/25/38 MVA 110/20/10 kV")
+    net.trafo3w.shift_lv_degree.at[t3] = 30.
+    pp.create_line(net, b3, b4, 1., "N2XS(FL)2Y 1x300 RM/35 64/110 kV", in_service=False)
+
+    res_bus = top.estimate_voltage_vector(net)
+    vm_hv = 1.02 * 115. / 110.
+    assert np.allclose(res_bus.vm_pu.loc[[mv1, mv2]].values, 1.02)
+    assert np.allclose(res_bus.vm_pu.loc[[b1, b2, b3]].values, vm_hv)
+    assert np.allclose(res_bus.vm_pu.at[lv], vm_hv)
+    assert np.allclose(res_bus.va_degree.loc[[b1, b2, b3]].values, 160.)
+    assert np.allclose(res_bus.va_degree.at[lv], 130.)
+    # buses without connection to an ext_grid are initialized flat
+    assert np.allclose(res_bus.loc[[b4, isolated]].values, [[1., 0.], [1., 0.]])
+
+    pp.runpp(net, init="estimate", calculate_voltage_angles=True)
+    assert net.converged
+
+
 if __name__ == '__main__':
     pass
 #    pytest.main(["test_graph_searches.py"])
@@ -0,0 +1,3 @@
+from pandapower.timeseries.data_sources import ArrayProfile, CSVProfile, HDF5Profile
+from pandapower.timeseries.output_writer import OutputWriter, read_npz_output
+from pandapower.timeseries.run_time_series import run_timeseries
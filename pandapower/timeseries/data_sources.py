@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+import numpy as np
+import pandas as pd
+
+
+class ArrayProfile(object):
+    """
+    Profile of an element variable given as array with one row per time step.
+
+    INPUT:
+        **data** (array) - profile values (number of time steps x number of elements)
+
+    OPTIONAL:
+        **index** (list, None) - element indices of the columns. By default, the columns
+        correspond to all elements of the element table in their order.
+    """
+
+    def __init__(self, data, index=None):
+        self.data = np.asarray(data, dtype=float)
+        if self.data.ndim == 1:
+            self.data = self.data[:, np.newaxis]
+        self.index = index
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def iter_chunks(self, chunk_size):
+        for start in range(0, self.data.shape[0], chunk_size):
+            yield self.data[start:start + chunk_size]
+
+
+class CSVProfile(object):
+    """
+    Profile of an element variable that is read in chunks of rows from a csv file with one row
+    per time step. Only one chunk is held in memory.
+
+    INPUT:
+        **path** (str) - path of the csv file
+
+    OPTIONAL:
+        **index** (list, None) - element indices of the columns. By default, the column names
+        of the file are the element indices.
+
+        **kwargs** - arguments for pandas.read_csv, e.g. sep or index_col
+    """
+
+    def __init__(self, path, index=None, **kwargs):
+        self.path = path
+        self.kwargs = kwargs
+        if index is None:
+            columns = pd.read_csv(path, nrows=0, **kwargs).columns
+            index = columns.astype(np.int64).values
+        self.index = index
+
+    def iter_chunks(self, chunk_size):
+        for chunk in pd.read_csv(self.path, chunksize=chunk_size, **self.kwargs):
+            yield chunk.values.astype(float)
+
+
+class HDF5Profile(object):
+    """
+    Profile of an element variable that is read in chunks of rows from a DataFrame in a HDF5
+    file (stored in "table" format with pandas.HDFStore, which requires pytables). Only one chunk
+    is held in memory.
+
+    INPUT:
+        **path** (str) - path of the HDF5 file
+
+        **key** (str) - key of the DataFrame in the file
+
+    OPTIONAL:
+        **index** (list, None) - element indices of the columns. By default, the column names
+        of the DataFrame are the element indices.
+    """
+
+    def __init__(self, path, key, index=None):
+        self.path = path
+        self.key = key
+        with pd.HDFStore(path, mode="r") as store:
+            self.n_rows = store.get_storer(key).nrows
+            if index is None:
+                index = store.select(key, start=0, stop=0).columns.astype(np.int64).values
+        self.index = index
+
+    def __len__(self):
+        return self.n_rows
+
+    def iter_chunks(self, chunk_size):
+        with pd.HDFStore(self.path, mode="r") as store:
+            for start in range(0, self.n_rows, chunk_size):
+                yield store.select(self.key, start=start, stop=start + chunk_size).values.astype(
+                    float)
+
+
+def _to_profile(data):
+    """
+    Converts arrays and DataFrames to an ArrayProfile. DataFrame columns are the element indices.
+    """
+    if isinstance(data, (ArrayProfile, CSVProfile, HDF5Profile)):
+        return data
+    if isinstance(data, pd.DataFrame):
+        return ArrayProfile(data.values, index=data.columns.values)
+    return ArrayProfile(data)
+
+
+def _get_number_of_time_steps(profiles):
+    """
+    Returns the number of time steps of the profiles or None if it is unknown (csv files).
+    Raises a ValueError if the profiles have different lengths.
+    """
+    lengths = set(len(profile) for profile in profiles if hasattr(profile, "__len__"))
+    if len(lengths) > 1:
+        raise ValueError("The profiles have different numbers of time steps: %s"
+                         % sorted(lengths))
+    return lengths.pop() if lengths else None
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+# result variables that can be logged in a time series simulation
+LOG_VARIABLES = {"res_bus": ["vm_pu", "va_degree"],
+                 "res_line": ["loading_percent", "i_ka", "p_from_kw", "q_from_kvar", "p_to_kw",
+                              "q_to_kvar"],
+                 "res_trafo": ["loading_percent", "p_hv_kw", "q_hv_kvar", "p_lv_kw", "q_lv_kvar"]}
+
+
+class OutputWriter(object):
+    """
+    Stores selected result variables of a time series simulation.
+
+    Without an output_path, the results are written into arrays (number of time steps x number of
+    elements), which are preallocated if the number of time steps is known in advance. With an
+    output_path, each chunk of time steps is written to disk as soon as it is calculated, so that
+    the memory usage does not depend on the number of time steps:
+
+        - "npz": one file chunk_<first time step>.npz per chunk in the directory output_path
+        - "hdf5": one table per variable in the HDF5 file output_path, to which the chunks are appended (requires pytables)
+
+    The convergence and the number of iterations of each time step are always stored.
+
+    OPTIONAL:
+        **log_variables** (list, None) - (table, variable) tuples of the results to store, e.g.
+        [("res_bus", "vm_pu"), ("res_line", "loading_percent")] (default). Supported variables
+        are listed in LOG_VARIABLES.
+
+        **output_path** (str, None) - directory (npz) or file (hdf5) the results are written to
+
+        **output_format** (str, "npz") - "npz" or "hdf5"
+
+        **overwrite** (bool, False) - if True, an existing HDF5 file or the chunk files of an
+        earlier simulation in the npz directory are deleted at the start of each simulation.
+        Otherwise, a ValueError is raised if they exist.
+    """
+
+    def __init__(self, log_variables=None, output_path=None, output_format="npz",
+                 overwrite=False):
+        if log_variables is None:
+            log_variables = [("res_bus", "vm_pu"), ("res_line", "loading_percent")]
+        for table, variable in log_variables:
+            if variable not in LOG_VARIABLES.get(table, []):
+                raise ValueError("Logging of %s.%s is not supported in time series simulations"
+                                 % (table, variable))
+        if output_format not in ["npz", "hdf5"]:
+            raise ValueError("Unknown output format %s" % output_format)
+        self.log_variables = list(log_variables)
+        self.output_path = output_path
+        self.output_format = output_format
+        self.overwrite = overwrite
+        self.output = {}
+
+    def _init_output(self, net, n_steps):
+        """
+        Prepares the output for a new simulation. n_steps is None if it is unknown.
+        """
+        self.index = {table: net[table[4:]].index.values for table, _ in self.log_variables}
+        self.n_steps = n_steps
+        self._chunks = {}
+        self.output = {}
+        keys = [(table, variable) for table, variable in self.log_variables] + \
+               [("pf", "converged"), ("pf", "iterations")]
+        if self.output_path is None:
+            for key in keys:
+                if n_steps is None:
+                    self._chunks[key] = []
+                else:
+                    self.output[key] = np.empty((n_steps,) + self._shape(key),
+                                                dtype=self._dtype(key))
+        elif self.output_format == "npz":
+            if not os.path.isdir(self.output_path):
+                os.makedirs(self.output_path)
+            # chunk files of an earlier simulation would be read together with the new ones
+            old_files = _get_chunk_files(self.output_path)
+            if len(old_files):
+                self._check_overwrite()
+                for f in old_files:
+                    os.remove(os.path.join(self.output_path, f))
+        elif os.path.exists(self.output_path):
+            self._check_overwrite()
+            os.remove(self.output_path)
+
+    def _check_overwrite(self):
+        if not self.overwrite:
+            raise ValueError("The results of an earlier simulation exist in %s. Use "
+                             "overwrite=True to replace them" % self.output_path)
+
+    def _shape(self, key):
+        return (len(self.index[key[0]]),) if key[0] in self.index else ()
+
+    @staticmethod
+    def _dtype(key):
+        if key == ("pf", "converged"):
+            return bool
+        if key == ("pf", "iterations"):
+            return np.int64
+        return np.float64
+
+    def _write_chunk(self, start, values):
+        """
+        Stores the results of the time steps start to start + len(chunk). values is a dict with
+        (table, variable) keys and arrays with one row per time step.
+        """
+        if self.output_path is None:
+            for key, data in values.items():
+                if self.n_steps is None:
+                    self._chunks[key].append(data)
+                else:
+                    self.output[key][start:start + data.shape[0]] = data
+        elif self.output_format == "npz":
+            path = os.path.join(self.output_path, "chunk_%08u.npz" % start)
+            arrays = {"%s.%s" % key: data for key, data in values.items()}
+            n = values[("pf", "converged")].shape[0]
+            arrays["time_step"] = np.arange(start, start + n)
+            np.savez(path, **arrays)
+        else:
+            with pd.HDFStore(self.output_path, mode="a") as store:
+                for key, data in values.items():
+                    index = np.arange(start, start + data.shape[0])
+                    if data.ndim == 1:
+                        df = pd.DataFrame({key[1]: data}, index=index)
+                    else:
+                        df = pd.DataFrame(data, index=index,
+                                          columns=[str(i) for i in self.index[key[0]]])
+                    store.append("%s/%s" % key, df, format="table")
+
+    def _finalize(self):
+        if self.output_path is None and self.n_steps is None:
+            for key, chunks in self._chunks.items():
+                self.output[key] = np.concatenate(chunks) if len(chunks) else \
+                    np.empty((0,) + self._shape(key), dtype=self._dtype(key))
+            self._chunks = {}
+        logger.debug("time series results stored for %s" % self.log_variables)
+
+    def get_dataframe(self, table, variable):
+        """
+        Returns the stored results of a variable as DataFrame with the time steps as index and
+        the element indices as columns (only for results stored in memory).
+        """
+        if self.output_path is not None:
+            raise NotImplementedError("The results are written to %s" % self.output_path)
+        data = self.output[(table, variable)]
+        if table == "pf":
+            return pd.DataFrame({variable: data})
+        return pd.DataFrame(data, columns=self.index[table])
+
+
+def read_npz_output(output_path, table, variable):
+    """
+    Reads the results of a variable from the chunk files written by an OutputWriter with
+    output_format "npz" and returns them as DataFrame with the time steps as index.
+    """
+    data, time_steps = [], []
+    for f in _get_chunk_files(output_path):
+        with np.load(os.path.join(output_path, f)) as chunk:
+            data.append(chunk["%s.%s" % (table, variable)])
+            time_steps.append(chunk["time_step"])
+    return pd.DataFrame(np.concatenate(data), index=np.concatenate(time_steps))
+
+
+def _get_chunk_files(output_path):
+    return sorted(f for f in os.listdir(output_path) if f.startswith("chunk_") and
+                  f.endswith(".npz"))
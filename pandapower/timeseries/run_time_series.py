@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+from itertools import count
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from pandapower.idx_bus import PD, QD, BASE_KV
+from pandapower.idx_gen import PG
+from pandapower.pf.makeSbus import makeSbus
+from pandapower.pf.newtonpf import newtonpf
+from pandapower.pf.ppci_variables import _get_branch_buses
+from pandapower.pf.run_batch_pf import _get_base_case_ppci, _get_injection_matrix, \
+    _get_line_loading, _get_trafo_loading
+from pandapower.run import runpp
+from pandapower.timeseries.data_sources import _to_profile, _get_number_of_time_steps
+from pandapower.timeseries.output_writer import OutputWriter
+
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+# element variables that can be given as profiles
+PROFILE_VARIABLES = {"load": ["p_kw", "q_kvar"],
+                     "sgen": ["p_kw", "q_kvar"],
+                     "storage": ["p_kw", "q_kvar"],
+                     "gen": ["p_kw"]}
+
+
+def run_timeseries(net, profiles, output_writer=None, chunk_size=1000, **kwargs):
+    """
+    Runs a power flow for each time step of the given profiles.
+
+    A power flow is carried out for the current values of net first. Its ppc, admittance matrices
+    and bus type index sets are reused for all time steps: the profile values are written
+    directly into the bus demand and generator injections of the internal ppc, without updating
+    the element tables of net. The profiles are read in chunks of time steps, the results of each
+    chunk are calculated with sparse matrix products and passed to the output writer, so that
+    only one chunk of profile values and results is held in memory at a time. Each power flow
+    starts from the voltages of the previous time step.
+
+    INPUT:
+        **net** - The pandapower format network
+
+        **profiles** (dict) - profiles with (element, variable) keys, e.g.
+        {("load", "p_kw"): ArrayProfile(p_kw), ("sgen", "p_kw"): CSVProfile("sgen_p.csv")}.
+        Arrays and DataFrames are converted to an ArrayProfile. Supported variables are listed in
+        PROFILE_VARIABLES. Variables without profile keep their values in net.
+
+    OPTIONAL:
+        **output_writer** (OutputWriter, None) - defines the results that are stored and where
+        they are stored. By default, the bus voltages and line loadings are stored in memory.
+
+        **chunk_size** (int, 1000) - number of time steps that are read and stored at once
+
+        **kwargs** - power flow options that are passed to runpp. Only the Newton-Raphson
+        algorithms ("nr" and "iwamoto_nr") without enforce_q_lims are supported.
+
+    OUTPUT:
+        **output_writer** (OutputWriter) - the output writer with the stored results. Results
+        of elements that are out of service or not supplied are the same as in the power flow
+        results, all results of time steps that did not converge are NaN. The result tables
+        of net contain the results of the initial power flow.
+
+    EXAMPLE:
+        import numpy as np
+        import pandapower.networks as pn
+        from pandapower.timeseries import run_timeseries, OutputWriter
+
+        net = pn.create_cigre_network_mv()
+        factors = np.random.uniform(0.5, 1.5, (8760, 1))
+        ow = OutputWriter([("res_bus", "vm_pu"), ("res_trafo", "loading_percent")])
+        run_timeseries(net, {("load", "p_kw"): factors * net.load.p_kw.values}, ow)
+        vm_pu = ow.get_dataframe("res_bus", "vm_pu")
+    """
+    algorithm = kwargs.get("algorithm", "nr")
+    if algorithm not in ["nr", "iwamoto_nr"]:
+        raise NotImplementedError("run_timeseries is only implemented for the Newton-Raphson "
+                                  "algorithms, not for algorithm %s" % algorithm)
+    if kwargs.get("enforce_q_lims", False):
+        raise NotImplementedError("enforce_q_lims is not supported by run_timeseries")
+    profiles = {key: _to_profile(profile) for key, profile in profiles.items()}
+    for element, variable in profiles:
+        if variable not in PROFILE_VARIABLES.get(element, []):
+            raise ValueError("Profiles of %s.%s are not supported in time series simulations"
+                             % (element, variable))
+    if output_writer is None:
+        output_writer = OutputWriter()
+    n_steps = _get_number_of_time_steps(profiles.values())
+
+    runpp(net, **kwargs)
+    ppci, pv, pq, V0 = _get_base_case_ppci(net)
+    columns = {key: _get_profile_columns(net, key[0], profile.index)
+               for key, profile in profiles.items()}
+    injections = _get_profile_injections(net, ppci, profiles, columns)
+    output_writer._init_output(net, n_steps)
+
+    options = net["_options"]
+    baseMVA, bus, gen = ppci["baseMVA"], ppci["bus"], ppci["gen"]
+    Ybus = ppci["internal"]["Ybus"]
+    keys = list(profiles.keys())
+    chunks = [profiles[key].iter_chunks(chunk_size) for key in keys]
+    V = V0
+    start = 0
+    n_not_converged = 0
+    for chunk in _zip_chunks(keys, chunks):
+        n = chunk[keys[0]].shape[0]
+        values = {}
+        for var in ["PD", "QD", "PG"]:
+            base, C, key_list = injections[var]
+            values[var] = base[:, np.newaxis] + sum(C[key] * chunk[key].T for key in key_list) \
+                if key_list else None
+
+        V_chunk = np.empty((bus.shape[0], n), dtype=np.complex128)
+        converged = np.zeros(n, dtype=bool)
+        iterations = np.zeros(n, dtype=np.int64)
+        for s in range(n):
+            if values["PD"] is not None:
+                bus[:, PD] = values["PD"][:, s]
+            if values["QD"] is not None:
+                bus[:, QD] = values["QD"][:, s]
+            if values["PG"] is not None:
+                gen[:, PG] = values["PG"][:, s]
+            Sbus = makeSbus(baseMVA, bus, gen)
+            V_s, converged[s], iterations[s], _, _, _ = newtonpf(Ybus, Sbus, V, pv, pq, ppci,
+                                                                 options)
+            V_chunk[:, s] = V_s
+            V = V_s if converged[s] else V0
+        n_not_converged += np.count_nonzero(~converged)
+
+        results = _get_time_series_results(net, ppci, V_chunk, output_writer.log_variables)
+        for data in results.values():
+            data[~converged] = np.nan
+        results[("pf", "converged")] = converged
+        results[("pf", "iterations")] = iterations
+        output_writer._write_chunk(start, results)
+        start += n
+    output_writer._finalize()
+    if n_not_converged:
+        logger.warning("Power flow did not converge for %u of %u time steps"
+                       % (n_not_converged, start))
+    return output_writer
+
+
+def _zip_chunks(keys, chunks):
+    """
+    Yields dicts with the next chunk of all profiles. Raises a ValueError if the profiles have
+    different numbers of time steps.
+    """
+    for i in count():
+        chunk = {}
+        for key, it in zip(keys, chunks):
+            data = next(it, None)
+            if data is not None:
+                chunk[key] = data
+        if not chunk:
+            return
+        lengths = set(data.shape[0] for data in chunk.values())
+        if len(chunk) < len(keys) or len(lengths) > 1:
+            raise ValueError("The profiles have different numbers of time steps (chunk %u)" % i)
+        yield chunk
+
+
+def _get_profile_columns(net, element, index):
+    """
+    Returns the positions of the profile columns in the element table.
+    """
+    if index is None:
+        return np.arange(len(net[element]))
+    index = np.asarray(index)
+    missing = ~np.in1d(index, net[element].index.values)
+    if np.any(missing):
+        raise ValueError("Profile columns %s are not in net.%s" % (index[missing], element))
+    return net[element].index.get_indexer(index)
+
+
+def _get_profile_injections(net, ppci, profiles, columns):
+    """
+    Returns the base values and the sparse matrices which map the profile values to the bus
+    demand (PD, QD) and the generator injections (PG) of the ppci. The base values are the ppci
+    values without the contribution of the elements with profiles.
+    """
+    bus, gen = ppci["bus"], ppci["gen"]
+    n_bus = bus.shape[0]
+    injections = {"PD": [bus[:, PD].copy(), {}, []], "QD": [bus[:, QD].copy(), {}, []],
+                  "PG": [gen[:, PG].copy(), {}, []]}
+    for (element, variable), profile in profiles.items():
+        key = (element, variable)
+        cols = columns[key]
+        if element == "gen":
+            C = _get_gen_injection_matrix(net, ppci, gen.shape[0])
+            var = "PG"
+        else:
+            C = _get_injection_matrix(net, element, n_bus)
+            var = "PD" if variable == "p_kw" else "QD"
+        # remove the contribution of the elements with profiles from the base values
+        injections[var][0] -= C[:, cols] * net[element][variable].values[cols]
+        injections[var][1][key] = C[:, cols].tocsr()
+        injections[var][2].append(key)
+    return {var: tuple(injections[var]) for var in injections}
+
+
+def _get_gen_injection_matrix(net, ppci, n_gen):
+    """
+    Returns the sparse matrix that maps the active power of the generators (in kW) to the
+    generator injections of the ppci (in MW)
+    """
+    gen_df = net["gen"]
+    is_gen = net["_is_elements"]["gen"]
+    n_ext_grid = np.count_nonzero(net["_is_elements"]["ext_grid"])
+    gen_is = ppci["internal"]["gen_is"]
+    # ppc gen rows of the generators follow the external grids, ppci rows are the in service rows
+    ppc_gen = n_ext_grid + np.cumsum(is_gen) - 1
+    ppci_gen = np.cumsum(gen_is) - 1
+    active = is_gen.copy()
+    active[is_gen] = gen_is[ppc_gen[is_gen]]
+    rows = ppci_gen[ppc_gen[active]]
+    cols = np.flatnonzero(active)
+    data = -gen_df["scaling"].values[active] * 1e-3
+    return csr_matrix((data, (rows, cols)), shape=(n_gen, len(gen_df)))
+
+
+def _get_time_series_results(net, ppci, V, log_variables):
+    """
+    Calculates the logged result variables for a matrix of voltages (one column per time step).
+    Returns a dict with (table, variable) keys and arrays with one row per time step in the
+    order of the element tables.
+    """
+    results = {}
+    tables = set(table for table, _ in log_variables)
+    n_steps = V.shape[1]
+    n_bus = ppci["bus"].shape[0]
+
+    if "res_bus" in tables:
+        bus_lookup = net["_pd2ppc_lookups"]["bus"]
+        ppci_bus = bus_lookup[net.bus.index.values]
+        bus_is = (ppci_bus >= 0) & (ppci_bus < n_bus)
+        V_bus = np.full((n_steps, len(net.bus)), np.nan, dtype=np.complex128)
+        V_bus[:, bus_is] = V[ppci_bus[bus_is]].T
+        bus_values = {"vm_pu": np.abs, "va_degree": lambda v: np.angle(v, deg=True)}
+        for table, variable in log_variables:
+            if table == "res_bus":
+                results[(table, variable)] = bus_values[variable](V_bus)
+
+    branch_tables = [table for table in ["res_line", "res_trafo"] if table in tables]
+    if not branch_tables:
+        return results
+    baseMVA, bus, branch = ppci["baseMVA"], ppci["bus"], ppci["branch"]
+    Yf, Yt = ppci["internal"]["Yf"], ppci["internal"]["Yt"]
+    branch_is = ppci["internal"]["branch_is"]
+    ppci_branch = np.cumsum(branch_is) - 1
+    # branch flows of the ppci in MVA
+    f_bus, t_bus = _get_branch_buses(branch)
+    Sf = V[f_bus] * np.conj(Yf * V) * baseMVA
+    St = V[t_bus] * np.conj(Yt * V) * baseMVA
+    for table in branch_tables:
+        element = table[4:]
+        n_el = len(net[element])
+        el_values = {}
+        s_f = np.zeros((n_el, n_steps), dtype=np.complex128)
+        s_t = np.zeros((n_el, n_steps), dtype=np.complex128)
+        # like in the power flow results, the currents of branches without supplied buses are NaN
+        i_f = np.full((n_el, n_steps), np.nan)
+        i_t = np.full((n_el, n_steps), np.nan)
+        if element in net["_pd2ppc_lookups"]["branch"]:
+            f, t = net["_pd2ppc_lookups"]["branch"][element]
+            el_is = branch_is[f:t]
+            br = ppci_branch[f:t][el_is]
+            s_f[el_is] = Sf[br] * 1e3
+            s_t[el_is] = St[br] * 1e3
+            u_f = np.abs(V[f_bus[br]]) * bus[f_bus[br], BASE_KV][:, np.newaxis] * np.sqrt(3)
+            u_t = np.abs(V[t_bus[br]]) * bus[t_bus[br], BASE_KV][:, np.newaxis] * np.sqrt(3)
+            i_f[el_is] = np.abs(Sf[br]) / u_f
+            i_t[el_is] = np.abs(St[br]) / u_t
+        if element == "line":
+            el_values["i_ka"] = np.maximum(i_f, i_t)
+            el_values["loading_percent"] = _get_line_loading(net, ppci, Sf, St, V).T
+            names = ("from", "to")
+        else:
+            el_values["loading_percent"] = _get_trafo_loading(net, ppci, Sf, St, V).T
+            names = ("hv", "lv")
+        el_values["p_%s_kw" % names[0]] = s_f.real
+        el_values["q_%s_kvar" % names[0]] = s_f.imag
+        el_values["p_%s_kw" % names[1]] = s_t.real
+        el_values["q_%s_kvar" % names[1]] = s_t.imag
+        for tab, variable in log_variables:
+            if tab == table:
+                results[(table, variable)] = el_values[variable].T
+    return results
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from timeit import default_timer
+
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _init_timings(net, calculation, profile):
+    """
+    Returns a new timing dict for the given calculation if profile is True or a callable and
+    stores it in net["_timings"]. Returns None if profile is False, in which case no timings are
+    recorded.
+
+    The timing dict contains:
+
+        - "calculation": name of the calculation (e.g. "runpp")
+        - "stages": wall time in seconds per stage, summed over all calls of the stage. Stages can be nested, e.g. "pf_algorithm" contains "makeYbus", "create_jacobian", "solve_linear_system" and "pfsoln".
+        - "calls": number of calls per stage (e.g. one Jacobian per Newton-Raphson iteration)
+        - "iterations": number of iterations of the solver
+        - "mismatch": infinity norm of the mismatch vector in p.u. before and after each iteration (Newton-Raphson power flow), the feasibility condition per iteration (OPF) or the maximum state change per iteration (state estimation)
+        - "nnz_Ybus": number of nonzeros of the admittance matrix
+        - "nnz_J": number of nonzeros of the last Jacobian matrix
+        - "success": True if the calculation was successful
+        - "total": total wall time of the calculation in seconds
+    """
+    if not profile:
+        return None
+    timings = {"calculation": calculation, "stages": OrderedDict(), "calls": {},
+               "iterations": None, "mismatch": [], "nnz_Ybus": None, "nnz_J": None,
+               "success": False, "total": None, "_t0": default_timer()}
+    net["_timings"] = timings
+    return timings
+
+
+def _run_profiled(net, calculation, profile, func, *args, **kwargs):
+    """
+    Runs func(net, *args, **kwargs) and records the timings of the calculation if profile is set.
+    The timing dict is passed to the calculation in net["_options"]["timings"]. The calculation
+    is successful if func does not raise an exception and does not return False.
+    """
+    timings = _init_timings(net, calculation, profile)
+    if timings is not None:
+        net["_options"]["timings"] = timings
+    try:
+        result = func(net, *args, **kwargs)
+        if timings is not None:
+            timings["success"] = result is not False
+        return result
+    finally:
+        _finish_timings(net, timings, profile)
+
+
+def _finish_timings(net, timings, profile):
+    """
+    Stores the total time of the calculation and passes the timings to profile if it is a
+    callable (e.g. the hook of a metrics exporter).
+    """
+    if timings is None:
+        return
+    timings["total"] = default_timer() - timings.pop("_t0")
+    if "_options" in net and net["_options"] is not None:
+        # power flows which reuse the options (e.g. runpp_batch) do not record timings
+        net["_options"].pop("timings", None)
+    if callable(profile):
+        try:
+            profile(timings)
+        except Exception as e:
+            logger.warning("timing hook %s failed: %s" % (profile, e))
+
+
+def _add_time(timings, stage, t):
+    """
+    Adds the wall time t in seconds to a stage.
+    """
+    timings["stages"][stage] = timings["stages"].get(stage, 0.) + t
+    timings["calls"][stage] = timings["calls"].get(stage, 0) + 1
+
+
+@contextmanager
+def _timed(timings, stage):
+    """
+    Records the wall time of the enclosed code as stage if timings is not None.
+    """
+    if timings is None:
+        yield
+        return
+    t0 = default_timer()
+    try:
+        yield
+    finally:
+        _add_time(timings, stage, default_timer() - t0)
@@ -8,6 +8,7 @@ from itertools import combinations
 
 import networkx as nx
 import numpy as np
+from scipy.sparse import csr_matrix
 
 try:
     import pplog as logging
@@ -173,3 +174,226 @@ def create_nxgraph(net, respect_switches=True, include_lines=True, include_trafo
                     del mg._adj[b][i]  # networkx versions 2.0
     mg.remove_nodes_from(net.bus[~net.bus.in_service].index)
     return mg
+
+
+class CSGraph(object):
+    """
+    Graph of a pandapower network for the graph searches of scipy.sparse.csgraph. The nodes are
+    the positions of the buses in the array buses, the edges are stored as arrays of their end
+    nodes and attributes. The sparse adjacency matrix is built from the edge arrays with
+    adjacency().
+
+    ATTRIBUTES:
+        **buses** (array) - pandapower indices of the buses which are the nodes of the graph
+
+        **from_nodes**, **to_nodes** (array) - nodes of the edges
+
+        **element** (array) - element type of the edges ("l", "i", "t", "t3" or "s")
+
+        **element_index** (array) - pandapower index of the element of the edges
+
+        **weight** (array) - length of the lines in km, zero for all other edges
+
+        **r_ohm**, **z_ohm** (array) - absolute resistance and impedance of the edges in Ohm (zero
+            if they are not calculated)
+
+        **traversable** (array) - False for the nodes of the notravbuses
+    """
+
+    def __init__(self, buses, from_buses, to_buses, element, element_index, weight, r_ohm, z_ohm,
+                 notravbuses=None):
+        self.buses = np.asarray(buses, dtype=np.int64)
+        self._lookup = -np.ones(self.buses.max() + 2 if len(self.buses) else 1, dtype=np.int64)
+        self._lookup[self.buses] = np.arange(len(self.buses))
+        from_nodes = self._get_nodes(from_buses)
+        to_nodes = self._get_nodes(to_buses)
+        # edges at buses which are not part of the graph are dropped
+        in_graph = (from_nodes >= 0) & (to_nodes >= 0)
+        self.from_nodes = from_nodes[in_graph]
+        self.to_nodes = to_nodes[in_graph]
+        self.element = np.asarray(element)[in_graph]
+        self.element_index = np.asarray(element_index, dtype=np.int64)[in_graph]
+        self.weight = np.asarray(weight, dtype=float)[in_graph]
+        self.r_ohm = np.asarray(r_ohm, dtype=float)[in_graph]
+        self.z_ohm = np.asarray(z_ohm, dtype=float)[in_graph]
+        self.traversable = ~self.contains(notravbuses) if notravbuses is not None else \
+            np.ones(len(self.buses), dtype=bool)
+
+    def __len__(self):
+        return len(self.buses)
+
+    def _get_nodes(self, buses):
+        buses = np.asarray(buses, dtype=np.int64)
+        nodes = -np.ones(len(buses), dtype=np.int64)
+        valid = (buses >= 0) & (buses < len(self._lookup))
+        nodes[valid] = self._lookup[buses[valid]]
+        return nodes
+
+    def contains(self, buses):
+        """
+        Returns a mask of the nodes whose buses are in buses
+        """
+        if isinstance(buses, (set, frozenset)):
+            buses = list(buses)
+        return np.in1d(self.buses, np.atleast_1d(np.asarray(buses, dtype=np.int64)))
+
+    def node(self, bus):
+        """
+        Returns the node of a bus, raises a KeyError if the bus is not part of the graph
+        """
+        node = self._get_nodes([bus])[0]
+        if node < 0:
+            raise KeyError(bus)
+        return node
+
+    def nodes(self, buses):
+        """
+        Returns the nodes of the buses, buses which are not part of the graph are dropped
+        """
+        nodes = self._get_nodes(np.atleast_1d(buses))
+        return nodes[nodes >= 0]
+
+    def adjacency(self, weight=None, notravbuses=None):
+        """
+        Returns the adjacency matrix of the graph as scipy.sparse.csr_matrix. Each edge is
+        contained in both directions, except for the directions starting at notravbuses (the
+        traversable attribute or the notravbuses given here). For parallel edges, the smallest
+        weight is used.
+
+        OPTIONAL:
+            **weight** (string, None) - edge attribute which is used as matrix entries
+                ("weight", "r_ohm" or "z_ohm"), all entries are one if None
+
+            **notravbuses** (set, None) - additional buses from which the graph is not traversed
+        """
+        traversable = self.traversable
+        if notravbuses is not None:
+            traversable = traversable & ~self.contains(notravbuses)
+        rows = np.r_[self.from_nodes, self.to_nodes]
+        cols = np.r_[self.to_nodes, self.from_nodes]
+        data = np.ones(len(rows)) if weight is None else np.r_[getattr(self, weight),
+                                                                getattr(self, weight)]
+        keep = traversable[rows]
+        rows, cols, data = rows[keep], cols[keep], data[keep]
+        # keep the smallest weight of parallel edges, zero weights remain explicit entries
+        order = np.lexsort((data, cols, rows))
+        rows, cols, data = rows[order], cols[order], data[order]
+        first = np.r_[True, (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])] if len(rows) \
+            else np.zeros(0, dtype=bool)
+        n = len(self.buses)
+        return csr_matrix((data[first], (rows[first], cols[first])), shape=(n, n))
+
+
+def create_csgraph(net, respect_switches=True, include_lines=True, include_trafos=True,
+                   include_impedances=True, nogobuses=None, notravbuses=None, calc_r_ohm=False,
+                   calc_z_ohm=False):
+    """
+     Converts a pandapower network into a CSGraph, which contains the same nodes and edges as the
+     NetworkX graph of create_nxgraph, but stores them in arrays. The graph searches of
+     scipy.sparse.csgraph are applied on its adjacency matrix, which is much faster than the
+     NetworkX graph for large networks. The topology functions connected_component,
+     connected_components, calc_distance_to_bus, unsupplied_buses and determine_stubs use it.
+
+     INPUT:
+        **net** (pandapowerNet) - variable that contains a pandapower network
+
+
+     OPTIONAL:
+        **respect_switches** (boolean, True) - True: open switches (line, trafo, bus) are being \
+            considered (no edge between nodes)
+            False: open switches are being ignored
+
+        **include_lines** (boolean, True) - determines, whether lines get converted to edges
+
+        **include_impedances** (boolean, True) - determines, whether per unit impedances
+            (net.impedance) are converted to edges
+
+        **include_trafos** (boolean, True) - determines, whether trafos get converted to edges
+
+        **nogobuses** (integer/list, None) - nogobuses are not being considered in the graph
+
+        **notravbuses** (integer/list, None) - lines connected to these buses are not being
+            considered in the graph
+
+        **calc_r_ohm** (boolean, False) - True: The function calculates absolute resistance in Ohm
+            False: All resistances are set to zero
+
+        **calc_z_ohm** (boolean, False) - True: The function calculates magnitude of the impedance
+            in Ohm
+            False: All impedances are set to zero
+
+     OUTPUT:
+        **g** (CSGraph) - Returns the graph with its edges as arrays
+
+     EXAMPLE:
+         import pandapower.topology as top
+         from scipy.sparse import csgraph
+
+         g = top.create_csgraph(net)
+         n, labels = csgraph.connected_components(g.adjacency(), directed=False)
+
+    """
+    edges = []
+
+    def add_edges(f, t, element, index, weight=None, r_ohm=None, z_ohm=None):
+        n = len(index)
+        zeros = np.zeros(n)
+        edges.append((np.asarray(f), np.asarray(t), np.full(n, element, dtype=object),
+                      np.asarray(index), zeros if weight is None else np.asarray(weight),
+                      zeros if r_ohm is None or not calc_r_ohm else np.asarray(r_ohm),
+                      zeros if z_ohm is None or not calc_z_ohm else np.asarray(z_ohm)))
+
+    switch = net.switch
+    open_switches = (switch.closed.values == 0) if respect_switches else \
+        np.zeros(len(switch), dtype=bool)
+    if include_lines:
+        line = net.line
+        # lines with open switches are excluded
+        nogolines = switch.element.values[(switch.et.values == "l") & open_switches]
+        line = line[line.in_service.values.astype(bool) & ~line.index.isin(nogolines)]
+        r_ohm = line.r_ohm_per_km.values * line.length_km.values
+        x_ohm = line.x_ohm_per_km.values * line.length_km.values
+        add_edges(line.from_bus.values, line.to_bus.values, "l", line.index.values,
+                  line.length_km.values, r_ohm, np.sqrt(r_ohm ** 2 + x_ohm ** 2))
+
+    if include_impedances:
+        if not include_lines and len(net.impedance) > 0:
+            logger.warning('Change notice: per unit impedance elements are included in the graph, '
+                           'even though lines are not. If this behaviour is undesired, set the '
+                           'parameter "include_impedances" to False')
+        impedance = net.impedance[net.impedance.in_service.values.astype(bool)]
+        z_base = net.bus.vn_kv.loc[impedance.from_bus.values].values ** 2 / (net.sn_kva / 1000)
+        add_edges(impedance.from_bus.values, impedance.to_bus.values, "i",
+                  impedance.index.values, None, impedance.rft_pu.abs().values * z_base,
+                  np.sqrt(impedance.rft_pu.values ** 2 + impedance.xft_pu.values ** 2) * z_base)
+
+    if include_trafos:
+        trafo = net.trafo
+        nogotrafos = switch.element.values[(switch.et.values == "t") & open_switches]
+        trafo = trafo[trafo.in_service.values.astype(bool) & ~trafo.index.isin(nogotrafos)]
+        z_base = trafo.vn_hv_kv.values ** 2 / (trafo.sn_kva.values / 1000)
+        add_edges(trafo.hv_bus.values, trafo.lv_bus.values, "t", trafo.index.values, None,
+                  trafo.vscr_percent.values / 100 * z_base, trafo.vsc_percent.values / 100 * z_base)
+
+        trafo3w = net.trafo3w[net.trafo3w.in_service.values.astype(bool)]
+        for b1, b2, side, sn1, sn2 in [("hv", "mv", "hv", "sn_hv_kva", "sn_mv_kva"),
+                                       ("mv", "lv", "mv", "sn_mv_kva", "sn_lv_kva"),
+                                       ("hv", "lv", "lv", "sn_hv_kva", "sn_lv_kva")]:
+            z_base = trafo3w.vn_hv_kv.values ** 2 / \
+                (np.minimum(trafo3w[sn1].values, trafo3w[sn2].values) / 1000)
+            add_edges(trafo3w["%s_bus" % b1].values, trafo3w["%s_bus" % b2].values, "t3",
+                      trafo3w.index.values, None,
+                      trafo3w["vscr_%s_percent" % side].values / 100 * z_base,
+                      trafo3w["vsc_%s_percent" % side].values / 100 * z_base)
+
+    # edges for closed bus-bus switches or any bus-bus switches
+    bs = (switch.et.values == "b") & ~open_switches
+    add_edges(switch.bus.values[bs], switch.element.values[bs], "s", switch.index.values[bs])
+
+    buses = net.bus.index.values[net.bus.in_service.values.astype(bool)]
+    if nogobuses is not None:
+        if isinstance(nogobuses, (set, frozenset)):
+            nogobuses = list(nogobuses)
+        buses = buses[~np.in1d(buses, np.atleast_1d(np.asarray(nogobuses, dtype=np.int64)))]
+    return CSGraph(buses, *[np.concatenate(arrays) for arrays in zip(*edges)],
+                   notravbuses=notravbuses)
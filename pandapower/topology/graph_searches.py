@@ -5,9 +5,12 @@
 
 
 import networkx as nx
+import numpy as np
 import pandas as pd
+from scipy.sparse import csr_matrix, csgraph
 
-from pandapower.topology.create_graph import create_nxgraph
+from pandapower.topology.create_graph import create_csgraph, CSGraph
+from pandapower.topology.topology_graph import TopologyGraph
 
 
 def connected_component(mg, bus, notravbuses=[]):
@@ -15,7 +18,8 @@ def connected_component(mg, bus, notravbuses=[]):
     Finds all buses in a NetworkX graph that are connected to a certain bus.
 
     INPUT:
-        **mg** (NetworkX graph) - NetworkX Graph or MultiGraph that represents a pandapower network.
+        **mg** (NetworkX graph / CSGraph / TopologyGraph) - NetworkX Graph or MultiGraph,
+            CSGraph or TopologyGraph that represents a pandapower network.
 
         **bus** (integer) - Index of the bus at which the search for connected components originates
 
@@ -35,6 +39,19 @@ def connected_component(mg, bus, notravbuses=[]):
          cc = top.connected_component(mg, 5)
 
     """
+    if isinstance(mg, CSGraph):
+        # breadth first search on the adjacency matrix, the start bus is always traversed
+        adjacency = mg.adjacency(notravbuses=set(notravbuses) - {bus})
+        nodes = csgraph.breadth_first_order(adjacency, mg.node(bus), directed=True,
+                                            return_predecessors=False)
+        for b in mg.buses[nodes].tolist():
+            yield b
+        return
+    if isinstance(mg, TopologyGraph):
+        _check_topology_graph_notravbuses(notravbuses)
+        for b in mg.connected_component(bus):
+            yield b
+        return
 
     yield bus
     visited = {bus}
@@ -57,7 +74,8 @@ def connected_components(mg, notravbuses=set()):
      Clusters all buses in a NetworkX graph that are connected to each other.
 
      INPUT:
-        **mg** (NetworkX graph) - NetworkX Graph or MultiGraph that represents a pandapower network.
+        **mg** (NetworkX graph / CSGraph / TopologyGraph) - NetworkX Graph or MultiGraph,
+            CSGraph or TopologyGraph that represents a pandapower network.
 
 
      OPTIONAL:
@@ -76,6 +94,15 @@ def connected_components(mg, notravbuses=set()):
          cc = top.connected_components(net, 5)
 
     """
+    if isinstance(mg, CSGraph):
+        for cc in _connected_components_csgraph(mg, notravbuses):
+            yield cc
+        return
+    if isinstance(mg, TopologyGraph):
+        _check_topology_graph_notravbuses(notravbuses)
+        for cc in mg.connected_components():
+            yield cc
+        return
 
     nodes = set(mg.nodes()) - notravbuses
     while nodes:
@@ -89,6 +116,39 @@ def connected_components(mg, notravbuses=set()):
                 yield set([f, t])
 
 
+def _check_topology_graph_notravbuses(notravbuses):
+    if len(notravbuses):
+        raise NotImplementedError("notravbuses are not supported for a TopologyGraph, use "
+                                  "create_csgraph or create_nxgraph instead")
+
+
+def _connected_components_csgraph(g, notravbuses):
+    notrav = g.contains(notravbuses) | ~g.traversable
+    trav_edges = ~notrav[g.from_nodes] & ~notrav[g.to_nodes]
+    n = len(g)
+    adjacency = csr_matrix((np.ones(np.count_nonzero(trav_edges)),
+                            (g.from_nodes[trav_edges], g.to_nodes[trav_edges])), shape=(n, n))
+    _, labels = csgraph.connected_components(adjacency, directed=False)
+    labels[notrav] = -1
+    ccs = dict()
+    for label, bus in zip(labels.tolist(), g.buses.tolist()):
+        if label >= 0:
+            ccs.setdefault(label, set()).add(bus)
+    # notravbuses belong to the components of all their traversable neighbours
+    f, t = g.from_nodes, g.to_nodes
+    for trav, other in [(f, t), (t, f)]:
+        at_notrav = ~notrav[trav] & notrav[other]
+        for label, bus in zip(labels[trav[at_notrav]].tolist(),
+                              g.buses[other[at_notrav]].tolist()):
+            ccs[label].add(bus)
+    for cc in ccs.values():
+        yield cc
+    # two notravbuses which are directly connected
+    both_notrav = notrav[f] & notrav[t]
+    for fb, tb in zip(g.buses[f[both_notrav]].tolist(), g.buses[t[both_notrav]].tolist()):
+        yield {fb, tb}
+
+
 def calc_distance_to_bus(net, bus, respect_switches=True, nogobuses=None,
                          notravbuses=None):
     """
@@ -120,9 +180,12 @@ def calc_distance_to_bus(net, bus, respect_switches=True, nogobuses=None,
          dist = top.calc_distance_to_bus(net, 5)
 
     """
-    g = create_nxgraph(net, respect_switches=respect_switches,
+    g = create_csgraph(net, respect_switches=respect_switches,
                        nogobuses=nogobuses, notravbuses=notravbuses)
-    return pd.Series(nx.single_source_dijkstra_path_length(g, bus))
+    # the adjacency matrix does not contain the directions starting at notravbuses
+    dist = csgraph.dijkstra(g.adjacency("weight"), directed=True, indices=g.node(bus))
+    reachable = np.isfinite(dist)
+    return pd.Series(dist[reachable], index=g.buses[reachable])
 
 
 def unsupplied_buses(net, mg=None, in_service_only=False, slacks=None, respect_switches=True):
@@ -133,7 +196,9 @@ def unsupplied_buses(net, mg=None, in_service_only=False, slacks=None, respect_s
         **net** (pandapowerNet) - variable that contains a pandapower network
 
      OPTIONAL:
-        **mg** (NetworkX graph) - NetworkX Graph or MultiGraph that represents a pandapower network.
+        **mg** (NetworkX graph / CSGraph / TopologyGraph) - NetworkX Graph or MultiGraph,
+            CSGraph or TopologyGraph that represents a pandapower network. A CSGraph is created
+            if None.
 
         **in_service_only** (boolean, False) - Defines whether only in service buses should be
             included in unsupplied_buses.
@@ -153,13 +218,23 @@ def unsupplied_buses(net, mg=None, in_service_only=False, slacks=None, respect_s
          top.unsupplied_buses(net)
     """
 
-    mg = mg or create_nxgraph(net, respect_switches=respect_switches)
-    if slacks is None:
-        slacks = set(net.ext_grid[net.ext_grid.in_service].bus.values)
-    not_supplied = set()
-    for cc in nx.connected_components(mg):
-        if not set(cc) & slacks:
-            not_supplied.update(set(cc))
+    if mg is None:
+        mg = create_csgraph(net, respect_switches=respect_switches)
+    if isinstance(mg, TopologyGraph):
+        # the supply status of the in service ext_grids is maintained by the graph
+        not_supplied = mg.unsupplied_buses(slacks)
+    else:
+        if slacks is None:
+            slacks = set(net.ext_grid[net.ext_grid.in_service].bus.values)
+        if isinstance(mg, CSGraph):
+            _, labels = csgraph.connected_components(mg.adjacency(), directed=False)
+            supplied = np.in1d(labels, labels[mg.contains(slacks)])
+            not_supplied = set(mg.buses[~supplied].tolist())
+        else:
+            not_supplied = set()
+            for cc in nx.connected_components(mg):
+                if not set(cc) & slacks:
+                    not_supplied.update(set(cc))
 
     buses_remove = set()
     if in_service_only:
@@ -348,16 +423,44 @@ def get_2connected_buses(g, roots):
     Get all buses which have at least two connections to the roots
 
     INPUT:
-        **g** (NetworkX graph) - NetworkX Graph or MultiGraph that represents a pandapower network
+        **g** (NetworkX graph / CSGraph) - NetworkX Graph or MultiGraph or CSGraph that
+            represents a pandapower network
 
         **roots** - Roots of the graphsearch
     """
+    if isinstance(g, CSGraph):
+        g = _csgraph_neighbors(g)
     char_dict = find_graph_characteristics(g, roots, characteristics=['connected', 'stub_buses'])
     connected, stub_buses = char_dict['connected'], char_dict['stub_buses']
     two_connected = connected - stub_buses
     return connected, two_connected
 
 
+def _csgraph_neighbors(g):
+    """
+    Returns the neighbors of all buses of a CSGraph as dict of lists. As in the adjacency of the
+    NetworkX graph of create_nxgraph, parallel edges are merged and the neighbors are ordered by
+    the first edge to them, so that the graph searches give the same results for both graphs.
+    """
+    traversable = g.traversable
+    n_edges = len(g.from_nodes)
+    rows = np.r_[g.from_nodes, g.to_nodes]
+    cols = np.r_[g.to_nodes, g.from_nodes]
+    position = np.r_[np.arange(n_edges), np.arange(n_edges)]
+    keep = traversable[rows]
+    rows, cols, position = rows[keep], cols[keep], position[keep]
+    # first edge between each pair of buses
+    order = np.lexsort((position, cols, rows))
+    rows, cols, position = rows[order], cols[order], position[order]
+    first = np.r_[True, (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])]
+    rows, cols, position = rows[first], cols[first], position[first]
+    order = np.lexsort((position, rows))
+    rows, cols = rows[order], cols[order]
+    splits = np.searchsorted(rows, np.arange(1, len(g)))
+    neighbors = np.split(g.buses[cols], splits)
+    return {bus: nb.tolist() for bus, nb in zip(g.buses.tolist(), neighbors)}
+
+
 def determine_stubs(net, roots=None, mg=None, respect_switches=False):
     """
      Finds stubs in a network. Open switches are being ignored. Results are being written in a new
@@ -379,7 +482,7 @@ def determine_stubs(net, roots=None, mg=None, respect_switches=False):
 
     """
     if mg is None:
-        mg = create_nxgraph(net, respect_switches=respect_switches)
+        mg = create_csgraph(net, respect_switches=respect_switches)
     # remove buses with degree lower 2 until none left
     if roots is None:
         roots = set(net.ext_grid.bus)
@@ -458,41 +561,78 @@ def estimate_voltage_vector(net):
     """
     Function initializes the voltage vector of net with a rough estimation. All buses are set to the
     slack bus voltage. Transformer differences in magnitude and phase shifting are accounted for.
+
+    The areas of the network that are not separated by transformers are the nodes of a tree, the
+    in service transformers (and the hv-mv / hv-lv windings of three winding transformers) are its
+    edges. The tree is searched breadth first from the areas of the in service ext_grids and the
+    voltages of all areas are calculated level by level as cumulative products of the voltage
+    ratios and sums of the phase shifts. Buses that are not reached are initialized flat.
     :param net: pandapower network
     :return: pandas dataframe with estimated vm_pu and va_degree
     """
-    res_bus = pd.DataFrame(index=net.bus.index, columns=["vm_pu", "va_degree"])
-    net_graph = create_nxgraph(net, include_trafos=False)
-    for _, ext_grid in net.ext_grid.iterrows():
-        area = list(connected_component(net_graph, ext_grid.bus))
-        res_bus.vm_pu.loc[area] = ext_grid.vm_pu
-        res_bus.va_degree.loc[area] = ext_grid.va_degree
-    trafos = net.trafo[net.trafo.in_service == 1]
-    trafo_index = trafos.index.tolist()
-    while len(trafo_index):
-        for tix in trafo_index:
-            trafo = trafos.ix[tix]
-            if pd.notnull(res_bus.vm_pu.at[trafo.hv_bus]) \
-                    and pd.isnull(res_bus.vm_pu.at[trafo.lv_bus]):
-                try:
-                    area = list(connected_component(net_graph, trafo.lv_bus))
-                    shift = trafo.shift_degree if "shift_degree" in trafo else 0
-                    ratio = (trafo.vn_hv_kv / trafo.vn_lv_kv) / (net.bus.vn_kv.at[trafo.hv_bus]
-                                                                 / net.bus.vn_kv.at[trafo.lv_bus])
-                    res_bus.vm_pu.loc[area] = res_bus.vm_pu.at[trafo.hv_bus] * ratio
-                    res_bus.va_degree.loc[area] = res_bus.va_degree.at[trafo.hv_bus] - shift
-                except KeyError:
-                    raise UserWarning("An out-of-service bus is connected to an in-service "
-                                      "transformer. Please set the transformer out of service or"
-                                      "put the bus into service. Treat results with caution!")
-                trafo_index.remove(tix)
-            elif pd.notnull(res_bus.vm_pu.at[trafo.hv_bus]):
-                # parallel transformer, lv buses are already set from previous transformer
-                trafo_index.remove(tix)
-            if len(trafo_index) == len(trafos):
-                # after the initial run we could not identify any areas correctly, it's probably a transmission grid
-                # with slack on the LV bus and multiple transformers/gens. do flat init and return
-                res_bus.vm_pu.loc[res_bus.vm_pu.isnull()] = 1.
-                res_bus.va_degree.loc[res_bus.va_degree.isnull()] = 0.
-                return res_bus
+    res_bus = pd.DataFrame({"vm_pu": 1., "va_degree": 0.}, index=net.bus.index,
+                           columns=["vm_pu", "va_degree"])
+    g = create_csgraph(net, include_trafos=False)
+    n_areas, labels = csgraph.connected_components(g.adjacency(), directed=False)
+    root = n_areas
+
+    # transformer edges between the areas with the voltage ratio and the phase shift from the hv
+    # to the lv area
+    vn_kv = net.bus.vn_kv
+    trafo = net.trafo[net.trafo.in_service.values.astype(bool)]
+    windings = [(trafo.hv_bus.values, trafo.lv_bus.values, trafo.vn_hv_kv.values,
+                 trafo.vn_lv_kv.values, trafo.shift_degree.values)]
+    trafo3w = net.trafo3w[net.trafo3w.in_service.values.astype(bool)]
+    for side in ["mv", "lv"]:
+        windings.append((trafo3w.hv_bus.values, trafo3w["%s_bus" % side].values,
+                         trafo3w.vn_hv_kv.values, trafo3w["vn_%s_kv" % side].values,
+                         trafo3w["shift_%s_degree" % side].values))
+    hv, lv, ratio, shift = [], [], [], []
+    for hv_bus, lv_bus, vn_hv_kv, vn_lv_kv, shift_degree in windings:
+        hv_node, lv_node = g._get_nodes(hv_bus), g._get_nodes(lv_bus)
+        connected = (hv_node >= 0) & (lv_node >= 0)
+        hv_bus, lv_bus = hv_bus[connected], lv_bus[connected]
+        hv.append(labels[hv_node[connected]])
+        lv.append(labels[lv_node[connected]])
+        ratio.append(vn_lv_kv[connected] / vn_hv_kv[connected] * vn_kv.loc[hv_bus].values /
+                     vn_kv.loc[lv_bus].values)
+        shift.append(np.nan_to_num(shift_degree[connected].astype(float)))
+    hv, lv, ratio, shift = [np.concatenate(arr) for arr in [hv, lv, ratio, shift]]
+
+    # the virtual root is connected to the areas of the ext_grids with their voltage as ratio
+    ext_grid = net.ext_grid[net.ext_grid.in_service.values.astype(bool)]
+    eg_nodes = g._get_nodes(ext_grid.bus.values)
+    ext_grid = ext_grid[eg_nodes >= 0]
+    eg_areas = labels[eg_nodes[eg_nodes >= 0]]
+    f = np.r_[np.full(len(eg_areas), root, dtype=np.int64), hv, lv]
+    t = np.r_[eg_areas, lv, hv]
+    ratio = np.r_[ext_grid.vm_pu.values, ratio, 1. / ratio]
+    shift = np.r_[-ext_grid.va_degree.values, shift, -shift]
+
+    adjacency = csr_matrix((np.ones(len(f)), (f, t)), shape=(n_areas + 1, n_areas + 1))
+    order, predecessors = csgraph.breadth_first_order(adjacency, root, directed=True,
+                                                      return_predecessors=True)
+    areas = order[1:]
+    parents = predecessors[areas]
+    # first edge from the parent to each area of the tree
+    keys = f * (n_areas + 1) + t
+    sorting = np.argsort(keys, kind="mergesort")
+    edges = sorting[np.searchsorted(keys[sorting], parents * (n_areas + 1) + areas)]
+
+    vm = np.ones(n_areas + 1)
+    va = np.zeros(n_areas + 1)
+    done = np.zeros(n_areas + 1, dtype=bool)
+    done[root] = True
+    level = np.ones(len(areas), dtype=bool)
+    while level.any():
+        # the next level of the tree contains the areas whose parents are calculated
+        level = ~done[areas] & done[parents]
+        vm[areas[level]] = vm[parents[level]] * ratio[edges[level]]
+        va[areas[level]] = va[parents[level]] - shift[edges[level]]
+        done[areas[level]] = True
+
+    reached = done[labels]
+    buses = g.buses[reached]
+    res_bus.loc[buses, "vm_pu"] = vm[labels[reached]]
+    res_bus.loc[buses, "va_degree"] = va[labels[reached]]
     return res_bus
@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016-2018 by University of Kassel and Fraunhofer Institute for Energy Economics
+# and Energy System Technology (IEE), Kassel. All rights reserved.
+
+
+from collections import deque
+
+import numpy as np
+from scipy.sparse import csr_matrix, csgraph
+
+try:
+    import pplog as logging
+except ImportError:
+    import logging
+
+logger = logging.getLogger(__name__)
+
+# edge type of the branch elements, same as in create_nxgraph / create_csgraph
+EDGE_TYPES = {"line": "l", "impedance": "i", "trafo": "t", "trafo3w": "t3"}
+
+# elements whose in service status is considered by TopologyGraph
+ELEMENTS = ["bus", "line", "impedance", "trafo", "trafo3w", "ext_grid"]
+
+
+class TopologyGraph(object):
+    """
+    Topology graph that is bound to a pandapower network and maintains its connected components
+    and the supply status of all buses while switches are operated and elements are switched in
+    or out of service. The graph contains the same edges as the graph of create_nxgraph, all
+    buses which are connected to an in service ext_grid are supplied.
+
+    Closing a switch or switching an element in service inserts edges, which merges the smaller
+    into the larger component. Opening a switch or switching an element out of service deletes
+    edges: two breadth first searches start alternately at both ends of a deleted edge and stop
+    as soon as they meet. Otherwise, the search that finishes first has found the separated part.
+    The effort of a switching action therefore only depends on the smaller of the affected parts
+    of the network, not on the size of the network.
+
+    The graph is updated by set_switch and set_in_service, which also change the net. If the net
+    is changed directly, update() applies the changes to the graph. New or deleted elements lead
+    to a rebuild of the graph.
+
+    INPUT:
+        **net** (pandapowerNet) - The pandapower network
+
+    OPTIONAL:
+        **respect_switches** (boolean, True) - True: open switches (line, trafo, bus) are being
+            considered (no edge between nodes)
+            False: open switches are being ignored
+
+        **include_lines** (boolean, True) - determines, whether lines get converted to edges
+
+        **include_impedances** (boolean, True) - determines, whether per unit impedances
+            (net.impedance) are converted to edges
+
+        **include_trafos** (boolean, True) - determines, whether trafos get converted to edges
+
+    EXAMPLE:
+        import pandapower.topology as top
+
+        tg = top.TopologyGraph(net)
+        tg.set_switch(3, closed=False)
+        unsupplied = tg.unsupplied_buses()
+        tg.set_in_service("line", 5, False)
+        supplied = tg.is_supplied(7)
+    """
+
+    def __init__(self, net, respect_switches=True, include_lines=True, include_trafos=True,
+                 include_impedances=True):
+        self.net = net
+        self.respect_switches = respect_switches
+        self.include_lines = include_lines
+        self.include_trafos = include_trafos
+        self.include_impedances = include_impedances
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Builds the graph and its connected components from the net.
+        """
+        net = self.net
+        tables = [t for t, include in [("line", self.include_lines),
+                                       ("impedance", self.include_impedances),
+                                       ("trafo", self.include_trafos),
+                                       ("trafo3w", self.include_trafos)] if include]
+        self._tables = tables
+        self._structure = self._get_structure()
+
+        # edges of all elements, independent of their state
+        f, t, edge_type, edge_index = [], [], [], []
+
+        def add_edges(fb, tb, et, index):
+            f.append(fb)
+            t.append(tb)
+            edge_type.extend([et] * len(index))
+            edge_index.append(index)
+
+        for table in tables:
+            element = net[table]
+            if table == "line" or table == "impedance":
+                add_edges(element.from_bus.values, element.to_bus.values, EDGE_TYPES[table],
+                          element.index.values)
+            elif table == "trafo":
+                add_edges(element.hv_bus.values, element.lv_bus.values, "t", element.index.values)
+            else:
+                for b1, b2 in [("hv", "mv"), ("mv", "lv"), ("hv", "lv")]:
+                    add_edges(element["%s_bus" % b1].values, element["%s_bus" % b2].values, "t3",
+                              element.index.values)
+        switch = net.switch
+        bs = switch.et.values == "b"
+        add_edges(switch.bus.values[bs], switch.element.values[bs], "s", switch.index.values[bs])
+
+        f = np.concatenate(f).astype(np.int64).tolist()
+        t = np.concatenate(t).astype(np.int64).tolist()
+        edge_index = np.concatenate(edge_index).astype(np.int64).tolist()
+        self._edges = list(zip(f, t))
+        self._element_edges = dict()
+        for e, key in enumerate(zip(edge_type, edge_index)):
+            self._element_edges.setdefault(key, []).append(e)
+        self._adj = {b: [] for b in net.bus.index.tolist()}
+        for e, (fb, tb) in enumerate(self._edges):
+            self._adj[fb].append((e, tb))
+            self._adj[tb].append((e, fb))
+
+        # state of the elements and switches
+        n_edges = len(self._edges)
+        self._node_active = dict(zip(net.bus.index.tolist(),
+                                     net.bus.in_service.values.astype(bool).tolist()))
+        self._edge_in_service = [True] * n_edges
+        self._edge_open = [0] * n_edges
+        for table in tables:
+            for idx, in_service in zip(net[table].index.tolist(),
+                                       net[table].in_service.values.astype(bool).tolist()):
+                for e in self._element_edges[(EDGE_TYPES[table], idx)]:
+                    self._edge_in_service[e] = in_service
+        self._switch_target = dict(zip(switch.index.tolist(),
+                                       zip(switch.et.values.tolist(), switch.element.tolist())))
+        self._switch_closed = dict(zip(switch.index.tolist(),
+                                       switch.closed.values.astype(bool).tolist()))
+        if self.respect_switches:
+            for sw, closed in self._switch_closed.items():
+                if not closed:
+                    for e, count in self._switch_edges(sw):
+                        self._edge_open[e] += count
+        self._edge_active = [self._edge_in_service[e] and not self._edge_open[e] and
+                             self._node_active[fb] and self._node_active[tb]
+                             for e, (fb, tb) in enumerate(self._edges)]
+
+        # in service ext_grids per bus
+        self._ext_grid_state = dict(zip(net.ext_grid.index.tolist(),
+                                        zip(net.ext_grid.bus.values.tolist(),
+                                            net.ext_grid.in_service.values.astype(bool).tolist())))
+        self._slacks = dict.fromkeys(self._adj, 0)
+        for bus, in_service in self._ext_grid_state.values():
+            if in_service:
+                self._slacks[bus] += 1
+
+        # connected components of the active buses
+        self._labels = dict()
+        self._members = dict()
+        self._comp_slacks = dict()
+        self._unsupplied = set()
+        self._next_label = 0
+        buses = net.bus.index.values
+        lookup = dict(zip(buses.tolist(), range(len(buses))))
+        active = np.array(self._edge_active, dtype=bool)
+        if n_edges:
+            fn = np.array([lookup[b] for b in f], dtype=np.int64)[active]
+            tn = np.array([lookup[b] for b in t], dtype=np.int64)[active]
+        else:
+            fn = tn = np.array([], dtype=np.int64)
+        adjacency = csr_matrix((np.ones(len(fn)), (fn, tn)), shape=(len(buses), len(buses)))
+        _, labels = csgraph.connected_components(adjacency, directed=False)
+        node_active = net.bus.in_service.values.astype(bool)
+        order = np.argsort(labels[node_active], kind="mergesort")
+        active_buses = buses[node_active][order].tolist()
+        if not active_buses:
+            return
+        bounds = np.flatnonzero(np.diff(labels[node_active][order])) + 1
+        for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(active_buses)]):
+            self._new_component(set(active_buses[start:stop]))
+
+    def update(self):
+        """
+        Applies all changes of the switch states and the in service status of the elements in the
+        net since the last update to the graph. The graph is rebuilt if elements were added or
+        deleted or if the buses of elements were changed.
+        """
+        if self._get_structure() != self._structure:
+            logger.debug("The structure of the net has changed, the topology graph is rebuilt")
+            self.rebuild()
+            return
+        net = self.net
+        switch = net.switch
+        stored = np.array([self._switch_closed[sw] for sw in switch.index.tolist()], dtype=bool)
+        changed = np.flatnonzero(stored != switch.closed.values.astype(bool))
+        for sw, closed in zip(switch.index.values[changed].tolist(),
+                              switch.closed.values[changed].astype(bool).tolist()):
+            self._set_switch(sw, closed)
+        for element in ELEMENTS:
+            if element not in self._tables and element not in ("bus", "ext_grid"):
+                continue
+            stored = np.array(self._get_in_service(element), dtype=bool)
+            in_service = net[element].in_service.values.astype(bool)
+            changed = np.flatnonzero(stored != in_service)
+            for idx, state in zip(net[element].index.values[changed].tolist(),
+                                  in_service[changed].tolist()):
+                self._set_in_service(element, idx, state)
+
+    def set_switch(self, switch, closed):
+        """
+        Opens or closes a switch in the net and updates the graph.
+
+        INPUT:
+            **switch** (int) - index of the switch
+
+            **closed** (boolean) - new state of the switch
+        """
+        self.net.switch.at[switch, "closed"] = bool(closed)
+        self._set_switch(switch, bool(closed))
+
+    def set_in_service(self, element, index, in_service):
+        """
+        Switches an element in or out of service in the net and updates the graph.
+
+        INPUT:
+            **element** (string) - "bus", "line", "impedance", "trafo", "trafo3w" or "ext_grid"
+
+            **index** (int) - index of the element
+
+            **in_service** (boolean) - new in service status of the element
+        """
+        if element not in ELEMENTS:
+            raise ValueError("The in service status of %s elements is not part of the topology "
+                             "graph" % element)
+        self.net[element].at[index, "in_service"] = bool(in_service)
+        self._set_in_service(element, index, bool(in_service))
+
+    def connected_component(self, bus):
+        """
+        Returns the set of all buses which are connected to the given bus. The set is empty if
+        the bus is out of service.
+        """
+        label = self._labels.get(bus)
+        return set() if label is None else set(self._members[label])
+
+    def connected_components(self):
+        """
+        Yields the sets of buses of all connected components of the in service buses.
+        """
+        for members in list(self._members.values()):
+            yield set(members)
+
+    def unsupplied_buses(self, slacks=None):
+        """
+        Returns the set of in service buses which are not connected to an in service ext_grid.
+        If slacks are given, the buses which are not connected to any of the slacks are returned.
+        """
+        if slacks is None:
+            return set(self._unsupplied)
+        supplied = {self._labels[bus] for bus in slacks if bus in self._labels}
+        return {bus for label, members in self._members.items() if label not in supplied
+                for bus in members}
+
+    def is_supplied(self, bus):
+        """
+        Returns True if the bus is in service and connected to an in service ext_grid.
+        """
+        return bus in self._labels and bus not in self._unsupplied
+
+    def _get_structure(self):
+        net = self.net
+        structure = [net.bus.index.values.tobytes()]
+        for table, columns in [("line", ["from_bus", "to_bus"]),
+                               ("impedance", ["from_bus", "to_bus"]),
+                               ("trafo", ["hv_bus", "lv_bus"]),
+                               ("trafo3w", ["hv_bus", "mv_bus", "lv_bus"]),
+                               ("switch", ["bus", "element"]), ("ext_grid", ["bus"])]:
+            structure.append(net[table].index.values.tobytes())
+            for column in columns:
+                structure.append(net[table][column].values.astype(np.int64).tobytes())
+        structure.append(net.switch.et.values.astype(str).tobytes())
+        return structure
+
+    def _get_in_service(self, element):
+        index = self.net[element].index.tolist()
+        if element == "bus":
+            return [self._node_active[b] for b in index]
+        if element == "ext_grid":
+            return [self._ext_grid_state[i][1] for i in index]
+        et = EDGE_TYPES[element]
+        return [self._edge_in_service[self._element_edges[(et, i)][0]] for i in index]
+
+    def _switch_edges(self, switch):
+        """
+        Returns the edges that are opened by the switch together with the number of open
+        switches the edge gets by opening the switch.
+        """
+        et, element = self._switch_target[switch]
+        if et == "b":
+            return [(e, 1) for e in self._element_edges.get(("s", switch), [])]
+        if et in ("l", "t"):
+            return [(e, 1) for e in self._element_edges.get((et, element), [])]
+        return []
+
+    def _set_switch(self, switch, closed):
+        if self._switch_closed[switch] == closed:
+            return
+        self._switch_closed[switch] = closed
+        if not self.respect_switches:
+            return
+        for e, count in self._switch_edges(switch):
+            self._edge_open[e] += -count if closed else count
+            self._update_edge(e)
+
+    def _set_in_service(self, element, index, in_service):
+        if element == "bus":
+            self._set_bus_in_service(index, in_service)
+        elif element == "ext_grid":
+            bus, old = self._ext_grid_state[index]
+            if old != in_service:
+                self._ext_grid_state[index] = (bus, in_service)
+                self._add_slacks(bus, 1 if in_service else -1)
+        elif element in self._tables:
+            for e in self._element_edges[(EDGE_TYPES[element], index)]:
+                self._edge_in_service[e] = in_service
+                self._update_edge(e)
+
+    def _set_bus_in_service(self, bus, in_service):
+        if self._node_active[bus] == in_service:
+            return
+        self._node_active[bus] = in_service
+        if in_service:
+            self._new_component({bus})
+            for e, _ in self._adj[bus]:
+                self._update_edge(e)
+        else:
+            # the bus is isolated after all its edges are deleted
+            for e, _ in self._adj[bus]:
+                self._update_edge(e)
+            self._remove_component(self._labels[bus])
+
+    def _add_slacks(self, bus, count):
+        self._slacks[bus] += count
+        label = self._labels.get(bus)
+        if label is None:
+            return
+        supplied = self._comp_slacks[label] > 0
+        self._comp_slacks[label] += count
+        if (self._comp_slacks[label] > 0) != supplied:
+            self._set_supplied(self._members[label], not supplied)
+
+    def _update_edge(self, e):
+        fb, tb = self._edges[e]
+        active = self._edge_in_service[e] and not self._edge_open[e] and \
+            self._node_active[fb] and self._node_active[tb]
+        if active == self._edge_active[e]:
+            return
+        self._edge_active[e] = active
+        if active:
+            self._join(fb, tb)
+        else:
+            self._split(fb, tb)
+
+    def _join(self, fb, tb):
+        large, small = self._labels[fb], self._labels[tb]
+        if large == small:
+            return
+        if len(self._members[large]) < len(self._members[small]):
+            large, small = small, large
+        supplied_large = self._comp_slacks[large] > 0
+        supplied_small = self._comp_slacks[small] > 0
+        if supplied_large != supplied_small:
+            self._set_supplied(self._members[small if supplied_large else large], True)
+        members = self._members.pop(small)
+        self._comp_slacks[large] += self._comp_slacks.pop(small)
+        for bus in members:
+            self._labels[bus] = large
+        self._members[large] |= members
+
+    def _split(self, fb, tb):
+        if fb == tb:
+            return
+        # alternating breadth first searches from both ends of the deleted edge
+        searches = [({fb}, deque([fb])), ({tb}, deque([tb]))]
+        edge_active, adj = self._edge_active, self._adj
+        i = 0
+        while True:
+            visited, queue = searches[i]
+            if not queue:
+                break
+            other = searches[1 - i][0]
+            for e, bus in adj[queue.popleft()]:
+                if edge_active[e] and bus not in visited:
+                    if bus in other:
+                        return
+                    visited.add(bus)
+                    queue.append(bus)
+            i = 1 - i
+        part = searches[i][0]
+        label = self._labels[fb]
+        supplied = self._comp_slacks[label] > 0
+        self._members[label] -= part
+        self._comp_slacks[label] -= sum(self._slacks[bus] for bus in part)
+        new_label = self._new_component(part, update_supplied=False)
+        if supplied:
+            for lab in (label, new_label):
+                if not self._comp_slacks[lab]:
+                    self._set_supplied(self._members[lab], False)
+
+    def _new_component(self, members, update_supplied=True):
+        label = self._next_label
+        self._next_label += 1
+        self._members[label] = members
+        for bus in members:
+            self._labels[bus] = label
+        self._comp_slacks[label] = sum(self._slacks[bus] for bus in members)
+        if update_supplied and not self._comp_slacks[label]:
+            self._set_supplied(members, False)
+        return label
+
+    def _remove_component(self, label):
+        members = self._members.pop(label)
+        self._comp_slacks.pop(label)
+        self._set_supplied(members, True)
+        for bus in members:
+            del self._labels[bus]
+
+    def _set_supplied(self, buses, supplied):
+        if supplied:
+            self._unsupplied.difference_update(buses)
+        else:
+            self._unsupplied.update(buses)